@@ -0,0 +1,295 @@
+"""Brasileirão CSV → MatchInputs pipeline.
+
+Lê data/csv/brasileirao/<temporada>_matches.csv (gerado por
+scripts/update_csv_from_api.py) uma vez por versão do arquivo, calcula os
+fallbacks de lambda, cartões e escanteios e os rótulos de horário como colunas
+vetorizadas e guarda um índice rodada → linhas. Cada rodada vira uma lista de
+`MatchInputs` sem reler o CSV. Com uma cópia Parquet atualizada e a temporada
+ainda não carregada, load_brasileirao_round_matches lê só o row group da rodada.
+
+Colunas esperadas: round, home_team, away_team, kickoff_utc, lambda_home,
+lambda_away, mean_cards, mean_corners, além de metadados opcionais. Colunas
+legadas (round_number, home_xg, home_cards etc.) continuam aceitas.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import pandas as pd
+
+from analysis.prediction import MatchInputs
+from data.parquet_store import round_filter
+from data.schema import load_table
+
+# Paths -----------------------------------------------------------------------
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "csv" / "brasileirao"
+
+# Fallback averages when CSV rows are missing richer context ------------------
+DEFAULT_BR_HOME_LAMBDA = 1.45
+DEFAULT_BR_AWAY_LAMBDA = 1.15
+DEFAULT_BR_CARDS = 4.5
+DEFAULT_BR_CORNERS = 9.2
+
+LEAGUE_NAME = "Brasileirão Série A"
+KICKOFF_SOURCES = ("kickoff_utc", "kickoff", "date")
+KICKOFF_LABEL_FORMAT = "%d %b %Y %H:%M (UTC)"
+
+
+# Public API -----------------------------------------------------------------
+def csv_for_season(season: int) -> Path:
+    return DATA_DIR / f"{season}_matches.csv"
+
+
+def list_brasileirao_seasons() -> List[int]:
+    """Temporadas com CSV de partidas disponível (padrão: [2025])."""
+    out: List[int] = []
+    for path in DATA_DIR.glob("*_matches.csv"):
+        try:
+            out.append(int(path.name.split("_")[0]))
+        except ValueError:
+            continue
+    return sorted(set(out)) or [2025]
+
+
+def list_brasileirao_rounds(season: int) -> List[int]:
+    """Rodadas presentes no CSV da temporada (lista vazia se não houver CSV)."""
+    if not csv_for_season(season).exists():
+        return []
+    return load_brasileirao_season(season).rounds()
+
+
+def load_brasileirao_round_matches(round_number: int, season: int) -> List[MatchInputs]:
+    """
+    Carrega as partidas de uma rodada do Brasileirão como MatchInputs.
+
+    Raises:
+        FileNotFoundError: CSV da temporada não existe
+        ValueError: Rodada sem partidas
+    """
+    matches = _round_source(season, round_number).round_matches(round_number)
+    if not matches:
+        raise ValueError(f"Nenhuma partida do Brasileirão encontrada para a rodada {round_number}")
+    return matches
+
+
+def load_brasileirao_season(season: int) -> "BrasileiraoSeason":
+    """
+    Temporada parseada, reaproveitada enquanto o CSV não mudar (mtime/tamanho).
+
+    Raises:
+        FileNotFoundError: CSV da temporada não existe
+    """
+    csv_path, key, version = _season_file(season)
+
+    with _seasons_lock:
+        cached = _seasons.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    parsed = BrasileiraoSeason(load_table(csv_path), season)
+    with _seasons_lock:
+        _seasons[key] = (version, parsed)
+        # A temporada inteira já cobre as rodadas lidas isoladamente
+        for round_key in [k for k in _rounds if k[0] == key]:
+            del _rounds[round_key]
+    return parsed
+
+
+def clear_season_cache() -> None:
+    """Descarta as temporadas (e rodadas avulsas) em memória."""
+    with _seasons_lock:
+        _seasons.clear()
+        _rounds.clear()
+
+
+def _round_source(season: int, round_number: int) -> "BrasileiraoSeason":
+    """Temporada em memória, se atual; senão só a rodada, lida do Parquet."""
+    csv_path, key, version = _season_file(season)
+    round_key = (key, int(round_number))
+
+    with _seasons_lock:
+        cached = _seasons.get(key)
+        if cached is None or cached[0] != version:
+            cached = _rounds.get(round_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    filters = round_filter(csv_path, round_number)
+    if filters is None:
+        return load_brasileirao_season(season)
+    parsed = BrasileiraoSeason(load_table(csv_path, filters=filters), season)
+    with _seasons_lock:
+        _rounds[round_key] = (version, parsed)
+    return parsed
+
+
+def _season_file(season: int) -> Tuple[Path, str, Tuple[int, int]]:
+    """CSV da temporada, chave de cache e versão (mtime/tamanho)."""
+    csv_path = csv_for_season(season)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Brasileirão matches CSV não encontrado: {csv_path}")
+    stat = csv_path.stat()
+    return csv_path, str(csv_path.resolve()), (stat.st_mtime_ns, stat.st_size)
+
+
+class BrasileiraoSeason:
+    """Partidas de uma temporada com colunas derivadas e índice por rodada."""
+
+    def __init__(self, df: pd.DataFrame, season: int):
+        self.season = season
+        df = df.reset_index(drop=True)
+
+        rounds = _numeric(df, "round")
+        if "round_number" in df.columns:
+            rounds = rounds.fillna(_numeric(df, "round_number"))
+
+        home_team = _team(df, "home_team")
+        away_team = _team(df, "away_team")
+        valid = rounds.notna() & (home_team != "") & (away_team != "")
+
+        mean_cards = _first_nonzero(
+            _numeric(df, "mean_cards"),
+            _row_mean(df, ("home_cards", "away_cards")),
+            default=DEFAULT_BR_CARDS,
+        )
+        mean_corners = _first_nonzero(
+            _numeric(df, "mean_corners"),
+            _row_mean(df, ("home_corners", "away_corners")),
+            default=DEFAULT_BR_CORNERS,
+        )
+        kickoff_value, kickoff_label = _kickoff(df)
+
+        derived = pd.DataFrame({
+            "round": rounds,
+            "home_team": home_team,
+            "away_team": away_team,
+            "lambda_home": _first_nonzero(
+                _numeric(df, "lambda_home"), _numeric(df, "home_xg"), default=DEFAULT_BR_HOME_LAMBDA
+            ),
+            "lambda_away": _first_nonzero(
+                _numeric(df, "lambda_away"), _numeric(df, "away_xg"), default=DEFAULT_BR_AWAY_LAMBDA
+            ),
+            "mean_cards": mean_cards,
+            "mean_corners": mean_corners,
+            "lambda_cards_home": (mean_cards * 0.55).clip(lower=1.0),
+            "lambda_cards_away": (mean_cards * 0.45).clip(lower=0.8),
+            "kickoff_value": kickoff_value,
+            "kickoff_label": kickoff_label,
+        })[valid]
+
+        self._derived: List[Dict[str, Any]] = derived.to_dict("records")
+        raw = df.drop(columns=["kickoff_dt"], errors="ignore")[valid]
+        self._raw: List[Dict[str, Any]] = raw.to_dict("records")
+
+        self._by_round: Dict[int, List[int]] = {}
+        for position, row in enumerate(self._derived):
+            self._by_round.setdefault(int(row["round"]), []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._derived)
+
+    def rounds(self) -> List[int]:
+        return sorted(self._by_round)
+
+    def round_matches(self, round_number: int) -> List[MatchInputs]:
+        """MatchInputs da rodada (objetos novos a cada chamada)."""
+        target_round = int(round_number)
+        return [self._match_inputs(p, target_round) for p in self._by_round.get(target_round, [])]
+
+    def all_matches(self) -> Dict[int, List[MatchInputs]]:
+        return {round_number: self.round_matches(round_number) for round_number in self.rounds()}
+
+    def _match_inputs(self, position: int, target_round: int) -> MatchInputs:
+        row = self._derived[position]
+        raw = self._raw[position]
+        context = {
+            "round": target_round,
+            "status": raw.get("status", "SCHEDULED"),
+            "league": LEAGUE_NAME,
+            "kickoff_label": row["kickoff_label"],
+            "lambda_cards_home": row["lambda_cards_home"],
+            "lambda_cards_away": row["lambda_cards_away"],
+            "lambda_corners": row["mean_corners"],
+            "odds": raw.get("odds") or {},
+            "fixture_metadata": {
+                "match_id": raw.get("match_id") or raw.get("id"),
+                "raw_stage": raw.get("stage"),
+            },
+            "season": self.season,
+        }
+        return MatchInputs(
+            home_team=row["home_team"],
+            away_team=row["away_team"],
+            round_number=target_round,
+            kickoff_utc=row["kickoff_value"],
+            lambda_home=row["lambda_home"],
+            lambda_away=row["lambda_away"],
+            mean_cards=row["mean_cards"],
+            mean_corners=row["mean_corners"],
+            context=context,
+            raw_row=dict(raw),
+        )
+
+
+# Helpers --------------------------------------------------------------------
+_seasons: Dict[str, Tuple[Tuple[int, int], BrasileiraoSeason]] = {}
+# Rodadas lidas isoladamente do Parquet: {(arquivo, rodada): (versão, rodada)}
+_rounds: Dict[Tuple[str, int], Tuple[Tuple[int, int], BrasileiraoSeason]] = {}
+_seasons_lock = threading.Lock()
+
+
+def _numeric(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(float("nan"), index=df.index)
+    return pd.to_numeric(df[column], errors="coerce").astype(float)
+
+
+def _team(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[column].astype("string").fillna("").str.strip().astype(object)
+
+
+def _row_mean(df: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
+    # Média dos valores presentes; NaN se nenhum existir
+    frame = pd.concat([_numeric(df, column) for column in columns], axis=1)
+    return frame.mean(axis=1, skipna=True)
+
+
+def _first_nonzero(*candidates: pd.Series, default: float) -> pd.Series:
+    """Primeiro valor presente e diferente de zero, na ordem dada."""
+    result = pd.Series(float("nan"), index=candidates[0].index)
+    for candidate in candidates:
+        result = result.fillna(candidate.where(candidate != 0))
+    return result.fillna(default)
+
+
+def _kickoff(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Horário (datetime ou texto original) e rótulo de cada partida."""
+    source = pd.Series(pd.NA, index=df.index, dtype="string")
+    for column in KICKOFF_SOURCES:
+        if column in df.columns:
+            text = df[column].astype("string").str.strip()
+            source = source.fillna(text.where(text != ""))
+
+    parsed = df["kickoff_dt"] if "kickoff_dt" in df.columns else pd.to_datetime(
+        source, format="ISO8601", utc=True, errors="coerce"
+    )
+    labels = parsed.dt.strftime(KICKOFF_LABEL_FORMAT)
+
+    # Fonte sem fuso (ex.: "2025-04-13 16:00") continua datetime ingênuo
+    has_offset = source.str.contains(r"(?:Z|[+-]\d{2}:?\d{2})$", regex=True).fillna(False)
+    values = [
+        _to_datetime(moment, bool(offset)) if not pd.isna(moment) else (text if not pd.isna(text) else None)
+        for moment, offset, text in zip(parsed, has_offset, source)
+    ]
+    labels = labels.fillna(source.fillna("")).astype(object)
+    return pd.Series(values, index=df.index, dtype=object), labels
+
+
+def _to_datetime(moment: pd.Timestamp, aware: bool) -> Any:
+    value = moment.to_pydatetime()
+    return value if aware else value.replace(tzinfo=None)
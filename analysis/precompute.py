@@ -0,0 +1,453 @@
+"""
+Pré-cálculo das previsões das próximas rodadas, fora das requisições da UI
+
+PrecomputeService observa os CSV de cada liga e o índice do histórico de odds
+(data/odds_history.py) pela versão do arquivo (mtime/tamanho), além da
+geração do PredictionStore. Quando algo muda, enfileira a rodada atual e a seguinte de cada liga em uma fila de
+prioridade ordenada pelo próximo kickoff, e os workers calculam:
+
+- run_prediction de cada partida, gravado no PredictionStore (a mesma chave
+  que app.cached_run_prediction lê, então a UI só faz uma leitura);
+- EV e Kelly de 1X2 com as melhores odds conhecidas, em um resumo por rodada
+  no cache em disco (get_precomputed_round). O resumo guarda a geração do
+  PredictionStore e deixa de valer após invalidate().
+
+Roda como processo separado (scripts/precompute_predictions.py) compartilhando
+o diretório cache/ com o app.
+"""
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from analysis import brasileirao_data_pipeline as brasileirao
+from analysis import premier_league_data_pipeline as premier
+from analysis.prediction import MODEL_VERSION, MatchInputs
+from analysis.prediction_store import PredictionStore, get_prediction_store
+from data.odds_history import get_odds_history_store
+from utils.disk_cache import get_disk_cache
+
+logger = logging.getLogger(__name__)
+
+ROUNDS_NAMESPACE = 'precomputed_rounds'
+
+# Padrão do slider "Simulações (n_sim)" do app
+DEFAULT_N_SIMS = (50_000,)
+DEFAULT_ROUNDS_AHEAD = 2
+DEFAULT_POLL_SECONDS = 30
+ROUND_TTL_SECONDS = 7 * 24 * 3600
+
+# Janela de odds consultada no histórico
+ODDS_LOOKBACK_DAYS = 7
+
+FINISHED_STATUSES = ('FINISHED', 'COMPLETE', 'COMPLETED')
+OUTCOMES_1X2 = (('home', 'home_win'), ('draw', 'draw'), ('away', 'away_win'))
+PROBABILITY_KEYS = {'home': 'p_home_win', 'draw': 'p_draw', 'away': 'p_away_win'}
+
+FileVersion = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass(frozen=True)
+class LeagueSource:
+    """Onde ler as rodadas de uma liga e quais arquivos observar"""
+    key: str
+    odds_sport_key: str
+    load_rounds: Callable[[], Dict[int, List[MatchInputs]]]
+    data_files: Callable[[], List[Path]]
+
+
+@dataclass(order=True)
+class PrecomputeJob:
+    """
+    Rodada a calcular; a fila entrega primeiro o kickoff mais próximo
+
+    As partidas não vão na fila: ficam em PrecomputeService._pending e são
+    substituídas a cada nova varredura, então o job sempre usa os dados mais
+    recentes da rodada.
+    """
+    kickoff: float
+    league: str = field(compare=False)
+    round_number: int = field(compare=False)
+
+
+def _premier_rounds() -> Dict[int, List[MatchInputs]]:
+    return premier.get_premier_pipeline().all_matches()
+
+
+def _brasileirao_rounds() -> Dict[int, List[MatchInputs]]:
+    season = max(brasileirao.list_brasileirao_seasons())
+    if not brasileirao.csv_for_season(season).exists():
+        return {}
+    parsed = brasileirao.load_brasileirao_season(season)
+    return {round_number: parsed.round_matches(round_number) for round_number in parsed.rounds()}
+
+
+LEAGUES: Dict[str, LeagueSource] = {
+    'premier_league': LeagueSource(
+        'premier_league', 'soccer_epl', _premier_rounds,
+        lambda: [premier.MATCHES_CSV, premier.TEAMS_CSV],
+    ),
+    'brasileirao': LeagueSource(
+        'brasileirao', 'soccer_brazil_campeonato', _brasileirao_rounds,
+        lambda: [brasileirao.csv_for_season(max(brasileirao.list_brasileirao_seasons()))],
+    ),
+}
+
+
+def kickoff_timestamp(match: MatchInputs) -> Optional[float]:
+    """Kickoff em segundos UTC (horários sem fuso são tratados como UTC)"""
+    value = match.kickoff_utc
+    if value is None or value == '':
+        return None
+    try:
+        moment = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+    if pd.isna(moment):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.tz_localize('UTC')
+    return moment.timestamp()
+
+
+def is_finished(match: MatchInputs) -> bool:
+    status = str((match.context or {}).get('status') or '').upper()
+    return status in FINISHED_STATUSES
+
+
+def upcoming_rounds(rounds: Dict[int, List[MatchInputs]], count: int = DEFAULT_ROUNDS_AHEAD) -> List[Tuple[int, float]]:
+    """
+    Rodada atual e seguintes: as primeiras com partidas ainda não encerradas
+
+    Returns:
+        [(rodada, próximo kickoff)], em ordem de rodada; sem kickoff conhecido → inf
+    """
+    selected = []
+    for round_number in sorted(rounds):
+        pending = [match for match in rounds[round_number] if not is_finished(match)]
+        if not pending:
+            continue
+        kickoffs = [ts for ts in (kickoff_timestamp(match) for match in pending) if ts is not None]
+        selected.append((round_number, min(kickoffs) if kickoffs else math.inf))
+        if len(selected) >= count:
+            break
+    return selected
+
+
+def value_metrics(probability: float, odd: Optional[float]) -> Dict[str, Optional[float]]:
+    """
+    EV e fração de Kelly (sem fração de banca) para uma odd decimal
+
+    Mesmas fórmulas de compute_ev/compute_kelly_raw do app.
+    """
+    if odd is None or not odd > 1:
+        return {'odd': None, 'ev': None, 'kelly': None}
+    ev = probability * odd - 1
+    kelly = ev / (odd - 1) if ev > 0 else None
+    return {'odd': float(odd), 'ev': ev, 'kelly': kelly}
+
+
+def _normalize_team(name: Any) -> str:
+    return ' '.join(str(name or '').lower().split())
+
+
+class PrecomputeService:
+    """Observa os dados das ligas e materializa as próximas rodadas"""
+
+    def __init__(
+        self,
+        leagues: Optional[Sequence[str]] = None,
+        store: Optional[PredictionStore] = None,
+        disk: Any = None,
+        n_sims: Sequence[int] = DEFAULT_N_SIMS,
+        rounds_ahead: int = DEFAULT_ROUNDS_AHEAD,
+        odds_history: Any = None,
+        sources: Optional[Dict[str, LeagueSource]] = None,
+    ):
+        """
+        Inicializa o serviço
+
+        Args:
+            leagues: Ligas a observar (padrão: todas de LEAGUES)
+            store: Armazenamento de previsões (padrão: get_prediction_store())
+            disk: Cache em disco dos resumos de rodada (padrão: get_disk_cache())
+            n_sims: Números de simulações a pré-calcular
+            rounds_ahead: Quantas rodadas pendentes por liga
+            odds_history: Histórico de odds (padrão: get_odds_history_store())
+            sources: Fontes por liga (padrão: LEAGUES)
+        """
+        sources = sources or LEAGUES
+        self.sources = {key: sources[key] for key in (leagues or sources)}
+        self.store = store or get_prediction_store()
+        self.disk = disk if disk is not None else get_disk_cache()
+        self.n_sims = tuple(int(n) for n in n_sims)
+        self.rounds_ahead = rounds_ahead
+        self.odds_history = odds_history if odds_history is not None else get_odds_history_store()
+
+        self._queue: 'queue.PriorityQueue[PrecomputeJob]' = queue.PriorityQueue()
+        self._pending: Dict[Tuple[str, int], List[MatchInputs]] = {}
+        self._versions: Dict[str, Tuple[int, FileVersion]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._stats = {'scans': 0, 'jobs': 0, 'matches': 0, 'errors': 0}
+
+    def scan(self) -> int:
+        """
+        Enfileira as próximas rodadas das ligas cujos arquivos mudaram
+
+        Uma nova geração do PredictionStore (invalidate()) também conta como
+        mudança: os resumos calculados na geração anterior deixaram de valer.
+
+        Returns:
+            Número de rodadas enfileiradas
+        """
+        enqueued = 0
+        generation = self.store.generation()
+        for key, source in self.sources.items():
+            version = (generation, self._version(source))
+            if self._versions.get(key) == version:
+                continue
+            try:
+                rounds = source.load_rounds()
+            except Exception as e:
+                self._count('errors')
+                logger.warning(f"Falha ao carregar rodadas de {key}: {e}")
+                continue
+            self._versions[key] = version
+            for round_number, kickoff in upcoming_rounds(rounds, self.rounds_ahead):
+                enqueued += self._enqueue(PrecomputeJob(kickoff, key, round_number), rounds[round_number])
+        self._count('scans')
+        return enqueued
+
+    def run_pending(self) -> int:
+        """
+        Processa a fila nesta thread até esvaziar
+
+        Returns:
+            Número de rodadas processadas
+        """
+        processed = 0
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return processed
+            self._run_job(job)
+            processed += 1
+
+    def run_once(self) -> int:
+        """Uma passada completa: scan + fila (para cron ou testes)"""
+        self.scan()
+        return self.run_pending()
+
+    def start(self, workers: int = 1) -> None:
+        """Inicia os workers que consomem a fila em segundo plano"""
+        self._stop.clear()
+        for index in range(workers):
+            thread = threading.Thread(target=self._worker, name=f'precompute-{index}', daemon=True)
+            thread.start()
+            self._workers.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Sinaliza parada e aguarda os workers"""
+        self._stop.set()
+        for thread in self._workers:
+            thread.join(timeout)
+        self._workers = []
+
+    def serve_forever(self, poll_seconds: float = DEFAULT_POLL_SECONDS, workers: int = 1) -> None:
+        """Loop do daemon: verifica mudanças a cada poll_seconds até stop()"""
+        self.start(workers)
+        try:
+            while not self._stop.is_set():
+                self.scan()
+                self._stop.wait(poll_seconds)
+        finally:
+            self.stop()
+
+    def compute_round(self, league: str, round_number: int, matches: List[MatchInputs],
+                      n_sims: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Calcula e grava previsões, EV e Kelly de uma rodada
+
+        Args:
+            league: Liga
+            round_number: Rodada
+            matches: Partidas da rodada
+            n_sims: Números de simulações (padrão: os do serviço)
+
+        Returns:
+            Resumos gravados (um por n_sim)
+        """
+        odds_by_match = self._latest_odds(self.sources[league])
+        # Lida antes de simular: uma invalidação durante o cálculo descarta o resumo
+        generation = self.store.generation()
+        summaries = []
+        for n_sim in (n_sims or self.n_sims):
+            rows = []
+            # Partidas ainda sem previsão são simuladas em um único lote vetorizado
+            predictions = self.store.get_or_compute_many(matches, n_sim)
+            for match, result in zip(matches, predictions):
+                odds = self._match_odds(match, odds_by_match)
+                rows.append({
+                    'home_team': match.home_team,
+                    'away_team': match.away_team,
+                    'kickoff': kickoff_timestamp(match),
+                    'finished': is_finished(match),
+                    'prediction': result,
+                    'value': {
+                        side: value_metrics(result[PROBABILITY_KEYS[side]], odds.get(side))
+                        for side in PROBABILITY_KEYS
+                    },
+                })
+            summary = {
+                'league': league,
+                'round': round_number,
+                'n_sim': n_sim,
+                'model_version': MODEL_VERSION,
+                'generation': generation,
+                'computed_at': time.time(),
+                'matches': rows,
+            }
+            if self.disk is not None:
+                now = summary['computed_at']
+                self.disk.set(ROUNDS_NAMESPACE, round_key(league, round_number, n_sim), summary,
+                              now, now + ROUND_TTL_SECONDS, now + ROUND_TTL_SECONDS)
+            summaries.append(summary)
+        self._count('matches', len(matches) * len(summaries))
+        return summaries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de varreduras, rodadas, partidas e erros"""
+        with self._lock:
+            return dict(self._stats, queued=self._queue.qsize())
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job: PrecomputeJob) -> None:
+        with self._lock:
+            matches = self._pending.pop((job.league, job.round_number), None)
+        if matches is None:
+            return
+        started = time.time()
+        try:
+            self.compute_round(job.league, job.round_number, matches)
+            self._count('jobs')
+            logger.info(
+                f"Rodada {job.round_number} de {job.league} pré-calculada "
+                f"({len(matches)} partidas, {time.time() - started:.1f}s)"
+            )
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Falha ao pré-calcular rodada {job.round_number} de {job.league}: {e}")
+
+    def _enqueue(self, job: PrecomputeJob, matches: List[MatchInputs]) -> int:
+        with self._lock:
+            queued = (job.league, job.round_number) in self._pending
+            # Rodada já na fila: só troca as partidas pelas da varredura atual
+            self._pending[(job.league, job.round_number)] = matches
+        if queued:
+            return 0
+        self._queue.put(job)
+        return 1
+
+    def _version(self, source: LeagueSource) -> FileVersion:
+        paths = list(source.data_files())
+        if self.odds_history is not None:
+            paths.extend(self.odds_history.index_files(source.odds_sport_key))
+        version = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                version.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                version.append((str(path), 0, 0))
+        return tuple(version)
+
+    def _latest_odds(self, source: LeagueSource) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """Melhor odd atual de cada resultado 1X2 por (mandante, visitante)"""
+        if self.odds_history is None:
+            return {}
+        start = datetime.now(timezone.utc) - timedelta(days=ODDS_LOOKBACK_DAYS)
+        try:
+            closing = self.odds_history.closing_odds(source.odds_sport_key, '1x2', start=start)
+        except Exception as e:
+            logger.debug(f"Histórico de odds indisponível para {source.key}: {e}")
+            return {}
+        if closing.empty:
+            return {}
+        closing = closing.assign(
+            home_key=closing['home_team'].map(_normalize_team),
+            away_key=closing['away_team'].map(_normalize_team),
+        )
+        best = closing.groupby(['home_key', 'away_key'])[[column for _, column in OUTCOMES_1X2]].max()
+        # Histórico guarda preços em float32: volta para 3 casas decimais
+        return {
+            index: {side: round(float(row[column]), 3) for side, column in OUTCOMES_1X2 if pd.notna(row[column])}
+            for index, row in best.iterrows()
+        }
+
+    @staticmethod
+    def _match_odds(match: MatchInputs, odds_by_match: Dict[Tuple[str, str], Dict[str, float]]) -> Dict[str, float]:
+        # Histórico de odds primeiro; odds do próprio CSV como alternativa
+        csv_odds = (match.context or {}).get('odds') or {}
+        odds = {side: csv_odds.get(side) for side in PROBABILITY_KEYS if csv_odds.get(side)}
+        odds.update(odds_by_match.get((_normalize_team(match.home_team), _normalize_team(match.away_team)), {}))
+        return odds
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+
+def round_key(league: str, round_number: int, n_sim: int) -> str:
+    return f"{league}:{int(round_number)}:{int(n_sim)}"
+
+
+def get_precomputed_round(league: str, round_number: int, n_sim: int = DEFAULT_N_SIMS[0],
+                          disk: Any = None, store: Optional[PredictionStore] = None) -> Optional[Dict[str, Any]]:
+    """
+    Resumo pré-calculado de uma rodada (previsões, EV e Kelly por partida)
+
+    Args:
+        league: Liga
+        round_number: Rodada
+        n_sim: Número de simulações
+        disk: Cache em disco (padrão: get_disk_cache())
+        store: Armazenamento cuja geração o resumo precisa ter (padrão: get_prediction_store())
+
+    Returns:
+        Resumo ou None se ainda não foi calculado ou se as previsões foram invalidadas depois
+    """
+    disk = disk if disk is not None else get_disk_cache()
+    if disk is None:
+        return None
+    found = disk.get(ROUNDS_NAMESPACE, round_key(league, round_number, n_sim))
+    if found is None or found[0].get('model_version') != MODEL_VERSION:
+        return None
+    store = store or get_prediction_store()
+    if found[0].get('generation') != store.generation():
+        return None
+    return found[0]
+
+
+def n_sims_from_env() -> Tuple[int, ...]:
+    """PRECOMPUTE_N_SIMS: lista separada por vírgulas (padrão: 50000)"""
+    raw = os.getenv('PRECOMPUTE_N_SIMS', '')
+    values = tuple(int(part) for part in raw.split(',') if part.strip())
+    return values or DEFAULT_N_SIMS
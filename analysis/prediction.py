@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
 
@@ -13,6 +13,10 @@ DEFAULT_AWAY_LAMBDA = 1.20
 MIN_LAMBDA = 0.05
 MAX_LAMBDA = 5.0
 TOP_SCORELINES = 5
+# Bump when run_prediction changes its output for the same inputs (invalidates stored predictions)
+MODEL_VERSION = "poisson-mc-1"
+# Upper bound on Poisson draws held in memory at once by run_predictions_batch
+BATCH_MAX_CELLS = 4_000_000
 
 
 @dataclass
@@ -58,6 +62,14 @@ def _resolve_lambda(match: MatchInputs, side: str) -> float:
     to contextual league defaults when explicit values are missing.
     """
 
+    # Pipelines fill lambda_* from float columns typed by data/schema.py at load
+    # time, so the common case needs no coercion. The fallbacks below read loosely
+    # typed context/raw_row dicts (API payloads, hand-built inputs) that have no
+    # declared schema, hence _coerce_float.
+    declared = getattr(match, f"lambda_{side}", None)
+    if isinstance(declared, float) and np.isfinite(declared) and declared > 0:
+        return float(min(MAX_LAMBDA, max(MIN_LAMBDA, declared)))
+
     side_key = "home" if side == "home" else "away"
     context = getattr(match, "context", {}) or {}
     raw_row = getattr(match, "raw_row", {}) or {}
@@ -179,7 +191,103 @@ def run_prediction(match: MatchInputs, n_sim: int = 50_000, seed: int | None = N
         for (hg, ag), count in score_counter.most_common(TOP_SCORELINES)
     ]
 
-    result = {
+    return _result_dict(
+        p_home_win, p_draw, p_away_win, p_over_2_5, p_btts,
+        clean_sheet_home, clean_sheet_away, lambda_home, lambda_away,
+        mean_home_goals, mean_away_goals, scoreline_top, n_sim, seed,
+    )
+
+
+def run_predictions_batch(matches: Sequence[MatchInputs], n_sim: int = 50_000) -> List[Dict[str, Any]]:
+    """
+    Vectorized run_prediction for many matches with the same n_sim.
+
+    All matches are simulated as rows of one (matches x n_sim) Poisson draw, in
+    chunks of at most BATCH_MAX_CELLS draws, so a batch costs a handful of NumPy
+    calls instead of one Python-level simulation per match. Results have the same
+    layout as run_prediction (unseeded; tied scorelines are ordered by score).
+
+    Args:
+        matches: Matches to simulate.
+        n_sim: Number of Monte Carlo draws per match.
+
+    Returns:
+        One result dict per match, in input order.
+    """
+    if n_sim <= 0:
+        raise ValueError("n_sim must be positive")
+
+    rng = np.random.default_rng()
+    lambdas_home = np.array([_resolve_lambda(match, "home") for match in matches], dtype=float)
+    lambdas_away = np.array([_resolve_lambda(match, "away") for match in matches], dtype=float)
+    rows_per_chunk = max(1, BATCH_MAX_CELLS // n_sim)
+
+    results: List[Dict[str, Any]] = []
+    for start in range(0, len(matches), rows_per_chunk):
+        lam_home = lambdas_home[start:start + rows_per_chunk]
+        lam_away = lambdas_away[start:start + rows_per_chunk]
+        home_goals = rng.poisson(lam=lam_home[:, None], size=(len(lam_home), n_sim))
+        away_goals = rng.poisson(lam=lam_away[:, None], size=(len(lam_away), n_sim))
+        total_goals = home_goals + away_goals
+
+        p_home_win = (home_goals > away_goals).mean(axis=1)
+        p_draw = (home_goals == away_goals).mean(axis=1)
+        p_away_win = (home_goals < away_goals).mean(axis=1)
+        p_over_2_5 = (total_goals >= 3).mean(axis=1)
+        p_btts = ((home_goals >= 1) & (away_goals >= 1)).mean(axis=1)
+        clean_sheet_home = (away_goals == 0).mean(axis=1)
+        clean_sheet_away = (home_goals == 0).mean(axis=1)
+        mean_home_goals = home_goals.mean(axis=1)
+        mean_away_goals = away_goals.mean(axis=1)
+        scorelines = _top_scorelines(home_goals, away_goals, n_sim)
+
+        for row in range(len(lam_home)):
+            results.append(_result_dict(
+                float(p_home_win[row]), float(p_draw[row]), float(p_away_win[row]),
+                float(p_over_2_5[row]), float(p_btts[row]),
+                float(clean_sheet_home[row]), float(clean_sheet_away[row]),
+                float(lam_home[row]), float(lam_away[row]),
+                float(mean_home_goals[row]), float(mean_away_goals[row]),
+                scorelines[row], n_sim, None,
+            ))
+    return results
+
+
+def _top_scorelines(home_goals: np.ndarray, away_goals: np.ndarray, n_sim: int) -> List[List[Dict[str, Any]]]:
+    """Most frequent scorelines per row, counted with a single bincount."""
+    rows = home_goals.shape[0]
+    width = int(max(home_goals.max(), away_goals.max())) + 1
+    codes = home_goals * width + away_goals + (np.arange(rows) * width * width)[:, None]
+    counts = np.bincount(codes.ravel(), minlength=rows * width * width).reshape(rows, width * width)
+    top = np.argsort(-counts, axis=1, kind="stable")[:, :TOP_SCORELINES]
+
+    out = []
+    for row in range(rows):
+        out.append([
+            {"score": f"{code // width}-{code % width}", "probability": float(counts[row, code] / n_sim)}
+            for code in top[row].tolist()
+            if counts[row, code] > 0
+        ])
+    return out
+
+
+def _result_dict(
+    p_home_win: float,
+    p_draw: float,
+    p_away_win: float,
+    p_over_2_5: float,
+    p_btts: float,
+    clean_sheet_home: float,
+    clean_sheet_away: float,
+    lambda_home: float,
+    lambda_away: float,
+    mean_home_goals: float,
+    mean_away_goals: float,
+    scoreline_top: List[Dict[str, Any]],
+    n_sim: int,
+    seed: Optional[int],
+) -> Dict[str, Any]:
+    return {
         "p_home_win": p_home_win,
         "p_draw": p_draw,
         "p_away_win": p_away_win,
@@ -213,8 +321,6 @@ def run_prediction(match: MatchInputs, n_sim: int = 50_000, seed: int | None = N
         "seed": seed,
     }
 
-    return result
-
 
 def format_report(match: MatchInputs, result: Dict[str, Any]) -> str:
     """
@@ -0,0 +1,356 @@
+"""
+Serviço HTTP/JSON de previsões para clientes programáticos
+
+Expõe run_prediction (Monte Carlo), DixonColesModel e o Kelly sem passar pelo
+Streamlit, usando apenas http.server da biblioteca padrão. Requisições
+concorrentes de partidas avulsas passam por um MicroBatcher: as que chegam
+dentro de alguns milissegundos viram uma única simulação vetorizada
+(run_predictions_batch), e tudo é lido/gravado no PredictionStore
+compartilhado com o app e o daemon de pré-cálculo.
+
+Endpoints:
+    GET  /health
+    POST /v1/match    {"home_team", "away_team", "lambda_home", "lambda_away",
+                       "n_sim"?, "seed"?, "model"?: "monte_carlo" | "dixon_coles",
+                       "league"?, "odds"?: {"home", "draw", "away"},
+                       "bankroll"?, "kelly_fraction"?}
+    GET  /v1/round?league=premier_league&round=12[&n_sim=50000]
+    GET  /v1/league?league=brasileirao[&n_sim=50000][&all=1]
+
+Uso: python scripts/serve_predictions.py --port 8600
+"""
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from analysis.precompute import (
+    PROBABILITY_KEYS,
+    PrecomputeService,
+    get_precomputed_round,
+    is_finished,
+    value_metrics,
+)
+from analysis.prediction import MatchInputs, run_prediction
+from analysis.prediction_store import PredictionStore, get_prediction_store
+from models.dixon_coles import DixonColesModel
+from modules.roi.kelly_criterion import KellyCriterion
+from utils.micro_batch import DEFAULT_MAX_BATCH, DEFAULT_WINDOW_SECONDS, MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_N_SIM = 50_000
+MAX_N_SIM = 200_000
+MODELS = ('monte_carlo', 'dixon_coles')
+
+# (partida, n_sim, seed)
+PredictionRequest = Tuple[MatchInputs, int, Optional[int]]
+
+
+class RequestError(ValueError):
+    """Requisição inválida (HTTP 400)"""
+
+
+class NotFoundError(LookupError):
+    """Recurso inexistente (HTTP 404)"""
+
+
+class PredictionService:
+    """Previsões de partida, rodada e liga, com micro-batching das partidas avulsas"""
+
+    def __init__(
+        self,
+        store: Optional[PredictionStore] = None,
+        precompute: Optional[PrecomputeService] = None,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        default_n_sim: int = DEFAULT_N_SIM,
+    ):
+        """
+        Inicializa o serviço
+
+        Args:
+            store: Armazenamento de previsões (padrão: get_prediction_store())
+            precompute: Calculador de rodadas (padrão: PrecomputeService com o mesmo store)
+            window_seconds: Janela do micro-batching
+            max_batch: Tamanho máximo de um lote
+            default_n_sim: n_sim quando a requisição não informa
+        """
+        self.store = store or get_prediction_store()
+        self.precompute = precompute or PrecomputeService(store=self.store, n_sims=(default_n_sim,))
+        self.default_n_sim = default_n_sim
+        self.batcher = MicroBatcher(self._predict_batch, window_seconds, max_batch, name='prediction-batcher')
+        self._models: Dict[str, DixonColesModel] = {}
+        self._models_lock = threading.Lock()
+
+    def predict_match(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Previsão de uma partida avulsa, com EV/Kelly se houver odds
+
+        Raises:
+            RequestError: Campos ausentes ou inválidos
+        """
+        if not isinstance(payload, dict):
+            raise RequestError("Corpo deve ser um objeto JSON")
+        model = payload.get('model', 'monte_carlo')
+        if model not in MODELS:
+            raise RequestError(f"model deve ser um de {MODELS}")
+        match = MatchInputs(
+            home_team=str(_required(payload, 'home_team')),
+            away_team=str(_required(payload, 'away_team')),
+            round_number=int(payload.get('round', 0) or 0),
+            kickoff_utc=payload.get('kickoff_utc'),
+            lambda_home=_positive(payload, 'lambda_home'),
+            lambda_away=_positive(payload, 'lambda_away'),
+            mean_cards=float(payload.get('mean_cards', 0) or 0),
+            mean_corners=float(payload.get('mean_corners', 0) or 0),
+        )
+
+        if model == 'dixon_coles':
+            prediction = self._dixon_coles(payload.get('league', 'brasileirao'), match)
+        else:
+            n_sim = self._n_sim(payload.get('n_sim'))
+            seed = payload.get('seed')
+            prediction = self.batcher.process((match, n_sim, None if seed is None else int(seed)))
+
+        response = {
+            'home_team': match.home_team,
+            'away_team': match.away_team,
+            'model': model,
+            'prediction': prediction,
+        }
+        odds = payload.get('odds') or {}
+        if odds:
+            response['value'] = self._value(prediction, odds, payload.get('bankroll'), payload.get('kelly_fraction'))
+        return response
+
+    def predict_round(self, league: str, round_number: int, n_sim: Any = None) -> Dict[str, Any]:
+        """
+        Previsões de uma rodada (resumo pré-calculado, se houver)
+
+        Raises:
+            NotFoundError: Liga ou rodada inexistente
+        """
+        return self._round(league, round_number, self._n_sim(n_sim))
+
+    def predict_league(self, league: str, n_sim: Any = None, include_finished: bool = False) -> Dict[str, Any]:
+        """
+        Previsões de todas as rodadas com partidas pendentes (ou de todas, com include_finished)
+
+        Raises:
+            NotFoundError: Liga inexistente
+        """
+        n_sim = self._n_sim(n_sim)
+        rounds = self._rounds(league)
+        selected = [
+            round_number for round_number in sorted(rounds)
+            if include_finished or not all(is_finished(match) for match in rounds[round_number])
+        ]
+        return {
+            'league': league,
+            'n_sim': n_sim,
+            'rounds': [self._round(league, round_number, n_sim, rounds) for round_number in selected],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas do micro-batching e do armazenamento"""
+        return {'batching': self.batcher.get_stats(), 'store': self.store.get_stats()}
+
+    def close(self) -> None:
+        """Encerra o micro-batching"""
+        self.batcher.close()
+
+    def _round(self, league: str, round_number: int, n_sim: int,
+               rounds: Optional[Dict[int, List[MatchInputs]]] = None) -> Dict[str, Any]:
+        summary = get_precomputed_round(league, round_number, n_sim, disk=self.precompute.disk,
+                                        store=self.precompute.store)
+        if summary is not None:
+            return dict(summary, source='precomputed')
+        rounds = rounds if rounds is not None else self._rounds(league)
+        if round_number not in rounds:
+            raise NotFoundError(f"Rodada {round_number} não encontrada em {league}")
+        summary = self.precompute.compute_round(league, round_number, rounds[round_number], n_sims=(n_sim,))[0]
+        return dict(summary, source='computed')
+
+    def _predict_batch(self, requests: List[PredictionRequest]) -> List[Any]:
+        # Partidas sem seed com o mesmo n_sim viram uma única simulação vetorizada
+        results: List[Any] = [None] * len(requests)
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for index, (match, n_sim, seed) in enumerate(requests):
+            if seed is None:
+                groups[n_sim].append(index)
+                continue
+            try:
+                results[index] = self._seeded(match, n_sim, seed)
+            except Exception as e:
+                results[index] = e
+        for n_sim, indexes in groups.items():
+            try:
+                predictions = self.store.get_or_compute_many([requests[index][0] for index in indexes], n_sim)
+            except Exception as e:
+                predictions = [e] * len(indexes)
+            for index, prediction in zip(indexes, predictions):
+                results[index] = prediction
+        return results
+
+    def _seeded(self, match: MatchInputs, n_sim: int, seed: int) -> Dict[str, Any]:
+        # Semente informada: mesma simulação de run_prediction, reprodutível
+        result = self.store.get(match, n_sim, seed)
+        if result is None:
+            result = run_prediction(match, n_sim=n_sim, seed=seed)
+            self.store.put(match, n_sim, seed, result)
+        return result
+
+    def _dixon_coles(self, league: str, match: MatchInputs) -> Dict[str, Any]:
+        with self._models_lock:
+            model = self._models.get(league)
+            if model is None:
+                try:
+                    model = DixonColesModel(league)
+                except Exception as e:
+                    raise RequestError(f"Liga desconhecida para Dixon-Coles: {league} ({e})")
+                self._models[league] = model
+        probabilities = model.calculate_match_probabilities(match.lambda_home, match.lambda_away)
+        return {
+            key: [int(v) for v in value] if key == 'most_likely_score' else float(value)
+            for key, value in probabilities.items()
+        }
+
+    def _value(self, prediction: Dict[str, Any], odds: Dict[str, Any], bankroll: Any,
+               kelly_fraction: Any) -> Dict[str, Any]:
+        kelly = None
+        if bankroll is not None:
+            try:
+                kelly = KellyCriterion(float(bankroll), float(kelly_fraction or 0.25))
+            except ValueError as e:
+                raise RequestError(str(e))
+
+        value = {}
+        for side, probability_key in PROBABILITY_KEYS.items():
+            odd = odds.get(side)
+            metrics = value_metrics(prediction[probability_key], float(odd) if odd is not None else None)
+            if kelly is not None and metrics['odd'] is not None:
+                metrics['stake'] = kelly.calculate_stake(prediction[probability_key], metrics['odd'])['stake']
+            value[side] = metrics
+        return value
+
+    def _rounds(self, league: str) -> Dict[int, List[MatchInputs]]:
+        source = self.precompute.sources.get(league)
+        if source is None:
+            raise NotFoundError(f"Liga desconhecida: {league}")
+        return source.load_rounds()
+
+    def _n_sim(self, value: Any) -> int:
+        n_sim = int(value) if value not in (None, '') else self.default_n_sim
+        if not 0 < n_sim <= MAX_N_SIM:
+            raise RequestError(f"n_sim deve estar entre 1 e {MAX_N_SIM}")
+        return n_sim
+
+
+def _required(payload: Dict[str, Any], name: str) -> Any:
+    value = payload.get(name)
+    if value is None or value == '':
+        raise RequestError(f"Campo obrigatório: {name}")
+    return value
+
+
+def _positive(payload: Dict[str, Any], name: str) -> float:
+    try:
+        value = float(_required(payload, name))
+    except (TypeError, ValueError):
+        raise RequestError(f"{name} deve ser numérico")
+    if not value > 0:
+        raise RequestError(f"{name} deve ser positivo")
+    return value
+
+
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    """Roteamento HTTP → PredictionService (definido em make_server)"""
+
+    service: PredictionService = None
+    server_version = 'PrognosticosPrediction/1.0'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == '/health':
+            self._handle(lambda: dict(status='ok', **self.service.get_stats()))
+        elif url.path == '/v1/round':
+            self._handle(lambda: self.service.predict_round(
+                _required(params, 'league'), _int(_required(params, 'round'), 'round'), params.get('n_sim')
+            ))
+        elif url.path == '/v1/league':
+            self._handle(lambda: self.service.predict_league(
+                _required(params, 'league'), params.get('n_sim'), params.get('all') in ('1', 'true')
+            ))
+        else:
+            self._send(404, {'error': f"Rota desconhecida: {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/v1/match':
+            self._send(404, {'error': f"Rota desconhecida: {url.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {'error': f"JSON inválido: {e}"})
+            return
+        self._handle(lambda: self.service.predict_match(payload))
+
+    def _handle(self, action) -> None:
+        try:
+            self._send(200, action())
+        except (RequestError, ValueError) as e:
+            self._send(400, {'error': str(e)})
+        except NotFoundError as e:
+            self._send(404, {'error': str(e)})
+        except Exception as e:
+            logger.exception(f"Erro ao processar {self.path}")
+            self._send(500, {'error': str(e)})
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def _int(value: Any, name: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"{name} deve ser inteiro")
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8600,
+                service: Optional[PredictionService] = None) -> ThreadingHTTPServer:
+    """
+    Cria o servidor HTTP (uma thread por conexão)
+
+    Args:
+        host: Endereço de escuta
+        port: Porta (0 escolhe uma livre)
+        service: Serviço de previsões (padrão: PredictionService())
+
+    Returns:
+        Servidor pronto para serve_forever()
+    """
+    handler = type('BoundPredictionRequestHandler', (PredictionRequestHandler,), {
+        'service': service or PredictionService(
+            window_seconds=float(os.getenv('PREDICTION_BATCH_WINDOW_MS', DEFAULT_WINDOW_SECONDS * 1000)) / 1000
+        ),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,220 @@
+"""
+Armazenamento compartilhado de previsões (run_prediction)
+
+A chave de cada previsão é um fingerprint compacto só do que determina o
+resultado: lambdas já resolvidos, n_sim, seed e MODEL_VERSION. raw_row, context
+e demais campos de MatchInputs não entram: partidas com os mesmos lambdas
+reutilizam a mesma simulação, e nada além desses números precisa ser
+serializado a cada chamada.
+
+As previsões ficam em memória e no cache em disco (utils.disk_cache), que é
+compartilhado entre sessões do Streamlit, workers e réplicas com o mesmo
+volume. invalidate() incrementa uma geração gravada no disco; como a geração
+faz parte da chave, os outros processos deixam de enxergar as previsões
+antigas em até GENERATION_CHECK_SECONDS, sem precisar ser avisados.
+"""
+import copy
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from analysis.prediction import (
+    MODEL_VERSION,
+    MatchInputs,
+    _resolve_lambda,
+    run_prediction,
+    run_predictions_batch,
+)
+from utils.cache import CacheManager
+from utils.cache_keys import make_key
+from utils.disk_cache import get_disk_cache
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = 'predictions'
+META_NAMESPACE = 'predictions_meta'
+GENERATION_KEY = 'generation'
+
+# Previsões são determinísticas para a mesma chave: podem durar bastante
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Intervalo entre leituras da geração no disco (invalidações de outros processos)
+GENERATION_CHECK_SECONDS = 1.0
+
+# Casas decimais dos lambdas na chave (ruído de ponto flutuante não gera miss)
+LAMBDA_DECIMALS = 6
+
+_NEVER = 10 * 365 * 24 * 3600
+
+
+def prediction_key(match: MatchInputs, n_sim: int, seed: Optional[int] = None) -> str:
+    """
+    Fingerprint das entradas que determinam o resultado de run_prediction
+
+    Args:
+        match: Partida
+        n_sim: Número de simulações
+        seed: Semente do gerador
+
+    Returns:
+        Chave compacta (hash)
+    """
+    return make_key(
+        MODEL_VERSION,
+        round(_resolve_lambda(match, 'home'), LAMBDA_DECIMALS),
+        round(_resolve_lambda(match, 'away'), LAMBDA_DECIMALS),
+        int(n_sim),
+        seed,
+    )
+
+
+class PredictionStore:
+    """Previsões em memória e em disco, invalidadas por geração"""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, disk: Any = None, persistent: bool = True):
+        """
+        Inicializa o armazenamento
+
+        Args:
+            ttl_seconds: Tempo de vida das previsões
+            disk: Cache em disco específico (DiskCache); padrão: get_disk_cache()
+            persistent: Usar o cache em disco (False: apenas memória do processo)
+        """
+        if disk is None and persistent:
+            disk = get_disk_cache()
+        self._disk = disk
+        self._cache = CacheManager(ttl_seconds=ttl_seconds, name=NAMESPACE, disk=disk)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get(self, match: MatchInputs, n_sim: int, seed: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Previsão armazenada (cópia), ou None
+
+        Args:
+            match: Partida
+            n_sim: Número de simulações
+            seed: Semente do gerador
+        """
+        result = self._cache.get(self._key(match, n_sim, seed))
+        with self._lock:
+            self._stats['hits' if result is not None else 'misses'] += 1
+        # Quem chama costuma acrescentar campos (EV, Kelly) ao dict
+        return copy.deepcopy(result) if result is not None else None
+
+    def put(self, match: MatchInputs, n_sim: int, seed: Optional[int], result: Dict[str, Any]) -> None:
+        """Armazena o resultado de run_prediction"""
+        self._cache.set(self._key(match, n_sim, seed), copy.deepcopy(result))
+
+    def get_or_compute(self, match: MatchInputs, n_sim: int, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Previsão armazenada ou calculada e armazenada
+
+        Args:
+            match: Partida
+            n_sim: Número de simulações
+            seed: Semente do gerador
+
+        Returns:
+            Resultado de run_prediction (cópia própria do chamador)
+        """
+        result = self.get(match, n_sim, seed)
+        if result is None:
+            result = run_prediction(match, n_sim=n_sim, seed=seed)
+            self.put(match, n_sim, seed, result)
+        return result
+
+    def get_or_compute_many(self, matches: Sequence[MatchInputs], n_sim: int) -> List[Dict[str, Any]]:
+        """
+        Previsões de várias partidas; as que faltam são simuladas em um único lote
+
+        Args:
+            matches: Partidas
+            n_sim: Número de simulações
+
+        Returns:
+            Um resultado por partida, na mesma ordem
+        """
+        results = [self.get(match, n_sim) for match in matches]
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            computed = run_predictions_batch([matches[index] for index in missing], n_sim=n_sim)
+            for index, result in zip(missing, computed):
+                self.put(matches[index], n_sim, None, result)
+                results[index] = result
+        return results
+
+    def invalidate(self) -> int:
+        """
+        Descarta todas as previsões, neste e nos demais processos
+
+        Returns:
+            Nova geração
+        """
+        with self._lock:
+            generation = max(self._generation, self._read_generation()) + 1
+            if self._disk is not None:
+                now = time.time()
+                self._disk.set(META_NAMESPACE, GENERATION_KEY, generation, now, now + _NEVER, now + _NEVER)
+            self._generation = generation
+            self._generation_checked_at = time.time()
+            self._stats['invalidations'] += 1
+        self._cache.clear()
+        logger.info(f"Previsões invalidadas (geração {generation})")
+        return generation
+
+    def generation(self) -> int:
+        """Geração atual (relida do disco a cada GENERATION_CHECK_SECONDS)"""
+        return self._current_generation()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Acertos, falhas, invalidações e geração atual"""
+        with self._lock:
+            stats = dict(self._stats, generation=self._generation)
+        stats['cached_items'] = self._cache.get_stats()['cached_items']
+        return stats
+
+    def _key(self, match: MatchInputs, n_sim: int, seed: Optional[int]) -> str:
+        return f"g{self._current_generation()}:{prediction_key(match, n_sim, seed)}"
+
+    def _current_generation(self) -> int:
+        now = time.time()
+        with self._lock:
+            if now - self._generation_checked_at < GENERATION_CHECK_SECONDS:
+                return self._generation
+            self._generation_checked_at = now
+        generation = self._read_generation()
+        with self._lock:
+            self._generation = max(self._generation, generation)
+            return self._generation
+
+    def _read_generation(self) -> int:
+        if self._disk is None:
+            return 0
+        found = self._disk.get(META_NAMESPACE, GENERATION_KEY)
+        return int(found[0]) if found else 0
+
+
+_store: Optional[PredictionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_prediction_store() -> PredictionStore:
+    """
+    Obter instância global do armazenamento de previsões
+
+    PREDICTION_STORE_TTL define o tempo de vida (segundos); o cache em disco
+    segue PERSISTENT_CACHE_ENABLED/PERSISTENT_CACHE_DIR.
+
+    Returns:
+        Instância do PredictionStore
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PredictionStore(ttl_seconds=int(os.getenv('PREDICTION_STORE_TTL', DEFAULT_TTL_SECONDS)))
+        return _store
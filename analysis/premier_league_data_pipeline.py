@@ -3,16 +3,28 @@
 This module converts the static Premier League CSV files into `MatchInputs`
 objects that can be consumed by the generic prediction layer
 (`analysis.prediction`).
+
+Both CSV files are parsed once per data version (mtime and size of each file)
+into a `PremierLeaguePipeline`. Team stats, lambdas, cards/corners context and
+odds are computed as whole columns at parse time; a Game Week → rows index
+serves any round without rescanning the matches file. Only the team columns
+the model uses are read, and when a fresh Parquet copy exists and the full
+season is not parsed yet, a single-round load reads just that Game Week.
 """
 
 from __future__ import annotations
 
-import csv
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from analysis.prediction import MatchInputs
+from data.parquet_store import Filter, round_filter
+from data.schema import FOOTYSTATS_MATCHES, FOOTYSTATS_TEAMS, MATCH_ALIASES, load_table
 
 # Paths -----------------------------------------------------------------------
 DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "csv" / "premier_league"
@@ -31,6 +43,30 @@ DEFAULT_MATCHES_PLAYED = 10
 DEFAULT_CARDS_PER_MATCH = 3.8
 DEFAULT_CORNERS_PER_MATCH = 10.0
 
+ODDS_COLUMNS = {
+    "home": "odds_ft_home_team_win",
+    "draw": "odds_ft_draw",
+    "away": "odds_ft_away_team_win",
+    "over_15": "odds_ft_over15",
+    "over_25": "odds_ft_over25",
+    "btts_yes": "odds_btts_yes",
+    "btts_no": "odds_btts_no",
+}
+
+# Teams file columns read by _build_team_index (the export has hundreds more)
+TEAM_COLUMNS = (
+    "team_name", "common_name",
+    "xg_for_avg_home", "xg_for_avg_away", "xg_for_avg_overall",
+    "xg_against_avg_home", "xg_against_avg_away", "xg_against_avg_overall",
+    "goals_scored_per_match_home", "goals_scored_per_match_away", "goals_scored_per_match",
+    "goals_conceded_per_match_home", "goals_conceded_per_match_away", "goals_conceded_per_match",
+    "points_per_game_home", "points_per_game_away", "points_per_game",
+    "matches_played_home", "matches_played_away",
+)
+
+# Schema aliases undone for raw_row, which keeps the FootyStats column names
+RAW_COLUMN_NAMES = {canonical: source for source, canonical in MATCH_ALIASES.items()}
+
 
 # Public API -----------------------------------------------------------------
 def load_premier_round_matches(round_id: int) -> List[MatchInputs]:
@@ -38,235 +74,296 @@ def load_premier_round_matches(round_id: int) -> List[MatchInputs]:
     Load all Premier League matches for a given round from the existing CSV files
     and return a list of MatchInputs compatible with run_prediction().
     """
-    if not MATCHES_CSV.exists():
-        raise FileNotFoundError(f"Premier League matches CSV not found: {MATCHES_CSV}")
-    if not TEAMS_CSV.exists():
-        raise FileNotFoundError(f"Premier League teams CSV not found: {TEAMS_CSV}")
-
-    team_index = _build_team_index(_load_csv_records(TEAMS_CSV))
-    round_rows = _load_round_rows(round_id)
-
-    match_inputs: List[MatchInputs] = []
-    for row in round_rows:
-        home_team = (row.get("home_team_name") or "").strip()
-        away_team = (row.get("away_team_name") or "").strip()
+    match_inputs = _round_pipeline(round_id).round_matches(round_id)
+    if not match_inputs:
+        raise ValueError(f"No Premier League fixtures found for round {round_id}")
+    return match_inputs
 
-        if not home_team or not away_team:
-            # Skip rows with missing mandatory team information
-            continue
 
-        home_stats = _build_team_stats(team_index.get(_normalize_team_name(home_team)), is_home=True)
-        away_stats = _build_team_stats(team_index.get(_normalize_team_name(away_team)), is_home=False)
-        context = _build_context(row)
+def get_premier_pipeline() -> "PremierLeaguePipeline":
+    """
+    Return the parsed pipeline for the current CSV files, rebuilding it only
+    when either file changes.
+    """
+    global _pipeline
+    version = _data_version()
+    with _pipeline_lock:
+        if _pipeline is None or _pipeline.version != version:
+            _pipeline = PremierLeaguePipeline(MATCHES_CSV, TEAMS_CSV, version=version)
+            # The full pipeline covers every single-round load
+            _round_pipelines.clear()
+        return _pipeline
 
-        pre_match_home_xg = _optional_float(row.get("Home Team Pre-Match xG"))
-        pre_match_away_xg = _optional_float(row.get("Away Team Pre-Match xG"))
 
-        lambda_home = _estimate_lambda(
-            attack=home_stats.get("xg_for_home"),
-            opponent_defense=away_stats.get("xgc_against_away"),
-            pre_match_xg=pre_match_home_xg,
-            default=DEFAULT_HOME_XG,
-        )
-        lambda_away = _estimate_lambda(
-            attack=away_stats.get("xg_for_away"),
-            opponent_defense=home_stats.get("xgc_against_home"),
-            pre_match_xg=pre_match_away_xg,
-            default=DEFAULT_AWAY_XG,
+def _round_pipeline(round_id: int) -> "PremierLeaguePipeline":
+    """
+    Pipeline holding at least one Game Week: the full one when it is current,
+    otherwise only that round's Parquet row group (cached per round).
+    """
+    version = _data_version()
+    with _pipeline_lock:
+        if _pipeline is not None and _pipeline.version == version:
+            return _pipeline
+        cached = _round_pipelines.get(int(round_id))
+    if cached is not None and cached.version == version:
+        return cached
+
+    filters = round_filter(MATCHES_CSV, round_id)
+    if filters is None:
+        return get_premier_pipeline()
+    pipeline = PremierLeaguePipeline(MATCHES_CSV, TEAMS_CSV, version=version, match_filters=filters)
+    with _pipeline_lock:
+        _round_pipelines[int(round_id)] = pipeline
+    return pipeline
+
+
+class PremierLeaguePipeline:
+    """Premier League matches and teams parsed once, indexed by Game Week."""
+
+    def __init__(
+        self,
+        matches_csv: Path = MATCHES_CSV,
+        teams_csv: Path = TEAMS_CSV,
+        version: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None,
+        match_filters: Optional[List[Filter]] = None,
+    ):
+        self.matches_csv = Path(matches_csv)
+        self.teams_csv = Path(teams_csv)
+        self.version = version or (_file_version(self.matches_csv), _file_version(self.teams_csv))
+
+        teams = load_table(self.teams_csv, FOOTYSTATS_TEAMS, columns=TEAM_COLUMNS)
+        self.team_index = _build_team_index(teams)
+        # raw_row keeps every match column, so only rows are pruned here
+        matches = load_table(self.matches_csv, FOOTYSTATS_MATCHES, filters=match_filters).reset_index(drop=True)
+
+        home_team = _text(matches, "home_team")
+        away_team = _text(matches, "away_team")
+        valid = (home_team != "") & (away_team != "")
+
+        derived = _derive_match_columns(matches, home_team, away_team, self.team_index)[valid]
+        self._rows: List[Dict[str, Any]] = derived.to_dict("records")
+
+        raw = matches.drop(columns=["kickoff_dt"], errors="ignore").rename(columns=RAW_COLUMN_NAMES)
+        raw = raw.astype(object).where(raw.notna(), None)[valid]
+        self._raw: List[Dict[str, Any]] = raw.to_dict("records")
+
+        self._by_round: Dict[int, List[int]] = {}
+        for position, row in enumerate(self._rows):
+            self._by_round.setdefault(row["round"], []).append(position)
+
+    def rounds(self) -> List[int]:
+        return sorted(self._by_round)
+
+    def round_matches(self, round_id: int) -> List[MatchInputs]:
+        """MatchInputs for one Game Week (new objects on every call)."""
+        return [self._match_inputs(position, round_id) for position in self._by_round.get(int(round_id), [])]
+
+    def all_matches(self) -> Dict[int, List[MatchInputs]]:
+        """MatchInputs for every Game Week in the file."""
+        return {round_id: self.round_matches(round_id) for round_id in self.rounds()}
+
+    def team_stats(self, team_name: str, is_home: bool) -> Dict[str, float]:
+        entry = self.team_index.get(_normalize_team_name(team_name))
+        if entry is None:
+            return _default_team_stats(is_home)
+        return dict(entry[0] if is_home else entry[1])
+
+    def _match_inputs(self, position: int, round_id: int) -> MatchInputs:
+        row = self._rows[position]
+        raw = self._raw[position]
+
+        home_stats = self.team_stats(row["home_team"], is_home=True)
+        away_stats = self.team_stats(row["away_team"], is_home=False)
+
+        context = {
+            "round": row["round"],
+            "status": raw.get("status") or "SCHEDULED",
+            "venue": raw.get("stadium_name") or row["home_team"],
+            "match_type": raw.get("match_type") or "normal",
+            "distance_km": 0.0,
+            "altitude_m": 0.0,
+            "lambda_cards_home": row["lambda_cards_home"],
+            "lambda_cards_away": row["lambda_cards_away"],
+            "lambda_corners": row["avg_corners"],
+            "odds": {key: row[f"odds_{key}"] for key in ODDS_COLUMNS},
+            "kickoff_label": raw.get("date_GMT"),
+            "referee": _extract_referee(raw),
+            "fixture_metadata": _build_fixture_metadata(raw),
+            "pre_match_xg": {
+                "home": row["home_pre_match_xg"],
+                "away": row["away_pre_match_xg"],
+            },
+            "team_stats": {
+                "home": home_stats,
+                "away": away_stats,
+            },
+            "expected_goals": {
+                "model": {"home": row["lambda_home"], "away": row["lambda_away"]},
+                "pre_match": {"home": row["pre_match_home_xg"], "away": row["pre_match_away_xg"]},
+            },
+        }
+
+        kickoff = row["kickoff"]
+        return MatchInputs(
+            home_team=row["home_team"],
+            away_team=row["away_team"],
+            round_number=round_id,
+            # Missing kickoff: "now", so downstream code always has a datetime
+            kickoff_utc=kickoff if kickoff is not None else datetime.now(timezone.utc),
+            lambda_home=row["lambda_home"],
+            lambda_away=row["lambda_away"],
+            mean_cards=row["mean_cards"],
+            mean_corners=row["avg_corners"],
+            context=context,
+            raw_row=dict(raw),
         )
 
-        mean_cards = (context["lambda_cards_home"] + context["lambda_cards_away"]) / 2.0
-        mean_corners = context["lambda_corners"]
-
-        context.update(
-            {
-                "team_stats": {
-                    "home": home_stats,
-                    "away": away_stats,
-                },
-                "expected_goals": {
-                    "model": {"home": lambda_home, "away": lambda_away},
-                    "pre_match": {"home": pre_match_home_xg, "away": pre_match_away_xg},
-                },
-            }
-        )
 
-        match_inputs.append(
-            MatchInputs(
-                home_team=home_team,
-                away_team=away_team,
-                round_number=round_id,
-                kickoff_utc=_parse_timestamp(row.get("timestamp"), row.get("date_GMT")),
-                lambda_home=lambda_home,
-                lambda_away=lambda_away,
-                mean_cards=mean_cards,
-                mean_corners=mean_corners,
-                context=context,
-                raw_row=row,
-            )
-        )
+# Helpers --------------------------------------------------------------------
+_pipeline: Optional[PremierLeaguePipeline] = None
+_round_pipelines: Dict[int, PremierLeaguePipeline] = {}
+_pipeline_lock = threading.Lock()
 
-    if not match_inputs:
-        raise ValueError(f"No Premier League fixtures found for round {round_id}")
 
-    return match_inputs
+def _file_version(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
 
 
-# Helpers --------------------------------------------------------------------
-def _load_csv_records(path: Path) -> List[Dict[str, str]]:
-    with path.open("r", encoding="utf-8", newline="") as handle:
-        return list(csv.DictReader(handle))
-
-
-def _load_round_rows(round_id: int) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
-    with MATCHES_CSV.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            row_round = int(_safe_float(row.get("Game Week"), -1))
-            if row_round == round_id:
-                rows.append(row)
-    return rows
-
-
-def _build_team_index(records: List[Dict[str, str]]) -> Dict[str, Dict[str, str]]:
-    index: Dict[str, Dict[str, str]] = {}
-    for row in records:
-        for key in ("team_name", "common_name"):
-            value = row.get(key)
-            if value:
-                index[_normalize_team_name(value)] = row
-    return index
+def _data_version() -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    if not MATCHES_CSV.exists():
+        raise FileNotFoundError(f"Premier League matches CSV not found: {MATCHES_CSV}")
+    if not TEAMS_CSV.exists():
+        raise FileNotFoundError(f"Premier League teams CSV not found: {TEAMS_CSV}")
+    return _file_version(MATCHES_CSV), _file_version(TEAMS_CSV)
 
 
-def _build_team_stats(team_row: Optional[Dict[str, str]], is_home: bool) -> Dict[str, float]:
-    if not team_row:
-        return _default_team_stats(is_home)
+def _column(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[column], errors="coerce").astype(float)
 
-    if is_home:
-        xg_for = _safe_float(
-            team_row.get("xg_for_avg_home"),
-            _safe_float(team_row.get("xg_for_avg_overall"), DEFAULT_HOME_XG),
-        )
-        xgc = _safe_float(
-            team_row.get("xg_against_avg_home"),
-            _safe_float(team_row.get("xg_against_avg_overall"), DEFAULT_AWAY_XGC),
-        )
-        goals_scored = _safe_float(
-            team_row.get("goals_scored_per_match_home"),
-            _safe_float(team_row.get("goals_scored_per_match"), DEFAULT_HOME_XG),
-        )
-        goals_conceded = _safe_float(
-            team_row.get("goals_conceded_per_match_home"),
-            _safe_float(team_row.get("goals_conceded_per_match"), DEFAULT_HOME_XGC),
-        )
-        points_pg = _safe_float(
-            team_row.get("points_per_game_home"),
-            _safe_float(team_row.get("points_per_game"), DEFAULT_FORM_POINTS / 5),
-        )
-        matches_played = int(_safe_float(team_row.get("matches_played_home"), DEFAULT_MATCHES_PLAYED))
-        xg_key = "xg_for_home"
-        xgc_key = "xgc_against_home"
-    else:
-        xg_for = _safe_float(
-            team_row.get("xg_for_avg_away"),
-            _safe_float(team_row.get("xg_for_avg_overall"), DEFAULT_AWAY_XG),
-        )
-        xgc = _safe_float(
-            team_row.get("xg_against_avg_away"),
-            _safe_float(team_row.get("xg_against_avg_overall"), DEFAULT_HOME_XGC),
-        )
-        goals_scored = _safe_float(
-            team_row.get("goals_scored_per_match_away"),
-            _safe_float(team_row.get("goals_scored_per_match"), DEFAULT_AWAY_XG),
-        )
-        goals_conceded = _safe_float(
-            team_row.get("goals_conceded_per_match_away"),
-            _safe_float(team_row.get("goals_conceded_per_match"), DEFAULT_AWAY_XGC),
-        )
-        points_pg = _safe_float(
-            team_row.get("points_per_game_away"),
-            _safe_float(team_row.get("points_per_game"), DEFAULT_FORM_POINTS / 5),
-        )
-        matches_played = int(_safe_float(team_row.get("matches_played_away"), DEFAULT_MATCHES_PLAYED))
-        xg_key = "xg_for_away"
-        xgc_key = "xgc_against_away"
 
-    attack_strength = goals_scored / PREMIER_TEAM_AVG_GOALS if PREMIER_TEAM_AVG_GOALS else 1.0
-    defense_strength = goals_conceded / PREMIER_TEAM_AVG_GOALS if PREMIER_TEAM_AVG_GOALS else 1.0
+def _first(df: pd.DataFrame, columns: Tuple[str, ...], default: float) -> pd.Series:
+    result = _column(df, columns[0])
+    for column in columns[1:]:
+        result = result.fillna(_column(df, column))
+    return result.fillna(default)
 
-    return {
-        xg_key: xg_for,
-        xgc_key: xgc,
-        "attack_strength": attack_strength,
-        "defense_strength": defense_strength,
-        "form_points": points_pg * 5,  # approximate last-five form
-        "matches_played": matches_played,
-        "goals_per_game": goals_scored,
-        "goals_conceded_per_game": goals_conceded,
-    }
 
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].astype("string").fillna("").str.strip().astype(object)
 
-def _build_context(row: Dict[str, Any]) -> Dict[str, Any]:
-    avg_cards = _safe_float(row.get("average_cards_per_match_pre_match"), DEFAULT_CARDS_PER_MATCH)
-    avg_corners = _safe_float(row.get("average_corners_per_match_pre_match"), DEFAULT_CORNERS_PER_MATCH)
-    home_pre_match_xg = _safe_float(row.get("Home Team Pre-Match xG"), DEFAULT_HOME_XG)
-    away_pre_match_xg = _safe_float(row.get("Away Team Pre-Match xG"), DEFAULT_AWAY_XG)
-
-    def _odds(value: Any) -> Optional[float]:
-        val = _safe_float(value, 0.0)
-        return val if val > 0 else None
-
-    context = {
-        "round": int(_safe_float(row.get("Game Week"), 0)),
-        "status": row.get("status", "SCHEDULED"),
-        "venue": row.get("stadium_name") or row.get("home_team_name"),
-        "match_type": row.get("match_type", "normal"),
-        "distance_km": 0.0,
-        "altitude_m": 0.0,
-        "lambda_cards_home": max(avg_cards * 0.55, 1.2),
-        "lambda_cards_away": max(avg_cards * 0.45, 1.0),
-        "lambda_corners": avg_corners,
-        "odds": {
-            "home": _odds(row.get("odds_ft_home_team_win")),
-            "draw": _odds(row.get("odds_ft_draw")),
-            "away": _odds(row.get("odds_ft_away_team_win")),
-            "over_15": _odds(row.get("odds_ft_over15")),
-            "over_25": _odds(row.get("odds_ft_over25")),
-            "btts_yes": _odds(row.get("odds_btts_yes")),
-            "btts_no": _odds(row.get("odds_btts_no")),
-        },
-        "kickoff_label": row.get("date_GMT"),
-        "referee": _extract_referee(row),
-        "fixture_metadata": _build_fixture_metadata(row),
-    }
 
-    context["pre_match_xg"] = {
-        "home": home_pre_match_xg,
-        "away": away_pre_match_xg,
-    }
+def _build_team_index(teams: pd.DataFrame) -> Dict[str, Tuple[Dict[str, float], Dict[str, float]]]:
+    """Normalized team_name/common_name → (home stats, away stats)."""
+    sides = [_team_stats_frame(teams, is_home=True), _team_stats_frame(teams, is_home=False)]
+    home_records, away_records = (side.to_dict("records") for side in sides)
 
-    return context
+    names = [key for key in ("team_name", "common_name") if key in teams.columns]
+    index: Dict[str, Tuple[Dict[str, float], Dict[str, float]]] = {}
+    for position, values in enumerate(teams[names].astype(object).itertuples(index=False)):
+        for value in values:
+            if isinstance(value, str) and value:
+                index[_normalize_team_name(value)] = (home_records[position], away_records[position])
+    return index
 
 
-def _parse_timestamp(timestamp_value: Any, fallback_label: Optional[str] = None) -> datetime:
-    if timestamp_value not in (None, "", "N/A"):
-        try:
-            seconds = int(float(timestamp_value))
-            return datetime.fromtimestamp(seconds, tz=timezone.utc)
-        except (TypeError, ValueError):
-            pass
+def _team_stats_frame(teams: pd.DataFrame, is_home: bool) -> pd.DataFrame:
+    side = "home" if is_home else "away"
+    xg_key = "xg_for_home" if is_home else "xg_for_away"
+    xgc_key = "xgc_against_home" if is_home else "xgc_against_away"
+
+    xg_for = _first(teams, (f"xg_for_avg_{side}", "xg_for_avg_overall"), DEFAULT_HOME_XG if is_home else DEFAULT_AWAY_XG)
+    xgc = _first(
+        teams, (f"xg_against_avg_{side}", "xg_against_avg_overall"), DEFAULT_AWAY_XGC if is_home else DEFAULT_HOME_XGC
+    )
+    goals_scored = _first(
+        teams, (f"goals_scored_per_match_{side}", "goals_scored_per_match"), DEFAULT_HOME_XG if is_home else DEFAULT_AWAY_XG
+    )
+    goals_conceded = _first(
+        teams,
+        (f"goals_conceded_per_match_{side}", "goals_conceded_per_match"),
+        DEFAULT_HOME_XGC if is_home else DEFAULT_AWAY_XGC,
+    )
+    points_pg = _first(teams, (f"points_per_game_{side}", "points_per_game"), DEFAULT_FORM_POINTS / 5)
+    matches_played = _first(teams, (f"matches_played_{side}",), DEFAULT_MATCHES_PLAYED).astype(int)
+
+    return pd.DataFrame(
+        {
+            xg_key: xg_for,
+            xgc_key: xgc,
+            "attack_strength": goals_scored / PREMIER_TEAM_AVG_GOALS if PREMIER_TEAM_AVG_GOALS else 1.0,
+            "defense_strength": goals_conceded / PREMIER_TEAM_AVG_GOALS if PREMIER_TEAM_AVG_GOALS else 1.0,
+            "form_points": points_pg * 5,  # approximate last-five form
+            "matches_played": matches_played,
+            "goals_per_game": goals_scored,
+            "goals_conceded_per_game": goals_conceded,
+        }
+    )
+
+
+def _derive_match_columns(
+    matches: pd.DataFrame,
+    home_team: pd.Series,
+    away_team: pd.Series,
+    team_index: Dict[str, Tuple[Dict[str, float], Dict[str, float]]],
+) -> pd.DataFrame:
+    """Every per-match number the MatchInputs need, computed column-wise."""
+    home_keys = home_team.str.strip().str.lower()
+    away_keys = away_team.str.strip().str.lower()
+    home_attack = home_keys.map({k: v[0]["xg_for_home"] for k, v in team_index.items()}).fillna(DEFAULT_HOME_XG)
+    home_defense = home_keys.map({k: v[0]["xgc_against_home"] for k, v in team_index.items()}).fillna(DEFAULT_AWAY_XGC)
+    away_attack = away_keys.map({k: v[1]["xg_for_away"] for k, v in team_index.items()}).fillna(DEFAULT_AWAY_XG)
+    away_defense = away_keys.map({k: v[1]["xgc_against_away"] for k, v in team_index.items()}).fillna(DEFAULT_HOME_XGC)
+
+    pre_match_home = _column(matches, "Home Team Pre-Match xG")
+    pre_match_away = _column(matches, "Away Team Pre-Match xG")
+    avg_cards = _column(matches, "average_cards_per_match_pre_match").fillna(DEFAULT_CARDS_PER_MATCH)
+    lambda_cards_home = (avg_cards * 0.55).clip(lower=1.2)
+    lambda_cards_away = (avg_cards * 0.45).clip(lower=1.0)
+
+    derived = pd.DataFrame(
+        {
+            "round": _column(matches, "round").fillna(0).astype(int),
+            "home_team": home_team,
+            "away_team": away_team,
+            "lambda_home": _estimate_lambda(home_attack, away_defense, pre_match_home),
+            "lambda_away": _estimate_lambda(away_attack, home_defense, pre_match_away),
+            "lambda_cards_home": lambda_cards_home,
+            "lambda_cards_away": lambda_cards_away,
+            "mean_cards": (lambda_cards_home + lambda_cards_away) / 2.0,
+            "avg_corners": _column(matches, "average_corners_per_match_pre_match").fillna(DEFAULT_CORNERS_PER_MATCH),
+            "home_pre_match_xg": pre_match_home.fillna(DEFAULT_HOME_XG),
+            "away_pre_match_xg": pre_match_away.fillna(DEFAULT_AWAY_XG),
+            "pre_match_home_xg": _optional(pre_match_home),
+            "pre_match_away_xg": _optional(pre_match_away),
+            "kickoff": _optional(matches["kickoff_dt"].map(lambda moment: moment.to_pydatetime()))
+            if "kickoff_dt" in matches.columns
+            else pd.Series(None, index=matches.index, dtype=object),
+        }
+    )
+    for key, column in ODDS_COLUMNS.items():
+        odds = _column(matches, column)
+        derived[f"odds_{key}"] = _optional(odds.where(odds > 0))
+    return derived
+
+
+def _estimate_lambda(attack: pd.Series, opponent_defense: pd.Series, pre_match_xg: pd.Series) -> pd.Series:
+    """
+    Blend team-specific attack metrics with opponent defensive data and, when available,
+    the CSV pre-match xG baseline. Keeps values within realistic Poisson bounds.
+    """
+    base = (attack * 0.65) + (opponent_defense * 0.35)
+    base = base.where(pre_match_xg.isna(), (base * 0.7) + (pre_match_xg * 0.3))
+    return base.clip(lower=0.2)
 
-    if fallback_label:
-        cleaned = fallback_label.replace("pm", "PM").replace("am", "AM")
-        for fmt in ("%b %d %Y - %I:%M%p", "%b %d %Y - %H:%M%p", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"):
-            try:
-                return datetime.strptime(cleaned, fmt).replace(tzinfo=timezone.utc)
-            except ValueError:
-                continue
 
-    # As a last resort, return "now" so downstream code always has a datetime.
-    return datetime.now(timezone.utc)
+def _optional(values: pd.Series) -> pd.Series:
+    # NaN/NaT → None once, so records carry plain Python values
+    return values.astype(object).where(values.notna(), None)
 
 
 def _default_team_stats(is_home: bool) -> Dict[str, float]:
@@ -288,42 +385,6 @@ def _normalize_team_name(name: str) -> str:
     return name.strip().lower()
 
 
-def _safe_float(value: Any, default: float) -> float:
-    try:
-        if value in (None, "", "N/A"):
-            return default
-        return float(value)
-    except (ValueError, TypeError):
-        return default
-
-
-def _optional_float(value: Any) -> Optional[float]:
-    try:
-        if value in (None, "", "N/A"):
-            return None
-        return float(value)
-    except (ValueError, TypeError):
-        return None
-
-
-def _estimate_lambda(
-    attack: Optional[float],
-    opponent_defense: Optional[float],
-    pre_match_xg: Optional[float],
-    default: float,
-) -> float:
-    """
-    Blend team-specific attack metrics with opponent defensive data and, when available,
-    the CSV pre-match xG baseline. Keeps values within realistic Poisson bounds.
-    """
-    base = attack if attack is not None else default
-    if opponent_defense is not None:
-        base = (base * 0.65) + (opponent_defense * 0.35)
-    if pre_match_xg is not None:
-        base = (base * 0.7) + (pre_match_xg * 0.3)
-    return max(0.2, base)
-
-
 def _extract_referee(row: Dict[str, Any]) -> Optional[str]:
     for key in ("referee_name", "referee", "Referee"):
         value = row.get(key)
@@ -1,9 +1,7 @@
 import os
-from datetime import datetime
 from pathlib import Path
-from typing import Literal, Any
+from typing import Literal
 
-import pandas as pd
 import streamlit as st
 
 from ui.league_selector import render_league_selector, get_league_info
@@ -16,7 +14,13 @@ from modules.roi.roi_simulator import ROISimulator
 from leagues.league_registry import LeagueRegistry
 from models.dixon_coles import DixonColesModel
 from analysis.premier_league_data_pipeline import load_premier_round_matches
+from analysis.brasileirao_data_pipeline import (
+    list_brasileirao_rounds,
+    list_brasileirao_seasons,
+    load_brasileirao_round_matches,
+)
 from analysis.prediction import run_prediction, format_report, MatchInputs
+from analysis.prediction_store import get_prediction_store
 
 st.set_page_config(
     page_title="Prognósticos – Premier League & Brasileirão",
@@ -38,25 +42,6 @@ THEME = {
 }
 
 BASE_DIR = Path(__file__).resolve().parent
-BR_DATA_DIR = BASE_DIR / "data" / "csv" / "brasileirao"
-def _br_csv_for_season(season: int) -> Path:
-    return BR_DATA_DIR / f"{season}_matches.csv"
-def _list_brasileirao_seasons() -> list[int]:
-    out: list[int] = []
-    for p in BR_DATA_DIR.glob("*_matches.csv"):
-        try:
-            year = int(p.name.split("_")[0])
-            out.append(year)
-        except Exception:
-            continue
-    return sorted(set(out)) or [2025]
-
-# Fallback averages when CSV rows are missing richer context for Brasileirão fixtures.
-DEFAULT_BR_HOME_LAMBDA = 1.45
-DEFAULT_BR_AWAY_LAMBDA = 1.15
-DEFAULT_BR_CARDS = 4.5
-DEFAULT_BR_CORNERS = 9.2
-
 st.markdown(
     f"""
     <style>
@@ -172,9 +157,15 @@ def cached_load_premier_round_matches(round_number: int):
     return load_premier_round_matches(round_number)
 
 
-@st.cache_data(show_spinner="Executando simulações de partida...")
 def cached_run_prediction(match, n_sim: int):
-    return run_prediction(match, n_sim=n_sim)
+    # Compartilhado entre sessões e processos; chave só com lambdas/n_sim/modelo
+    store = get_prediction_store()
+    result = store.get(match, n_sim)
+    if result is None:
+        with st.spinner("Executando simulações de partida..."):
+            result = run_prediction(match, n_sim=n_sim)
+        store.put(match, n_sim, None, result)
+    return result
 
 @st.cache_data(show_spinner="Carregando rodada do Brasileirão...")
 def cached_load_brasileirao_round_matches(round_number: int, season: int):
@@ -182,18 +173,7 @@ def cached_load_brasileirao_round_matches(round_number: int, season: int):
 
 @st.cache_data(show_spinner="Lendo rodadas disponíveis do Brasileirão...")
 def cached_brasileirao_rounds(season: int) -> list[int]:
-    csv_path = _br_csv_for_season(season)
-    if not csv_path.exists():
-        return []
-
-    try:
-        df = pd.read_csv(csv_path, usecols=["round"])
-    except ValueError:
-        df = pd.read_csv(csv_path)
-
-    round_series = pd.to_numeric(df.get("round"), errors="coerce").dropna()
-    rounds = sorted({int(value) for value in round_series.tolist()})
-    return rounds
+    return list_brasileirao_rounds(season)
 
 Trend = Literal["home", "draw", "away"]
 
@@ -493,149 +473,6 @@ def render_match_card(match, result: dict, odds_ctx: dict, bankroll: float) -> N
     st.markdown("</div>", unsafe_allow_html=True)
 
 
-def _to_float(value: Any) -> float | None:
-    if value is None:
-        return None
-    if isinstance(value, str):
-        cleaned = value.strip()
-        if not cleaned:
-            return None
-        value = cleaned.replace(",", ".")
-    if pd.isna(value):
-        return None
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
-
-
-def _mean_or_default(values: list[float | None], default: float) -> float:
-    valid = [v for v in values if v is not None]
-    if not valid:
-        return default
-    return sum(valid) / len(valid)
-
-
-def _parse_brasileirao_datetime(label: str):
-    if not label:
-        return None
-    cleaned = str(label).strip()
-    if not cleaned:
-        return None
-    iso_candidate = cleaned.replace("Z", "+00:00")
-    try:
-        return datetime.fromisoformat(iso_candidate)
-    except ValueError:
-        pass
-    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"):
-        try:
-            return datetime.strptime(cleaned, fmt)
-        except ValueError:
-            continue
-    return cleaned
-
-
-def load_brasileirao_round_matches(round_number: int, season: int) -> list[MatchInputs]:
-    """
-    Carrega partidas do Brasileirão a partir de data/csv/brasileirao/2025_matches.csv.
-
-    O CSV é gerado por scripts/update_csv_from_api.py e contém as colunas:
-        round, home_team, away_team, kickoff_utc, lambda_home, lambda_away,
-        mean_cards, mean_corners, além de metadados opcionais.
-
-    Para manter compatibilidade com versões antigas, o loader também aceita
-    colunas legadas (home_xg, home_cards etc).
-    """
-    csv_path = _br_csv_for_season(season)
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Brasileirão matches CSV não encontrado: {csv_path}")
-
-    df = pd.read_csv(csv_path)
-    df["round"] = pd.to_numeric(df.get("round"), errors="coerce")
-    if "round_number" in df.columns:
-        legacy_round = pd.to_numeric(df["round_number"], errors="coerce")
-        df["round"] = df["round"].fillna(legacy_round)
-
-    target_round = int(round_number)
-    round_df = df[df["round"] == target_round]
-
-    match_inputs: list[MatchInputs] = []
-    for _, row in round_df.iterrows():
-        home_team = str(row.get("home_team", "")).strip()
-        away_team = str(row.get("away_team", "")).strip()
-        if not home_team or not away_team:
-            continue
-
-        lambda_home = (
-            _to_float(row.get("lambda_home"))
-            or _to_float(row.get("home_xg"))
-            or DEFAULT_BR_HOME_LAMBDA
-        )
-        lambda_away = (
-            _to_float(row.get("lambda_away"))
-            or _to_float(row.get("away_xg"))
-            or DEFAULT_BR_AWAY_LAMBDA
-        )
-
-        mean_cards = (
-            _to_float(row.get("mean_cards"))
-            or _mean_or_default(
-                [_to_float(row.get("home_cards")), _to_float(row.get("away_cards"))],
-                DEFAULT_BR_CARDS,
-            )
-        )
-        mean_corners = (
-            _to_float(row.get("mean_corners"))
-            or _mean_or_default(
-                [_to_float(row.get("home_corners")), _to_float(row.get("away_corners"))],
-                DEFAULT_BR_CORNERS,
-            )
-        )
-
-        kickoff_source = row.get("kickoff_utc") or row.get("kickoff") or row.get("date")
-        kickoff_dt = _parse_brasileirao_datetime(kickoff_source)
-        kickoff_value = kickoff_dt if isinstance(kickoff_dt, datetime) else kickoff_source
-        if isinstance(kickoff_value, datetime):
-            kickoff_label = kickoff_value.strftime("%d %b %Y %H:%M (UTC)")
-        else:
-            kickoff_label = str(kickoff_value or "")
-
-        context = {
-            "round": target_round,
-            "status": row.get("status", "SCHEDULED"),
-            "league": "Brasileirão Série A",
-            "kickoff_label": kickoff_label,
-            "lambda_cards_home": max(mean_cards * 0.55, 1.0),
-            "lambda_cards_away": max(mean_cards * 0.45, 0.8),
-            "lambda_corners": mean_corners,
-            "odds": row.get("odds") or {},
-            "fixture_metadata": {
-                "match_id": row.get("match_id") or row.get("id"),
-                "raw_stage": row.get("stage"),
-            },
-            "season": season,
-        }
-
-        match_inputs.append(
-            MatchInputs(
-                home_team=home_team,
-                away_team=away_team,
-                round_number=target_round,
-                kickoff_utc=kickoff_value,
-                lambda_home=lambda_home,
-                lambda_away=lambda_away,
-                mean_cards=mean_cards,
-                mean_corners=mean_corners,
-                context=context,
-                raw_row=row.to_dict(),
-            )
-        )
-
-    if not match_inputs:
-        raise ValueError(f"Nenhuma partida do Brasileirão encontrada para a rodada {round_number}")
-
-    return match_inputs
-
 st.sidebar.header("⚙️ Configurações")
 
 available_leagues = LeagueRegistry.get_available_leagues()
@@ -645,7 +482,7 @@ selected_league_key = st.sidebar.selectbox(
     format_func=lambda x: available_leagues[x]
 )
 selected_round = st.sidebar.selectbox("Rodada:", list(range(1, 39)))
-br_seasons = _list_brasileirao_seasons()
+br_seasons = list_brasileirao_seasons()
 selected_br_season = st.sidebar.selectbox("Ano (Brasileirão):", options=br_seasons, index=len(br_seasons)-1)
 available_rounds_br = cached_brasileirao_rounds(selected_br_season)
 if not available_rounds_br:
@@ -0,0 +1,232 @@
+"""
+Coletor assíncrono da Football-Data.org
+
+Espelha os métodos públicos do FootballDataCollector, mas permite montar os
+dados de uma rodada inteira (estatísticas dos times, H2H, classificação e
+artilheiros) com as requisições em paralelo. As chamadas continuam passando pelo
+agendador central e pelo cliente HTTP com pool, então o limite de requisições
+do provedor é respeitado: o tempo total passa a ser o da requisição mais lenta
+de cada janela de cota, e não a soma de todas.
+
+Para o Streamlit (síncrono) use fetch_round(), que executa o loop de eventos.
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple, Union
+
+from data.collector import FootballDataCollector, extract_h2h, summarize_team_stats
+
+Fixture = Union[Tuple[int, int], Dict[str, Any]]
+
+
+class AsyncFootballDataCollector:
+    """Versão asyncio do FootballDataCollector"""
+
+    def __init__(self, collector: Optional[FootballDataCollector] = None, max_concurrency: int = 8):
+        """
+        Inicializa o coletor
+
+        Args:
+            collector: Coletor síncrono usado nas requisições (cota, cache e headers)
+            max_concurrency: Requisições simultâneas no máximo
+        """
+        self.collector = collector or FootballDataCollector()
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix='football-data'
+        )
+        self._semaphores: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+
+    # ------------------------------------------------------------------
+    # Métodos espelhados do FootballDataCollector
+    # ------------------------------------------------------------------
+
+    async def get_competition_info(self, league_code: str = "BSA") -> Dict:
+        """Busca informações da competição"""
+        return await self._call(self.collector.get_competition_info, league_code)
+
+    async def get_teams(self, league_code: str = "BSA", season: int = None) -> List[Dict]:
+        """Busca todos os times da liga"""
+        return await self._call(self.collector.get_teams, league_code, season)
+
+    async def get_team_info(self, team_id: int) -> Dict:
+        """Busca informações detalhadas de um time"""
+        return await self._call(self.collector.get_team_info, team_id)
+
+    async def get_team_matches(self, team_id: int, status: str = "FINISHED", limit: int = 10) -> List[Dict]:
+        """Busca partidas de um time (com cache)"""
+        return await self._call(self.collector.get_team_matches, team_id, status, limit)
+
+    async def get_match_index(self, season: int = None):
+        """Índice de partidas finalizadas da temporada (com cache)"""
+        return await self._call(self.collector.get_match_index, season)
+
+    async def get_h2h(self, team1_id: int, team2_id: int, limit: int = 5) -> List[Dict]:
+        """Busca histórico de confrontos diretos"""
+        index = await self._indexed(team1_id)
+        if index is not None:
+            return index.h2h(team1_id, team2_id, limit)
+        matches = await self.get_team_matches(team1_id, status="FINISHED", limit=50)
+        return extract_h2h(matches, team1_id, team2_id, limit)
+
+    async def get_standings(self, season: int = None) -> Dict:
+        """Busca classificação do Brasileirão"""
+        return await self._call(self.collector.get_standings, season)
+
+    async def get_match_details(self, match_id: int) -> Dict:
+        """Busca detalhes de uma partida específica"""
+        return await self._call(self.collector.get_match_details, match_id)
+
+    async def get_scorers(self, season: int = None, limit: int = 10) -> List[Dict]:
+        """Busca artilheiros do Brasileirão"""
+        return await self._call(self.collector.get_scorers, season, limit)
+
+    async def calculate_team_stats(self, team_id: int, venue: str = "HOME") -> Dict:
+        """Calcula estatísticas de um time baseado em partidas recentes"""
+        index = await self._indexed(team_id)
+        if index is not None:
+            matches = index.team_matches(team_id, limit=10)
+        else:
+            matches = await self.get_team_matches(team_id, status="FINISHED", limit=10)
+        return summarize_team_stats(matches, team_id, venue) or self.collector._get_default_stats()
+
+    # ------------------------------------------------------------------
+    # Rodada inteira
+    # ------------------------------------------------------------------
+
+    async def get_round_data(
+        self,
+        fixtures: Sequence[Fixture],
+        h2h_limit: int = 5,
+        include_standings: bool = True,
+        include_scorers: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Busca em paralelo tudo que a análise de uma rodada precisa
+
+        Args:
+            fixtures: Jogos como (mandante_id, visitante_id) ou dicts no formato
+                do RoundManager (home_team/away_team com 'id')
+            h2h_limit: Confrontos diretos por jogo
+            include_standings: Buscar classificação
+            include_scorers: Buscar artilheiros
+
+        Returns:
+            Dict com 'fixtures' (home_stats, away_stats e h2h de cada jogo,
+            na ordem recebida), 'standings' e 'scorers'
+        """
+        pairs = [_fixture_ids(fixture) for fixture in fixtures]
+
+        tasks: List[Awaitable] = []
+        for home_id, away_id in pairs:
+            tasks.append(self.calculate_team_stats(home_id, venue="HOME"))
+            tasks.append(self.calculate_team_stats(away_id, venue="AWAY"))
+            tasks.append(self.get_h2h(home_id, away_id, limit=h2h_limit))
+        if include_standings:
+            tasks.append(self.get_standings())
+        if include_scorers:
+            tasks.append(self.get_scorers())
+
+        results = await asyncio.gather(*tasks)
+
+        fixtures_data = []
+        for idx, (home_id, away_id) in enumerate(pairs):
+            home_stats, away_stats, h2h = results[idx * 3: idx * 3 + 3]
+            fixtures_data.append({
+                'home_team_id': home_id,
+                'away_team_id': away_id,
+                'home_stats': home_stats,
+                'away_stats': away_stats,
+                'h2h': h2h,
+            })
+
+        extra = results[len(pairs) * 3:]
+        return {
+            'fixtures': fixtures_data,
+            'standings': extra.pop(0) if include_standings else {},
+            'scorers': extra.pop(0) if include_scorers else [],
+        }
+
+    def fetch_round(self, fixtures: Sequence[Fixture], **kwargs) -> Dict[str, Any]:
+        """Fachada síncrona de get_round_data() (para o Streamlit)"""
+        return run_sync(self.get_round_data(fixtures, **kwargs))
+
+    def close(self) -> None:
+        """Encerra as threads de I/O"""
+        self._executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------------
+    # Infraestrutura
+    # ------------------------------------------------------------------
+
+    async def _indexed(self, team_id: int):
+        if not self.collector.use_match_index:
+            return None
+        index = await self.get_match_index()
+        return index if index.has_team(team_id) else None
+
+    async def _call(self, func, *args):
+        # Chamadas idênticas em andamento no mesmo loop compartilham o resultado
+        key = (func.__name__,) + args
+        pending = self._pending.get(key)
+        if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+            return await asyncio.shield(pending)
+
+        future = asyncio.ensure_future(self._run(func, *args))
+        self._pending[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._pending.get(key) is future and future.done():
+                del self._pending[key]
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        # Um semáforo por loop (fetch_round cria um loop a cada chamada)
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+
+def _fixture_ids(fixture: Fixture) -> Tuple[int, int]:
+    if isinstance(fixture, dict):
+        home = fixture.get('home_team_id') or fixture['home_team']['id']
+        away = fixture.get('away_team_id') or fixture['away_team']['id']
+        return home, away
+    home, away = fixture
+    return home, away
+
+
+def run_sync(coroutine: Awaitable) -> Any:
+    """
+    Executa uma corrotina a partir de código síncrono
+
+    Se já houver um loop rodando na thread atual, a corrotina roda em uma
+    thread auxiliar com loop próprio.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    result: Dict[str, Any] = {}
+
+    def runner():
+        try:
+            result['value'] = asyncio.run(coroutine)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result['value']
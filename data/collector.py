@@ -11,6 +11,8 @@ from datetime import datetime
 import json
 from typing import Dict, List, Optional
 
+from utils.request_scheduler import BACKGROUND, INTERACTIVE, get_request_scheduler
+
 load_dotenv()
 
 # Importar cache
@@ -19,26 +21,168 @@ try:
         matches_cache,
         get_cache_key_matches,
         get_cache_key_team_stats,
-        get_cache_key_h2h
+        get_cache_key_h2h,
+        get_cache_key_match_index
     )
     CACHE_ENABLED = True
 except ImportError:
     CACHE_ENABLED = False
     print("⚠️ Cache não disponível")
 
+
+def _team_result(match: Dict, team_id: int):
+    """(gols pró, gols contra, é mandante) de um jogo do ponto de vista do time"""
+    home_goals = match['score']['fullTime']['home']
+    away_goals = match['score']['fullTime']['away']
+    if match['homeTeam']['id'] == team_id:
+        return home_goals, away_goals, True
+    return away_goals, home_goals, False
+
+
+def extract_h2h(matches: List[Dict], team1_id: int, team2_id: int, limit: int = 5) -> List[Dict]:
+    """
+    Filtra confrontos diretos de uma lista de partidas da API
+    
+    Args:
+        matches: Partidas no formato da Football-Data.org
+        team1_id: ID do primeiro time
+        team2_id: ID do segundo time
+        limit: Número máximo de confrontos
+        
+    Returns:
+        Lista com confrontos no formato de get_h2h
+    """
+    h2h_matches = []
+    for match in matches:
+        home_id = match['homeTeam']['id']
+        away_id = match['awayTeam']['id']
+        
+        # Verificar se é confronto direto
+        if (home_id == team1_id and away_id == team2_id) or \
+           (home_id == team2_id and away_id == team1_id):
+            h2h_matches.append({
+                'date': match['utcDate'],
+                'home_team': match['homeTeam']['name'],
+                'away_team': match['awayTeam']['name'],
+                'home_goals': match['score']['fullTime']['home'],
+                'away_goals': match['score']['fullTime']['away'],
+                'home_xg': 0,  # Football-Data.org não fornece xG
+                'away_xg': 0,
+            })
+            
+            if len(h2h_matches) >= limit:
+                break
+    
+    return h2h_matches
+
+
+def summarize_team_stats(matches: List[Dict], team_id: int, venue: str = "HOME") -> Optional[Dict]:
+    """
+    Estatísticas de um time a partir das suas partidas
+    
+    Args:
+        matches: Partidas finalizadas do time (formato da API)
+        team_id: ID do time
+        venue: HOME ou AWAY
+        
+    Returns:
+        Dict com estatísticas ou None se não houver jogos no mando
+    """
+    if not matches:
+        return None
+    
+    goals_for = []
+    goals_against = []
+    wins = 0
+    draws = 0
+    losses = 0
+    clean_sheets = 0
+    
+    for match in matches:
+        scored, conceded, is_home = _team_result(match, team_id)
+        
+        # Filtrar por venue se especificado
+        if venue == "HOME" and not is_home:
+            continue
+        if venue == "AWAY" and is_home:
+            continue
+        
+        goals_for.append(scored)
+        goals_against.append(conceded)
+        
+        if scored > conceded:
+            wins += 1
+        elif scored == conceded:
+            draws += 1
+        else:
+            losses += 1
+        
+        if conceded == 0:
+            clean_sheets += 1
+    
+    matches_played = len(goals_for)
+    
+    if matches_played == 0:
+        return None
+    
+    return {
+        'team_name': matches[0]['homeTeam']['name'] if matches[0]['homeTeam']['id'] == team_id else matches[0]['awayTeam']['name'],
+        'matches_played': matches_played,
+        'wins_home' if venue == "HOME" else 'wins_away': wins,
+        'goals_for_home' if venue == "HOME" else 'goals_for_away': sum(goals_for) / matches_played,
+        'goals_against_home' if venue == "HOME" else 'goals_against_away': sum(goals_against) / matches_played,
+        'clean_sheets_home' if venue == "HOME" else 'clean_sheets_away': clean_sheets,
+        'form': calculate_form(matches, team_id),
+    }
+
+
+def calculate_form(matches: List[Dict], team_id: int) -> str:
+    """Calcula forma recente (últimos 5 jogos)"""
+    form = ""
+    
+    for match in matches[-5:]:
+        scored, conceded, _ = _team_result(match, team_id)
+        
+        if scored > conceded:
+            form += "W"
+        elif scored == conceded:
+            form += "D"
+        else:
+            form += "L"
+    
+    return form
+
+
 class FootballDataCollector:
     """Coleta dados da API Football-Data.org"""
     
-    def __init__(self):
+    def __init__(self, priority: str = INTERACTIVE, use_match_index: bool = True):
         self.api_key = os.getenv("FOOTBALL_DATA_API_KEY") or os.getenv("API_FOOTBALL_KEY")
         self.base_url = "https://api.football-data.org/v4"
         self.headers = {"X-Auth-Token": self.api_key}
+        # Requisições passam pelo agendador central (cota de ~10/min)
+        self.scheduler = get_request_scheduler()
+        self.priority = priority
         self.brasileirao_code = "BSA"  # Usar código ao invés de ID numérico
         self.premier_league_code = "PL"  # Código Premier League
         self.current_season = 2025
         
         # Backward compatibility - CORREÇÃO DO BUG brasileiro_id (Prompt 0.1-0.2)
         self.brasileiro_id = self.brasileirao_code
+        self.brasileirao_id = self.brasileirao_code  # usado em partidas, classificação e artilheiros
+        
+        # H2H/estatísticas respondidos pelo índice da temporada (1 requisição)
+        self.use_match_index = use_match_index
+    
+    def _get(self, endpoint: str, params: Optional[Dict] = None, priority: Optional[str] = None) -> requests.Response:
+        """GET na Football-Data.org respeitando a cota do provedor"""
+        return self.scheduler.get(
+            'football_data',
+            endpoint,
+            params=params,
+            headers=self.headers,
+            priority=priority or self.priority
+        )
     
     def get_competition_info(self, league_code: str = "BSA") -> Dict:
         """Busca informações da competição
@@ -52,7 +196,7 @@ class FootballDataCollector:
         endpoint = f"{self.base_url}/competitions/{league_code}"
 
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=10)
+            response = self._get(endpoint)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -76,7 +220,7 @@ class FootballDataCollector:
             params['season'] = season
 
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             return data.get('teams', [])
@@ -97,7 +241,7 @@ class FootballDataCollector:
         endpoint = f"{self.base_url}/teams/{team_id}"
         
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=10)
+            response = self._get(endpoint)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -121,14 +265,27 @@ class FootballDataCollector:
         Returns:
             Lista de partidas
         """
-        # Verificar cache
-        if CACHE_ENABLED:
-            cache_key = get_cache_key_matches(team_id, status, limit)
-            cached_data = matches_cache.get(cache_key)
-            if cached_data is not None:
-                return cached_data
+        def fetch():
+            return self._fetch_team_matches(team_id, status, limit)
         
-        # Buscar da API
+        def refresh():
+            return self._fetch_team_matches(team_id, status, limit, priority=BACKGROUND)
+        
+        # Cache vencido é servido na hora e atualizado em segundo plano
+        if CACHE_ENABLED:
+            matches = matches_cache.get_or_refresh(get_cache_key_matches(team_id, status, limit), fetch, refresh)
+        else:
+            matches = fetch()
+        return matches or []
+    
+    def _fetch_team_matches(
+        self,
+        team_id: int,
+        status: str,
+        limit: int,
+        priority: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """Partidas de um time direto da API (None se falhar ou vier vazio)"""
         endpoint = f"{self.base_url}/teams/{team_id}/matches"
         params = {
             'status': status,
@@ -137,19 +294,52 @@ class FootballDataCollector:
         }
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params, priority=priority)
             response.raise_for_status()
             data = response.json()
-            matches = data.get('matches', [])
-            
-            # Armazenar no cache
-            if CACHE_ENABLED and matches:
-                matches_cache.set(cache_key, matches)
-            
-            return matches
+            # Lista vazia não vai para o cache
+            return data.get('matches', []) or None
         except Exception as e:
             print(f"Erro ao buscar partidas do time {team_id}: {e}")
-            return []
+            return None
+    
+    def get_match_index(self, season: int = None, force_refresh: bool = False):
+        """
+        Índice de partidas finalizadas da temporada (com cache)
+        
+        Uma única requisição da competição inteira substitui as buscas por
+        time e por confronto.
+        
+        Args:
+            season: Ano da temporada (padrão: atual)
+            force_refresh: Ignorar o cache
+            
+        Returns:
+            MatchIndex (pode estar vazio se a API falhar)
+        """
+        from data.match_index import MatchIndex
+        
+        season = season or self.current_season
+        if CACHE_ENABLED and not force_refresh:
+            cache_key = get_cache_key_match_index(self.brasileirao_code, season)
+            cached_index = matches_cache.get(cache_key)
+            if cached_index is not None:
+                return cached_index
+        
+        index = MatchIndex.from_api(self, self.brasileirao_code, season)
+        
+        # Índice vazio também fica em cache: evita repetir a chamada com a API fora
+        if CACHE_ENABLED:
+            matches_cache.set(get_cache_key_match_index(self.brasileirao_code, season), index)
+        
+        return index
+    
+    def _indexed(self, team_id: int):
+        """Índice da temporada, se ele cobrir o time"""
+        if not self.use_match_index:
+            return None
+        index = self.get_match_index()
+        return index if index.has_team(team_id) else None
     
     def get_h2h(self, team1_id: int, team2_id: int, limit: int = 5) -> List[Dict]:
         """
@@ -163,33 +353,15 @@ class FootballDataCollector:
         Returns:
             Lista com últimos confrontos
         """
+        index = self._indexed(team1_id)
+        if index is not None:
+            return index.h2h(team1_id, team2_id, limit)
+        
         # Football-Data.org não tem endpoint direto de H2H
         # Vamos buscar partidas de um time e filtrar pelo oponente
         
         all_matches = self.get_team_matches(team1_id, status="FINISHED", limit=50)
-        
-        h2h_matches = []
-        for match in all_matches:
-            home_id = match['homeTeam']['id']
-            away_id = match['awayTeam']['id']
-            
-            # Verificar se é confronto direto
-            if (home_id == team1_id and away_id == team2_id) or \
-               (home_id == team2_id and away_id == team1_id):
-                h2h_matches.append({
-                    'date': match['utcDate'],
-                    'home_team': match['homeTeam']['name'],
-                    'away_team': match['awayTeam']['name'],
-                    'home_goals': match['score']['fullTime']['home'],
-                    'away_goals': match['score']['fullTime']['away'],
-                    'home_xg': 0,  # Football-Data.org não fornece xG
-                    'away_xg': 0,
-                })
-                
-                if len(h2h_matches) >= limit:
-                    break
-        
-        return h2h_matches
+        return extract_h2h(all_matches, team1_id, team2_id, limit)
     
     def get_standings(self, season: int = None) -> Dict:
         """
@@ -207,7 +379,7 @@ class FootballDataCollector:
             params['season'] = season
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -233,7 +405,7 @@ class FootballDataCollector:
         endpoint = f"{self.base_url}/matches/{match_id}"
         
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=10)
+            response = self._get(endpoint)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -257,7 +429,7 @@ class FootballDataCollector:
             params['season'] = season
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             return data.get('scorers', [])
@@ -276,103 +448,16 @@ class FootballDataCollector:
         Returns:
             Dict com estatísticas calculadas
         """
-        matches = self.get_team_matches(team_id, status="FINISHED", limit=10)
-        
-        if not matches:
-            return self._get_default_stats()
-        
-        goals_for = []
-        goals_against = []
-        wins = 0
-        draws = 0
-        losses = 0
-        clean_sheets = 0
-        
-        for match in matches:
-            home_id = match['homeTeam']['id']
-            away_id = match['awayTeam']['id']
-            home_goals = match['score']['fullTime']['home']
-            away_goals = match['score']['fullTime']['away']
-            
-            # Verificar se é casa ou fora
-            is_home = (home_id == team_id)
-            
-            # Filtrar por venue se especificado
-            if venue == "HOME" and not is_home:
-                continue
-            if venue == "AWAY" and is_home:
-                continue
-            
-            # Calcular estatísticas
-            if is_home:
-                goals_for.append(home_goals)
-                goals_against.append(away_goals)
-                
-                if home_goals > away_goals:
-                    wins += 1
-                elif home_goals == away_goals:
-                    draws += 1
-                else:
-                    losses += 1
-                
-                if away_goals == 0:
-                    clean_sheets += 1
-            else:
-                goals_for.append(away_goals)
-                goals_against.append(home_goals)
-                
-                if away_goals > home_goals:
-                    wins += 1
-                elif away_goals == home_goals:
-                    draws += 1
-                else:
-                    losses += 1
-                
-                if home_goals == 0:
-                    clean_sheets += 1
-        
-        matches_played = len(goals_for)
-        
-        if matches_played == 0:
-            return self._get_default_stats()
-        
-        return {
-            'team_name': matches[0]['homeTeam']['name'] if matches[0]['homeTeam']['id'] == team_id else matches[0]['awayTeam']['name'],
-            'matches_played': matches_played,
-            'wins_home' if venue == "HOME" else 'wins_away': wins,
-            'goals_for_home' if venue == "HOME" else 'goals_for_away': sum(goals_for) / matches_played,
-            'goals_against_home' if venue == "HOME" else 'goals_against_away': sum(goals_against) / matches_played,
-            'clean_sheets_home' if venue == "HOME" else 'clean_sheets_away': clean_sheets,
-            'form': self._calculate_form(matches, team_id),
-        }
+        index = self._indexed(team_id)
+        if index is not None:
+            matches = index.team_matches(team_id, limit=10)
+        else:
+            matches = self.get_team_matches(team_id, status="FINISHED", limit=10)
+        return summarize_team_stats(matches, team_id, venue) or self._get_default_stats()
     
     def _calculate_form(self, matches: List[Dict], team_id: int) -> str:
         """Calcula forma recente (últimos 5 jogos)"""
-        form = ""
-        
-        for match in matches[-5:]:
-            home_id = match['homeTeam']['id']
-            home_goals = match['score']['fullTime']['home']
-            away_goals = match['score']['fullTime']['away']
-            
-            is_home = (home_id == team_id)
-            
-            if is_home:
-                if home_goals > away_goals:
-                    form += "W"
-                elif home_goals == away_goals:
-                    form += "D"
-                else:
-                    form += "L"
-            else:
-                if away_goals > home_goals:
-                    form += "W"
-                elif away_goals == home_goals:
-                    form += "D"
-                else:
-                    form += "L"
-        
-        return form
+        return calculate_form(matches, team_id)
     
     def _get_default_stats(self) -> Dict:
         """Retorna estatísticas padrão quando não há dados"""
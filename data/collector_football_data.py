@@ -11,24 +11,39 @@ from datetime import datetime
 import json
 from typing import Dict, List, Optional
 
+from utils.request_scheduler import INTERACTIVE, get_request_scheduler
+
 load_dotenv()
 
 class FootballDataCollector:
     """Coleta dados da API Football-Data.org"""
     
-    def __init__(self):
+    def __init__(self, priority: str = INTERACTIVE):
         self.api_key = os.getenv("FOOTBALL_DATA_API_KEY") or os.getenv("API_FOOTBALL_KEY")
         self.base_url = "https://api.football-data.org/v4"
         self.headers = {"X-Auth-Token": self.api_key}
         self.brasileirao_id = 2013  # BSA
         self.current_season = 2025
+        # Requisições passam pelo agendador central (cota de ~10/min)
+        self.scheduler = get_request_scheduler()
+        self.priority = priority
+    
+    def _get(self, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET na Football-Data.org respeitando a cota do provedor"""
+        return self.scheduler.get(
+            'football_data',
+            endpoint,
+            params=params,
+            headers=self.headers,
+            priority=self.priority
+        )
     
     def get_competition_info(self) -> Dict:
         """Busca informações da competição (Brasileirão)"""
         endpoint = f"{self.base_url}/competitions/{self.brasileirao_id}"
         
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=10)
+            response = self._get(endpoint)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -51,7 +66,7 @@ class FootballDataCollector:
             params['season'] = season
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             return data.get('teams', [])
@@ -72,7 +87,7 @@ class FootballDataCollector:
         endpoint = f"{self.base_url}/teams/{team_id}"
         
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=10)
+            response = self._get(endpoint)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -104,7 +119,7 @@ class FootballDataCollector:
         }
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             return data.get('matches', [])
@@ -168,7 +183,7 @@ class FootballDataCollector:
             params['season'] = season
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -194,7 +209,7 @@ class FootballDataCollector:
         endpoint = f"{self.base_url}/matches/{match_id}"
         
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=10)
+            response = self._get(endpoint)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -218,7 +233,7 @@ class FootballDataCollector:
             params['season'] = season
         
         try:
-            response = requests.get(endpoint, headers=self.headers, params=params, timeout=10)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             return data.get('scorers', [])
@@ -4,12 +4,13 @@ Collector para Football-Data.org API
 import requests
 from typing import Dict, List, Any
 from data.adapters.data_adapter import FootballDataAdapter
+from utils.request_scheduler import INTERACTIVE, get_request_scheduler
 
 
 class FootballDataCollector:
     """Collector para Football-Data.org API"""
     
-    def __init__(self, league_key: str, api_config: Dict[str, Any]):
+    def __init__(self, league_key: str, api_config: Dict[str, Any], priority: str = INTERACTIVE):
         self.league_key = league_key
         self.api_config = api_config
         self.base_url = api_config['base_url']
@@ -17,6 +18,14 @@ class FootballDataCollector:
         self.api_key = api_config['api_key']
         self.adapter = FootballDataAdapter()
         self.headers = {'X-Auth-Token': self.api_key}
+        self.scheduler = get_request_scheduler()
+        self.priority = priority
+    
+    def _get(self, url: str, params: Dict = None) -> requests.Response:
+        """GET na Football-Data.org respeitando a cota do provedor"""
+        return self.scheduler.get(
+            'football_data', url, params=params, headers=self.headers, priority=self.priority
+        )
     
     def get_matches(self, season: int = None) -> List[Dict]:
         """Coleta matches da liga"""
@@ -26,7 +35,7 @@ class FootballDataCollector:
             params['season'] = season
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self._get(url, params=params)
             response.raise_for_status()
             matches = response.json().get('matches', [])
             return [self.adapter.normalize_match(m) for m in matches]
@@ -39,7 +48,7 @@ class FootballDataCollector:
         url = f"{self.base_url}/competitions/{self.league_id}/teams"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get(url)
             response.raise_for_status()
             teams = response.json().get('teams', [])
             return [self.adapter.normalize_team(t) for t in teams]
@@ -52,7 +61,7 @@ class FootballDataCollector:
         url = f"{self.base_url}/competitions/{self.league_id}/standings"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get(url)
             response.raise_for_status()
             standings = response.json().get('standings', [{}])[0].get('table', [])
             return [self.adapter.normalize_stats(s) for s in standings]
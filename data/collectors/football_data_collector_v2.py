@@ -5,12 +5,14 @@ import requests
 from typing import Dict, List, Any
 import logging
 
+from utils.request_scheduler import INTERACTIVE, get_request_scheduler
+
 logger = logging.getLogger(__name__)
 
 class FootballDataCollectorV2:
     """Collector para Football-Data.org API v4 com suporte a múltiplas ligas"""
     
-    def __init__(self, league_key: str, api_config: Dict[str, Any]):
+    def __init__(self, league_key: str, api_config: Dict[str, Any], priority: str = INTERACTIVE):
         self.league_key = league_key
         self.api_config = api_config
         self.base_url = api_config['base_url']
@@ -22,6 +24,10 @@ class FootballDataCollectorV2:
             'X-Auth-Token': self.api_key,
             'Content-Type': 'application/json'
         }
+        
+        # Cota da Football-Data.org compartilhada com o resto da aplicação
+        self.scheduler = get_request_scheduler()
+        self.priority = priority
     
     def get_matches(self, season: int = None, status: str = "SCHEDULED") -> List[Dict]:
         """
@@ -48,11 +54,12 @@ class FootballDataCollectorV2:
             
             logger.info(f"Buscando matches de {self.league_key} em {url}")
             
-            response = requests.get(
+            response = self.scheduler.get(
+                'football_data',
                 url,
-                headers=self.headers,
                 params=params,
-                timeout=10
+                headers=self.headers,
+                priority=self.priority
             )
             
             # Verificar status da resposta
@@ -100,11 +107,12 @@ class FootballDataCollectorV2:
             if season:
                 params['season'] = season
             
-            response = requests.get(
+            response = self.scheduler.get(
+                'football_data',
                 url,
-                headers=self.headers,
                 params=params,
-                timeout=10
+                headers=self.headers,
+                priority=self.priority
             )
             
             response.raise_for_status()
@@ -138,11 +146,12 @@ class FootballDataCollectorV2:
             if season:
                 params['season'] = season
             
-            response = requests.get(
+            response = self.scheduler.get(
+                'football_data',
                 url,
-                headers=self.headers,
                 params=params,
-                timeout=10
+                headers=self.headers,
+                priority=self.priority
             )
             
             response.raise_for_status()
@@ -1,9 +1,9 @@
 """
 Collector para FootyStats API
 """
-import requests
 from typing import Dict, List, Any
 from data.adapters.data_adapter import FootyStatsAdapter
+from utils.http_client import get_http_client
 
 
 class FootyStatsCollector:
@@ -16,6 +16,7 @@ class FootyStatsCollector:
         self.league_id = api_config['league_id']
         self.api_key = api_config['api_key']
         self.adapter = FootyStatsAdapter()
+        self.http = get_http_client()
     
     def get_matches(self, season: int = None) -> List[Dict]:
         """Coleta matches da liga"""
@@ -26,7 +27,7 @@ class FootyStatsCollector:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             matches = response.json().get('data', [])
             return [self.adapter.normalize_match(m) for m in matches]
@@ -43,7 +44,7 @@ class FootyStatsCollector:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             teams = response.json().get('data', [])
             return [self.adapter.normalize_team(t) for t in teams]
@@ -61,7 +62,7 @@ class FootyStatsCollector:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             standings = response.json().get('league_table', [])
             return [self.adapter.normalize_stats(s) for s in standings]
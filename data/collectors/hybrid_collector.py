@@ -6,13 +6,227 @@ Data: 2025-11-14
 
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
+import threading
+
+from data.parquet_store import Filter, round_filter
+from data.schema import load_table
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """Completa colunas de data (aliases e tipos já vêm de data/schema.py)"""
+    # Criar kickoff_utc se não existir (usar date ou date_GMT)
+    if 'kickoff_utc' not in df.columns:
+        if 'date' in df.columns:
+            df['kickoff_utc'] = df['date']
+        elif 'date_GMT' in df.columns:
+            df['kickoff_utc'] = df['date_GMT']
+
+    # Garantir que temos 'date' se não existir
+    if 'date' not in df.columns:
+        if 'kickoff_utc' in df.columns:
+            df['date'] = df['kickoff_utc']
+        elif 'date_GMT' in df.columns:
+            df['date'] = df['date_GMT']
+
+    return df
+
+
+# Estatística: (coluna do mandante, coluna do visitante)
+TEAM_STAT_COLUMNS = {
+    'goals': ('home_score', 'away_score'),
+    'xg': ('home_xg', 'away_xg'),
+    'shots': ('home_shots', 'away_shots'),
+    'corners': ('home_corners', 'away_corners'),
+    'cards': ('home_cards', 'away_cards'),
+}
+
+
+def _empty_team_stats(team_name: str) -> Dict:
+    return {
+        'team': team_name,
+        'matches_played': 0,
+        'wins': 0,
+        'draws': 0,
+        'losses': 0,
+        'goals_for': 0,
+        'goals_against': 0,
+        'xg_for': 0.0,
+        'xg_against': 0.0,
+        'shots_for': 0,
+        'shots_against': 0,
+        'corners_for': 0,
+        'corners_against': 0,
+        'cards_for': 0,
+        'cards_against': 0
+    }
+
+
+def _numeric_column(df: pd.DataFrame, column: str) -> pd.Series:
+    # Coluna ausente ou valor vazio contam como 0
+    if column not in df.columns:
+        return pd.Series(0, index=df.index)
+    return pd.to_numeric(df[column], errors='coerce').fillna(0)
+
+
+class MatchTable:
+    """
+    Jogos de uma temporada já normalizados, com índices por rodada, status e time
+
+    Os índices guardam as posições dos jogos em records (em ordem do CSV), de
+    modo que os filtros de get_matches não percorrem a tabela inteira.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: Tuple[int, int] = (0, 0)):
+        """
+        Args:
+            df: DataFrame lido do CSV de jogos
+            version: (mtime_ns, tamanho) do arquivo de origem
+        """
+        self.df = _normalize_matches(df)
+        self.version = version
+        self.records: List[Dict] = self.df.to_dict('records')
+
+        columns = set(self.df.columns)
+        # Índice None = coluna ausente (filtro correspondente é ignorado)
+        self.by_round: Optional[Dict[Any, List[int]]] = {} if 'round' in columns else None
+        self.by_status: Optional[Dict[str, List[int]]] = {} if 'status' in columns else None
+        self.by_team: Optional[Dict[str, List[int]]] = (
+            {} if {'home_team', 'away_team'} <= columns else None
+        )
+
+        # Estatísticas por time, por venue (a tabela já é por versão do CSV)
+        self._team_stats: Dict[Optional[str], Dict[str, Dict]] = {}
+        self._team_stats_lock = threading.Lock()
+
+        for position, match in enumerate(self.records):
+            if self.by_round is not None and not pd.isna(match['round']):
+                self.by_round.setdefault(match['round'], []).append(position)
+            if self.by_status is not None:
+                self.by_status.setdefault(match['status'], []).append(position)
+            if self.by_team is not None:
+                self.by_team.setdefault(match['home_team'], []).append(position)
+                if match['away_team'] != match['home_team']:
+                    self.by_team.setdefault(match['away_team'], []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def select(
+        self,
+        round_number: Optional[int] = None,
+        status: Optional[str] = None,
+        team: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Jogos que atendem a todos os filtros (cópias, podem ser alteradas)
+
+        Args:
+            round_number: Rodada
+            status: Status já normalizado (FINISHED, SCHEDULED, ...)
+            team: Time mandante ou visitante
+
+        Returns:
+            Lista de jogos na ordem do CSV
+        """
+        selections = []
+        if round_number is not None and self.by_round is not None:
+            selections.append(self.by_round.get(round_number, []))
+        if status and self.by_status is not None:
+            selections.append(self.by_status.get(status, []))
+        if team and self.by_team is not None:
+            selections.append(self.by_team.get(team, []))
+
+        if not selections:
+            positions = range(len(self.records))
+        else:
+            # Parte da menor seleção; as demais viram conjuntos
+            selections.sort(key=len)
+            others = [set(selection) for selection in selections[1:]]
+            positions = [p for p in selections[0] if all(p in other for other in others)]
+
+        return [dict(self.records[p]) for p in positions]
+
+
+    def team_stats(self, venue: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Estatísticas de todos os times (jogos finalizados), calculadas uma vez
+
+        Args:
+            venue: 'HOME', 'AWAY' ou None (todos os jogos)
+
+        Returns:
+            Dict {time: estatísticas}
+        """
+        with self._team_stats_lock:
+            if venue not in self._team_stats:
+                self._team_stats[venue] = self._compute_team_stats(venue)
+            return self._team_stats[venue]
+
+    def _compute_team_stats(self, venue: Optional[str]) -> Dict[str, Dict]:
+        df = self.df
+        if 'status' in df.columns:
+            df = df[df['status'] == 'FINISHED']
+
+        # Formato longo: uma linha por (jogo, time), com colunas *_for/*_against
+        sides = []
+        for is_home in (True, False):
+            if venue == 'HOME' and not is_home or venue == 'AWAY' and is_home:
+                continue
+            side = pd.DataFrame({'team': df['home_team' if is_home else 'away_team']})
+            for stat, (home_col, away_col) in TEAM_STAT_COLUMNS.items():
+                own, other = (home_col, away_col) if is_home else (away_col, home_col)
+                side[f'{stat}_for'] = _numeric_column(df, own)
+                side[f'{stat}_against'] = _numeric_column(df, other)
+            sides.append(side)
+
+        long = pd.concat(sides, ignore_index=True)
+        long['wins'] = long['goals_for'] > long['goals_against']
+        long['draws'] = long['goals_for'] == long['goals_against']
+        long['losses'] = long['goals_for'] < long['goals_against']
+
+        # xG é sempre float, mesmo sem colunas de xG no CSV
+        long[['xg_for', 'xg_against']] = long[['xg_for', 'xg_against']].astype(float)
+
+        # observed=True: times categóricos sem jogos não entram
+        grouped = long.groupby('team', sort=False, observed=True)
+        totals = grouped.sum()
+        totals['matches_played'] = grouped.size()
+
+        played = totals['matches_played']
+        totals['avg_goals_for'] = totals['goals_for'] / played
+        totals['avg_goals_against'] = totals['goals_against'] / played
+        totals['avg_xg_for'] = totals['xg_for'] / played
+        totals['avg_xg_against'] = totals['xg_against'] / played
+
+        # tolist() devolve tipos nativos preservando o dtype de cada coluna
+        columns = {column: totals[column].tolist() for column in totals.columns}
+        stats = {}
+        for position, team in enumerate(totals.index):
+            team_stats = _empty_team_stats(team)
+            for key in list(team_stats) + ['avg_goals_for', 'avg_goals_against', 'avg_xg_for', 'avg_xg_against']:
+                if key != 'team':
+                    team_stats[key] = columns[key][position]
+            stats[team] = team_stats
+        return stats
+
+
+def _records(df: pd.DataFrame, version: Tuple[int, int]) -> List[Dict]:
+    return df.to_dict('records')
+
+
+def _standings_by_round(df: pd.DataFrame, version: Tuple[int, int]) -> Dict[Any, List[Dict]]:
+    # Classificação de cada rodada já ordenada por posição
+    return {
+        round_number: group.sort_values('position').to_dict('records')
+        for round_number, group in df.groupby('round')
+    }
+
+
 class HybridDataCollector:
     """
     Collector híbrido que usa:
@@ -26,6 +240,10 @@ class HybridDataCollector:
     - Desenvolvimento offline possível
     """
 
+    # Tabelas normalizadas por arquivo: {(caminho, builder, filtros): (versão, tabela)}
+    _tables: Dict[Tuple[str, Callable, Tuple], Tuple[Tuple[int, int], Any]] = {}
+    _tables_lock = threading.Lock()
+
     def __init__(self, league_key: str = 'brasileirao', odds_api_key: Optional[str] = None):
         """
         Inicializa o collector híbrido
@@ -54,7 +272,10 @@ class HybridDataCollector:
         if self._odds_collector is None and self._odds_api_key:
             try:
                 from data.odds_collector import OddsCollector
-                self._odds_collector = OddsCollector(self._odds_api_key)
+                self._odds_collector = OddsCollector(
+                    api_key=self._odds_api_key,
+                    sport_key=self._get_odds_sport_key() or "soccer_brazil_campeonato"
+                )
                 logger.info("OddsCollector inicializado com sucesso")
             except ImportError:
                 logger.warning("OddsCollector não disponível. Continuando sem odds.")
@@ -84,72 +305,15 @@ class HybridDataCollector:
             return []
 
         try:
-            df = pd.read_csv(matches_file)
-
-            # Normalizar nomes de colunas para formato padronizado
-            # Premier League usa nomes diferentes
-            column_mapping = {}
-            if 'home_team_name' in df.columns:
-                column_mapping['home_team_name'] = 'home_team'
-            if 'away_team_name' in df.columns:
-                column_mapping['away_team_name'] = 'away_team'
-            if 'Game Week' in df.columns:
-                column_mapping['Game Week'] = 'round'
-            if 'date_GMT' in df.columns:
-                # Renomear date_GMT para date
-                if 'date' not in df.columns:
-                    column_mapping['date_GMT'] = 'date'
-            
-            if column_mapping:
-                df = df.rename(columns=column_mapping)
-            
-            # Criar kickoff_utc se não existir (usar date ou date_GMT)
-            if 'kickoff_utc' not in df.columns:
-                if 'date' in df.columns:
-                    df['kickoff_utc'] = df['date']
-                elif 'date_GMT' in df.columns:
-                    df['kickoff_utc'] = df['date_GMT']
-            
-            # Garantir que temos 'date' se não existir
-            if 'date' not in df.columns:
-                if 'kickoff_utc' in df.columns:
-                    df['date'] = df['kickoff_utc']
-                elif 'date_GMT' in df.columns:
-                    df['date'] = df['date_GMT']
-            
-            # Normalizar status (Premier League usa "complete" ao invés de "FINISHED")
-            if 'status' in df.columns:
-                df['status'] = df['status'].replace({
-                    'complete': 'FINISHED',
-                    'scheduled': 'SCHEDULED',
-                    'in_play': 'IN_PLAY',
-                    'live': 'IN_PLAY'
-                })
-
-            # Filtros
-            if round_number is not None:
-                round_col = 'round' if 'round' in df.columns else 'Game Week'
-                if round_col in df.columns:
-                    df = df[df[round_col] == round_number]
-
-            if status:
-                if 'status' in df.columns:
-                    # Normalizar status do filtro também
-                    if status == 'FINISHED':
-                        df = df[df['status'].isin(['FINISHED', 'complete'])]
-                    elif status == 'SCHEDULED':
-                        df = df[df['status'].isin(['SCHEDULED', 'scheduled'])]
-                    else:
-                        df = df[df['status'] == status]
-
-            if team:
-                home_col = 'home_team' if 'home_team' in df.columns else 'home_team_name'
-                away_col = 'away_team' if 'away_team' in df.columns else 'away_team_name'
-                if home_col in df.columns and away_col in df.columns:
-                    df = df[(df[home_col] == team) | (df[away_col] == team)]
-
-            # Converter para lista de dicionários
-            matches = df.to_dict('records')
+            table = self._cached_table(matches_file, MatchTable)
+            if table is None and round_number is not None:
+                # Tabela ainda não carregada: com Parquet, lê só o row group da rodada
+                filters = round_filter(matches_file, round_number)
+                if filters is not None:
+                    table = self._load_table(matches_file, MatchTable, filters)
+            if table is None:
+                table = self._load_table(matches_file, MatchTable)
+            matches = table.select(round_number=round_number, status=status, team=team)
 
             logger.info(f"Carregados {len(matches)} jogos do CSV")
             return matches
@@ -158,6 +322,59 @@ class HybridDataCollector:
             logger.error(f"Erro ao ler matches do CSV: {e}")
             return []
 
+    def _load_table(
+        self,
+        file_path: Path,
+        builder: Callable[[pd.DataFrame, Tuple[int, int]], Any],
+        filters: Optional[List[Filter]] = None
+    ) -> Any:
+        """
+        Lê um CSV uma única vez e reaproveita a versão normalizada
+
+        A tabela é compartilhada entre instâncias e só é reconstruída quando
+        o mtime ou o tamanho do arquivo mudam.
+
+        Args:
+            file_path: Caminho do CSV
+            builder: Função (DataFrame, versão) -> tabela normalizada
+            filters: Filtros de linha (ex.: round_filter); a tabela filtrada é
+                guardada separadamente da completa
+
+        Returns:
+            Tabela construída por builder
+        """
+        stat = file_path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (str(file_path.resolve()), builder, tuple(filters or ()))
+
+        with HybridDataCollector._tables_lock:
+            cached = HybridDataCollector._tables.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        # Parquet exportado (se atualizado) evita reinterpretar o CSV;
+        # aliases e tipos vêm do esquema declarado do arquivo
+        table = builder(load_table(file_path, filters=filters), version)
+        with HybridDataCollector._tables_lock:
+            HybridDataCollector._tables[key] = (version, table)
+        logger.debug(f"CSV carregado em memória: {file_path}")
+        return table
+
+    def _cached_table(self, file_path: Path, builder: Callable) -> Any:
+        """Tabela completa já em memória e atual, ou None"""
+        stat = file_path.stat()
+        with HybridDataCollector._tables_lock:
+            cached = HybridDataCollector._tables.get((str(file_path.resolve()), builder, ()))
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+        return None
+
+    @classmethod
+    def clear_table_cache(cls) -> None:
+        """Descarta as tabelas em memória (próxima leitura relê os CSV)"""
+        with cls._tables_lock:
+            cls._tables.clear()
+
     def get_match(self, home_team: str, away_team: str, round_number: Optional[int] = None) -> Optional[Dict]:
         """
         Obtém um jogo específico
@@ -209,25 +426,18 @@ class HybridDataCollector:
                 logger.warning(f"Sport key não mapeado para liga: {self.league_key}")
                 return matches
 
-            odds_data = self.odds_collector.get_odds(odds_sport_key)
-
-            # Mapear odds por combinação de times
-            odds_map = {}
-            for odd in odds_data:
-                home = odd.get('home_team', '')
-                away = odd.get('away_team', '')
-                key = f"{home}_{away}".lower().replace(' ', '')
-                odds_map[key] = odd
+            # Snapshot da rodada (matriz montada uma vez, índice por times)
+            snapshot = self.odds_collector.get_snapshot()
 
             # Adicionar odds aos matches
             for match in matches:
                 if match.get('status') == 'SCHEDULED':
                     home = match.get('home_team', '')
                     away = match.get('away_team', '')
-                    key = f"{home}_{away}".lower().replace(' ', '')
+                    match_odds = snapshot.get(home, away)
 
-                    if key in odds_map:
-                        match['odds'] = odds_map[key]
+                    if match_odds:
+                        match['odds'] = match_odds
                         logger.debug(f"Odds adicionadas: {home} vs {away}")
 
             logger.info(f"Odds integradas para {len(future_matches)} jogos futuros")
@@ -251,8 +461,8 @@ class HybridDataCollector:
             return []
 
         try:
-            df = pd.read_csv(teams_file)
-            teams = df.to_dict('records')
+            records = self._load_table(teams_file, _records)
+            teams = [dict(team) for team in records]
             logger.info(f"Carregados {len(teams)} times do CSV")
             return teams
         except Exception as e:
@@ -286,19 +496,13 @@ class HybridDataCollector:
             return []
 
         try:
-            df = pd.read_csv(standings_file)
+            by_round = self._load_table(standings_file, _standings_by_round)
 
-            if round_number is not None:
-                df = df[df['round'] == round_number]
-            else:
+            if round_number is None:
                 # Usar última rodada disponível
-                latest_round = df['round'].max()
-                df = df[df['round'] == latest_round]
-
-            # Ordenar por posição
-            df = df.sort_values('position')
+                round_number = max(by_round) if by_round else None
 
-            standings = df.to_dict('records')
+            standings = [dict(row) for row in by_round.get(round_number, [])]
             logger.info(f"Carregada classificação com {len(standings)} times")
             return standings
 
@@ -317,79 +521,34 @@ class HybridDataCollector:
         Returns:
             Estatísticas do time
         """
-        matches = self.get_matches(team=team_name, status='FINISHED')
-
-        stats = {
-            'team': team_name,
-            'matches_played': 0,
-            'wins': 0,
-            'draws': 0,
-            'losses': 0,
-            'goals_for': 0,
-            'goals_against': 0,
-            'xg_for': 0.0,
-            'xg_against': 0.0,
-            'shots_for': 0,
-            'shots_against': 0,
-            'corners_for': 0,
-            'corners_against': 0,
-            'cards_for': 0,
-            'cards_against': 0
-        }
+        stats = self.get_all_team_stats(venue=venue).get(team_name)
+        return stats if stats is not None else _empty_team_stats(team_name)
 
-        for match in matches:
-            is_home = match['home_team'] == team_name
+    def get_all_team_stats(self, venue: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Estatísticas de todos os times em uma única passada vetorizada
 
-            # Filtrar por venue se especificado
-            if venue == 'HOME' and not is_home:
-                continue
-            if venue == 'AWAY' and is_home:
-                continue
+        O resultado fica guardado na tabela de jogos, ou seja, é recalculado
+        apenas quando o CSV muda.
 
-            stats['matches_played'] += 1
-
-            if is_home:
-                goals_for = match.get('home_score', 0)
-                goals_against = match.get('away_score', 0)
-                stats['xg_for'] += match.get('home_xg', 0) or 0
-                stats['xg_against'] += match.get('away_xg', 0) or 0
-                stats['shots_for'] += match.get('home_shots', 0) or 0
-                stats['shots_against'] += match.get('away_shots', 0) or 0
-                stats['corners_for'] += match.get('home_corners', 0) or 0
-                stats['corners_against'] += match.get('away_corners', 0) or 0
-                stats['cards_for'] += match.get('home_cards', 0) or 0
-                stats['cards_against'] += match.get('away_cards', 0) or 0
-            else:
-                goals_for = match.get('away_score', 0)
-                goals_against = match.get('home_score', 0)
-                stats['xg_for'] += match.get('away_xg', 0) or 0
-                stats['xg_against'] += match.get('home_xg', 0) or 0
-                stats['shots_for'] += match.get('away_shots', 0) or 0
-                stats['shots_against'] += match.get('home_shots', 0) or 0
-                stats['corners_for'] += match.get('away_corners', 0) or 0
-                stats['corners_against'] += match.get('home_corners', 0) or 0
-                stats['cards_for'] += match.get('away_cards', 0) or 0
-                stats['cards_against'] += match.get('home_cards', 0) or 0
-
-            stats['goals_for'] += goals_for or 0
-            stats['goals_against'] += goals_against or 0
-
-            # Resultado
-            if goals_for > goals_against:
-                stats['wins'] += 1
-            elif goals_for == goals_against:
-                stats['draws'] += 1
-            else:
-                stats['losses'] += 1
+        Args:
+            venue: 'HOME', 'AWAY' ou None (todos os jogos)
+
+        Returns:
+            Dict {time: estatísticas} no mesmo formato de get_team_stats
+        """
+        matches_file = self.csv_path / f'{self.season}_matches.csv'
 
-        # Calcular médias
-        if stats['matches_played'] > 0:
-            stats['avg_goals_for'] = stats['goals_for'] / stats['matches_played']
-            stats['avg_goals_against'] = stats['goals_against'] / stats['matches_played']
-            stats['avg_xg_for'] = stats['xg_for'] / stats['matches_played']
-            stats['avg_xg_against'] = stats['xg_against'] / stats['matches_played']
+        if not matches_file.exists():
+            logger.error(f"Arquivo de matches não encontrado: {matches_file}")
+            return {}
 
-        return stats
+        try:
+            table = self._load_table(matches_file, MatchTable)
+            return {team: dict(stats) for team, stats in table.team_stats(venue).items()}
+        except Exception as e:
+            logger.error(f"Erro ao calcular estatísticas dos times: {e}")
+            return {}
 
     def _get_odds_sport_key(self) -> Optional[str]:
         """
@@ -424,10 +583,10 @@ class HybridDataCollector:
         for file_type in ['matches', 'teams', 'standings']:
             file_path = self.csv_path / f'{self.season}_{file_type}.csv'
             if file_path.exists():
-                df = pd.read_csv(file_path)
+                builder = MatchTable if file_type == 'matches' else _records
                 info['files'][file_type] = {
                     'exists': True,
-                    'rows': len(df),
+                    'rows': len(self._load_table(file_path, builder)),
                     'last_modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
                 }
             else:
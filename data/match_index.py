@@ -0,0 +1,197 @@
+"""
+Índice de partidas da temporada
+
+Montado uma única vez a partir de uma busca da competição inteira na
+Football-Data.org (ou dos CSVs), indexa os jogos finalizados por time e por
+par de times (sem ordem). H2H, estatísticas e forma de qualquer time passam a
+ser respondidos da memória, sem uma requisição por par ou por time.
+"""
+
+import csv
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from data.collector import calculate_form, extract_h2h, summarize_team_stats
+
+TeamId = Hashable
+
+
+class MatchIndex:
+    """Partidas finalizadas indexadas por time e por confronto"""
+
+    def __init__(self, matches: Iterable[Dict]):
+        """
+        Inicializa o índice
+
+        Args:
+            matches: Partidas no formato da Football-Data.org (homeTeam,
+                awayTeam, score.fullTime, utcDate, status). Jogos sem placar
+                são ignorados.
+        """
+        finished = [
+            match for match in matches
+            if match.get('status', 'FINISHED') == 'FINISHED'
+            and match['score']['fullTime']['home'] is not None
+            and match['score']['fullTime']['away'] is not None
+        ]
+        # Ordem cronológica: a mesma das listas devolvidas pela API
+        finished.sort(key=lambda match: match.get('utcDate') or '')
+
+        self.matches: List[Dict] = finished
+        self._by_team: Dict[TeamId, List[Dict]] = defaultdict(list)
+        self._by_pair: Dict[Tuple, List[Dict]] = defaultdict(list)
+        self._team_names: Dict[TeamId, str] = {}
+
+        for match in finished:
+            home_id = match['homeTeam']['id']
+            away_id = match['awayTeam']['id']
+            self._by_team[home_id].append(match)
+            self._by_team[away_id].append(match)
+            self._by_pair[_pair_key(home_id, away_id)].append(match)
+            self._team_names[home_id] = match['homeTeam']['name']
+            self._team_names[away_id] = match['awayTeam']['name']
+
+    @classmethod
+    def from_api(cls, collector, league_code: str = "BSA", season: Optional[int] = None) -> 'MatchIndex':
+        """
+        Monta o índice com uma única requisição da competição inteira
+
+        Args:
+            collector: FootballDataCollector (cota, headers e base_url)
+            league_code: Código da competição
+            season: Temporada (padrão: atual)
+
+        Returns:
+            MatchIndex (vazio se a API falhar)
+        """
+        endpoint = f"{collector.base_url}/competitions/{league_code}/matches"
+        params = {'status': 'FINISHED'}
+        if season:
+            params['season'] = season
+
+        try:
+            response = collector._get(endpoint, params=params)
+            response.raise_for_status()
+            matches = response.json().get('matches', [])
+        except Exception as e:
+            print(f"Erro ao buscar partidas da competição {league_code}: {e}")
+            matches = []
+        return cls(matches)
+
+    @classmethod
+    def from_csv(
+        cls,
+        matches_csv: Union[str, Path],
+        team_ids: Optional[Dict[str, TeamId]] = None
+    ) -> 'MatchIndex':
+        """
+        Monta o índice a partir do CSV de partidas (formato data/csv/brasileirao)
+
+        Args:
+            matches_csv: Caminho do <temporada>_matches.csv
+            team_ids: Nome do time -> ID. Padrão: <temporada>_teams.csv ao lado
+                do arquivo, se existir; sem ID, o próprio nome é a chave.
+
+        Returns:
+            MatchIndex
+        """
+        matches_csv = Path(matches_csv)
+        if team_ids is None:
+            team_ids = _load_team_ids(matches_csv)
+
+        matches = []
+        with open(matches_csv, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                home_score = _to_int(row.get('home_score'))
+                away_score = _to_int(row.get('away_score'))
+                home_name = row['home_team']
+                away_name = row['away_team']
+                matches.append({
+                    'id': row.get('id'),
+                    'utcDate': row.get('date'),
+                    'matchday': _to_int(row.get('round')),
+                    'status': (row.get('status') or 'FINISHED').upper(),
+                    'homeTeam': {'id': team_ids.get(home_name, home_name), 'name': home_name},
+                    'awayTeam': {'id': team_ids.get(away_name, away_name), 'name': away_name},
+                    'score': {'fullTime': {'home': home_score, 'away': away_score}},
+                })
+        return cls(matches)
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def has_team(self, team_id: TeamId) -> bool:
+        """Se o time tem jogos finalizados no índice"""
+        return team_id in self._by_team
+
+    def team_name(self, team_id: TeamId) -> Optional[str]:
+        """Nome do time no índice"""
+        return self._team_names.get(team_id)
+
+    def team_matches(self, team_id: TeamId, limit: Optional[int] = 10) -> List[Dict]:
+        """
+        Últimos jogos finalizados de um time, em ordem cronológica
+
+        Args:
+            team_id: ID do time
+            limit: Número máximo de jogos (None = todos)
+
+        Returns:
+            Lista de partidas (formato da API)
+        """
+        matches = self._by_team.get(team_id, [])
+        return list(matches[-limit:]) if limit else list(matches)
+
+    def h2h(self, team1_id: TeamId, team2_id: TeamId, limit: int = 5) -> List[Dict]:
+        """
+        Confrontos diretos mais recentes (formato de FootballDataCollector.get_h2h)
+
+        Args:
+            team1_id: ID do primeiro time
+            team2_id: ID do segundo time
+            limit: Número de confrontos
+
+        Returns:
+            Lista com os confrontos, do mais recente para o mais antigo
+        """
+        pair = self._by_pair.get(_pair_key(team1_id, team2_id), [])
+        return extract_h2h(reversed(pair[-limit:]), team1_id, team2_id, limit)
+
+    def team_stats(self, team_id: TeamId, venue: str = "HOME", limit: int = 10) -> Optional[Dict]:
+        """
+        Estatísticas dos últimos jogos (formato de calculate_team_stats)
+
+        Returns:
+            Dict com estatísticas ou None se não houver jogos no mando
+        """
+        return summarize_team_stats(self.team_matches(team_id, limit), team_id, venue)
+
+    def form(self, team_id: TeamId, last: int = 5) -> str:
+        """Forma recente (W/D/L) dos últimos jogos"""
+        return calculate_form(self.team_matches(team_id, last), team_id)
+
+
+def _pair_key(team1_id: TeamId, team2_id: TeamId) -> Tuple:
+    # Par sem ordem; str() permite comparar IDs numéricos e nomes
+    return tuple(sorted((team1_id, team2_id), key=str))
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_team_ids(matches_csv: Path) -> Dict[str, TeamId]:
+    teams_csv = matches_csv.with_name(matches_csv.name.replace('_matches', '_teams'))
+    if teams_csv == matches_csv or not teams_csv.exists():
+        return {}
+
+    team_ids = {}
+    with open(teams_csv, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            if row.get('id') and row.get('name'):
+                team_ids[row['name']] = _to_int(row['id']) or row['id']
+    return team_ids
@@ -3,23 +3,107 @@ Coletor de Odds usando The Odds API
 Busca odds reais de casas de apostas
 """
 
-import requests
+import math
 import os
+import unicodedata
 from dotenv import load_dotenv
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from data.odds_matrix import OUTCOMES, OddsMatrix
+from data.odds_history import OddsHistoryStore, get_odds_history_store
+from utils.request_scheduler import INTERACTIVE, get_request_scheduler
+
 load_dotenv()
 
+# Importar cache
+try:
+    from utils.cache import odds_cache, get_cache_key_odds
+    CACHE_ENABLED = True
+except ImportError:
+    CACHE_ENABLED = False
+
+
+def normalize_team_name(name: str) -> str:
+    """Normaliza nome do time para comparação (sem acentos, minúsculo)"""
+    normalized = unicodedata.normalize('NFKD', name or '')
+    normalized = normalized.encode('ASCII', 'ignore').decode('ASCII')
+    return normalized.lower().strip()
+
+
+class OddsSnapshot:
+    """
+    Odds de uma liga coletadas uma única vez (1 requisição por rodada)
+    
+    Os jogos são indexados por (mandante, visitante) normalizados, então
+    cada consulta por partida é O(1) e não gera nova chamada à API.
+    """
+    
+    def __init__(
+        self,
+        sport_key: str,
+        events: List[Dict],
+        fetched_at: Optional[datetime] = None,
+        margin_method: str = 'proportional'
+    ):
+        self.sport_key = sport_key
+        self.events = events
+        self.fetched_at = fetched_at or datetime.now()
+        self.matrix = OddsMatrix.from_events(events)
+        self.processed = _process_matrix(self.matrix, margin_method)
+        self._index = {
+            (normalize_team_name(item['home_team']), normalize_team_name(item['away_team'])): item
+            for item in self.processed
+        }
+    
+    def get(self, home_team: str, away_team: str) -> Optional[Dict]:
+        """
+        Odds processadas de um jogo do snapshot
+        
+        Args:
+            home_team: Nome do time mandante
+            away_team: Nome do time visitante
+            
+        Returns:
+            Dict com odds do jogo ou None
+        """
+        return self._index.get((normalize_team_name(home_team), normalize_team_name(away_team)))
+    
+    def __len__(self) -> int:
+        return len(self.processed)
+
 class OddsCollector:
     """Coleta odds reais de casas de apostas"""
     
-    def __init__(self):
-        self.api_key = os.getenv("ODDS_API_KEY")
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        sport_key: str = "soccer_brazil_campeonato",
+        history_store: Optional[OddsHistoryStore] = None,
+        record_history: bool = True,
+        priority: str = INTERACTIVE
+    ):
+        self.api_key = api_key or os.getenv("ODDS_API_KEY")
         self.base_url = "https://api.the-odds-api.com/v4"
-        self.sport_key = "soccer_brazil_campeonato"  # Brasileirão
+        self.sport_key = sport_key  # Brasileirão por padrão
         self.regions = "us,uk,eu"  # Múltiplas regiões
         self.odds_format = "decimal"  # Formato decimal (ex: 2.50)
+        self.markets = "h2h,totals"  # 1X2 e Over/Under
+        
+        # Cota mensal medida em créditos: passa pelo agendador central
+        self.scheduler = get_request_scheduler()
+        self.priority = priority
+        
+        # Histórico append-only de cada coleta (movimento de linha)
+        self.record_history = record_history
+        self._history_store = history_store
+    
+    @property
+    def history_store(self) -> OddsHistoryStore:
+        """Store de histórico (global por padrão)"""
+        if self._history_store is None:
+            self._history_store = get_odds_history_store()
+        return self._history_store
     
     def get_upcoming_matches(self) -> List[Dict]:
         """
@@ -28,21 +112,45 @@ class OddsCollector:
         Returns:
             Lista de jogos com odds
         """
-        endpoint = f"{self.base_url}/sports/{self.sport_key}/odds"
+        return self.get_odds(self.sport_key)
+    
+    def get_odds(self, sport_key: Optional[str] = None) -> List[Dict]:
+        """
+        Busca odds brutas de todos os jogos de uma liga (1 requisição)
+        
+        Args:
+            sport_key: Sport key da The Odds API (padrão: self.sport_key)
+            
+        Returns:
+            Lista de jogos com odds no formato da API
+        """
+        endpoint = f"{self.base_url}/sports/{sport_key or self.sport_key}/odds"
         params = {
             'apiKey': self.api_key,
             'regions': self.regions,
             'oddsFormat': self.odds_format,
-            'markets': 'h2h,totals'  # 1X2 e Over/Under
+            'markets': self.markets
         }
+        # The Odds API cobra 1 crédito por mercado x região
+        cost = len(self.markets.split(',')) * len(self.regions.split(','))
         
         try:
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = self.scheduler.get(
+                'odds_api', endpoint, params=params, priority=self.priority, cost=cost
+            )
             response.raise_for_status()
-            return response.json()
+            events = response.json()
         except Exception as e:
             print(f"Erro ao buscar odds: {e}")
             return []
+        
+        if self.record_history and events:
+            try:
+                self.history_store.append_snapshot(sport_key or self.sport_key, events)
+            except Exception as e:
+                print(f"Erro ao gravar histórico de odds: {e}")
+        
+        return events
     
     def get_match_odds(
         self, 
@@ -59,22 +167,56 @@ class OddsCollector:
         Returns:
             Dict com odds do jogo ou None
         """
-        matches = self.get_upcoming_matches()
+        return self.get_snapshot().get(home_team, away_team)
+    
+    def get_snapshot(self, force_refresh: bool = False) -> OddsSnapshot:
+        """
+        Snapshot de odds da liga, coletado uma vez e reaproveitado via cache
+        
+        Args:
+            force_refresh: Ignorar o cache e buscar novamente na API
+            
+        Returns:
+            OddsSnapshot indexado por (mandante, visitante)
+        """
+        if CACHE_ENABLED and not force_refresh:
+            cached_snapshot = odds_cache.get(get_cache_key_odds(self.sport_key))
+            if cached_snapshot is not None:
+                return cached_snapshot
         
-        for match in matches:
-            if (self._normalize_team_name(match['home_team']) == self._normalize_team_name(home_team) and
-                self._normalize_team_name(match['away_team']) == self._normalize_team_name(away_team)):
-                return self._process_match_odds(match)
+        events = self.get_odds(self.sport_key)
+        snapshot = OddsSnapshot(self.sport_key, events)
         
-        return None
+        # Coletas vazias (erro ou sem jogos) não ficam no cache
+        if CACHE_ENABLED and events:
+            odds_cache.set(get_cache_key_odds(self.sport_key), snapshot)
+        
+        return snapshot
+    
+    def build_odds_matrix(self, matches: List[Dict]) -> OddsMatrix:
+        """
+        Monta a matriz (jogos x casas x resultados) de uma coleta
+        
+        Args:
+            matches: Jogos brutos retornados por get_odds()
+            
+        Returns:
+            OddsMatrix pronta para melhor preço, margem e arbitragem
+        """
+        return OddsMatrix.from_events(matches)
     
-    def _normalize_team_name(self, name: str) -> str:
-        """Normaliza nome do time para comparação"""
-        # Remover acentos e converter para minúsculas
-        import unicodedata
-        normalized = unicodedata.normalize('NFKD', name)
-        normalized = normalized.encode('ASCII', 'ignore').decode('ASCII')
-        return normalized.lower().strip()
+    def process_odds(self, matches: List[Dict], margin_method: str = 'proportional') -> List[Dict]:
+        """
+        Processa todos os jogos de uma coleta de uma só vez
+        
+        Args:
+            matches: Jogos brutos retornados por get_odds()
+            margin_method: Método de remoção de margem (proportional, shin, power)
+            
+        Returns:
+            Lista de odds processadas, com probabilidades justas e surebets
+        """
+        return _process_matrix(self.build_odds_matrix(matches), margin_method)
     
     def _process_match_odds(self, match: Dict) -> Dict:
         """
@@ -86,92 +228,7 @@ class OddsCollector:
         Returns:
             Dict com odds processadas
         """
-        result = {
-            'match_id': match['id'],
-            'home_team': match['home_team'],
-            'away_team': match['away_team'],
-            'commence_time': match['commence_time'],
-            'bookmakers': [],
-            'best_odds': {
-                'home_win': 0,
-                'draw': 0,
-                'away_win': 0,
-                'over_25': 0,
-                'under_25': 0
-            },
-            'average_odds': {
-                'home_win': 0,
-                'draw': 0,
-                'away_win': 0,
-                'over_25': 0,
-                'under_25': 0
-            }
-        }
-        
-        # Coletar odds de todas as casas
-        home_odds_list = []
-        draw_odds_list = []
-        away_odds_list = []
-        over_25_list = []
-        under_25_list = []
-        
-        for bookmaker in match.get('bookmakers', []):
-            bookmaker_data = {
-                'name': bookmaker['title'],
-                'last_update': bookmaker['last_update'],
-                'odds': {}
-            }
-            
-            # Processar mercado H2H (1X2)
-            for market in bookmaker.get('markets', []):
-                if market['key'] == 'h2h':
-                    for outcome in market['outcomes']:
-                        if outcome['name'] == match['home_team']:
-                            bookmaker_data['odds']['home_win'] = outcome['price']
-                            home_odds_list.append(outcome['price'])
-                        elif outcome['name'] == match['away_team']:
-                            bookmaker_data['odds']['away_win'] = outcome['price']
-                            away_odds_list.append(outcome['price'])
-                        else:  # Draw
-                            bookmaker_data['odds']['draw'] = outcome['price']
-                            draw_odds_list.append(outcome['price'])
-                
-                # Processar mercado Totals (Over/Under)
-                elif market['key'] == 'totals':
-                    for outcome in market['outcomes']:
-                        # Procurar Over/Under 2.5
-                        if outcome.get('point') == 2.5:
-                            if outcome['name'] == 'Over':
-                                bookmaker_data['odds']['over_25'] = outcome['price']
-                                over_25_list.append(outcome['price'])
-                            elif outcome['name'] == 'Under':
-                                bookmaker_data['odds']['under_25'] = outcome['price']
-                                under_25_list.append(outcome['price'])
-            
-            result['bookmakers'].append(bookmaker_data)
-        
-        # Calcular melhores odds (maiores valores)
-        if home_odds_list:
-            result['best_odds']['home_win'] = max(home_odds_list)
-            result['average_odds']['home_win'] = sum(home_odds_list) / len(home_odds_list)
-        
-        if draw_odds_list:
-            result['best_odds']['draw'] = max(draw_odds_list)
-            result['average_odds']['draw'] = sum(draw_odds_list) / len(draw_odds_list)
-        
-        if away_odds_list:
-            result['best_odds']['away_win'] = max(away_odds_list)
-            result['average_odds']['away_win'] = sum(away_odds_list) / len(away_odds_list)
-        
-        if over_25_list:
-            result['best_odds']['over_25'] = max(over_25_list)
-            result['average_odds']['over_25'] = sum(over_25_list) / len(over_25_list)
-        
-        if under_25_list:
-            result['best_odds']['under_25'] = max(under_25_list)
-            result['average_odds']['under_25'] = sum(under_25_list) / len(under_25_list)
-        
-        return result
+        return self.build_odds_matrix([match]).to_processed()[0]
     
     def convert_odds_to_probability(self, odds: float) -> float:
         """
@@ -237,7 +294,10 @@ class OddsCollector:
         params = {'apiKey': self.api_key}
         
         try:
-            response = requests.get(endpoint, params=params, timeout=10)
+            # /sports não consome créditos
+            response = self.scheduler.get(
+                'odds_api', endpoint, params=params, priority=self.priority, cost=0
+            )
             
             return {
                 'requests_remaining': response.headers.get('x-requests-remaining', 'N/A'),
@@ -249,6 +309,43 @@ class OddsCollector:
             return {}
 
 
+def _process_matrix(matrix: OddsMatrix, margin_method: str = 'proportional') -> List[Dict]:
+    """Odds processadas + probabilidades justas + surebets de toda a matriz"""
+    processed = matrix.to_processed()
+    fair = matrix.fair_probabilities(method=margin_method)
+    
+    arbitrage_by_match: Dict[str, List[Dict]] = {}
+    for opportunity in matrix.arbitrage_opportunities():
+        arbitrage_by_match.setdefault(opportunity['match_id'], []).append(opportunity)
+    
+    for idx, item in enumerate(processed):
+        item['fair_probabilities'] = {
+            outcome: (None if math.isnan(value) else float(value))
+            for outcome, value in zip(OUTCOMES, fair[idx])
+        }
+        item['arbitrage'] = arbitrage_by_match.get(item['match_id'], [])
+    
+    return processed
+
+
+_odds_collectors: Dict[str, 'OddsCollector'] = {}
+
+
+def get_odds_collector(sport_key: str = "soccer_brazil_campeonato") -> OddsCollector:
+    """
+    Obter instância compartilhada do OddsCollector de uma liga
+    
+    Args:
+        sport_key: Sport key da The Odds API
+        
+    Returns:
+        Instância do OddsCollector
+    """
+    if sport_key not in _odds_collectors:
+        _odds_collectors[sport_key] = OddsCollector(sport_key=sport_key)
+    return _odds_collectors[sport_key]
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     collector = OddsCollector()
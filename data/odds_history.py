@@ -0,0 +1,505 @@
+"""
+Histórico de odds em segmentos colunares comprimidos (somente append)
+
+Cada coleta da The Odds API vira um segmento .npz por mercado, particionado em
+<raiz>/<liga>/<AAAA-MM-DD>/<mercado>/. Dentro do segmento as linhas ficam
+ordenadas por (jogo, casa, timestamp). Cada partição tem o seu índice
+(index.jsonl) com jogos e intervalo de tempo de cada segmento, e a liga tem um
+manifesto pequeno (index.jsonl) com uma linha por partição criada. As consultas
+podam as partições pela data no manifesto, leem só os índices dessas partições
+e abrem apenas os segmentos que podem conter o jogo/intervalo pedido.
+
+Partições de dias encerrados são compactadas (compact()) em um único arquivo
+ordenado por (jogo, casa, timestamp); isso acontece automaticamente na primeira
+coleta de cada novo dia. O app e o daemon de pré-cálculo compartilham cache/:
+a compactação e os appends no índice de uma partição passam por um lock de
+arquivo (fcntl) para que dois processos não compactem a mesma partição. Sem
+fcntl (Windows) a compactação automática fica desligada.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data.odds_matrix import MARKETS, OUTCOMES, OddsMatrix
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+DEFAULT_HISTORY_DIR = Path(__file__).resolve().parent.parent / 'cache' / 'odds_history'
+
+KEY_COLUMNS = ('match_id', 'bookmaker', 'timestamp')
+META_COLUMNS = ('home_team', 'away_team', 'commence_time')
+
+DateLike = Union[str, date, datetime, None]
+
+# Lock entre processos de cada partição (compactação x append no índice)
+LOCK_FILE = '.lock'
+
+
+class OddsHistoryStore:
+    """Armazena e consulta snapshots de odds para análise de movimento de linha"""
+
+    def __init__(self, root_dir: Optional[Union[str, Path]] = None):
+        """
+        Inicializa o store
+
+        Args:
+            root_dir: Diretório raiz do histórico (padrão: cache/odds_history)
+        """
+        self.root_dir = Path(root_dir) if root_dir else DEFAULT_HISTORY_DIR
+
+    def append_snapshot(
+        self,
+        league: str,
+        events: List[Dict],
+        fetched_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Grava um snapshot de odds (resposta bruta da API)
+
+        Args:
+            league: Identificador da liga (partição)
+            events: Jogos no formato da The Odds API
+            fetched_at: Momento da coleta (padrão: agora, UTC)
+
+        Returns:
+            Número de linhas (jogo x casa x mercado) gravadas
+        """
+        matrix = OddsMatrix.from_events(events)
+        return self.append_matrix(league, matrix, fetched_at)
+
+    def append_matrix(
+        self,
+        league: str,
+        matrix: OddsMatrix,
+        fetched_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Grava uma OddsMatrix já montada
+
+        Args:
+            league: Identificador da liga (partição)
+            matrix: Matriz de odds da coleta
+            fetched_at: Momento da coleta (padrão: agora, UTC)
+
+        Returns:
+            Número de linhas gravadas
+        """
+        fetched_at = _as_utc(fetched_at or datetime.now(timezone.utc))
+        timestamp = int(fetched_at.timestamp())
+        partition_date = fetched_at.date().isoformat()
+        written = 0
+        new_partition = False
+
+        for market, columns in MARKETS.items():
+            prices = matrix.prices[:, :, columns]
+            # Linha existe quando a casa cota ao menos um resultado do mercado
+            match_idx, book_idx = np.nonzero(~np.all(np.isnan(prices), axis=2))
+            if match_idx.size == 0:
+                continue
+
+            segment = {
+                'match_id': np.array([str(matrix.matches[i]['match_id']) for i in match_idx]),
+                'bookmaker': np.array([matrix.bookmakers[j] for j in book_idx]),
+                'timestamp': np.full(match_idx.size, timestamp, dtype=np.int64),
+                'home_team': np.array([str(matrix.matches[i]['home_team']) for i in match_idx]),
+                'away_team': np.array([str(matrix.matches[i]['away_team']) for i in match_idx]),
+                'commence_time': np.array([str(matrix.matches[i]['commence_time']) for i in match_idx]),
+            }
+            market_prices = prices[match_idx, book_idx].astype(np.float32)
+            for offset, outcome_idx in enumerate(columns):
+                segment[OUTCOMES[outcome_idx]] = market_prices[:, offset]
+
+            order = np.lexsort((segment['timestamp'], segment['bookmaker'], segment['match_id']))
+            segment = {name: values[order] for name, values in segment.items()}
+
+            index_path = self._partition_index_path(league, partition_date, market)
+            if not index_path.exists():
+                new_partition = True
+                self._append_jsonl(self._manifest_path(league), {'date': partition_date, 'market': market})
+
+            path = self._write_segment(league, partition_date, market, f'seg-{timestamp}', segment)
+            with self._partition_lock(league, partition_date, market):
+                self._append_jsonl(index_path, {
+                    'path': str(path.relative_to(self.root_dir)),
+                    'ts_min': timestamp,
+                    'ts_max': timestamp,
+                    'rows': int(match_idx.size),
+                    'matches': sorted(set(segment['match_id'].tolist())),
+                })
+            written += int(match_idx.size)
+
+        logger.debug(f"Snapshot de odds gravado: {league} ({written} linhas)")
+
+        if new_partition and FCNTL_AVAILABLE:
+            # Primeira coleta do dia: compacta os dias anteriores
+            try:
+                self.compact(league, before=partition_date)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Falha ao compactar o histórico de odds de {league}: {e}")
+        return written
+
+    def compact(self, league: str, before: DateLike = None) -> int:
+        """
+        Junta os segmentos de cada partição anterior a `before` em um único arquivo
+
+        Args:
+            league: Liga
+            before: Data limite, exclusiva (padrão: hoje, UTC)
+
+        Returns:
+            Número de partições compactadas
+        """
+        cutoff = _to_timestamp(before or datetime.now(timezone.utc).date(), end_of_day=False)
+        compacted = 0
+        for market in MARKETS:
+            for partition_date in self._partitions(league, market, None, cutoff - 1):
+                if self._compact_partition(league, partition_date, market):
+                    compacted += 1
+        if compacted:
+            logger.info(f"Histórico de odds de {league}: {compacted} partições compactadas")
+        return compacted
+
+    def index_files(self, league: str) -> List[Path]:
+        """
+        Arquivos de índice que mudam a cada coleta (manifesto e partições mais recentes)
+
+        Úteis para detectar novas odds pela versão do arquivo (mtime/tamanho).
+        """
+        manifest = self._manifest_path(league)
+        dates = sorted({entry['date'] for entry in self._read_jsonl(manifest)})
+        paths = [manifest]
+        if dates:
+            paths.extend(self._partition_index_path(league, dates[-1], market) for market in MARKETS)
+        return paths
+
+    def iter_segments(
+        self,
+        league: str,
+        market: str,
+        start: DateLike = None,
+        end: DateLike = None,
+        match_id: Optional[str] = None,
+        bookmaker: Optional[str] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Percorre, segmento a segmento, as observações de um intervalo
+
+        Args:
+            league: Liga
+            market: '1x2' ou 'over_under_25'
+            start: Início do intervalo (data ou datetime, inclusivo)
+            end: Fim do intervalo (data ou datetime, inclusivo)
+            match_id: Filtrar por jogo
+            bookmaker: Filtrar por casa
+
+        Yields:
+            DataFrame com as observações de cada segmento
+        """
+        if market not in MARKETS:
+            raise ValueError(f"Mercado inválido: {market}. Opções: {list(MARKETS)}")
+
+        ts_start = _to_timestamp(start, end_of_day=False)
+        ts_end = _to_timestamp(end, end_of_day=True)
+        match_id = None if match_id is None else str(match_id)
+
+        for partition_date in self._partitions(league, market, ts_start, ts_end):
+            yield from self._read_partition(league, partition_date, market, ts_start, ts_end,
+                                            match_id, bookmaker)
+
+    def query(self, league: str, market: str, start: DateLike = None, end: DateLike = None,
+              match_id: Optional[str] = None, bookmaker: Optional[str] = None) -> pd.DataFrame:
+        """
+        Observações de um intervalo em um único DataFrame
+
+        Use iter_segments() para intervalos grandes.
+
+        Returns:
+            DataFrame ordenado por (match_id, bookmaker, timestamp)
+        """
+        frames = list(self.iter_segments(league, market, start, end, match_id, bookmaker))
+        if not frames:
+            return self._empty_frame(market)
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values(list(KEY_COLUMNS), kind='stable').reset_index(drop=True)
+
+    def opening_odds(self, league: str, market: str, start: DateLike = None,
+                     end: DateLike = None) -> pd.DataFrame:
+        """
+        Primeira cotação de cada (jogo, casa) no intervalo
+
+        Returns:
+            DataFrame com uma linha por (match_id, bookmaker)
+        """
+        return self._extreme_odds(league, market, start, end, opening=True)
+
+    def closing_odds(self, league: str, market: str, start: DateLike = None,
+                     end: DateLike = None) -> pd.DataFrame:
+        """
+        Última cotação de cada (jogo, casa) no intervalo
+
+        Returns:
+            DataFrame com uma linha por (match_id, bookmaker)
+        """
+        return self._extreme_odds(league, market, start, end, opening=False)
+
+    def movement(self, league: str, match_id: str, market: str = '1x2',
+                 bookmaker: Optional[str] = None) -> pd.DataFrame:
+        """
+        Série temporal das odds de um jogo
+
+        Args:
+            league: Liga
+            match_id: ID do jogo na The Odds API
+            market: Mercado
+            bookmaker: Filtrar por casa (padrão: todas)
+
+        Returns:
+            DataFrame com timestamp em datetime UTC e variação desde a abertura
+        """
+        df = self.query(league, market, match_id=match_id, bookmaker=bookmaker)
+        if df.empty:
+            return df
+
+        df['fetched_at'] = pd.to_datetime(df['timestamp'], unit='s', utc=True)
+        outcomes = _market_outcomes(market)
+        opening = df.groupby('bookmaker')[outcomes].transform('first')
+        for outcome in outcomes:
+            df[f'{outcome}_change'] = df[outcome] - opening[outcome]
+        return df
+
+    def _extreme_odds(self, league, market, start, end, opening: bool) -> pd.DataFrame:
+        # Segmentos já vêm ordenados por (jogo, casa, timestamp): reduz cada um a uma
+        # linha por (jogo, casa) e ordena/concatena uma única vez no final
+        keep = 'first' if opening else 'last'
+        reduced = [
+            frame.drop_duplicates(['match_id', 'bookmaker'], keep=keep)
+            for frame in self.iter_segments(league, market, start, end)
+        ]
+        if not reduced:
+            return self._empty_frame(market)
+
+        combined = pd.concat(reduced, ignore_index=True).sort_values('timestamp', kind='stable')
+        best = combined.drop_duplicates(['match_id', 'bookmaker'], keep=keep)
+        return best.sort_values(['match_id', 'bookmaker']).reset_index(drop=True)
+
+    def _partitions(self, league: str, market: str, ts_start: Optional[int],
+                    ts_end: Optional[int]) -> List[str]:
+        # Datas do mercado no manifesto, podadas pelo intervalo pedido
+        dates = set()
+        for entry in self._read_jsonl(self._manifest_path(league)):
+            if entry['market'] != market:
+                continue
+            day_start = _to_timestamp(entry['date'], end_of_day=False)
+            if ts_end is not None and day_start > ts_end:
+                continue
+            if ts_start is not None and day_start + 86399 < ts_start:
+                continue
+            dates.add(entry['date'])
+        return sorted(dates)
+
+    def _read_partition(self, league: str, partition_date: str, market: str, ts_start: Optional[int],
+                        ts_end: Optional[int], match_id: Optional[str],
+                        bookmaker: Optional[str]) -> List[pd.DataFrame]:
+        index_path = self._partition_index_path(league, partition_date, market)
+        for attempt in range(2):
+            try:
+                frames = []
+                for entry in self._read_jsonl(index_path):
+                    if ts_start is not None and entry['ts_max'] < ts_start:
+                        continue
+                    if ts_end is not None and entry['ts_min'] > ts_end:
+                        continue
+                    if match_id is not None and match_id not in entry['matches']:
+                        continue
+                    frame = self._load_segment(entry['path'], ts_start, ts_end, match_id, bookmaker)
+                    if frame is not None:
+                        frames.append(frame)
+                return frames
+            except FileNotFoundError:
+                # Uma compactação concorrente trocou os segmentos: relê o índice da partição
+                if attempt:
+                    raise
+        return []
+
+    def _load_segment(self, relative_path: str, ts_start: Optional[int], ts_end: Optional[int],
+                      match_id: Optional[str], bookmaker: Optional[str]) -> Optional[pd.DataFrame]:
+        with np.load(self.root_dir / relative_path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in data.files}
+
+        mask = np.ones(columns['timestamp'].size, dtype=bool)
+        if match_id is not None:
+            # Linhas ordenadas por jogo: busca binária em vez de varredura
+            lo = np.searchsorted(columns['match_id'], match_id, side='left')
+            hi = np.searchsorted(columns['match_id'], match_id, side='right')
+            mask[:] = False
+            mask[lo:hi] = True
+        if bookmaker is not None:
+            mask &= columns['bookmaker'] == bookmaker
+        if ts_start is not None:
+            mask &= columns['timestamp'] >= ts_start
+        if ts_end is not None:
+            mask &= columns['timestamp'] <= ts_end
+
+        if not mask.any():
+            return None
+        return pd.DataFrame({name: values[mask] for name, values in columns.items()})
+
+    def _compact_partition(self, league: str, partition_date: str, market: str) -> bool:
+        # Outro processo compactando a mesma partição: espera e relê o índice já compactado
+        with self._partition_lock(league, partition_date, market):
+            return self._compact_partition_locked(league, partition_date, market)
+
+    def _compact_partition_locked(self, league: str, partition_date: str, market: str) -> bool:
+        index_path = self._partition_index_path(league, partition_date, market)
+        entries = list(self._read_jsonl(index_path))
+        if len(entries) <= 1:
+            return False
+
+        parts = []
+        for entry in entries:
+            with np.load(self.root_dir / entry['path'], allow_pickle=False) as data:
+                parts.append({name: data[name] for name in data.files})
+        segment = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        order = np.lexsort((segment['timestamp'], segment['bookmaker'], segment['match_id']))
+        segment = {name: values[order] for name, values in segment.items()}
+
+        path = self._write_segment(league, partition_date, market, 'part', segment)
+        merged = {
+            'path': str(path.relative_to(self.root_dir)),
+            'ts_min': min(entry['ts_min'] for entry in entries),
+            'ts_max': max(entry['ts_max'] for entry in entries),
+            'rows': int(order.size),
+            'matches': sorted({match for entry in entries for match in entry['matches']}),
+        }
+
+        self._write_jsonl(index_path, [merged])
+        for entry in entries:
+            (self.root_dir / entry['path']).unlink(missing_ok=True)
+        return True
+
+    def _write_segment(self, league: str, partition_date: str, market: str,
+                       prefix: str, segment: Dict[str, np.ndarray]) -> Path:
+        directory = self.root_dir / league / partition_date / market
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{prefix}-{os.getpid()}-{datetime.now().strftime("%f")}.npz'
+
+        # Escrita atômica: arquivo temporário + rename
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                np.savez_compressed(handle, **segment)
+            os.replace(tmp_name, path)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return path
+
+    @contextmanager
+    def _partition_lock(self, league: str, partition_date: str, market: str) -> Iterator[None]:
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        directory = self.root_dir / league / partition_date / market
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / LOCK_FILE, 'a') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _manifest_path(self, league: str) -> Path:
+        return self.root_dir / league / 'index.jsonl'
+
+    def _partition_index_path(self, league: str, partition_date: str, market: str) -> Path:
+        return self.root_dir / league / partition_date / market / 'index.jsonl'
+
+    @staticmethod
+    def _append_jsonl(path: Path, entry: Dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps(entry) + '\n')
+
+    @staticmethod
+    def _write_jsonl(path: Path, entries: List[Dict]) -> None:
+        # Reescrita atômica (compactação)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                handle.writelines(json.dumps(entry) + '\n' for entry in entries)
+            os.replace(tmp_name, path)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    @staticmethod
+    def _read_jsonl(path: Path) -> Iterator[Dict]:
+        if not path.exists():
+            return
+        with open(path, 'r', encoding='utf-8') as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    @staticmethod
+    def _empty_frame(market: str) -> pd.DataFrame:
+        return pd.DataFrame(columns=list(KEY_COLUMNS) + list(META_COLUMNS) + _market_outcomes(market))
+
+
+def _market_outcomes(market: str) -> List[str]:
+    return [OUTCOMES[idx] for idx in MARKETS[market]]
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _to_timestamp(value: DateLike, end_of_day: bool) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if 'T' in value or ' ' in value else date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return int(_as_utc(value).timestamp())
+    moment = datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if end_of_day:
+        return int(moment.timestamp()) + 86399
+    return int(moment.timestamp())
+
+
+_history_store = None
+
+
+def get_odds_history_store() -> OddsHistoryStore:
+    """
+    Obter instância global do histórico de odds
+
+    O diretório pode ser definido pela variável ODDS_HISTORY_DIR.
+
+    Returns:
+        Instância do OddsHistoryStore
+    """
+    global _history_store
+    if _history_store is None:
+        _history_store = OddsHistoryStore(os.getenv('ODDS_HISTORY_DIR') or None)
+    return _history_store
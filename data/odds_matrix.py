@@ -0,0 +1,385 @@
+"""
+Matriz densa de odds (jogos x casas x resultados)
+Construída uma vez por coleta da The Odds API e usada para melhor preço,
+remoção de margem e varredura de arbitragem com reduções vetorizadas
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Ordem fixa dos resultados no último eixo da matriz
+OUTCOMES: Tuple[str, ...] = ('home_win', 'draw', 'away_win', 'over_25', 'under_25')
+OUTCOME_INDEX: Dict[str, int] = {name: idx for idx, name in enumerate(OUTCOMES)}
+
+# Grupos de resultados mutuamente exclusivos (cada grupo é um mercado)
+MARKETS: Dict[str, Tuple[int, ...]] = {
+    '1x2': (0, 1, 2),
+    'over_under_25': (3, 4),
+}
+
+MARGIN_METHODS = ('proportional', 'shin', 'power')
+
+_SHIN_MAX_ITER = 1000
+_POWER_MAX_ITER = 50
+_TOLERANCE = 1e-12
+
+
+@dataclass
+class OddsMatrix:
+    """
+    Odds de vários jogos e casas em um único array
+
+    Attributes:
+        matches: Metadados de cada jogo (id, times, horário)
+        bookmakers: Nomes das casas, na ordem do segundo eixo
+        prices: Array (jogos x casas x resultados); NaN = sem cotação
+        last_updates: Array (jogos x casas) com o last_update de cada casa
+        listed: Array (jogos x casas) indicando se a casa aparece no jogo
+    """
+
+    matches: List[Dict]
+    bookmakers: List[str]
+    prices: np.ndarray
+    last_updates: Optional[np.ndarray] = None
+    listed: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        if self.last_updates is None:
+            self.last_updates = np.full(self.prices.shape[:2], None, dtype=object)
+        if self.listed is None:
+            self.listed = ~np.all(np.isnan(self.prices), axis=2)
+        self._match_positions = {
+            match['match_id']: idx for idx, match in enumerate(self.matches)
+        }
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict]) -> 'OddsMatrix':
+        """
+        Constrói a matriz a partir da resposta bruta de /sports/{sport}/odds
+
+        Args:
+            events: Lista de jogos no formato da The Odds API
+
+        Returns:
+            OddsMatrix com todas as casas presentes nos jogos
+        """
+        events = list(events or [])
+        bookmaker_positions: Dict[str, int] = {}
+        entries = []
+        matches = []
+
+        for match_idx, event in enumerate(events):
+            home_team = event.get('home_team')
+            away_team = event.get('away_team')
+            matches.append({
+                'match_id': event.get('id'),
+                'home_team': home_team,
+                'away_team': away_team,
+                'commence_time': event.get('commence_time'),
+            })
+
+            for bookmaker in event.get('bookmakers', []):
+                name = bookmaker.get('title') or bookmaker.get('key')
+                book_idx = bookmaker_positions.setdefault(name, len(bookmaker_positions))
+                entries.append((match_idx, book_idx, None, bookmaker.get('last_update')))
+
+                for market in bookmaker.get('markets', []):
+                    key = market.get('key')
+                    for outcome in market.get('outcomes', []):
+                        outcome_idx = _outcome_index(key, outcome, home_team, away_team)
+                        if outcome_idx is not None:
+                            entries.append((match_idx, book_idx, outcome_idx, outcome.get('price')))
+
+        prices = np.full((len(matches), len(bookmaker_positions), len(OUTCOMES)), np.nan)
+        last_updates = np.full((len(matches), len(bookmaker_positions)), None, dtype=object)
+        listed = np.zeros((len(matches), len(bookmaker_positions)), dtype=bool)
+
+        for match_idx, book_idx, outcome_idx, value in entries:
+            if outcome_idx is None:
+                last_updates[match_idx, book_idx] = value
+                listed[match_idx, book_idx] = True
+            elif value is not None:
+                prices[match_idx, book_idx, outcome_idx] = float(value)
+
+        # Odds <= 1 não são cotações válidas
+        prices[prices <= 1.0] = np.nan
+
+        return cls(
+            matches=matches,
+            bookmakers=list(bookmaker_positions),
+            prices=prices,
+            last_updates=last_updates,
+            listed=listed,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.prices.shape
+
+    def index_of(self, match_id) -> Optional[int]:
+        """Posição do jogo na matriz ou None"""
+        return self._match_positions.get(match_id)
+
+    def best_odds(self) -> np.ndarray:
+        """
+        Melhor odd por jogo e resultado
+
+        Returns:
+            Array (jogos x resultados); 0 quando nenhuma casa cota
+        """
+        return _nan_reduce(np.nanmax, self.prices)
+
+    def best_bookmakers(self) -> np.ndarray:
+        """
+        Índice da casa com a melhor odd por jogo e resultado
+
+        Returns:
+            Array (jogos x resultados) de inteiros; -1 quando não há cotação
+        """
+        if self.prices.size == 0:
+            return np.full((self.prices.shape[0], len(OUTCOMES)), -1, dtype=int)
+        filled = np.where(np.isnan(self.prices), -np.inf, self.prices)
+        best = filled.argmax(axis=1)
+        best[np.isneginf(filled.max(axis=1))] = -1
+        return best
+
+    def average_odds(self) -> np.ndarray:
+        """
+        Odd média por jogo e resultado
+
+        Returns:
+            Array (jogos x resultados); 0 quando nenhuma casa cota
+        """
+        return _nan_reduce(np.nanmean, self.prices)
+
+    def overround(self, source: str = 'average') -> Dict[str, np.ndarray]:
+        """
+        Soma das probabilidades implícitas por mercado (1.0 = sem margem)
+
+        Args:
+            source: 'average' ou 'best'
+
+        Returns:
+            Dict mercado -> array (jogos,)
+        """
+        odds = self._source_odds(source)
+        result = {}
+        for market, columns in MARKETS.items():
+            with np.errstate(divide='ignore'):
+                implied = np.where(odds[:, columns] > 0, 1.0 / odds[:, columns], np.nan)
+            result[market] = implied.sum(axis=1)
+        return result
+
+    def fair_probabilities(self, method: str = 'proportional', source: str = 'average') -> np.ndarray:
+        """
+        Probabilidades sem margem para todos os jogos e mercados
+
+        Args:
+            method: 'proportional', 'shin' ou 'power'
+            source: Odds usadas como base ('average' ou 'best')
+
+        Returns:
+            Array (jogos x resultados); NaN onde o mercado está incompleto
+        """
+        odds = self._source_odds(source)
+        probs = np.full(odds.shape, np.nan)
+        for columns in MARKETS.values():
+            market_odds = np.where(odds[:, columns] > 0, odds[:, columns], np.nan)
+            probs[:, columns] = remove_margin(market_odds, method=method)
+        return probs
+
+    def arbitrage_opportunities(self, min_profit: float = 0.0) -> List[Dict]:
+        """
+        Varre todos os jogos em busca de surebets entre casas diferentes
+
+        Uma arbitragem existe quando a soma de 1/melhor_odd de um mercado é
+        menor que 1; o lucro garantido é 1/soma - 1.
+
+        Args:
+            min_profit: Lucro mínimo (fração) para reportar a oportunidade
+
+        Returns:
+            Lista de oportunidades ordenada por lucro (maior primeiro)
+        """
+        best = self.best_odds()
+        best_books = self.best_bookmakers()
+        opportunities = []
+
+        for market, columns in MARKETS.items():
+            market_best = best[:, columns]
+            complete = np.all(market_best > 0, axis=1)
+            with np.errstate(divide='ignore'):
+                implied = np.where(market_best > 0, 1.0 / market_best, np.nan)
+            total = implied.sum(axis=1)
+            profit = np.where(complete, 1.0 / total - 1.0, -np.inf)
+
+            for match_idx in np.flatnonzero(profit > min_profit):
+                match = self.matches[match_idx]
+                stakes = implied[match_idx] / total[match_idx]
+                legs = {}
+                for offset, outcome_idx in enumerate(columns):
+                    legs[OUTCOMES[outcome_idx]] = {
+                        'bookmaker': self.bookmakers[best_books[match_idx, outcome_idx]],
+                        'odds': float(market_best[match_idx, offset]),
+                        'stake_fraction': float(stakes[offset]),
+                    }
+                opportunities.append({
+                    'match_id': match['match_id'],
+                    'home_team': match['home_team'],
+                    'away_team': match['away_team'],
+                    'market': market,
+                    'implied_total': float(total[match_idx]),
+                    'profit': float(profit[match_idx]),
+                    'legs': legs,
+                })
+
+        opportunities.sort(key=lambda item: item['profit'], reverse=True)
+        return opportunities
+
+    def to_processed(self) -> List[Dict]:
+        """
+        Converte a matriz no formato de OddsCollector._process_match_odds
+
+        Returns:
+            Lista de dicts (um por jogo) com bookmakers, best_odds e average_odds
+        """
+        best = self.best_odds()
+        average = self.average_odds()
+        present = ~np.isnan(self.prices)
+
+        processed = []
+        for match_idx, match in enumerate(self.matches):
+            bookmakers = []
+            for book_idx in np.flatnonzero(self.listed[match_idx]):
+                outcome_ids = np.flatnonzero(present[match_idx, book_idx])
+                bookmakers.append({
+                    'name': self.bookmakers[book_idx],
+                    'last_update': self.last_updates[match_idx, book_idx],
+                    'odds': {
+                        OUTCOMES[idx]: float(self.prices[match_idx, book_idx, idx])
+                        for idx in outcome_ids
+                    },
+                })
+
+            processed.append({
+                'match_id': match['match_id'],
+                'home_team': match['home_team'],
+                'away_team': match['away_team'],
+                'commence_time': match['commence_time'],
+                'bookmakers': bookmakers,
+                'best_odds': _outcome_dict(best[match_idx]),
+                'average_odds': _outcome_dict(average[match_idx]),
+            })
+
+        return processed
+
+    def _source_odds(self, source: str) -> np.ndarray:
+        if source == 'best':
+            return self.best_odds()
+        if source == 'average':
+            return self.average_odds()
+        raise ValueError(f"Fonte de odds inválida: {source}. Use 'average' ou 'best'")
+
+
+def remove_margin(odds: np.ndarray, method: str = 'proportional') -> np.ndarray:
+    """
+    Remove a margem da casa de um mercado (último eixo = resultados)
+
+    Args:
+        odds: Array (..., k) de odds decimais; NaN marca cotação ausente
+        method: 'proportional', 'shin' ou 'power'
+
+    Returns:
+        Array (..., k) de probabilidades somando 1; NaN onde faltam odds
+    """
+    odds = np.asarray(odds, dtype=float)
+    if method not in MARGIN_METHODS:
+        raise ValueError(f"Método inválido: {method}. Opções: {MARGIN_METHODS}")
+
+    implied = 1.0 / odds
+    valid = np.all(np.isfinite(implied), axis=-1, keepdims=True)
+    implied = np.where(valid, implied, 1.0 / implied.shape[-1] if implied.shape[-1] else 0.0)
+
+    if method == 'proportional':
+        probs = implied / implied.sum(axis=-1, keepdims=True)
+    elif method == 'shin':
+        probs = _shin(implied)
+    else:
+        probs = _power(implied)
+
+    return np.where(valid, probs, np.nan)
+
+
+def _shin(implied: np.ndarray) -> np.ndarray:
+    """Método de Shin (proporção z de apostadores informados)"""
+    n_outcomes = implied.shape[-1]
+    booksum = implied.sum(axis=-1, keepdims=True)
+
+    if n_outcomes == 2:
+        # Solução fechada para mercados de dois resultados
+        diff = implied[..., :1] - implied[..., 1:]
+        diff_sq = diff ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = ((booksum - 1) * (diff_sq - booksum)) / (booksum * (diff_sq - 1))
+        z = np.nan_to_num(z, nan=0.0)
+    else:
+        z = np.zeros_like(booksum)
+        for _ in range(_SHIN_MAX_ITER):
+            root = np.sqrt(z ** 2 + 4 * (1 - z) * implied ** 2 / booksum)
+            new_z = (root.sum(axis=-1, keepdims=True) - 2) / (n_outcomes - 2)
+            if np.all(np.abs(new_z - z) < _TOLERANCE):
+                z = new_z
+                break
+            z = new_z
+
+    probs = (np.sqrt(z ** 2 + 4 * (1 - z) * implied ** 2 / booksum) - z) / (2 * (1 - z))
+    # Normalização final elimina o resíduo numérico da iteração
+    return probs / probs.sum(axis=-1, keepdims=True)
+
+
+def _power(implied: np.ndarray) -> np.ndarray:
+    """Método da potência: encontra k tal que sum(q_i ** k) = 1 (Newton)"""
+    k = np.ones(implied.shape[:-1] + (1,))
+    log_implied = np.log(implied)
+    for _ in range(_POWER_MAX_ITER):
+        powered = implied ** k
+        f = powered.sum(axis=-1, keepdims=True) - 1
+        df = (powered * log_implied).sum(axis=-1, keepdims=True)
+        step = np.divide(f, df, out=np.zeros_like(f), where=df != 0)
+        k = k - step
+        if np.all(np.abs(step) < _TOLERANCE):
+            break
+    probs = implied ** k
+    return probs / probs.sum(axis=-1, keepdims=True)
+
+
+def _outcome_index(market_key: str, outcome: Dict, home_team: str, away_team: str) -> Optional[int]:
+    name = outcome.get('name')
+    if market_key == 'h2h':
+        if name == home_team:
+            return OUTCOME_INDEX['home_win']
+        if name == away_team:
+            return OUTCOME_INDEX['away_win']
+        return OUTCOME_INDEX['draw']
+    if market_key == 'totals' and outcome.get('point') == 2.5:
+        if name == 'Over':
+            return OUTCOME_INDEX['over_25']
+        if name == 'Under':
+            return OUTCOME_INDEX['under_25']
+    return None
+
+
+def _nan_reduce(func, prices: np.ndarray) -> np.ndarray:
+    if prices.shape[1] == 0:
+        return np.zeros((prices.shape[0], prices.shape[2]))
+    empty = np.all(np.isnan(prices), axis=1)
+    with np.errstate(all='ignore'):
+        filled = np.where(empty[:, None, :], 0.0, prices)
+        reduced = func(filled, axis=1)
+    return np.where(empty, 0.0, reduced)
+
+
+def _outcome_dict(values: np.ndarray) -> Dict[str, float]:
+    return {name: float(values[idx]) for idx, name in enumerate(OUTCOMES)}
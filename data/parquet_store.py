@@ -0,0 +1,235 @@
+"""
+Armazenamento colunar opcional (Parquet) para os CSV das ligas
+
+Os CSV em data/csv/<liga>/<temporada>_<tipo>.csv continuam sendo o formato de
+troca. Quando o pyarrow está instalado, scripts/update_csv_from_api.py grava
+também uma cópia tipada em Parquet, particionada por temporada:
+
+    data/parquet/<liga>/<tipo>/season=<temporada>/data.parquet
+
+Jogos são gravados com um row group por rodada, então ler uma rodada (ou só
+algumas colunas) não decodifica o arquivo inteiro. Só filtros na coluna de
+rodada pulam row groups; filtros em outras colunas (ex.: time) são aplicados
+depois da leitura. read_frame escolhe a fonte: Parquet se existir e for pelo
+menos tão novo quanto o CSV; senão, o próprio CSV com os mesmos filtros
+aplicados em pandas. round_filter diz aos loaders de rodada quando vale a pena
+ler só a rodada pedida.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Colunas de rodada usadas para separar row groups (Brasileirão / FootyStats)
+ROUND_COLUMNS = ('round', 'Game Week')
+
+# Filtro no formato do pyarrow: (coluna, operador, valor)
+Filter = Tuple[str, str, Any]
+
+
+def parquet_enabled() -> bool:
+    """Parquet disponível (pyarrow instalado) e não desativado por PARQUET_ENABLED=0"""
+    if not PARQUET_AVAILABLE:
+        return False
+    return os.getenv('PARQUET_ENABLED', '1').lower() not in ('0', 'false', 'no')
+
+
+def parquet_path_for(csv_file: Path) -> Path:
+    """
+    Caminho do Parquet correspondente a um CSV de liga
+
+    data/csv/<liga>/<temporada>_<tipo>.csv -> data/parquet/<liga>/<tipo>/season=<temporada>/data.parquet
+    """
+    csv_file = Path(csv_file)
+    season, _, kind = csv_file.stem.partition('_')
+    league_dir = csv_file.parent
+    return league_dir.parent.parent / 'parquet' / league_dir.name / (kind or 'data') / f'season={season}' / 'data.parquet'
+
+
+def write_parquet(df: pd.DataFrame, csv_file: Path) -> Optional[Path]:
+    """
+    Grava a cópia Parquet de um CSV recém-salvo
+
+    Args:
+        df: Dados gravados no CSV
+        csv_file: Caminho do CSV (define liga, tipo e temporada)
+
+    Returns:
+        Caminho do Parquet ou None se o Parquet estiver indisponível
+    """
+    if not parquet_enabled():
+        return None
+
+    path = parquet_path_for(csv_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame = _typed(df)
+
+    round_column = next((c for c in ROUND_COLUMNS if c in frame.columns), None)
+    tmp_path = path.with_suffix('.tmp')
+    try:
+        if round_column is None:
+            pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path)
+        else:
+            # Um row group por rodada: estatísticas min/max permitem pular o resto
+            frame = frame.sort_values(round_column, kind='stable')
+            schema = pa.Schema.from_pandas(frame, preserve_index=False)
+            with pq.ParquetWriter(tmp_path, schema) as writer:
+                for _, group in frame.groupby(round_column, sort=True, dropna=False):
+                    writer.write_table(pa.Table.from_pandas(group, schema=schema, preserve_index=False))
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"Não foi possível gravar Parquet {path}: {e}")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return None
+
+    logger.info(f"Parquet salvo: {len(frame)} linhas em {path}")
+    return path
+
+
+def export_csv(csv_file: Path) -> Optional[Path]:
+    """
+    Converte um CSV de liga para Parquet
+
+    Os tipos são os mesmos que pandas infere ao ler o CSV, de modo que os
+    loaders recebem os mesmos dados vindos de qualquer uma das fontes.
+
+    Returns:
+        Caminho do Parquet ou None se indisponível
+    """
+    if not parquet_enabled():
+        return None
+    return write_parquet(pd.read_csv(csv_file), csv_file)
+
+
+def read_frame(
+    csv_file: Path,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[List[Filter]] = None
+) -> pd.DataFrame:
+    """
+    Lê uma tabela de liga do Parquet (se atualizado) ou do CSV
+
+    Args:
+        csv_file: Caminho do CSV
+        columns: Colunas desejadas (ausentes são ignoradas)
+        filters: Lista de (coluna, operador, valor) combinados com E;
+            operadores: ==, !=, <, <=, >, >=, in
+
+    Returns:
+        DataFrame com as linhas e colunas pedidas
+
+    Raises:
+        FileNotFoundError: Nem Parquet nem CSV existem
+    """
+    path = parquet_path_for(csv_file)
+    if parquet_enabled() and _is_fresh(path, Path(csv_file)):
+        try:
+            return _read_parquet(path, columns, filters)
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Falha ao ler Parquet {path}, usando CSV: {e}")
+
+    if columns is not None:
+        # Colunas dos filtros precisam ser lidas para filtrar
+        wanted = set(columns) | {column for column, _, _ in filters or []}
+        df = pd.read_csv(csv_file, usecols=lambda column: column in wanted)
+    else:
+        df = pd.read_csv(csv_file)
+    df = _apply_filters(df, filters)
+    if columns is not None:
+        df = df[[column for column in columns if column in df.columns]]
+    return df.reset_index(drop=True)
+
+
+def has_fresh_parquet(csv_file: Path) -> bool:
+    """Há Parquet utilizável para este CSV"""
+    return parquet_enabled() and _is_fresh(parquet_path_for(csv_file), Path(csv_file))
+
+
+def round_filter(csv_file: Path, round_number: int) -> Optional[List[Filter]]:
+    """
+    Filtro que lê só o row group de uma rodada, se houver Parquet atualizado
+
+    Sem Parquet o CSV precisa ser lido inteiro de qualquer forma, então é melhor
+    carregar (e manter em memória) a tabela completa.
+
+    Returns:
+        [(coluna de rodada, '==', rodada)] ou None
+    """
+    csv_file = Path(csv_file)
+    if not has_fresh_parquet(csv_file):
+        return None
+    try:
+        names = set(pq.read_schema(parquet_path_for(csv_file)).names)
+    except (OSError, pa.ArrowException):
+        return None
+    column = next((c for c in ROUND_COLUMNS if c in names), None)
+    return None if column is None else [(column, '==', int(round_number))]
+
+
+def _is_fresh(path: Path, csv_file: Path) -> bool:
+    if not path.exists():
+        return False
+    if not csv_file.exists():
+        return True
+    # CSV editado à mão depois da exportação prevalece
+    return path.stat().st_mtime_ns >= csv_file.stat().st_mtime_ns
+
+
+def _read_parquet(path: Path, columns: Optional[Sequence[str]], filters: Optional[List[Filter]]) -> pd.DataFrame:
+    available = set(pq.read_schema(path).names)
+    if filters and any(column not in available for column, _, _ in filters):
+        # Filtro em coluna inexistente: nenhuma linha atende
+        names = [c for c in (columns or available) if c in available]
+        return pd.DataFrame(columns=names)
+
+    selected = None if columns is None else [c for c in columns if c in available]
+    table = pq.read_table(path, columns=selected, filters=filters or None)
+    return table.to_pandas()
+
+
+def _apply_filters(df: pd.DataFrame, filters: Optional[Iterable[Filter]]) -> pd.DataFrame:
+    for column, op, value in filters or []:
+        if column not in df.columns:
+            return df.iloc[0:0]
+        series = df[column]
+        if op == 'in':
+            mask = series.isin(list(value))
+        elif op in ('=', '=='):
+            mask = series == value
+        elif op == '!=':
+            mask = series != value
+        elif op == '<':
+            mask = series < value
+        elif op == '<=':
+            mask = series <= value
+        elif op == '>':
+            mask = series > value
+        elif op == '>=':
+            mask = series >= value
+        else:
+            raise ValueError(f"Operador de filtro não suportado: {op}")
+        df = df[mask]
+    return df
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    # Colunas object com tipos mistos viram texto (Arrow exige tipo único)
+    frame = df.copy()
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            values = frame[column]
+            frame[column] = values.where(values.isna(), values.astype(str))
+    return frame
@@ -1,20 +1,183 @@
 """
 Gerenciador de Rodadas do Brasileirão
 Busca jogos por rodada e organiza informações
+
+A temporada inteira é buscada em uma única requisição (ou lida do CSV) e
+indexada por rodada, com a contagem de status de cada uma. Rodada atual e
+próxima rodada saem do índice; depois, apenas as rodadas ainda incompletas
+que já podem ter mudado são atualizadas.
 """
 
+import csv
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime
 from data.collector import FootballDataCollector
+from utils.request_scheduler import INTERACTIVE
+
+# Importar cache
+try:
+    from utils.cache import matches_cache, get_cache_key_rounds
+    CACHE_ENABLED = True
+except ImportError:
+    CACHE_ENABLED = False
+
+CSV_DIR = Path(__file__).resolve().parent / 'csv' / 'brasileirao'
+
+
+def _summarize_round(round_number: int, matches: List[Dict]) -> Dict:
+    """Contagem de status de uma rodada (formato de get_round_status)"""
+    status_count = {
+        'FINISHED': 0,
+        'SCHEDULED': 0,
+        'TIMED': 0,
+        'IN_PLAY': 0,
+        'PAUSED': 0
+    }
+    
+    for match in matches:
+        status = match['status']
+        status_count[status] = status_count.get(status, 0) + 1
+    
+    return {
+        'round': round_number,
+        'total_matches': len(matches),
+        'finished': status_count['FINISHED'],
+        'scheduled': status_count['SCHEDULED'] + status_count['TIMED'],
+        'in_play': status_count['IN_PLAY'] + status_count['PAUSED'],
+        'is_complete': bool(matches) and status_count['FINISHED'] == len(matches),
+    }
+
+
+def _parse_kickoff(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+class RoundIndex:
+    """
+    Jogos da temporada agrupados por rodada, com status pré-calculado
+    
+    Compartilhado via cache e lido sem lock: não é alterado depois de criado,
+    atualizações geram um novo índice (with_rounds).
+    """
+    
+    def __init__(self, matches: List[Dict], total_rounds: int = 38, source: str = 'api'):
+        self.total_rounds = total_rounds
+        self.source = source
+        self.lock = threading.Lock()
+        self.rounds: Dict[int, List[Dict]] = {}
+        self.summaries: Dict[int, Dict] = {}
+        self.current_round = 1
+        self.next_round = 1
+        self.updated_at = time.time()
+        
+        for match in matches:
+            self.rounds.setdefault(match['round'], []).append(match)
+        for round_number, round_matches in self.rounds.items():
+            self.summaries[round_number] = _summarize_round(round_number, round_matches)
+        self._update_pointers()
+    
+    def __len__(self) -> int:
+        return sum(len(matches) for matches in self.rounds.values())
+    
+    def __getstate__(self) -> Dict:
+        # O lock não é serializável (cache em disco/Redis): recriado ao carregar
+        state = self.__dict__.copy()
+        state.pop('lock', None)
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+    
+    def matches(self, round_number: int) -> List[Dict]:
+        """Jogos de uma rodada"""
+        return list(self.rounds.get(round_number, []))
+    
+    def summary(self, round_number: int) -> Dict:
+        """Status de uma rodada (vazio se a rodada não tem jogos)"""
+        return self.summaries.get(round_number) or _summarize_round(round_number, [])
+    
+    def with_rounds(self, replacements: Dict[int, List[Dict]]) -> 'RoundIndex':
+        """Novo índice com algumas rodadas substituídas (este não é alterado)"""
+        rounds = {**self.rounds, **replacements}
+        matches = [match for round_number in sorted(rounds) for match in rounds[round_number]]
+        return RoundIndex(matches, self.total_rounds, source=self.source)
+    
+    def stale_rounds(self, now: Optional[datetime] = None, lookahead_hours: int = 24) -> List[int]:
+        """
+        Rodadas incompletas cujo status pode ter mudado
+        
+        Uma rodada entra na lista se não está completa e tem algum jogo que já
+        começou (ou começa dentro de lookahead_hours).
+        """
+        now = now or datetime.now(timezone.utc)
+        horizon = now + timedelta(hours=lookahead_hours)
+        stale = []
+        for round_number, summary in sorted(self.summaries.items()):
+            if summary['is_complete']:
+                continue
+            kickoffs = [_parse_kickoff(match['date']) for match in self.rounds[round_number]]
+            if any(kickoff is None or kickoff <= horizon for kickoff in kickoffs):
+                stale.append(round_number)
+        return stale
+    
+    def _update_pointers(self) -> None:
+        # Rodada atual: primeira rodada com jogos que ainda não terminou
+        current = None
+        for round_number in sorted(self.summaries):
+            if not self.summaries[round_number]['is_complete'] and self.summaries[round_number]['total_matches']:
+                current = round_number
+                break
+        
+        if current is None:
+            # Todas as rodadas conhecidas terminaram
+            last = max(self.summaries) if self.summaries else 0
+            current = min(last + 1, self.total_rounds) if last else 1
+        
+        self.current_round = current
+        # Se rodada atual já terminou, próxima é +1
+        if self.summary(current)['is_complete']:
+            self.next_round = min(current + 1, self.total_rounds)
+        else:
+            self.next_round = current
+
 
 class RoundManager:
     """Gerencia jogos por rodada do Brasileirão"""
     
-    def __init__(self):
-        self.collector = FootballDataCollector()
+    def __init__(
+        self,
+        priority: str = INTERACTIVE,
+        csv_path: Optional[Path] = None,
+        refresh_interval: int = 300
+    ):
+        """
+        Inicializa o gerenciador
+        
+        Args:
+            priority: Prioridade das requisições (INTERACTIVE ou BACKGROUND)
+            csv_path: CSV de partidas usado quando a API não responde
+                (padrão: data/csv/brasileirao/<temporada>_matches.csv)
+            refresh_interval: Segundos entre atualizações das rodadas incompletas
+        """
+        self.collector = FootballDataCollector(priority=priority)
         self.brasileirao_id = 2013
         self.current_season = 2025
         self.total_rounds = 38
+        self.csv_path = Path(csv_path) if csv_path else CSV_DIR / f"{self.current_season}_matches.csv"
+        self.refresh_interval = refresh_interval
+        self._index: Optional[RoundIndex] = None
     
     def get_round_matches(self, round_number: int) -> List[Dict]:
         """
@@ -22,66 +185,55 @@ class RoundManager:
         
         Args:
             round_number: Número da rodada (1-38)
-            
+        
         Returns:
             Lista de jogos da rodada
         """
         if round_number < 1 or round_number > self.total_rounds:
             raise ValueError(f"Rodada deve estar entre 1 e {self.total_rounds}")
         
-        # Buscar partidas da competição
-        endpoint = f"{self.collector.base_url}/competitions/{self.brasileirao_id}/matches"
-        params = {
-            'season': self.current_season,
-            'matchday': round_number
-        }
+        index = self.get_round_index()
+        if index is not None:
+            return index.matches(round_number)
         
-        try:
-            import requests
-            response = requests.get(
-                endpoint, 
-                headers=self.collector.headers, 
-                params=params, 
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            matches = data.get('matches', [])
-            
-            # Processar e organizar dados
-            processed_matches = []
-            for match in matches:
-                processed_matches.append({
-                    'id': match['id'],
-                    'round': round_number,
-                    'date': match['utcDate'],
-                    'status': match['status'],
-                    'home_team': {
-                        'id': match['homeTeam']['id'],
-                        'name': match['homeTeam']['name'],
-                        'crest': match['homeTeam'].get('crest', '')
-                    },
-                    'away_team': {
-                        'id': match['awayTeam']['id'],
-                        'name': match['awayTeam']['name'],
-                        'crest': match['awayTeam'].get('crest', '')
-                    },
-                    'score': {
-                        'home': match['score']['fullTime']['home'],
-                        'away': match['score']['fullTime']['away'],
-                        'half_time_home': match['score']['halfTime']['home'],
-                        'half_time_away': match['score']['halfTime']['away']
-                    } if match['status'] == 'FINISHED' else None,
-                    'venue': match.get('venue', 'N/A'),
-                    'referee': match.get('referees', [{}])[0].get('name', 'N/A') if match.get('referees') else 'N/A'
-                })
-            
-            return processed_matches
-            
-        except Exception as e:
-            print(f"Erro ao buscar jogos da rodada {round_number}: {e}")
-            return []
+        # Sem índice (API e CSV indisponíveis): busca só a rodada
+        return self._fetch_round(round_number)
+    
+    def get_round_index(self, force_refresh: bool = False) -> Optional[RoundIndex]:
+        """
+        Índice da temporada por rodada (compartilhado via cache)
+        
+        Args:
+            force_refresh: Recarregar a temporada inteira
+        
+        Returns:
+            RoundIndex ou None se nenhuma fonte estiver disponível
+        """
+        cache_key = None
+        if CACHE_ENABLED:
+            cache_key = get_cache_key_rounds(self.brasileirao_id, self.current_season)
+            if not force_refresh:
+                cached_index = matches_cache.get(cache_key)
+                if cached_index is not None:
+                    self._index = cached_index
+        
+        if self._index is None or force_refresh:
+            self._index = self._load_index()
+        elif time.time() - self._index.updated_at > self.refresh_interval:
+            refreshed = self._refresh_incomplete(self._index)
+            if refreshed is None:
+                # Outra thread atualizou: usar o índice novo que ela publicou
+                published = matches_cache.get(cache_key) if cache_key is not None else None
+                if published is not None:
+                    self._index = published
+                return self._index
+            self._index = refreshed
+        else:
+            return self._index
+        
+        if self._index is not None and cache_key is not None:
+            matches_cache.set(cache_key, self._index)
+        return self._index
     
     def is_round_finished(self, round_number: int) -> bool:
         """
@@ -89,16 +241,11 @@ class RoundManager:
         
         Args:
             round_number: Número da rodada
-            
+        
         Returns:
             True se todos os jogos foram finalizados
         """
-        matches = self.get_round_matches(round_number)
-        
-        if not matches:
-            return False
-        
-        return all(match['status'] == 'FINISHED' for match in matches)
+        return self.get_round_status(round_number)['is_complete']
     
     def get_round_status(self, round_number: int) -> Dict:
         """
@@ -106,7 +253,7 @@ class RoundManager:
         
         Args:
             round_number: Número da rodada
-            
+        
         Returns:
             Dict com estatísticas da rodada
         """
@@ -119,35 +266,16 @@ class RoundManager:
                 'finished': 0,
                 'scheduled': 0,
                 'in_play': 0,
-                'is_complete': False
+                'is_complete': False,
+                'matches': []
             }
         
-        status_count = {
-            'FINISHED': 0,
-            'SCHEDULED': 0,
-            'TIMED': 0,
-            'IN_PLAY': 0,
-            'PAUSED': 0
-        }
-        
-        for match in matches:
-            status = match['status']
-            status_count[status] = status_count.get(status, 0) + 1
-        
-        return {
-            'round': round_number,
-            'total_matches': len(matches),
-            'finished': status_count['FINISHED'],
-            'scheduled': status_count['SCHEDULED'] + status_count['TIMED'],
-            'in_play': status_count['IN_PLAY'] + status_count['PAUSED'],
-            'is_complete': status_count['FINISHED'] == len(matches),
-            'matches': matches
-        }
+        return {**_summarize_round(round_number, matches), 'matches': matches}
     
     def get_match_by_teams(
-        self, 
-        round_number: int, 
-        home_team_name: str, 
+        self,
+        round_number: int,
+        home_team_name: str,
         away_team_name: str
     ) -> Optional[Dict]:
         """
@@ -157,14 +285,14 @@ class RoundManager:
             round_number: Número da rodada
             home_team_name: Nome do time mandante
             away_team_name: Nome do time visitante
-            
+        
         Returns:
             Dict com dados do jogo ou None
         """
         matches = self.get_round_matches(round_number)
         
         for match in matches:
-            if (match['home_team']['name'] == home_team_name and 
+            if (match['home_team']['name'] == home_team_name and
                 match['away_team']['name'] == away_team_name):
                 return match
         
@@ -177,15 +305,15 @@ class RoundManager:
         Returns:
             Número da rodada atual
         """
+        index = self.get_round_index()
+        if index is not None:
+            return index.current_round
+        
         for round_num in range(1, self.total_rounds + 1):
             status = self.get_round_status(round_num)
             
-            # Se tem jogos agendados ou em andamento, é a rodada atual
-            if status['scheduled'] > 0 or status['in_play'] > 0:
-                return round_num
-            
-            # Se não está completa, é a rodada atual
-            if not status['is_complete']:
+            # Se tem jogos agendados ou em andamento, ou não está completa, é a rodada atual
+            if status['scheduled'] > 0 or status['in_play'] > 0 or not status['is_complete']:
                 return round_num
         
         # Se todas rodadas terminaram, retornar última
@@ -198,6 +326,10 @@ class RoundManager:
         Returns:
             Número da próxima rodada
         """
+        index = self.get_round_index()
+        if index is not None:
+            return index.next_round
+        
         current = self.get_current_round()
         
         # Se rodada atual já terminou, próxima é +1
@@ -205,6 +337,153 @@ class RoundManager:
             return min(current + 1, self.total_rounds)
         
         return current
+    
+    def _load_index(self) -> Optional[RoundIndex]:
+        """Temporada inteira: 1 requisição à API ou, em falha, o CSV"""
+        matches = self._fetch_season()
+        if matches:
+            return RoundIndex(matches, self.total_rounds, source='api')
+        
+        matches = self._read_csv()
+        if matches:
+            return RoundIndex(matches, self.total_rounds, source='csv')
+        
+        return None
+    
+    def _refresh_incomplete(self, index: RoundIndex) -> Optional[RoundIndex]:
+        """
+        Novo índice com as rodadas incompletas que já podem ter mudado atualizadas
+        
+        O índice atual (compartilhado via cache, lido sem lock) nunca é alterado:
+        o resultado o substitui por inteiro.
+        
+        Returns:
+            Índice atualizado ou None se outra thread já atualizou
+        """
+        with index.lock:
+            if time.time() - index.updated_at <= self.refresh_interval:
+                return None  # outra thread já atualizou
+            
+            replacements = {}
+            if index.source == 'csv':
+                matches = self._read_csv()
+                fresh = RoundIndex(matches, self.total_rounds, source='csv') if matches else None
+                replacements = dict(fresh.rounds) if fresh else {}
+            else:
+                for round_number in index.stale_rounds():
+                    matches = self._fetch_round(round_number)
+                    if matches:
+                        replacements[round_number] = matches
+            
+            refreshed = index.with_rounds(replacements)
+            # Quem esperava pelo lock do índice antigo não repete a atualização
+            index.updated_at = refreshed.updated_at
+            return refreshed
+    
+    def _fetch_season(self) -> List[Dict]:
+        """Todos os jogos da temporada em uma requisição"""
+        endpoint = f"{self.collector.base_url}/competitions/{self.brasileirao_id}/matches"
+        params = {'season': self.current_season}
+        
+        try:
+            response = self.collector._get(endpoint, params=params)
+            response.raise_for_status()
+            data = response.json()
+            return [
+                self._process_match(match, match.get('matchday'))
+                for match in data.get('matches', [])
+                if match.get('matchday')
+            ]
+        except Exception as e:
+            print(f"Erro ao buscar jogos da temporada: {e}")
+            return []
+    
+    def _fetch_round(self, round_number: int) -> List[Dict]:
+        """Jogos de uma rodada direto da API"""
+        endpoint = f"{self.collector.base_url}/competitions/{self.brasileirao_id}/matches"
+        params = {
+            'season': self.current_season,
+            'matchday': round_number
+        }
+        
+        try:
+            response = self.collector._get(endpoint, params=params)
+            response.raise_for_status()
+            data = response.json()
+            return [self._process_match(match, round_number) for match in data.get('matches', [])]
+        except Exception as e:
+            print(f"Erro ao buscar jogos da rodada {round_number}: {e}")
+            return []
+    
+    @staticmethod
+    def _process_match(match: Dict, round_number: int) -> Dict:
+        """Converte um jogo da API para o formato do RoundManager"""
+        return {
+            'id': match['id'],
+            'round': round_number,
+            'date': match['utcDate'],
+            'status': match['status'],
+            'home_team': {
+                'id': match['homeTeam']['id'],
+                'name': match['homeTeam']['name'],
+                'crest': match['homeTeam'].get('crest', '')
+            },
+            'away_team': {
+                'id': match['awayTeam']['id'],
+                'name': match['awayTeam']['name'],
+                'crest': match['awayTeam'].get('crest', '')
+            },
+            'score': {
+                'home': match['score']['fullTime']['home'],
+                'away': match['score']['fullTime']['away'],
+                'half_time_home': match['score']['halfTime']['home'],
+                'half_time_away': match['score']['halfTime']['away']
+            } if match['status'] == 'FINISHED' else None,
+            'venue': match.get('venue', 'N/A'),
+            'referee': match.get('referees', [{}])[0].get('name', 'N/A') if match.get('referees') else 'N/A'
+        }
+    
+    def _read_csv(self) -> List[Dict]:
+        """Jogos do CSV local no formato do RoundManager"""
+        if not self.csv_path.exists():
+            return []
+        
+        team_ids = {}
+        teams_csv = self.csv_path.with_name(self.csv_path.name.replace('_matches', '_teams'))
+        if teams_csv != self.csv_path and teams_csv.exists():
+            with open(teams_csv, newline='', encoding='utf-8') as handle:
+                for row in csv.DictReader(handle):
+                    team_ids[row.get('name')] = int(row['id']) if str(row.get('id', '')).isdigit() else row.get('id')
+        
+        matches = []
+        try:
+            with open(self.csv_path, newline='', encoding='utf-8') as handle:
+                for row in csv.DictReader(handle):
+                    if not str(row.get('round', '')).isdigit():
+                        continue
+                    status = (row.get('status') or 'SCHEDULED').upper()
+                    finished = status == 'FINISHED' and row.get('home_score') not in (None, '')
+                    matches.append({
+                        'id': row.get('id'),
+                        'round': int(row['round']),
+                        'date': row.get('date'),
+                        'status': status,
+                        'home_team': {'id': team_ids.get(row['home_team']), 'name': row['home_team'], 'crest': ''},
+                        'away_team': {'id': team_ids.get(row['away_team']), 'name': row['away_team'], 'crest': ''},
+                        'score': {
+                            'home': int(float(row['home_score'])),
+                            'away': int(float(row['away_score'])),
+                            'half_time_home': None,
+                            'half_time_away': None
+                        } if finished else None,
+                        'venue': 'N/A',
+                        'referee': row.get('referee') or 'N/A'
+                    })
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Erro ao ler CSV de partidas {self.csv_path}: {e}")
+            return []
+        
+        return matches
 
 
 # Exemplo de uso
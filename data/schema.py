@@ -0,0 +1,241 @@
+"""
+Esquemas declarados dos CSV das ligas
+
+Cada arquivo (data/csv/<liga>/<temporada>_<tipo>.csv) tem um esquema com
+aliases de colunas, tipos numéricos, colunas categóricas (times, árbitro,
+status) e as colunas de data usadas para montar kickoff_dt. apply_schema faz
+toda a conversão de uma vez, com operações vetorizadas do pandas, para que os
+loaders não precisem converter valores linha a linha.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from data.parquet_store import Filter, read_frame
+
+# Nomes da Football-Data/FootyStats -> nomes padronizados
+MATCH_ALIASES = {
+    'home_team_name': 'home_team',
+    'away_team_name': 'away_team',
+    'Game Week': 'round',
+    'date_GMT': 'date',
+}
+
+# Premier League usa "complete" ao invés de "FINISHED"
+STATUS_MAP = {
+    'complete': 'FINISHED',
+    'scheduled': 'SCHEDULED',
+    'in_play': 'IN_PLAY',
+    'live': 'IN_PLAY',
+}
+
+# Formato especial para timestamps em segundos (FootyStats)
+UNIX_SECONDS = 'unix'
+ISO8601 = 'ISO8601'
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Tipos e aliases de um CSV de liga"""
+    name: str
+    aliases: Mapping[str, str] = field(default_factory=dict)
+    integers: Tuple[str, ...] = ()
+    floats: Tuple[str, ...] = ()
+    categories: Tuple[str, ...] = ()
+    strings: Tuple[str, ...] = ()
+    # Colunas (já com alias) tentadas em ordem para kickoff_dt: (coluna, formato)
+    kickoff: Tuple[Tuple[str, str], ...] = ()
+    status_map: Mapping[str, str] = field(default_factory=dict)
+    # Colunas não declaradas viram float (arquivos largos da FootyStats)
+    numeric_by_default: bool = False
+
+    @property
+    def declared(self) -> set:
+        """Colunas com tipo declarado"""
+        return set(self.integers) | set(self.floats) | set(self.categories) | set(self.strings)
+
+
+MATCHES = TableSchema(
+    name='matches',
+    aliases=MATCH_ALIASES,
+    integers=(
+        'id', 'match_id', 'round', 'round_number',
+        'home_score', 'away_score', 'home_shots', 'away_shots',
+        'home_corners', 'away_corners', 'home_cards', 'away_cards',
+    ),
+    floats=('home_xg', 'away_xg', 'lambda_home', 'lambda_away', 'mean_cards', 'mean_corners'),
+    categories=('home_team', 'away_team', 'status', 'referee'),
+    strings=('date', 'kickoff_utc', 'kickoff'),
+    kickoff=(('kickoff_utc', ISO8601), ('kickoff', ISO8601), ('date', ISO8601)),
+    status_map=STATUS_MAP,
+)
+
+TEAMS = TableSchema(
+    name='teams',
+    integers=('id', 'founded'),
+    categories=('name', 'code'),
+    strings=('stadium', 'city', 'crest_url'),
+)
+
+STANDINGS = TableSchema(
+    name='standings',
+    integers=(
+        'round', 'position', 'matches_played', 'wins', 'draws', 'losses',
+        'goals_for', 'goals_against', 'goal_difference', 'points',
+    ),
+    categories=('team',),
+)
+
+FOOTYSTATS_MATCHES = TableSchema(
+    name='matches',
+    aliases=MATCH_ALIASES,
+    integers=('timestamp', 'round'),
+    categories=('home_team', 'away_team', 'status', 'referee', 'stadium_name'),
+    strings=('date', 'home_team_goal_timings', 'away_team_goal_timings'),
+    kickoff=(('timestamp', UNIX_SECONDS), ('date', '%b %d %Y - %I:%M%p')),
+    status_map=STATUS_MAP,
+    numeric_by_default=True,
+)
+
+FOOTYSTATS_TEAMS = TableSchema(
+    name='teams',
+    categories=('team_name', 'common_name'),
+    strings=('season', 'country'),
+    numeric_by_default=True,
+)
+
+# Esquema por tipo de arquivo; ligas com exportação própria sobrescrevem
+DEFAULT_SCHEMAS: Dict[str, TableSchema] = {
+    'matches': MATCHES,
+    'teams': TEAMS,
+    'standings': STANDINGS,
+}
+
+LEAGUE_SCHEMAS: Dict[Tuple[str, str], TableSchema] = {
+    ('premier_league', 'matches'): FOOTYSTATS_MATCHES,
+    ('premier_league', 'teams'): FOOTYSTATS_TEAMS,
+}
+
+
+def schema_for(csv_file: Path) -> Optional[TableSchema]:
+    """
+    Esquema de um CSV de liga pelo caminho (<liga>/<temporada>_<tipo>.csv)
+
+    Returns:
+        TableSchema ou None se o tipo de arquivo não for conhecido
+    """
+    csv_file = Path(csv_file)
+    kind = csv_file.stem.partition('_')[2]
+    return LEAGUE_SCHEMAS.get((csv_file.parent.name, kind)) or DEFAULT_SCHEMAS.get(kind)
+
+
+def apply_schema(df: pd.DataFrame, schema: Optional[TableSchema]) -> pd.DataFrame:
+    """
+    Aplica aliases e tipos declarados a um DataFrame lido do CSV
+
+    Args:
+        df: DataFrame bruto
+        schema: Esquema do arquivo (None devolve df sem alterações)
+
+    Returns:
+        DataFrame com colunas padronizadas e tipadas (mais kickoff_dt, se declarado)
+    """
+    if schema is None:
+        return df
+
+    # Alias só vale se a coluna padronizada ainda não existe
+    renames = {
+        source: target for source, target in schema.aliases.items()
+        if source in df.columns and target not in df.columns
+    }
+    if renames:
+        df = df.rename(columns=renames)
+    else:
+        df = df.copy()
+
+    if schema.status_map and 'status' in df.columns:
+        df['status'] = df['status'].replace(dict(schema.status_map))
+
+    for column in schema.integers:
+        if column in df.columns:
+            df[column] = _integers(df[column])
+    for column in schema.floats:
+        if column in df.columns:
+            df[column] = _numeric(df[column])
+
+    if schema.numeric_by_default:
+        declared = schema.declared
+        for column in df.columns:
+            if column not in declared:
+                df[column] = _numeric(df[column])
+
+    for column in schema.categories:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    if schema.kickoff:
+        df['kickoff_dt'] = _kickoff(df, schema.kickoff)
+
+    return df
+
+
+def load_table(
+    csv_file: Path,
+    schema: Optional[TableSchema] = None,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[List[Filter]] = None
+) -> pd.DataFrame:
+    """
+    Lê um CSV de liga (ou seu Parquet) já tipado
+
+    Args:
+        csv_file: Caminho do CSV
+        schema: Esquema (padrão: schema_for(csv_file))
+        columns: Colunas a ler, com os nomes do arquivo
+        filters: Filtros (coluna, operador, valor) com os nomes do arquivo
+
+    Returns:
+        DataFrame tipado
+    """
+    if schema is None:
+        schema = schema_for(csv_file)
+    return apply_schema(read_frame(csv_file, columns=columns, filters=filters), schema)
+
+
+def _numeric(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float) if pd.api.types.is_float_dtype(series) else series
+    # Texto: aceita vírgula decimal e trata "", "N/A" etc. como vazio
+    text = series.astype('string').str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(text, errors='coerce').astype(float)
+
+
+def _integers(series: pd.Series) -> pd.Series:
+    values = _numeric(series)
+    if pd.api.types.is_integer_dtype(values):
+        return values
+    # Com vazios fica float64 (NaN), como o pandas já faz ao ler o CSV
+    if values.notna().all() and (values % 1 == 0).all():
+        return values.astype('int64')
+    return values
+
+
+def _kickoff(df: pd.DataFrame, sources: Sequence[Tuple[str, str]]) -> pd.Series:
+    kickoff = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns, UTC]')
+    for column, fmt in sources:
+        if column not in df.columns:
+            continue
+        if fmt == UNIX_SECONDS:
+            seconds = _numeric(df[column])
+            seconds = seconds.where(seconds > 0)
+            parsed = pd.to_datetime(seconds, unit='s', utc=True, errors='coerce')
+        else:
+            text = df[column].astype('string').str.strip()
+            if fmt != ISO8601:
+                text = text.str.upper()
+            parsed = pd.to_datetime(text, format=fmt, utc=True, errors='coerce')
+        kickoff = kickoff.fillna(parsed.astype('datetime64[ns, UTC]'))
+    return kickoff
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Daemon de pré-cálculo das previsões das próximas rodadas
+
+Observa os CSV das ligas e o histórico de odds; quando mudam, recalcula as
+previsões, EV e Kelly da rodada atual e da seguinte e grava no cache
+compartilhado (cache/store), que o app apenas lê.
+
+Uso:
+    python scripts/precompute_predictions.py                  # loop contínuo
+    python scripts/precompute_predictions.py --once           # uma passada (cron)
+    python scripts/precompute_predictions.py --league premier_league --n-sim 50000,100000
+
+Variáveis: PRECOMPUTE_N_SIMS, PRECOMPUTE_POLL_SECONDS, PERSISTENT_CACHE_DIR
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analysis.precompute import DEFAULT_POLL_SECONDS, LEAGUES, PrecomputeService, n_sims_from_env
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Pré-calcular previsões das próximas rodadas')
+    parser.add_argument(
+        '--league',
+        action='append',
+        choices=sorted(LEAGUES),
+        help='Liga a observar (repetível; padrão: todas)'
+    )
+    parser.add_argument(
+        '--n-sim',
+        type=str,
+        default=None,
+        help='Simulações a pré-calcular, separadas por vírgula (padrão: PRECOMPUTE_N_SIMS ou 50000)'
+    )
+    parser.add_argument(
+        '--rounds-ahead',
+        type=int,
+        default=2,
+        help='Rodadas pendentes por liga (default: 2)'
+    )
+    parser.add_argument(
+        '--poll',
+        type=float,
+        default=float(os.getenv('PRECOMPUTE_POLL_SECONDS', DEFAULT_POLL_SECONDS)),
+        help='Intervalo entre verificações de mudança, em segundos'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Workers consumindo a fila (default: 1)'
+    )
+    parser.add_argument(
+        '--once',
+        action='store_true',
+        help='Processar uma vez e sair'
+    )
+
+    args = parser.parse_args()
+
+    n_sims = tuple(int(n) for n in args.n_sim.split(',')) if args.n_sim else n_sims_from_env()
+    service = PrecomputeService(leagues=args.league, n_sims=n_sims, rounds_ahead=args.rounds_ahead)
+
+    if args.once:
+        processed = service.run_once()
+        logger.info(f"✅ {processed} rodadas pré-calculadas: {service.get_stats()}")
+        return
+
+    logger.info(f"🚀 Pré-cálculo iniciado: ligas={list(service.sources)}, n_sim={n_sims}, poll={args.poll}s")
+    try:
+        service.serve_forever(poll_seconds=args.poll, workers=args.workers)
+    except KeyboardInterrupt:
+        logger.info("Encerrando pré-cálculo")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP/JSON de previsões para clientes programáticos (bots)
+
+Uso:
+    python scripts/serve_predictions.py --port 8600
+    curl -X POST localhost:8600/v1/match -d '{"home_team": "A", "away_team": "B", "lambda_home": 1.5, "lambda_away": 1.1}'
+    curl 'localhost:8600/v1/round?league=premier_league&round=12'
+
+Variáveis: PREDICTION_BATCH_WINDOW_MS, PERSISTENT_CACHE_DIR
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analysis.prediction_service import make_server
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Servidor HTTP de previsões')
+    parser.add_argument('--host', type=str, default='0.0.0.0', help='Endereço de escuta (default: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=8600, help='Porta (default: 8600)')
+
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    logger.info(f"🚀 Serviço de previsões em http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Encerrando serviço de previsões")
+    finally:
+        server.server_close()
+        server.RequestHandlerClass.service.close()
+
+
+if __name__ == '__main__':
+    main()
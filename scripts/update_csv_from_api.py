@@ -3,6 +3,9 @@
 Script para atualizar CSV com dados da API
 Rodar 1x por dia via cron ou manualmente
 
+Com pyarrow instalado, cada CSV também é exportado para Parquet
+(data/parquet/<liga>/<tipo>/season=<temporada>/data.parquet).
+
 Uso:
     python scripts/update_csv_from_api.py --league brasileirao
     python scripts/update_csv_from_api.py --league premier_league --season 2024
@@ -25,7 +28,10 @@ import pandas as pd
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from data.collectors.football_data_collector_v2 import FootballDataCollectorV2
+from analysis.prediction_store import get_prediction_store
+from data.parquet_store import export_csv
 from utils.leagues_config import get_api_config
+from utils.request_scheduler import BACKGROUND
 
 # Configurar logging
 logging.basicConfig(
@@ -102,6 +108,7 @@ def _update_generic_matches_csv(collector, csv_dir: Path, season: str) -> bool:
 
         csv_file = csv_dir / f'{season}_matches.csv'
         df.to_csv(csv_file, index=False)
+        export_csv(csv_file)
 
         logger.info(f"✅ Matches salvos: {len(matches)} jogos em {csv_file}")
         return True
@@ -171,6 +178,7 @@ def update_brasileirao_matches_csv(collector, csv_dir: Path, season: str) -> boo
 
     csv_file = csv_dir / f'{season}_matches.csv'
     df.to_csv(csv_file, index=False)
+    export_csv(csv_file)
 
     logger.info(f"✅ Brasileirão salvo com {len(df)} partidas em {csv_file}")
     return True
@@ -248,6 +256,7 @@ def update_teams_csv(collector, csv_dir: Path, season: str):
         # Salvar CSV
         csv_file = csv_dir / f'{season}_teams.csv'
         df.to_csv(csv_file, index=False)
+        export_csv(csv_file)
 
         logger.info(f"✅ Times salvos: {len(teams)} times em {csv_file}")
         return True
@@ -334,6 +343,7 @@ def update_standings_csv(collector, csv_dir: Path, season: str):
             df = pd.concat([existing_df, df], ignore_index=True)
 
         df.to_csv(csv_file, index=False)
+        export_csv(csv_file)
 
         logger.info(f"✅ Classificação salva em {csv_file}")
         return True
@@ -368,7 +378,8 @@ def update_league_csv(league_key: str, season: str = '2025'):
 
     # Criar collector
     try:
-        collector = FootballDataCollectorV2(league_key, api_config)
+        # Atualização em segundo plano: não disputa cota com a UI
+        collector = FootballDataCollectorV2(league_key, api_config, priority=BACKGROUND)
     except Exception as e:
         logger.error(f"❌ Erro ao criar collector: {e}")
         return False
@@ -380,6 +391,10 @@ def update_league_csv(league_key: str, season: str = '2025'):
         'standings': update_standings_csv(collector, csv_dir, season)
     }
 
+    # Novos dados: previsões armazenadas (todas as sessões/processos) são recalculadas
+    if any(results.values()):
+        get_prediction_store().invalidate()
+
     # Salvar timestamp da última atualização
     timestamp_file = csv_dir / 'last_update.txt'
     with open(timestamp_file, 'w') as f:
@@ -0,0 +1,190 @@
+"""
+Testes para o coletor assíncrono da Football-Data.org contra uma API falsa local
+"""
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data.async_collector import AsyncFootballDataCollector, run_sync
+from data.collector import FootballDataCollector
+from utils.cache import matches_cache
+from utils.http_client import HttpClient
+from utils.request_scheduler import ProviderQuota, RequestScheduler
+
+DELAY = 0.2
+
+TEAMS = {1: 'Flamengo', 2: 'Palmeiras', 3: 'Botafogo', 4: 'Fluminense'}
+
+
+def _match(match_id, home_id, away_id, home_goals, away_goals):
+    return {
+        'id': match_id,
+        'utcDate': f'2025-0{match_id % 9 + 1}-10T19:00:00Z',
+        'homeTeam': {'id': home_id, 'name': TEAMS[home_id]},
+        'awayTeam': {'id': away_id, 'name': TEAMS[away_id]},
+        'score': {'fullTime': {'home': home_goals, 'away': away_goals}},
+    }
+
+
+SEASON = [
+    _match(1, 1, 2, 2, 1),
+    _match(2, 3, 4, 0, 0),
+    _match(3, 2, 1, 1, 1),
+    _match(4, 4, 3, 3, 2),
+    _match(5, 1, 3, 1, 0),
+    _match(6, 2, 4, 0, 2),
+]
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """API falsa: cada resposta demora DELAY segundos"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.arrivals.append((time.monotonic(), self.path))
+        time.sleep(DELAY)
+
+        path = self.path.split('?')[0]
+        team = re.fullmatch(r'/teams/(\d+)/matches', path)
+        if team:
+            team_id = int(team.group(1))
+            body = {'matches': [m for m in SEASON if team_id in (m['homeTeam']['id'], m['awayTeam']['id'])]}
+        elif path.endswith('/matches'):
+            body = {'matches': SEASON}
+        elif path.endswith('/standings'):
+            body = {'standings': [{'type': 'TOTAL', 'table': [{'position': 1, 'team': {'id': 1}}]}]}
+        elif path.endswith('/scorers'):
+            body = {'scorers': [{'player': {'name': 'Pedro'}, 'goals': 20}]}
+        else:
+            body = {}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FakeApiHandler)
+    httpd.arrivals = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _collector(server, tmp_path, quota, use_match_index=False):
+    collector = FootballDataCollector(use_match_index=use_match_index)
+    collector.base_url = server.url
+    collector.scheduler = RequestScheduler(
+        {'football_data': quota},
+        state_file=tmp_path / 'quota.json',
+        http_client=HttpClient(max_retries=0),
+    )
+    return collector
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    matches_cache.clear()
+    yield
+    matches_cache.clear()
+
+
+FIXTURES = [(1, 2), (3, 4)]
+FAST_QUOTA = ProviderQuota('football_data', rate=100, per_seconds=1)
+
+
+class TestAsyncFootballDataCollector:
+    """Testes do coletor assíncrono"""
+
+    def test_round_matches_sync_results(self, server, tmp_path):
+        sync = _collector(server, tmp_path, FAST_QUOTA)
+        expected = [
+            (sync.calculate_team_stats(1, 'HOME'), sync.calculate_team_stats(2, 'AWAY'), sync.get_h2h(1, 2)),
+            (sync.calculate_team_stats(3, 'HOME'), sync.calculate_team_stats(4, 'AWAY'), sync.get_h2h(3, 4)),
+        ]
+        matches_cache.clear()
+
+        collector = AsyncFootballDataCollector(_collector(server, tmp_path, FAST_QUOTA))
+        data = collector.fetch_round(FIXTURES)
+        collector.close()
+
+        for fixture, (home_stats, away_stats, h2h) in zip(data['fixtures'], expected):
+            assert fixture['home_stats'] == home_stats
+            assert fixture['away_stats'] == away_stats
+            assert fixture['h2h'] == h2h
+        assert data['fixtures'][0]['h2h'][0]['home_goals'] == 2
+        assert data['standings']['table'][0]['position'] == 1
+        assert data['scorers'][0]['goals'] == 20
+
+    def test_requests_run_concurrently(self, server, tmp_path):
+        collector = AsyncFootballDataCollector(_collector(server, tmp_path, FAST_QUOTA))
+        start = time.monotonic()
+        collector.fetch_round(FIXTURES)
+        elapsed = time.monotonic() - start
+        collector.close()
+
+        # 4 times (limit=10) + 2 H2H (limit=50) + classificação + artilheiros
+        assert len(server.arrivals) == 8
+        assert elapsed < len(server.arrivals) * DELAY / 2
+
+    def test_provider_rate_limit_is_respected(self, server, tmp_path):
+        quota = ProviderQuota('football_data', rate=4, per_seconds=1, interactive_reserve=0)
+        collector = AsyncFootballDataCollector(_collector(server, tmp_path, quota))
+        collector.fetch_round(FIXTURES, include_scorers=False)
+        collector.close()
+
+        arrivals = sorted(moment for moment, _ in server.arrivals)
+        assert len(arrivals) == 7
+        # Bucket de 4: a 5ª requisição espera o reabastecimento (0,25s por token)
+        assert arrivals[4] - arrivals[0] >= 0.2
+
+    def test_accepts_round_manager_fixtures(self, server, tmp_path):
+        collector = AsyncFootballDataCollector(_collector(server, tmp_path, FAST_QUOTA))
+        fixtures = [{'home_team': {'id': 1, 'name': 'Flamengo'}, 'away_team': {'id': 2, 'name': 'Palmeiras'}}]
+        data = collector.fetch_round(fixtures, include_standings=False, include_scorers=False)
+        collector.close()
+
+        assert data['fixtures'][0]['home_stats']['team_name'] == 'Flamengo'
+        assert data['standings'] == {}
+
+    def test_round_from_match_index(self, server, tmp_path):
+        per_team = AsyncFootballDataCollector(_collector(server, tmp_path, FAST_QUOTA))
+        expected = per_team.fetch_round(FIXTURES, include_standings=False, include_scorers=False)
+        per_team.close()
+        matches_cache.clear()
+        server.arrivals.clear()
+
+        collector = AsyncFootballDataCollector(_collector(server, tmp_path, FAST_QUOTA, use_match_index=True))
+        data = collector.fetch_round(FIXTURES)
+        collector.close()
+
+        # Competição inteira + classificação + artilheiros
+        assert len(server.arrivals) == 3
+        for fixture, reference in zip(data['fixtures'], expected['fixtures']):
+            assert fixture['home_stats'] == reference['home_stats']
+            assert fixture['away_stats'] == reference['away_stats']
+            assert sorted(m['date'] for m in fixture['h2h']) == sorted(m['date'] for m in reference['h2h'])
+
+    def test_run_sync_inside_running_loop(self):
+        async def inner():
+            return 42
+
+        async def outer():
+            return run_sync(inner())
+
+        assert asyncio.run(outer()) == 42
@@ -0,0 +1,115 @@
+"""
+Testes para o pipeline de rodadas do Brasileirão (CSV → MatchInputs)
+"""
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from analysis import brasileirao_data_pipeline as pipeline
+
+SEASON_CSV = """round,home_team,away_team,kickoff_utc,lambda_home,lambda_away,mean_cards,mean_corners,status,match_id
+30,Flamengo,Palmeiras,2025-11-02T16:00:00Z,1.62,0,,10.5,SCHEDULED,501
+30,Santos,Botafogo,,1.30,1.05,5.1,,SCHEDULED,502
+31,Bahia,Grêmio,2025-11-09T19:30:00Z,,,4.2,8.8,SCHEDULED,503
+"""
+
+LEGACY_CSV = """round_number,date,home_team,away_team,home_xg,away_xg,home_cards,away_cards,home_corners,away_corners,status
+1,2025-04-13 16:00,Flamengo,Palmeiras,1.85,1.42,3,,6,4,FINISHED
+1,2025-04-13 18:30,,Corinthians,1.20,1.15,4,3,5,5,FINISHED
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, 'DATA_DIR', tmp_path)
+    pipeline.clear_season_cache()
+    (tmp_path / '2025_matches.csv').write_text(SEASON_CSV, encoding='utf-8')
+    yield tmp_path
+    pipeline.clear_season_cache()
+
+
+class TestBrasileiraoPipeline:
+    """Testes do loader vetorizado"""
+
+    def test_round_matches_with_fallbacks(self, data_dir):
+        matches = pipeline.load_brasileirao_round_matches(30, 2025)
+
+        assert [(m.home_team, m.away_team) for m in matches] == [('Flamengo', 'Palmeiras'), ('Santos', 'Botafogo')]
+        first, second = matches
+        assert first.kickoff_utc == datetime(2025, 11, 2, 16, 0, tzinfo=timezone.utc)
+        assert first.context['kickoff_label'] == '02 Nov 2025 16:00 (UTC)'
+        # lambda_away = 0 cai para o padrão; mean_cards vazio também
+        assert first.lambda_away == pipeline.DEFAULT_BR_AWAY_LAMBDA
+        assert first.mean_cards == pipeline.DEFAULT_BR_CARDS
+        assert first.context['lambda_cards_home'] == pytest.approx(pipeline.DEFAULT_BR_CARDS * 0.55)
+        assert first.context['fixture_metadata']['match_id'] == 501
+        assert second.kickoff_utc is None and second.context['kickoff_label'] == ''
+        assert second.mean_corners == pipeline.DEFAULT_BR_CORNERS
+        assert second.raw_row['match_id'] == 502
+
+    def test_legacy_columns(self, data_dir):
+        (data_dir / '2024_matches.csv').write_text(LEGACY_CSV, encoding='utf-8')
+        matches = pipeline.load_brasileirao_round_matches(1, 2024)
+
+        # Linha sem mandante é descartada
+        assert len(matches) == 1
+        match = matches[0]
+        assert (match.lambda_home, match.lambda_away) == (1.85, 1.42)
+        assert match.mean_cards == 3.0
+        assert match.mean_corners == 5.0
+        assert match.kickoff_utc == datetime(2025, 4, 13, 16, 0)
+        assert pipeline.list_brasileirao_seasons() == [2024, 2025]
+
+    def test_season_parsed_once_per_file_version(self, data_dir, monkeypatch):
+        calls = []
+        original = pipeline.load_table
+        monkeypatch.setattr(pipeline, 'load_table', lambda path: calls.append(path) or original(path))
+
+        assert pipeline.list_brasileirao_rounds(2025) == [30, 31]
+        pipeline.load_brasileirao_round_matches(30, 2025)
+        pipeline.load_brasileirao_round_matches(31, 2025)
+        assert len(calls) == 1
+
+        csv_file = data_dir / '2025_matches.csv'
+        stat = csv_file.stat()
+        csv_file.write_text(SEASON_CSV + '32,Vasco da Gama,Cruzeiro,2025-11-16T19:00:00Z,,,,,SCHEDULED,504\n',
+                            encoding='utf-8')
+        os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert pipeline.list_brasileirao_rounds(2025) == [30, 31, 32]
+        assert len(calls) == 2
+
+    def test_missing_round_and_season(self, data_dir):
+        with pytest.raises(ValueError):
+            pipeline.load_brasileirao_round_matches(5, 2025)
+        with pytest.raises(FileNotFoundError):
+            pipeline.load_brasileirao_round_matches(1, 1999)
+        assert pipeline.list_brasileirao_rounds(1999) == []
+
+    def test_single_round_read_from_parquet(self, tmp_path, monkeypatch):
+        pytest.importorskip('pyarrow')
+        from data.parquet_store import export_csv
+
+        league_dir = tmp_path / 'csv' / 'brasileirao'
+        league_dir.mkdir(parents=True)
+        (league_dir / '2025_matches.csv').write_text(SEASON_CSV, encoding='utf-8')
+        export_csv(league_dir / '2025_matches.csv')
+        monkeypatch.setattr(pipeline, 'DATA_DIR', league_dir)
+        pipeline.clear_season_cache()
+
+        frames = []
+        original = pipeline.load_table
+        monkeypatch.setattr(pipeline, 'load_table', lambda path, **kwargs: frames.append(kwargs) or original(path, **kwargs))
+
+        matches = pipeline.load_brasileirao_round_matches(31, 2025)
+        assert [m.home_team for m in matches] == ['Bahia']
+        assert frames == [{'filters': [('round', '==', 31)]}]
+        pipeline.load_brasileirao_round_matches(31, 2025)
+        assert len(frames) == 1
+
+        # Temporada completa substitui as rodadas avulsas
+        assert pipeline.list_brasileirao_rounds(2025) == [30, 31]
+        assert [m.home_team for m in pipeline.load_brasileirao_round_matches(30, 2025)] == ['Flamengo', 'Santos']
+        assert frames[1:] == [{}]
+        pipeline.clear_season_cache()
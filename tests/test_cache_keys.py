@@ -0,0 +1,138 @@
+"""
+Testes para as chaves de cache canônicas (utils/cache_keys.py)
+"""
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.prediction import MatchInputs
+from utils.cache_keys import UnstableKeyError, fingerprint, make_key
+from utils.cache_manager import CacheManager
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _inputs(**overrides):
+    values = dict(
+        home_team='Arsenal', away_team='Chelsea', round_number=5,
+        kickoff_utc=datetime(2024, 9, 1, 15, tzinfo=timezone.utc),
+        lambda_home=1.6, lambda_away=1.1, mean_cards=4.2, mean_corners=10.5,
+        context={'league': 'EPL', 'weights': [0.5, 0.5]},
+    )
+    values.update(overrides)
+    return MatchInputs(**values)
+
+
+class TestMakeKey:
+    """Testes de igualdade e diferença entre chaves"""
+
+    def test_dict_order_does_not_matter(self):
+        """Testa dicts com a mesma informação em ordens diferentes"""
+        assert make_key({'a': 1, 'b': [1, 2]}) == make_key({'b': [1, 2], 'a': 1})
+        assert make_key(x=1, y=2) == make_key(y=2, x=1)
+        assert make_key({3, 1, 2}) == make_key({1, 2, 3})
+
+    def test_types_do_not_collide(self):
+        """Testa valores com a mesma representação textual"""
+        keys = {make_key(v) for v in (1, '1', 1.5, '1.5', True, None, 'None', b'1', [1], (1, ))}
+        # Listas e tuplas são equivalentes; os demais são distintos
+        assert len(keys) == 9
+        assert make_key('ab', 'c') != make_key('a', 'bc')
+
+    def test_numpy_arrays_hashed_by_content(self):
+        """Testa arrays pelo buffer, dtype e shape"""
+        a = np.arange(12, dtype=np.float64)
+        assert make_key(a) == make_key(a.copy())
+        assert make_key(a.reshape(3, 4)) != make_key(a)
+        assert make_key(a.astype(np.float32)) != make_key(a)
+        # Visão não contígua igual ao array contíguo
+        assert make_key(a.reshape(3, 4).T) == make_key(np.ascontiguousarray(a.reshape(3, 4).T))
+        assert make_key(np.float64(1.5)) == make_key(1.5)
+
+    def test_dataframe_content_fingerprint(self):
+        """Testa DataFrames por conteúdo, colunas e índice"""
+        df = pd.DataFrame({'team': ['Arsenal', 'Chelsea'], 'xg': [1.6, 1.1]})
+        assert make_key(df) == make_key(df.copy())
+        changed = df.copy()
+        changed.loc[1, 'xg'] = 1.2
+        assert make_key(changed) != make_key(df)
+        assert make_key(df.rename(columns={'xg': 'xga'})) != make_key(df)
+        assert make_key(df.set_index(pd.Index([5, 6]))) != make_key(df)
+
+    def test_dataclass_by_fields(self):
+        """Testa MatchInputs campo a campo"""
+        assert make_key(_inputs()) == make_key(_inputs())
+        assert make_key(_inputs(lambda_home=1.7)) != make_key(_inputs())
+        assert make_key(_inputs(context={'weights': [0.5, 0.5], 'league': 'EPL'})) == make_key(_inputs())
+
+    def test_nan_and_negative_zero(self):
+        """Testa normalização de NaN e -0.0"""
+        assert make_key(float('nan')) == make_key(np.nan)
+        assert make_key(-0.0) == make_key(0.0)
+
+    def test_unstable_arguments_rejected(self):
+        """Testa funções e estruturas com ciclo"""
+        with pytest.raises(UnstableKeyError):
+            make_key(lambda: None)
+        cyclic = []
+        cyclic.append(cyclic)
+        with pytest.raises(UnstableKeyError):
+            make_key(cyclic)
+
+    def test_stable_across_processes(self):
+        """Testa a mesma chave em outro interpretador (outro PYTHONHASHSEED)"""
+        code = (
+            "import numpy as np, pandas as pd\n"
+            "from utils.cache_keys import make_key\n"
+            "print(make_key({'b': {1, 2, 3}, 'a': 'x'}, np.arange(4), "
+            "pd.DataFrame({'c': [1.0, 2.0]}), team='Arsenal'))\n"
+        )
+        expected = make_key(
+            {'a': 'x', 'b': {3, 2, 1}}, np.arange(4), pd.DataFrame({'c': [1.0, 2.0]}), team='Arsenal'
+        )
+        for seed in ('1', '2'):
+            result = subprocess.run(
+                [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True,
+                env={'PYTHONHASHSEED': seed, 'PATH': '', 'PYTHONPATH': str(ROOT)}, check=True
+            )
+            assert result.stdout.strip() == expected
+
+    def test_fingerprint_is_fixed_length(self):
+        """Testa tamanho do hash independente do argumento"""
+        assert len(fingerprint('x')) == len(fingerprint(np.zeros(10_000))) == 32
+
+
+class TestCachedDecoratorKeys:
+    """Testes do decorador cached com argumentos complexos"""
+
+    def test_equal_arguments_hit_cache(self):
+        """Testa acerto com cópias iguais de DataFrame e MatchInputs"""
+        cache = CacheManager(use_redis=False)
+        calls = []
+
+        @cache.cached(ttl_seconds=60, prefix='pred')
+        def predict(df, inputs):
+            calls.append(1)
+            return float(df['xg'].sum()) + inputs.lambda_home
+
+        df = pd.DataFrame({'xg': [1.0, 2.0]})
+        assert predict(df, _inputs()) == predict(df.copy(), _inputs())
+        assert len(calls) == 1
+        predict(df, _inputs(lambda_home=2.0))
+        assert len(calls) == 2
+
+    def test_unstable_arguments_bypass_cache(self):
+        """Testa chamada sem cache quando o argumento não gera chave"""
+        cache = CacheManager(use_redis=False)
+
+        @cache.cached(ttl_seconds=60, prefix='fn')
+        def apply(fn):
+            return fn()
+
+        assert apply(lambda: 1) == 1
+        assert cache.get_stats()['cached_items'] == 0
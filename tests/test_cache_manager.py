@@ -2,7 +2,14 @@
 Testes para CacheManager
 """
 import pytest
+import re
+import threading
 import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from analysis.prediction import MatchInputs
 from utils.cache_manager import (
     CacheManager,
     get_cache_manager,
@@ -139,6 +146,307 @@ class TestCacheManager:
         assert cache.get('key') == 'value2'
 
 
+class TestCacheLimits:
+    """Testes dos limites de tamanho e do despejo LRU/LFU"""
+    
+    def test_lru_evicts_least_recently_used(self):
+        """Testa despejo do item menos usado recentemente"""
+        cache = CacheManager(use_redis=False, max_entries=3, max_bytes=0, eviction_policy='lru')
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key, ttl_seconds=60)
+        
+        cache.get('a')
+        cache.set('d', 'd', ttl_seconds=60)
+        
+        assert list(cache.memory_cache) == ['c', 'a', 'd']
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_lfu_evicts_least_frequently_used(self):
+        """Testa despejo do item menos acessado"""
+        cache = CacheManager(use_redis=False, max_entries=3, max_bytes=0, eviction_policy='lfu')
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key, ttl_seconds=60)
+        for _ in range(3):
+            cache.get('a')
+        cache.get('c')
+        
+        cache.set('d', 'd', ttl_seconds=60)
+        assert set(cache.memory_cache) == {'a', 'c', 'd'}
+        
+        # 'd' (1 acesso) sai antes de 'c' (2 acessos)
+        cache.set('e', 'e', ttl_seconds=60)
+        assert set(cache.memory_cache) == {'a', 'c', 'e'}
+    
+    def test_byte_limit_and_accounting(self):
+        """Testa contagem incremental de bytes e limite por tamanho"""
+        # Um shard: ordem LRU global, não apenas dentro de cada shard
+        cache = CacheManager(use_redis=False, max_entries=0, max_bytes=50_000, shards=1)
+        cache.set('small', 'x', ttl_seconds=60)
+        small_bytes = cache.get_stats()['memory_bytes']
+        assert small_bytes > 0
+        
+        for i in range(10):
+            cache.set(f'big_{i}', 'x' * 10_000, ttl_seconds=60)
+        
+        stats = cache.get_stats()
+        assert stats['memory_bytes'] <= 50_000
+        assert stats['cached_items'] < 11
+        assert 'small' not in cache.memory_cache
+        
+        # Valor maior que o limite não é armazenado
+        assert cache.set('huge', 'x' * 60_000, ttl_seconds=60) is False
+        assert cache.get('huge') is None
+        
+        cache.clear()
+        assert cache.get_stats()['memory_bytes'] == 0
+    
+    def test_overwrite_and_delete_update_bytes(self):
+        """Testa bytes após sobrescrever e deletar"""
+        cache = CacheManager(use_redis=False, max_entries=0, max_bytes=0)
+        cache.set('key', 'x' * 1000, ttl_seconds=60)
+        cache.set('key', 'x', ttl_seconds=60)
+        assert cache.get_stats()['memory_bytes'] < 1000
+        
+        cache.delete('key')
+        assert cache.get_stats()['memory_bytes'] == 0
+        assert cache.memory_cache == {} and cache.cache_timestamps == {}
+    
+    def test_expired_entries_swept_on_write(self):
+        """Testa remoção de expirados sem precisar lê-los"""
+        cache = CacheManager(use_redis=False, max_entries=0, max_bytes=0, shards=1)
+        for i in range(5):
+            cache.set(f'old_{i}', i, ttl_seconds=0)
+        cache.set('fresh', 1, ttl_seconds=60)
+        
+        assert list(cache.memory_cache) == ['fresh']
+        assert cache.get_stats()['expirations'] == 5
+    
+    def test_cleanup_expired_all_shards(self):
+        """Testa varredura completa de expirados em todos os shards"""
+        cache = CacheManager(use_redis=False, max_entries=0, max_bytes=0, shards=4)
+        for i in range(8):
+            cache.set(f'short_{i}', i, ttl_seconds=1)
+        cache.set('fresh', 1, ttl_seconds=60)
+        
+        time.sleep(1.1)
+        assert cache.cleanup_expired() == 8
+        assert list(cache.memory_cache) == ['fresh']
+    
+    def test_invalid_policy(self):
+        """Testa política de despejo inválida"""
+        with pytest.raises(ValueError):
+            CacheManager(use_redis=False, eviction_policy='fifo')
+
+
+class InProcessRedis:
+    """Substituto em processo do redis.Redis (só os comandos usados pelo cache)"""
+    
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+    
+    def ping(self):
+        return True
+    
+    def get(self, key):
+        self.commands.append('GET')
+        return self.data.get(key)
+    
+    def mget(self, keys):
+        self.commands.append('MGET')
+        return [self.data.get(key) for key in keys]
+    
+    def setex(self, key, ttl, value):
+        self.commands.append('SETEX')
+        assert isinstance(value, bytes) and ttl >= 1
+        self.data[key] = value
+    
+    def delete(self, *keys):
+        self.commands.append('DEL')
+        return sum(self.data.pop(key, None) is not None for key in keys)
+    
+    def scan_iter(self, match='*', count=None):
+        # Glob do Redis: \ escapa o próximo caractere
+        regex = ''.join(
+            re.escape(part[1]) if part.startswith('\\') else '.*' if part == '*' else '.' if part == '?' else re.escape(part)
+            for part in re.findall(r'\\.|.', match)
+        )
+        return [key for key in list(self.data) if re.fullmatch(regex, key)]
+    
+    def pipeline(self, transaction=True):
+        return InProcessPipeline(self)
+    
+    def info(self):
+        return {'used_memory_human': '1K', 'connected_clients': 1, 'total_commands_processed': len(self.commands)}
+
+
+class InProcessPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+    
+    def setex(self, key, ttl, value):
+        self.queued.append((key, value))
+        return self
+    
+    def execute(self):
+        self.client.commands.append('PIPELINE')
+        for key, value in self.queued:
+            self.client.data[key] = value
+        return [True] * len(self.queued)
+
+
+class TestRedisBackend:
+    """Testes do backend Redis com um substituto em processo"""
+    
+    @pytest.fixture
+    def redis_client(self):
+        return InProcessRedis()
+    
+    @pytest.fixture
+    def cache(self, redis_client):
+        return CacheManager(redis_client=redis_client, namespace='test')
+    
+    def test_binary_round_trip(self, cache, redis_client):
+        """Testa arrays NumPy, datetimes e dataclasses sem virar texto"""
+        match = MatchInputs(
+            home_team='Arsenal', away_team='Liverpool', round_number=2,
+            kickoff_utc=datetime(2025, 8, 22, 14, 0, tzinfo=timezone.utc),
+            lambda_home=1.7, lambda_away=1.4, mean_cards=3.8, mean_corners=10.0,
+        )
+        cache.set('matrix', np.eye(3), ttl_seconds=60)
+        cache.set('match', match, ttl_seconds=60)
+        
+        assert set(redis_client.data) == {'test:matrix', 'test:match'}
+        np.testing.assert_array_equal(cache.get('matrix'), np.eye(3))
+        assert cache.get('match') == match
+        assert cache.get('missing') is None
+    
+    def test_shared_between_instances(self, redis_client):
+        """Testa réplicas diferentes lendo o mesmo Redis"""
+        CacheManager(redis_client=redis_client, namespace='app').set('prediction', {'home': 0.5}, ttl_seconds=60)
+        assert CacheManager(redis_client=redis_client, namespace='app').get('prediction') == {'home': 0.5}
+        assert CacheManager(redis_client=redis_client, namespace='other').get('prediction') is None
+    
+    def test_batched_round_trips(self, cache, redis_client):
+        """Testa set_many/get_many com uma ida ao servidor cada"""
+        cache.set_many({f'round|{i}': {'round': i} for i in range(1, 6)}, ttl_seconds=60)
+        found = cache.get_many([f'round|{i}' for i in range(0, 7)])
+        
+        assert sorted(found) == [f'round|{i}' for i in range(1, 6)]
+        assert found['round|3'] == {'round': 3}
+        assert redis_client.commands == ['PIPELINE', 'MGET']
+    
+    def test_namespaced_invalidation(self, cache, redis_client):
+        """Testa invalidação por prefixo dentro do namespace"""
+        redis_client.data['foreign:match|1'] = b'x'
+        cache.set_many({'match|1': 1, 'match|2': 2, 'referee|1': 3, 'a*b': 4, 'axb': 5}, ttl_seconds=60)
+        
+        assert cache.delete_prefix('match|') == 2
+        assert cache.get_many(['match|1', 'referee|1']) == {'referee|1': 3}
+        
+        # Caracteres de glob no prefixo são literais
+        assert cache.delete_prefix('a*') == 1
+        assert cache.get('axb') == 5
+        
+        assert cache.clear() is True
+        assert set(redis_client.data) == {'foreign:match|1'}
+    
+    def test_memory_batch_and_prefix(self):
+        """Testa as mesmas operações no backend em memória"""
+        cache = CacheManager(use_redis=False)
+        cache.set_many({'match|1': 1, 'match|2': 2, 'other': 3}, ttl_seconds=60)
+        
+        assert cache.get_many(['match|1', 'missing']) == {'match|1': 1}
+        assert cache.delete_prefix('match|') == 2
+        assert list(cache.memory_cache) == ['other']
+
+
+class TestSingleFlight:
+    """Testes do agrupamento de chamadas concorrentes no decorator"""
+    
+    def _run_concurrently(self, func, n_threads=8):
+        barrier = threading.Barrier(n_threads)
+        results, errors = [], []
+        
+        def call():
+            barrier.wait()
+            try:
+                results.append(func('brasileirao'))
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=call) for _ in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results, errors
+    
+    @pytest.mark.parametrize('backend', ['memory', 'redis'])
+    def test_concurrent_misses_compute_once(self, backend):
+        """Testa que só a primeira chamada executa a função"""
+        if backend == 'redis':
+            cache = CacheManager(redis_client=InProcessRedis(), namespace='test')
+        else:
+            cache = CacheManager(use_redis=False)
+        calls = []
+        
+        @cache.cached(ttl_seconds=60, prefix='league')
+        def league_stats(league):
+            calls.append(league)
+            time.sleep(0.2)
+            return {'league': league, 'avg_goals': 2.5}
+        
+        results, errors = self._run_concurrently(league_stats)
+        
+        assert errors == []
+        assert calls == ['brasileirao']
+        assert results == [{'league': 'brasileirao', 'avg_goals': 2.5}] * 8
+        assert cache._inflight == {}
+    
+    def test_exception_propagates_to_waiters(self):
+        """Testa que a exceção do cálculo chega a todos que esperavam"""
+        cache = CacheManager(use_redis=False)
+        calls = []
+        
+        @cache.cached(ttl_seconds=60, prefix='api')
+        def api_result(league):
+            calls.append(league)
+            time.sleep(0.2)
+            raise ConnectionError('API fora do ar')
+        
+        results, errors = self._run_concurrently(api_result)
+        
+        assert results == []
+        assert len(errors) == 8
+        assert all(isinstance(e, ConnectionError) for e in errors)
+        assert len(calls) == 1
+        
+        # Próxima chamada tenta de novo
+        with pytest.raises(ConnectionError):
+            api_result('brasileirao')
+        assert len(calls) == 2
+    
+    def test_recursive_call_same_key(self):
+        """Testa chamada recursiva com a mesma chave sem deadlock"""
+        cache = CacheManager(use_redis=False)
+        
+        calls = []
+        
+        @cache.cached(ttl_seconds=60, prefix='rec')
+        def load_round(round_number):
+            calls.append(round_number)
+            if len(calls) == 1:
+                # Mesma chave dentro do próprio cálculo
+                return load_round(round_number)
+            return {'round': round_number}
+        
+        assert load_round(30) == {'round': 30}
+        assert calls == [30, 30]
+        assert load_round.__name__ == 'load_round'
+
+
 class TestCacheDecorators:
     """Testes para decorators de cache"""
     
@@ -211,6 +519,63 @@ class TestCacheConfig:
         assert CACHE_CONFIG['round_results']['prefix'] == 'round'
 
 
+class TestConcurrency:
+    """Testes de acesso concorrente aos shards"""
+    
+    def test_many_threads_exact_counts(self):
+        """Testa contagens exatas de acertos e falhas com muitas threads"""
+        cache = CacheManager(use_redis=False, max_entries=0, max_bytes=0, shards=8)
+        n_threads, n_keys = 16, 200
+        barrier = threading.Barrier(n_threads)
+        errors = []
+        
+        def worker(t):
+            try:
+                barrier.wait()
+                for i in range(n_keys):
+                    key = f't{t}_k{i}'
+                    assert cache.get(key) is None
+                    cache.set(key, (t, i), ttl_seconds=60)
+                    assert cache.get(key) == (t, i)
+                    assert cache.get(f'shared_{i % 10}') in (None, i % 10)
+                    cache.set(f'shared_{i % 10}', i % 10, ttl_seconds=60)
+            except Exception as e:  # pragma: no cover - reportado abaixo
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        stats = cache.get_stats()
+        total_gets = n_threads * n_keys * 3
+        assert stats['hits'] + stats['misses'] == total_gets
+        # Chaves próprias: uma falha e um acerto cada; compartilhadas: no máximo 10 falhas por thread
+        own_keys = n_threads * n_keys
+        assert own_keys <= stats['hits'] <= total_gets - own_keys
+        assert stats['misses'] - own_keys <= n_threads * 10
+        assert stats['sets'] == own_keys * 2
+        assert stats['cached_items'] == own_keys + 10
+    
+    def test_held_shard_does_not_block_others(self):
+        """Testa que um shard ocupado não bloqueia chaves de outros shards"""
+        cache = CacheManager(use_redis=False, shards=4)
+        busy = cache._shard('busy')
+        other = next(f'k{i}' for i in range(100) if cache._shard(f'k{i}') is not busy)
+        
+        done = threading.Event()
+        with busy.lock:
+            thread = threading.Thread(
+                target=lambda: (cache.set(other, 1, ttl_seconds=60), done.set())
+            )
+            thread.start()
+            assert done.wait(2)
+        thread.join()
+        assert cache.get(other) == 1
+
+
 class TestCachePerformance:
     """Testes de performance do cache"""
     
@@ -0,0 +1,137 @@
+"""
+Testes para o cache persistente em disco (SQLite)
+"""
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.cache import CacheManager
+from utils.disk_cache import DiskCache
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def no_refresh_thread(monkeypatch):
+    monkeypatch.setenv('CACHE_REFRESH_AHEAD', '0')
+
+
+class TestDiskCache:
+    """Testes da camada SQLite"""
+
+    def test_round_trip_with_ttl_metadata(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        now = time.time()
+        assert disk.set('matches', 'k', {'id': 1}, now, now + 60, now + 120)
+
+        value, created_at, expires_at = disk.get('matches', 'k')
+        assert value == {'id': 1}
+        assert (created_at, expires_at) == (now, now + 60)
+        assert disk.get('teams', 'k') is None
+
+        assert (tmp_path / 'cache.sqlite3').exists()
+
+    def test_entries_beyond_stale_window_ignored_and_purged(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        now = time.time()
+        disk.set('matches', 'old', 1, now - 100, now - 50, now - 10)
+        disk.set('matches', 'stale', 2, now - 100, now - 50, now + 60)
+
+        assert disk.get('matches', 'old') is None
+        assert disk.get('matches', 'stale')[0] == 2
+        assert disk.purge_expired() == 1
+        assert disk.count('matches') == 1
+
+    def test_unserializable_value_skipped(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        assert disk.set('matches', 'lock', threading.Lock(), 0, time.time() + 60, time.time() + 60) is False
+
+        cache = CacheManager(ttl_seconds=60, name='matches', disk=disk)
+        cache.set('lock', threading.Lock())
+        assert cache.get('lock') is not None
+
+    def test_visible_to_other_processes(self, tmp_path):
+        DiskCache(tmp_path)
+        code = (
+            "import time; from utils.disk_cache import DiskCache; "
+            f"d = DiskCache({str(tmp_path)!r}); now = time.time(); "
+            "d.set('matches', 'k', [1, 2, 3], now, now + 60, now + 60)"
+        )
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, timeout=60)
+
+        assert DiskCache(tmp_path).get('matches', 'k')[0] == [1, 2, 3]
+
+    def test_concurrent_writers_and_readers(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(20):
+                    now = time.time()
+                    disk.set('matches', f'{n}_{i}', i, now, now + 60, now + 60)
+                    assert disk.get('matches', f'{n}_{i}')[0] == i
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert disk.count('matches') == 80
+
+
+class TestPersistentCacheManager:
+    """Testes do CacheManager com a camada em disco"""
+
+    def test_warm_restart_promotes_to_memory(self, tmp_path):
+        before = CacheManager(ttl_seconds=60, name='matches', disk=DiskCache(tmp_path))
+        before.set('matches_1765_FINISHED_10', [{'id': 1}])
+
+        # Novo processo: memória vazia, mesmo diretório
+        after = CacheManager(ttl_seconds=60, name='matches', disk=DiskCache(tmp_path))
+        assert after.get('matches_1765_FINISHED_10') == [{'id': 1}]
+        assert after.get('matches_1765_FINISHED_10') == [{'id': 1}]
+
+        stats = after.get_stats()
+        assert (stats['disk_hits'], stats['hits']) == (1, 2)
+        assert after.get_ttl_remaining('matches_1765_FINISHED_10') > 50
+
+    def test_stale_disk_entry_served_while_refreshing(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        now = time.time()
+        disk.set('matches', 'k', 'old', now - 120, now - 60, now + 600)
+
+        cache = CacheManager(ttl_seconds=60, stale_ttl_seconds=600, name='matches', disk=disk)
+        assert cache.get_or_refresh('k', lambda: 'new') == 'old'
+        assert cache.wait_for_refreshes()
+
+        assert cache.get('k') == 'new'
+        assert CacheManager(ttl_seconds=60, name='matches', disk=DiskCache(tmp_path)).get('k') == 'new'
+
+    def test_clear_removes_namespace_only(self, tmp_path):
+        disk = DiskCache(tmp_path)
+        matches = CacheManager(ttl_seconds=60, name='matches', disk=disk)
+        teams = CacheManager(ttl_seconds=60, name='teams', disk=disk)
+        matches.set('k', 1)
+        teams.set('k', 2)
+
+        matches.clear()
+        assert disk.count('matches') == 0
+        assert CacheManager(ttl_seconds=60, name='teams', disk=disk).get('k') == 2
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv('PERSISTENT_CACHE_ENABLED', '0')
+        monkeypatch.setattr('utils.disk_cache._disk_cache', None)
+
+        cache = CacheManager(ttl_seconds=60, name='matches', persistent=True)
+        cache.set('k', 1)
+        assert cache.get('k') == 1
+        assert cache._disk is None and cache.persistent is False
@@ -0,0 +1,134 @@
+"""
+Testes para o cache HTTP em disco com revalidação (ETag / If-Modified-Since)
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.http_cache import HttpCache
+from utils.http_client import HttpClient
+
+LAST_MODIFIED = 'Wed, 01 Oct 2025 12:00:00 GMT'
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    """Recursos versionados: /etag usa ETag, /modified usa Last-Modified, /plain nenhum"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split('?')[0]
+        server.seen.append((path, dict(self.headers)))
+
+        etag = f'"v{server.version}"'
+        if path == '/etag' and self.headers.get('If-None-Match') == etag:
+            return self._reply(304, b'', {'ETag': etag, 'X-Requests-Available-Minute': '7'})
+        if path == '/modified' and self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            return self._reply(304, b'', {'Last-Modified': LAST_MODIFIED})
+
+        body = json.dumps({'path': path, 'version': server.version}).encode()
+        headers = {'Content-Type': 'application/json'}
+        if path == '/etag':
+            headers['ETag'] = etag
+        elif path == '/modified':
+            headers['Last-Modified'] = LAST_MODIFIED
+        self._reply(200, body, headers)
+
+    def _reply(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ConditionalHandler)
+    httpd.version = 1
+    httpd.seen = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(tmp_path):
+    return HttpClient(max_retries=0, cache=HttpCache(tmp_path / 'http'))
+
+
+class TestHttpCache:
+    """Testes da revalidação condicional"""
+
+    def test_etag_revalidation_survives_restart(self, server, tmp_path):
+        first = _client(tmp_path).get(f'{server.url}/etag', params={'season': 2025})
+        assert first.json() == {'path': '/etag', 'version': 1}
+
+        # Novo cliente (processo reiniciado) com o mesmo diretório
+        client = _client(tmp_path)
+        second = client.get(f'{server.url}/etag', params={'season': 2025})
+
+        assert server.seen[-1][1].get('If-None-Match') == '"v1"'
+        assert second.status_code == 200
+        assert second.from_cache is True
+        assert second.json() == {'path': '/etag', 'version': 1}
+        # Cabeçalhos da resposta 304 (cota) chegam ao chamador
+        assert second.headers['X-Requests-Available-Minute'] == '7'
+        assert client.cache.get_stats()['revalidated'] == 1
+
+    def test_changed_resource_replaces_entry(self, server, tmp_path):
+        client = _client(tmp_path)
+        client.get(f'{server.url}/etag')
+        server.version = 2
+
+        changed = client.get(f'{server.url}/etag')
+        assert changed.json()['version'] == 2
+        assert not getattr(changed, 'from_cache', False)
+
+        again = client.get(f'{server.url}/etag')
+        assert again.from_cache is True
+        assert again.json()['version'] == 2
+
+    def test_last_modified_revalidation(self, server, tmp_path):
+        client = _client(tmp_path)
+        client.get(f'{server.url}/modified')
+        response = client.get(f'{server.url}/modified')
+
+        assert server.seen[-1][1].get('If-Modified-Since') == LAST_MODIFIED
+        assert response.from_cache is True
+        assert response.json()['path'] == '/modified'
+
+    def test_responses_without_validators_are_not_stored(self, server, tmp_path):
+        client = _client(tmp_path)
+        client.get(f'{server.url}/plain')
+        client.get(f'{server.url}/plain')
+
+        assert 'If-None-Match' not in server.seen[-1][1]
+        assert client.cache.get_stats()['stored'] == 0
+
+    def test_entry_is_single_file_without_credentials(self, server, tmp_path):
+        client = _client(tmp_path)
+        client.get(f'{server.url}/etag', params={'apiKey': 'secret-key'})
+
+        files = [path for path in (tmp_path / 'http').rglob('*') if path.is_file()]
+        assert [path.suffix for path in files] == ['.entry']
+        assert b'secret-key' not in files[0].read_bytes()
+
+        again = client.get(f'{server.url}/etag', params={'apiKey': 'secret-key'})
+        assert again.from_cache is True
+        assert again.json() == {'path': '/etag', 'version': 1}
+
+    def test_key_depends_on_params_and_headers(self, tmp_path):
+        cache = HttpCache(tmp_path)
+        base = cache.key('http://api/x', {'a': 1, 'b': 2}, {'X-Auth-Token': 't'})
+        assert base == cache.key('http://api/x', {'b': 2, 'a': 1}, {'x-auth-token': 't'})
+        assert base != cache.key('http://api/x', {'a': 1}, {'X-Auth-Token': 't'})
+        assert base != cache.key('http://api/x', {'a': 1, 'b': 2}, {'X-Auth-Token': 'u'})
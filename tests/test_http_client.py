@@ -0,0 +1,114 @@
+"""
+Testes para o cliente HTTP compartilhado (pool, keep-alive e retry) contra um servidor local
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.http_client import HttpClient
+from utils.request_scheduler import ProviderQuota, RequestScheduler
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Respostas roteirizadas por caminho: cada chamada consome o próximo status"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.client_ports.append(self.client_address[1])
+        script = server.scripts.get(self.path.split('?')[0], [(200, {})])
+        status, headers = script.pop(0) if len(script) > 1 else script[0]
+
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    httpd.scripts = {}
+    httpd.client_ports = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client():
+    sleeps = []
+    client = HttpClient(max_retries=3, backoff_factor=0.1, sleep=sleeps.append)
+    client.sleeps = sleeps
+    yield client
+    client.close()
+
+
+class TestHttpClient:
+    """Testes do cliente com pool de conexões"""
+
+    def test_keep_alive_reuses_connection(self, server, client):
+        for _ in range(5):
+            assert client.get(f'{server.url}/ok').json() == {'path': '/ok'}
+        # Mesma porta de origem = mesma conexão TCP
+        assert len(set(server.client_ports)) == 1
+
+    def test_retries_server_errors_with_backoff(self, server, client):
+        server.scripts['/flaky'] = [(503, {}), (502, {}), (200, {})]
+        response = client.get(f'{server.url}/flaky')
+
+        assert response.status_code == 200
+        assert len(client.sleeps) == 2
+        assert 0 <= client.sleeps[0] <= 0.1
+        assert 0 <= client.sleeps[1] <= 0.2
+        assert client.get_stats()['retries'] == 2
+
+    def test_honors_retry_after(self, server, client):
+        server.scripts['/limited'] = [(429, {'Retry-After': '2'}), (200, {})]
+        assert client.get(f'{server.url}/limited').status_code == 200
+        assert client.sleeps == [2.0]
+
+    def test_long_retry_after_returns_response(self, server, client):
+        server.scripts['/limited'] = [(429, {'Retry-After': '3600'}), (200, {})]
+        assert client.get(f'{server.url}/limited').status_code == 429
+        assert client.sleeps == []
+
+    def test_gives_up_after_max_retries(self, server, client):
+        server.scripts['/down'] = [(500, {})]
+        assert client.get(f'{server.url}/down').status_code == 500
+        assert len(client.sleeps) == 3
+
+    def test_client_errors_are_not_retried(self, server, client):
+        server.scripts['/missing'] = [(404, {})]
+        assert client.get(f'{server.url}/missing').status_code == 404
+        assert client.sleeps == []
+
+    def test_connection_errors_are_retried(self, client):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get('http://127.0.0.1:9/unreachable', timeout=0.5)
+        assert len(client.sleeps) == 3
+
+    def test_scheduler_sends_through_client(self, server, client, tmp_path):
+        scheduler = RequestScheduler(
+            {'football_data': ProviderQuota('football_data', rate=10, per_seconds=60)},
+            state_file=tmp_path / 'quota.json',
+            http_client=client,
+        )
+        server.scripts['/competitions/BSA/matches'] = [(200, {'X-Requests-Available-Minute': '4'})]
+
+        response = scheduler.get('football_data', f'{server.url}/competitions/BSA/matches')
+        assert response.json() == {'path': '/competitions/BSA/matches'}
+        assert scheduler.get_stats()['providers']['football_data']['tokens_available'] <= 4.01
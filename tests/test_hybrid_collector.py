@@ -0,0 +1,147 @@
+"""
+Testes para as tabelas em memória do HybridDataCollector
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from data.collectors import hybrid_collector
+from data.collectors.hybrid_collector import HybridDataCollector
+
+MATCHES_CSV = """id,round,date,home_team,away_team,home_score,away_score,status
+1,1,2025-04-13 16:00,Flamengo,Palmeiras,2,1,FINISHED
+2,1,2025-04-13 18:30,Botafogo,Santos,0,0,FINISHED
+3,2,2025-04-20 16:00,Palmeiras,Botafogo,1,3,FINISHED
+4,2,2025-04-20 18:30,Santos,Flamengo,,,SCHEDULED
+"""
+
+PREMIER_CSV = """date_GMT,status,home_team_name,away_team_name,Game Week
+Aug 15 2025 - 7:00pm,complete,Liverpool,Bournemouth,1
+Aug 22 2025 - 7:00pm,scheduled,Bournemouth,Arsenal,2
+"""
+
+
+@pytest.fixture
+def collector(tmp_path):
+    HybridDataCollector.clear_table_cache()
+    collector = HybridDataCollector()
+    collector.csv_path = tmp_path
+    (tmp_path / '2025_matches.csv').write_text(MATCHES_CSV, encoding='utf-8')
+    yield collector
+    HybridDataCollector.clear_table_cache()
+
+
+@pytest.fixture
+def read_counter(monkeypatch):
+    calls = []
+    original = pd.read_csv
+
+    def counting_read_csv(path, *args, **kwargs):
+        calls.append(str(path))
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(hybrid_collector.pd, 'read_csv', counting_read_csv)
+    return calls
+
+
+class TestHybridTables:
+    """Testes do cache de tabelas normalizadas"""
+
+    def test_file_parsed_once_across_calls(self, collector, read_counter):
+        collector.get_matches()
+        collector.get_matches(round_number=2)
+        collector.get_match('Flamengo', 'Palmeiras')
+        collector.get_team_stats('Botafogo')
+        collector.get_csv_info()
+
+        # Outra instância (nova execução do Streamlit) reaproveita a tabela
+        other = HybridDataCollector()
+        other.csv_path = collector.csv_path
+        other.get_matches(team='Santos')
+
+        assert read_counter.count(str(collector.csv_path / '2025_matches.csv')) == 1
+
+    def test_filters_use_indexes(self, collector):
+        assert [m['id'] for m in collector.get_matches(round_number=2)] == [3, 4]
+        assert [m['id'] for m in collector.get_matches(team='Flamengo')] == [1, 4]
+        assert [m['id'] for m in collector.get_matches(team='Flamengo', status='FINISHED')] == [1]
+        assert [m['id'] for m in collector.get_matches(round_number=1, team='Santos')] == [2]
+        assert collector.get_matches(round_number=9) == []
+
+        stats = collector.get_team_stats('Botafogo')
+        assert (stats['matches_played'], stats['wins'], stats['draws']) == (2, 1, 1)
+
+    def test_returned_matches_are_copies(self, collector):
+        collector.get_matches(round_number=1)[0]['odds'] = {'home': 1.9}
+        assert 'odds' not in collector.get_matches(round_number=1)[0]
+
+    def test_reloads_when_file_changes(self, collector, read_counter):
+        assert len(collector.get_matches()) == 4
+
+        matches_file = collector.csv_path / '2025_matches.csv'
+        stat = matches_file.stat()
+        matches_file.write_text(MATCHES_CSV + '5,3,2025-04-27 16:00,Flamengo,Botafogo,,,SCHEDULED\n',
+                                encoding='utf-8')
+        os.utime(matches_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert [m['id'] for m in collector.get_matches(round_number=3)] == [5]
+        assert len(read_counter) == 2
+
+    def test_premier_league_columns_normalized(self, collector):
+        (collector.csv_path / '2025_matches.csv').write_text(PREMIER_CSV, encoding='utf-8')
+
+        finished = collector.get_matches(status='FINISHED')
+        assert [m['home_team'] for m in finished] == ['Liverpool']
+        assert finished[0]['date'] == 'Aug 15 2025 - 7:00pm'
+        assert [m['status'] for m in collector.get_matches(round_number=2, team='Arsenal')] == ['SCHEDULED']
+
+    def test_standings_latest_round(self, collector):
+        (collector.csv_path / '2025_standings.csv').write_text(
+            'round,position,team\n1,2,Flamengo\n1,1,Botafogo\n2,2,Botafogo\n2,1,Flamengo\n',
+            encoding='utf-8'
+        )
+        assert [row['team'] for row in collector.get_standings()] == ['Flamengo', 'Botafogo']
+        assert [row['team'] for row in collector.get_standings(round_number=1)] == ['Botafogo', 'Flamengo']
+
+    def test_all_team_stats_match_single_team(self, collector):
+        all_stats = collector.get_all_team_stats()
+        assert set(all_stats) == {'Flamengo', 'Palmeiras', 'Botafogo', 'Santos'}
+        assert all_stats['Palmeiras'] == collector.get_team_stats('Palmeiras')
+        assert (all_stats['Palmeiras']['goals_for'], all_stats['Palmeiras']['goals_against']) == (2, 5)
+        assert all_stats['Palmeiras']['losses'] == 2
+        assert all_stats['Palmeiras']['avg_goals_against'] == 2.5
+
+        home = collector.get_all_team_stats(venue='HOME')
+        assert home['Botafogo']['matches_played'] == 1
+        assert 'Santos' not in home
+        assert collector.get_team_stats('Santos', venue='HOME')['matches_played'] == 0
+
+    def test_all_team_stats_cached_per_file_version(self, collector):
+        collector.get_all_team_stats()['Flamengo']['wins'] = 99
+        assert collector.get_all_team_stats()['Flamengo']['wins'] == 1
+
+        table = collector._load_table(collector.csv_path / '2025_matches.csv', hybrid_collector.MatchTable)
+        assert collector.get_all_team_stats(venue='AWAY') is not table.team_stats('AWAY')
+        assert table.team_stats('AWAY') is table.team_stats('AWAY')
+
+    def test_round_read_from_parquet_before_full_table(self, tmp_path):
+        pytest.importorskip('pyarrow')
+        from data.parquet_store import export_csv
+
+        league_dir = tmp_path / 'csv' / 'brasileirao'
+        league_dir.mkdir(parents=True)
+        (league_dir / '2025_matches.csv').write_text(MATCHES_CSV, encoding='utf-8')
+        export_csv(league_dir / '2025_matches.csv')
+        HybridDataCollector.clear_table_cache()
+        collector = HybridDataCollector()
+        collector.csv_path = league_dir
+
+        assert [m['id'] for m in collector.get_matches(round_number=2)] == [3, 4]
+        assert [len(table) for _, table in HybridDataCollector._tables.values()] == [2]
+
+        # Depois da tabela completa, as rodadas saem dela
+        assert len(collector.get_matches()) == 4
+        assert [m['id'] for m in collector.get_matches(round_number=1)] == [1, 2]
+        assert len(HybridDataCollector._tables) == 2
+        HybridDataCollector.clear_table_cache()
@@ -0,0 +1,105 @@
+"""
+Testes para o índice de partidas da temporada (H2H, estatísticas e forma em memória)
+"""
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from data.collector import FootballDataCollector, summarize_team_stats
+from data.match_index import MatchIndex
+from utils.cache import matches_cache
+
+BRASILEIRAO_CSV = Path(__file__).parent.parent / 'data' / 'csv' / 'brasileirao' / '2025_matches.csv'
+
+
+def _match(match_id, date, home_id, away_id, home_goals, away_goals, status='FINISHED'):
+    return {
+        'id': match_id,
+        'utcDate': date,
+        'status': status,
+        'homeTeam': {'id': home_id, 'name': f'Time {home_id}'},
+        'awayTeam': {'id': away_id, 'name': f'Time {away_id}'},
+        'score': {'fullTime': {'home': home_goals, 'away': away_goals}},
+    }
+
+
+SEASON = [
+    _match(3, '2025-05-01T19:00:00Z', 20, 10, 0, 0),
+    _match(1, '2025-04-01T19:00:00Z', 10, 20, 2, 1),
+    _match(2, '2025-04-15T19:00:00Z', 10, 30, 1, 3),
+    _match(4, '2025-05-20T19:00:00Z', 30, 20, 2, 2),
+    _match(5, '2025-06-01T19:00:00Z', 10, 20, None, None, status='SCHEDULED'),
+]
+
+
+@pytest.fixture
+def index():
+    return MatchIndex(SEASON)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    matches_cache.clear()
+    yield
+    matches_cache.clear()
+
+
+class TestMatchIndex:
+    """Testes do índice em memória"""
+
+    def test_ignores_unfinished_and_sorts(self, index):
+        assert len(index) == 4
+        assert [m['id'] for m in index.team_matches(10)] == [1, 2, 3]
+
+    def test_h2h_unordered_pair_most_recent_first(self, index):
+        h2h = index.h2h(20, 10)
+        assert [m['date'] for m in h2h] == ['2025-05-01T19:00:00Z', '2025-04-01T19:00:00Z']
+        assert index.h2h(10, 20, limit=1)[0]['home_team'] == 'Time 20'
+        assert index.h2h(10, 99) == []
+
+    def test_stats_and_form(self, index):
+        stats = index.team_stats(10, venue='HOME')
+        assert stats == summarize_team_stats(index.team_matches(10), 10, 'HOME')
+        assert stats['matches_played'] == 2
+        assert stats['wins_home'] == 1
+        assert index.form(10) == 'WLD'
+        assert index.team_stats(30, venue='AWAY')['goals_for_away'] == 3
+
+    def test_from_csv(self):
+        index = MatchIndex.from_csv(BRASILEIRAO_CSV)
+        # Flamengo x Palmeiras (rodada 1) com IDs do teams.csv
+        assert index.team_name(1) == 'Flamengo'
+        h2h = index.h2h(2, 1)
+        assert h2h and h2h[-1]['home_goals'] == 2
+        assert all(m['status'] == 'FINISHED' for m in index.matches)
+
+
+class TestCollectorUsesIndex:
+    """FootballDataCollector responde H2H e estatísticas pelo índice"""
+
+    def test_one_request_for_many_queries(self, monkeypatch):
+        collector = FootballDataCollector()
+        calls = []
+
+        def fake_get(endpoint, params=None):
+            calls.append(endpoint)
+            response = Mock()
+            response.json.return_value = {'matches': SEASON}
+            return response
+
+        monkeypatch.setattr(collector, '_get', fake_get)
+
+        assert len(collector.get_h2h(10, 20)) == 2
+        assert len(collector.get_h2h(30, 20)) == 1
+        assert collector.calculate_team_stats(10, venue='HOME')['matches_played'] == 2
+        assert collector.calculate_team_stats(20, venue='AWAY')['matches_played'] == 2
+
+        assert calls == [f'{collector.base_url}/competitions/BSA/matches']
+
+    def test_falls_back_to_team_matches(self, monkeypatch):
+        collector = FootballDataCollector()
+        monkeypatch.setattr(collector, 'get_match_index', lambda *args, **kwargs: MatchIndex([]))
+        monkeypatch.setattr(collector, 'get_team_matches', lambda *args, **kwargs: SEASON[:4])
+
+        assert len(collector.get_h2h(10, 20)) == 2
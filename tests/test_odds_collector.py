@@ -0,0 +1,86 @@
+"""
+Testes para o snapshot de odds por rodada do OddsCollector
+"""
+import pytest
+
+from data.odds_collector import OddsCollector, OddsSnapshot
+from utils.cache import odds_cache
+
+
+def _event(event_id, home, away, prices):
+    return {
+        'id': event_id,
+        'home_team': home,
+        'away_team': away,
+        'commence_time': '2025-11-02T19:00:00Z',
+        'bookmakers': [{
+            'title': 'Bet A',
+            'last_update': '2025-11-01T12:00:00Z',
+            'markets': [{
+                'key': 'h2h',
+                'outcomes': [
+                    {'name': home, 'price': prices[0]},
+                    {'name': 'Draw', 'price': prices[1]},
+                    {'name': away, 'price': prices[2]},
+                ]
+            }]
+        }]
+    }
+
+
+ROUND_EVENTS = [
+    _event('e1', 'Flamengo', 'Botafogo', (1.90, 3.40, 4.10)),
+    _event('e2', 'São Paulo', 'Internacional', (2.20, 3.10, 3.40)),
+    _event('e3', 'Grêmio', 'Atlético-MG', (2.60, 3.20, 2.80)),
+]
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    """Collector com a chamada HTTP substituída por um contador"""
+    odds_cache.clear()
+    collector = OddsCollector(api_key='test-key')
+    calls = []
+
+    def fake_get_odds(sport_key=None):
+        calls.append(sport_key)
+        return ROUND_EVENTS
+
+    monkeypatch.setattr(collector, 'get_odds', fake_get_odds)
+    collector.calls = calls
+    yield collector
+    odds_cache.clear()
+
+
+class TestOddsSnapshot:
+    """Testes do snapshot indexado"""
+
+    def test_lookup_is_normalized(self):
+        snapshot = OddsSnapshot('soccer_brazil_campeonato', ROUND_EVENTS)
+        assert len(snapshot) == 3
+        assert snapshot.get('SAO PAULO', 'internacional')['match_id'] == 'e2'
+        assert snapshot.get('Gremio', 'Atletico-MG')['best_odds']['away_win'] == 2.80
+        assert snapshot.get('Flamengo', 'Vasco') is None
+
+    def test_one_fetch_per_round(self, collector):
+        for event in ROUND_EVENTS:
+            odds = collector.get_match_odds(event['home_team'], event['away_team'])
+            assert odds['match_id'] == event['id']
+
+        assert collector.calls == ['soccer_brazil_campeonato']
+
+    def test_snapshot_shared_between_instances(self, collector):
+        collector.get_snapshot()
+        other = OddsCollector(api_key='test-key')
+        assert other.get_match_odds('Flamengo', 'Botafogo')['match_id'] == 'e1'
+        assert len(collector.calls) == 1
+
+    def test_force_refresh(self, collector):
+        collector.get_snapshot()
+        collector.get_snapshot(force_refresh=True)
+        assert len(collector.calls) == 2
+
+    def test_empty_fetch_not_cached(self, collector, monkeypatch):
+        monkeypatch.setattr(collector, 'get_odds', lambda sport_key=None: [])
+        assert collector.get_match_odds('Flamengo', 'Botafogo') is None
+        assert odds_cache.get_stats()['cached_items'] == 0
@@ -0,0 +1,183 @@
+"""
+Testes para o histórico de odds (OddsHistoryStore)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from data.odds_history import OddsHistoryStore
+
+
+def _events(home_price, over_price=None):
+    markets = [{
+        'key': 'h2h',
+        'outcomes': [
+            {'name': 'Flamengo', 'price': home_price},
+            {'name': 'Draw', 'price': 3.40},
+            {'name': 'Botafogo', 'price': 4.00},
+        ]
+    }]
+    if over_price is not None:
+        markets.append({
+            'key': 'totals',
+            'outcomes': [
+                {'name': 'Over', 'point': 2.5, 'price': over_price},
+                {'name': 'Under', 'point': 2.5, 'price': 1.90},
+            ]
+        })
+    return [
+        {
+            'id': 'e1',
+            'home_team': 'Flamengo',
+            'away_team': 'Botafogo',
+            'commence_time': '2025-11-02T19:00:00Z',
+            'bookmakers': [
+                {'title': 'Bet A', 'last_update': 'x', 'markets': markets},
+                {'title': 'Bet B', 'last_update': 'x', 'markets': markets[:1]},
+            ]
+        },
+        {
+            'id': 'e2',
+            'home_team': 'Palmeiras',
+            'away_team': 'Corinthians',
+            'commence_time': '2025-11-02T21:00:00Z',
+            'bookmakers': [{
+                'title': 'Bet A',
+                'last_update': 'x',
+                'markets': [{
+                    'key': 'h2h',
+                    'outcomes': [
+                        {'name': 'Palmeiras', 'price': 1.80},
+                        {'name': 'Draw', 'price': 3.60},
+                        {'name': 'Corinthians', 'price': 4.50},
+                    ]
+                }]
+            }]
+        },
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store com três coletas em dias diferentes"""
+    store = OddsHistoryStore(tmp_path)
+    store.append_snapshot('soccer_brazil_campeonato', _events(2.00, 1.95),
+                          datetime(2025, 10, 28, 12, 0, tzinfo=timezone.utc))
+    store.append_snapshot('soccer_brazil_campeonato', _events(1.90, 1.85),
+                          datetime(2025, 10, 30, 12, 0, tzinfo=timezone.utc))
+    store.append_snapshot('soccer_brazil_campeonato', _events(1.75),
+                          datetime(2025, 11, 2, 18, 0, tzinfo=timezone.utc))
+    return store
+
+
+class TestOddsHistoryStore:
+    """Testes do store colunar append-only"""
+
+    def test_partition_layout(self, store, tmp_path):
+        league_dir = tmp_path / 'soccer_brazil_campeonato'
+        assert (league_dir / 'index.jsonl').exists()
+        assert len(list((league_dir / '2025-10-28' / '1x2').glob('*.npz'))) == 1
+        assert len(list((league_dir / '2025-10-28' / 'over_under_25').glob('*.npz'))) == 1
+        # Última coleta não tem totals
+        assert not (league_dir / '2025-11-02' / 'over_under_25').exists()
+
+    def test_query_range(self, store):
+        df = store.query('soccer_brazil_campeonato', '1x2', start='2025-10-29', end='2025-11-02')
+        assert sorted(df['timestamp'].unique()) == [
+            int(datetime(2025, 10, 30, 12, tzinfo=timezone.utc).timestamp()),
+            int(datetime(2025, 11, 2, 18, tzinfo=timezone.utc).timestamp()),
+        ]
+        assert list(df.columns[:3]) == ['match_id', 'bookmaker', 'timestamp']
+
+    def test_opening_and_closing(self, store):
+        opening = store.opening_odds('soccer_brazil_campeonato', '1x2')
+        closing = store.closing_odds('soccer_brazil_campeonato', '1x2')
+
+        assert len(opening) == 3  # (e1, A), (e1, B), (e2, A)
+        row_open = opening[(opening.match_id == 'e1') & (opening.bookmaker == 'Bet A')].iloc[0]
+        row_close = closing[(closing.match_id == 'e1') & (closing.bookmaker == 'Bet A')].iloc[0]
+        assert row_open['home_win'] == pytest.approx(2.00)
+        assert row_close['home_win'] == pytest.approx(1.75)
+
+    def test_movement_series(self, store):
+        df = store.movement('soccer_brazil_campeonato', 'e1', bookmaker='Bet A')
+        assert len(df) == 3
+        assert df['home_win_change'].iloc[-1] == pytest.approx(-0.25)
+        assert str(df['fetched_at'].dt.tz) == 'UTC'
+
+    def test_iter_segments_prunes_by_match(self, store):
+        frames = list(store.iter_segments('soccer_brazil_campeonato', 'over_under_25', match_id='e2'))
+        assert frames == []
+        frames = list(store.iter_segments('soccer_brazil_campeonato', 'over_under_25', match_id='e1'))
+        assert len(frames) == 2
+        assert all(set(frame['match_id']) == {'e1'} for frame in frames)
+
+    def test_compact_merges_partition(self, tmp_path):
+        store = OddsHistoryStore(tmp_path)
+        league = 'soccer_brazil_campeonato'
+        for hour, price in ((9, 2.10), (12, 2.00), (15, 1.95)):
+            store.append_snapshot(league, _events(price), datetime(2025, 10, 28, hour, tzinfo=timezone.utc))
+        partition = tmp_path / league / '2025-10-28' / '1x2'
+        before = store.query(league, '1x2')
+        assert len(list(partition.glob('*.npz'))) == 3
+
+        assert store.compact(league, before='2025-10-29') == 1
+        assert len(list(partition.glob('*.npz'))) == 1
+        assert len((partition / 'index.jsonl').read_text().splitlines()) == 1
+        pd.testing.assert_frame_equal(store.query(league, '1x2'), before)
+        assert store.opening_odds(league, '1x2')['home_win'].max() == pytest.approx(2.10)
+        # Já compactada
+        assert store.compact(league, before='2025-10-29') == 0
+
+    def test_new_day_compacts_previous_partitions(self, tmp_path):
+        store = OddsHistoryStore(tmp_path)
+        league = 'soccer_brazil_campeonato'
+        store.append_snapshot(league, _events(2.00), datetime(2025, 10, 28, 9, tzinfo=timezone.utc))
+        store.append_snapshot(league, _events(1.90), datetime(2025, 10, 28, 18, tzinfo=timezone.utc))
+        store.append_snapshot(league, _events(1.80), datetime(2025, 10, 29, 9, tzinfo=timezone.utc))
+
+        assert len(list((tmp_path / league / '2025-10-28' / '1x2').glob('*.npz'))) == 1
+        assert len(store.movement(league, 'e1', bookmaker='Bet A')) == 3
+        assert tmp_path / league / '2025-10-29' / '1x2' / 'index.jsonl' in store.index_files(league)
+
+    def test_concurrent_compaction_does_not_duplicate_rows(self, tmp_path):
+        league = 'soccer_brazil_campeonato'
+        writer = OddsHistoryStore(tmp_path)
+        for hour, price in ((9, 2.10), (12, 2.00), (15, 1.95)):
+            writer.append_snapshot(league, _events(price), datetime(2025, 10, 28, hour, tzinfo=timezone.utc))
+        before = writer.query(league, '1x2')
+
+        # Cada instância abre o próprio arquivo de lock, como processos distintos
+        stores = [OddsHistoryStore(tmp_path) for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            compacted = list(pool.map(lambda store: store.compact(league, before='2025-10-29'), stores))
+
+        partition = tmp_path / league / '2025-10-28' / '1x2'
+        assert sorted(compacted) == [0, 0, 0, 1]
+        assert len(list(partition.glob('*.npz'))) == 1
+        pd.testing.assert_frame_equal(writer.query(league, '1x2'), before)
+
+    def test_compaction_waits_for_partition_lock(self, tmp_path):
+        league = 'soccer_brazil_campeonato'
+        store = OddsHistoryStore(tmp_path)
+        for hour in (9, 12):
+            store.append_snapshot(league, _events(2.00), datetime(2025, 10, 28, hour, tzinfo=timezone.utc))
+
+        other = OddsHistoryStore(tmp_path)
+        with other._partition_lock(league, '2025-10-28', '1x2'):
+            thread = threading.Thread(target=store.compact, args=(league, '2025-10-29'))
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+            assert len((tmp_path / league / '2025-10-28' / '1x2' / 'index.jsonl').read_text().splitlines()) == 2
+        thread.join(5)
+        assert not thread.is_alive()
+        assert len(list((tmp_path / league / '2025-10-28' / '1x2').glob('*.npz'))) == 1
+
+    def test_unknown_league_and_market(self, store):
+        assert store.query('soccer_epl', '1x2').empty
+        with pytest.raises(ValueError):
+            store.query('soccer_brazil_campeonato', 'btts')
@@ -0,0 +1,145 @@
+"""
+Testes para OddsMatrix (melhor preço, remoção de margem e arbitragem)
+"""
+import numpy as np
+import pytest
+
+from data.odds_collector import OddsCollector
+from data.odds_matrix import OddsMatrix, remove_margin, OUTCOME_INDEX
+
+
+def _bookmaker(title, home, draw, away, over=None, under=None):
+    markets = [{
+        'key': 'h2h',
+        'outcomes': [
+            {'name': 'Flamengo', 'price': home},
+            {'name': 'Draw', 'price': draw},
+            {'name': 'Palmeiras', 'price': away},
+        ]
+    }]
+    if over is not None:
+        markets.append({
+            'key': 'totals',
+            'outcomes': [
+                {'name': 'Over', 'point': 2.5, 'price': over},
+                {'name': 'Under', 'point': 2.5, 'price': under},
+                {'name': 'Over', 'point': 3.5, 'price': 9.99},
+            ]
+        })
+    return {'title': title, 'last_update': '2025-11-01T12:00:00Z', 'markets': markets}
+
+
+@pytest.fixture
+def events():
+    """Dois jogos, três casas (uma ausente no segundo jogo)"""
+    return [
+        {
+            'id': 'm1',
+            'home_team': 'Flamengo',
+            'away_team': 'Palmeiras',
+            'commence_time': '2025-11-02T19:00:00Z',
+            'bookmakers': [
+                _bookmaker('Bet A', 2.10, 3.30, 3.60, 1.90, 1.95),
+                _bookmaker('Bet B', 2.00, 3.50, 3.80, 2.05, 1.80),
+                _bookmaker('Bet C', 2.05, 3.40, 3.70),
+            ]
+        },
+        {
+            'id': 'm2',
+            'home_team': 'Flamengo',
+            'away_team': 'Palmeiras',
+            'commence_time': '2025-11-09T19:00:00Z',
+            'bookmakers': [
+                _bookmaker('Bet A', 2.50, 3.00, 3.00),
+                _bookmaker('Bet C', 3.20, 4.00, 4.20),
+            ]
+        },
+    ]
+
+
+class TestOddsMatrix:
+    """Testes da matriz densa de odds"""
+
+    def test_shape_and_missing_values(self, events):
+        matrix = OddsMatrix.from_events(events)
+        assert matrix.shape == (2, 3, 5)
+        assert matrix.bookmakers == ['Bet A', 'Bet B', 'Bet C']
+        # Bet B não cota o segundo jogo
+        assert np.all(np.isnan(matrix.prices[1, 1]))
+        # Linha 3.5 é ignorada
+        assert matrix.prices[0, 0, OUTCOME_INDEX['over_25']] == 1.90
+
+    def test_best_and_average_odds(self, events):
+        matrix = OddsMatrix.from_events(events)
+        best = matrix.best_odds()
+        average = matrix.average_odds()
+
+        assert best[0, OUTCOME_INDEX['home_win']] == 2.10
+        assert best[0, OUTCOME_INDEX['away_win']] == 3.80
+        assert average[0, OUTCOME_INDEX['draw']] == pytest.approx((3.30 + 3.50 + 3.40) / 3)
+        # Sem cotação de totals no segundo jogo
+        assert best[1, OUTCOME_INDEX['over_25']] == 0
+        assert matrix.best_bookmakers()[1, OUTCOME_INDEX['over_25']] == -1
+
+    def test_arbitrage_scan(self, events):
+        matrix = OddsMatrix.from_events(events)
+        opportunities = matrix.arbitrage_opportunities()
+
+        # Jogo 2: 1/3.2 + 1/4.0 + 1/4.2 < 1
+        assert len(opportunities) == 1
+        arb = opportunities[0]
+        assert arb['match_id'] == 'm2'
+        assert arb['market'] == '1x2'
+        assert arb['profit'] > 0
+        assert arb['legs']['home_win']['bookmaker'] == 'Bet C'
+        stakes = sum(leg['stake_fraction'] for leg in arb['legs'].values())
+        assert stakes == pytest.approx(1.0)
+
+    def test_processed_format_matches_collector(self, events):
+        processed = OddsCollector()._process_match_odds(events[0])
+
+        assert processed['match_id'] == 'm1'
+        assert len(processed['bookmakers']) == 3
+        assert processed['bookmakers'][2]['odds'] == {'home_win': 2.05, 'draw': 3.40, 'away_win': 3.70}
+        assert processed['best_odds']['over_25'] == 2.05
+        assert processed['average_odds']['under_25'] == pytest.approx(1.875)
+
+
+class TestMarginRemoval:
+    """Testes dos métodos de remoção de margem"""
+
+    @pytest.mark.parametrize('method', ['proportional', 'shin', 'power'])
+    def test_probabilities_sum_to_one(self, method):
+        odds = np.array([[2.10, 3.30, 3.60], [1.50, 4.20, 6.50]])
+        probs = remove_margin(odds, method=method)
+        assert np.allclose(probs.sum(axis=1), 1.0)
+        assert np.all(probs > 0)
+
+    @pytest.mark.parametrize('method', ['shin', 'power'])
+    def test_favourite_longshot_adjustment(self, method):
+        """Shin e potência tiram mais margem do azarão que o proporcional"""
+        odds = np.array([1.30, 5.00, 11.0])
+        proportional = remove_margin(odds, method='proportional')
+        adjusted = remove_margin(odds, method=method)
+        assert adjusted[0] > proportional[0]
+        assert adjusted[2] < proportional[2]
+
+    def test_two_way_shin(self):
+        probs = remove_margin(np.array([1.90, 1.90]), method='shin')
+        assert np.allclose(probs, [0.5, 0.5])
+
+    def test_missing_odds_propagate_nan(self):
+        probs = remove_margin(np.array([[2.0, np.nan, 3.0]]), method='power')
+        assert np.all(np.isnan(probs))
+
+    def test_invalid_method(self):
+        with pytest.raises(ValueError):
+            remove_margin(np.array([2.0, 2.0]), method='unknown')
+
+    def test_collector_process_odds(self, events):
+        processed = OddsCollector().process_odds(events, margin_method='shin')
+        fair = processed[0]['fair_probabilities']
+        total = fair['home_win'] + fair['draw'] + fair['away_win']
+        assert total == pytest.approx(1.0)
+        assert processed[1]['fair_probabilities']['over_25'] is None
+        assert processed[1]['arbitrage'][0]['market'] == '1x2'
@@ -0,0 +1,79 @@
+"""
+Testes para o armazenamento Parquet opcional dos CSV das ligas
+"""
+import os
+
+import pytest
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+from data.parquet_store import export_csv, has_fresh_parquet, parquet_path_for, read_frame, round_filter
+
+MATCHES_CSV = """round,home_team,away_team,kickoff_utc,lambda_home,status
+2,Santos,Flamengo,2025-04-20T18:30:00Z,1.3,SCHEDULED
+1,Flamengo,Palmeiras,2025-04-13T16:00:00Z,1.8,FINISHED
+1,Botafogo,Santos,2025-04-13T18:30:00Z,,FINISHED
+3,Flamengo,Botafogo,2025-04-27T16:00:00Z,1.6,SCHEDULED
+"""
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    league_dir = tmp_path / 'csv' / 'brasileirao'
+    league_dir.mkdir(parents=True)
+    path = league_dir / '2025_matches.csv'
+    path.write_text(MATCHES_CSV, encoding='utf-8')
+    return path
+
+
+class TestParquetStore:
+    """Testes de exportação e leitura com filtros"""
+
+    def test_partitioned_path(self, csv_file, tmp_path):
+        assert parquet_path_for(csv_file) == (
+            tmp_path / 'parquet' / 'brasileirao' / 'matches' / 'season=2025' / 'data.parquet'
+        )
+
+    def test_one_row_group_per_round(self, csv_file):
+        path = export_csv(csv_file)
+
+        metadata = pq.ParquetFile(path).metadata
+        assert metadata.num_row_groups == 3
+        assert has_fresh_parquet(csv_file)
+        assert pq.read_schema(path).field('round').type == 'int64'
+
+    def test_round_filter_matches_csv(self, csv_file):
+        expected = read_frame(csv_file, filters=[('round', '==', 1)])
+        export_csv(csv_file)
+        result = read_frame(csv_file, filters=[('round', '==', 1)])
+
+        assert list(result['home_team']) == ['Flamengo', 'Botafogo'] == list(expected['home_team'])
+        assert result['lambda_home'].isna().tolist() == [False, True]
+
+    def test_column_projection_and_team_filter(self, csv_file):
+        export_csv(csv_file)
+        result = read_frame(csv_file, columns=['round', 'missing'], filters=[('home_team', 'in', ['Flamengo'])])
+
+        assert list(result.columns) == ['round']
+        assert sorted(result['round']) == [1, 3]
+
+    def test_round_filter_only_with_fresh_parquet(self, csv_file):
+        assert round_filter(csv_file, 2) is None
+        export_csv(csv_file)
+        assert round_filter(csv_file, '2') == [('round', '==', 2)]
+
+    def test_newer_csv_wins(self, csv_file):
+        export_csv(csv_file)
+        stat = parquet_path_for(csv_file).stat()
+        csv_file.write_text(MATCHES_CSV + '4,Palmeiras,Santos,2025-05-04T16:00:00Z,1.5,SCHEDULED\n',
+                            encoding='utf-8')
+        os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert not has_fresh_parquet(csv_file)
+        assert list(read_frame(csv_file, filters=[('round', '>=', 4)])['home_team']) == ['Palmeiras']
+
+    def test_disabled_by_env(self, csv_file, monkeypatch):
+        monkeypatch.setenv('PARQUET_ENABLED', '0')
+        assert export_csv(csv_file) is None
+        assert not parquet_path_for(csv_file).exists()
+        assert len(read_frame(csv_file)) == 4
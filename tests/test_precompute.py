@@ -0,0 +1,163 @@
+"""
+Testes para o pré-cálculo das próximas rodadas (analysis/precompute.py)
+"""
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from analysis.precompute import (
+    LeagueSource,
+    PrecomputeService,
+    get_precomputed_round,
+    upcoming_rounds,
+    value_metrics,
+)
+from analysis.prediction import MatchInputs
+from analysis.prediction_store import PredictionStore
+from data.odds_history import OddsHistoryStore
+from utils.disk_cache import DiskCache
+
+
+def _match(home, away, kickoff, status='SCHEDULED', lambda_home=1.5, odds=None):
+    return MatchInputs(
+        home_team=home, away_team=away, round_number=0, kickoff_utc=kickoff,
+        lambda_home=lambda_home, lambda_away=1.1, mean_cards=4.0, mean_corners=10.0,
+        context={'status': status, 'odds': odds or {}},
+    )
+
+
+@pytest.fixture
+def league_csv(tmp_path):
+    path = tmp_path / 'matches.csv'
+    path.write_text('round\n1\n')
+    return path
+
+
+@pytest.fixture
+def rounds():
+    return {
+        1: [_match('A', 'B', datetime(2025, 1, 1, tzinfo=timezone.utc), status='FINISHED')],
+        2: [_match('C', 'D', datetime(2025, 1, 8, 18), odds={'home': 2.5, 'draw': 3.2, 'away': 3.0})],
+        3: [_match('E', 'F', datetime(2025, 1, 15, 18))],
+        4: [_match('G', 'H', datetime(2025, 1, 22, 18))],
+    }
+
+
+@pytest.fixture
+def service(tmp_path, league_csv, rounds):
+    disk = DiskCache(tmp_path / 'store')
+    calls = []
+
+    def load():
+        calls.append(1)
+        return rounds
+
+    sources = {
+        'test': LeagueSource('test', 'soccer_test', load, lambda: [league_csv]),
+        'later': LeagueSource('later', 'soccer_later', lambda: {
+            7: [_match('X', 'Y', datetime(2025, 1, 2, 12))],
+        }, lambda: [league_csv]),
+    }
+    svc = PrecomputeService(
+        store=PredictionStore(disk=disk), disk=disk, n_sims=(2000,),
+        odds_history=OddsHistoryStore(tmp_path / 'odds'), sources=sources,
+    )
+    svc.load_calls = calls
+    return svc
+
+
+class TestUpcomingRounds:
+    """Testes da seleção de rodadas pendentes"""
+
+    def test_skips_finished_and_limits_count(self, rounds):
+        """Testa rodada atual e seguinte, ignorando rodadas encerradas"""
+        selected = upcoming_rounds(rounds, count=2)
+        assert [round_number for round_number, _ in selected] == [2, 3]
+        # Horário sem fuso tratado como UTC
+        assert selected[0][1] == datetime(2025, 1, 8, 18, tzinfo=timezone.utc).timestamp()
+
+    def test_value_metrics(self):
+        """Testa EV e Kelly com as fórmulas do app"""
+        assert value_metrics(0.5, 2.5) == pytest.approx({'odd': 2.5, 'ev': 0.25, 'kelly': 0.25 / 1.5})
+        assert value_metrics(0.3, 2.0)['kelly'] is None
+        assert value_metrics(0.5, None) == {'odd': None, 'ev': None, 'kelly': None}
+
+
+class TestPrecomputeService:
+    """Testes da fila e da gravação dos resumos"""
+
+    def test_scan_only_when_files_change(self, service, league_csv):
+        """Testa que a fila só recebe rodadas quando os arquivos mudam"""
+        assert service.scan() == 3
+        assert service.scan() == 0
+        assert len(service.load_calls) == 1
+
+        service.run_pending()
+        league_csv.write_text('round\n1\n2\n')
+        assert service.scan() == 3
+
+    def test_invalidation_after_scan_recomputes(self, service):
+        """Testa que invalidate() depois do cálculo re-enfileira as rodadas"""
+        assert service.run_once() == 3
+        assert service.scan() == 0
+
+        service.store.invalidate()
+        assert get_precomputed_round('test', 2, 2000, disk=service.disk, store=service.store) is None
+        assert service.run_once() == 3
+        summary = get_precomputed_round('test', 2, 2000, disk=service.disk, store=service.store)
+        assert summary['generation'] == service.store.generation()
+
+    def test_requeued_round_uses_latest_matches(self, service, rounds, league_csv):
+        """Testa que a rodada ainda na fila é calculada com os dados da última varredura"""
+        assert service.scan() == 3
+        rounds[2] = [_match('C', 'D', datetime(2025, 1, 8, 18), lambda_home=3.0)]
+        league_csv.write_text('round\n1\n2\n')
+        assert service.scan() == 0
+
+        assert service.run_pending() == 3
+        summary = get_precomputed_round('test', 2, 2000, disk=service.disk, store=service.store)
+        assert summary['matches'][0]['prediction']['lambda_home'] == 3.0
+        assert service.get_stats()['jobs'] == 3
+
+    def test_next_kickoff_processed_first(self, service):
+        """Testa a prioridade pelo próximo kickoff entre ligas"""
+        service.scan()
+        order = []
+        while not service._queue.empty():
+            job = service._queue.get_nowait()
+            order.append((job.league, job.round_number))
+        assert order == [('later', 7), ('test', 2), ('test', 3)]
+
+    def test_round_summary_and_store_hits(self, service):
+        """Testa resumo com EV/Kelly e previsão já disponível para a UI"""
+        assert service.run_once() == 3
+
+        summary = get_precomputed_round('test', 2, 2000, disk=service.disk, store=service.store)
+        row = summary['matches'][0]
+        p_home = row['prediction']['p_home_win']
+        assert row['value']['home']['ev'] == pytest.approx(p_home * 2.5 - 1)
+        assert get_precomputed_round('test', 1, 2000, disk=service.disk, store=service.store) is None
+
+        # A UI lê a mesma chave do PredictionStore
+        match = _match('C', 'D', datetime(2025, 1, 8, 18))
+        assert service.store.get(match, 2000)['p_home_win'] == p_home
+
+    def test_odds_history_preferred_over_csv(self, service):
+        """Testa odds mais recentes do histórico (melhor preço entre casas)"""
+        now = datetime.now(timezone.utc)
+        events = [{
+            'id': 'm1', 'home_team': 'C', 'away_team': 'D', 'commence_time': now.isoformat(),
+            'bookmakers': [
+                {'key': key, 'markets': [{'key': 'h2h', 'outcomes': [
+                    {'name': 'C', 'price': price}, {'name': 'Draw', 'price': 3.4}, {'name': 'D', 'price': 2.9},
+                ]}]}
+                for key, price in (('book1', 2.6), ('book2', 2.8))
+            ],
+        }]
+        service.odds_history.append_snapshot('soccer_test', events, fetched_at=now)
+
+        service.run_once()
+        row = get_precomputed_round('test', 2, 2000, disk=service.disk, store=service.store)['matches'][0]
+        assert row['value']['home']['odd'] == 2.8
+        assert row['value']['draw']['odd'] == 3.4
@@ -0,0 +1,187 @@
+"""
+Testes para o micro-batching e o serviço HTTP de previsões
+"""
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from analysis.precompute import LeagueSource, PrecomputeService
+from analysis.prediction import MatchInputs, run_prediction, run_predictions_batch
+from analysis.prediction_service import PredictionService, make_server
+from analysis.prediction_store import PredictionStore
+from data.odds_history import OddsHistoryStore
+from utils.disk_cache import DiskCache
+from utils.micro_batch import MicroBatcher
+
+
+def _match(home, away, lambda_home=1.5, lambda_away=1.1, status='SCHEDULED'):
+    return MatchInputs(
+        home_team=home, away_team=away, round_number=1, kickoff_utc=datetime(2025, 1, 8, 18),
+        lambda_home=lambda_home, lambda_away=lambda_away, mean_cards=4.0, mean_corners=10.0,
+        context={'status': status, 'odds': {'home': 2.2, 'draw': 3.3, 'away': 3.4}},
+    )
+
+
+@pytest.fixture
+def service(tmp_path):
+    disk = DiskCache(tmp_path / 'store')
+    store = PredictionStore(disk=disk)
+    rounds = {
+        1: [_match('A', 'B', status='FINISHED')],
+        2: [_match('C', 'D'), _match('E', 'F', lambda_home=2.0)],
+    }
+    precompute = PrecomputeService(
+        store=store, disk=disk, n_sims=(2000,), odds_history=OddsHistoryStore(tmp_path / 'odds'),
+        sources={'test': LeagueSource('test', 'soccer_test', lambda: rounds, lambda: [])},
+    )
+    svc = PredictionService(store=store, precompute=precompute, window_seconds=0.05, default_n_sim=2000)
+    yield svc
+    svc.close()
+
+
+@pytest.fixture
+def server(service):
+    httpd = make_server('127.0.0.1', 0, service)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _request(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestMicroBatcher:
+    """Testes do agrupamento de chamadas concorrentes"""
+
+    def test_concurrent_items_share_batch(self):
+        """Testa que chamadas dentro da janela viram um único lote"""
+        batches = []
+
+        def handler(items):
+            batches.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(handler, window_seconds=0.1, max_batch=100)
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(batcher.process, range(10)))
+        batcher.close()
+
+        assert results == [item * 2 for item in range(10)]
+        assert len(batches) < 10
+        assert batcher.get_stats()['items'] == 10
+
+    def test_max_batch_and_errors(self):
+        """Testa limite do lote e exceções por item"""
+        def handler(items):
+            return [ValueError(item) if item < 0 else item for item in items]
+
+        batcher = MicroBatcher(handler, window_seconds=0.05, max_batch=2)
+        futures = [batcher.submit(item) for item in (1, -1, 2)]
+        assert futures[0].result(2) == 1
+        with pytest.raises(ValueError):
+            futures[1].result(2)
+        assert futures[2].result(2) == 2
+        batcher.close()
+        assert batcher.get_stats()['largest_batch'] <= 2
+
+
+class TestBatchPrediction:
+    """Testes da simulação vetorizada"""
+
+    def test_batch_matches_single_run_layout_and_values(self):
+        """Testa mesmo formato e probabilidades próximas de run_prediction"""
+        matches = [_match('A', 'B'), _match('C', 'D', lambda_home=2.5, lambda_away=0.6)]
+        batch = run_predictions_batch(matches, n_sim=50_000)
+        for match, result in zip(matches, batch):
+            single = run_prediction(match, n_sim=50_000, seed=1)
+            assert set(result) == set(single)
+            for key in ('p_home_win', 'p_draw', 'p_away_win', 'p_over_2_5', 'p_btts'):
+                assert result[key] == pytest.approx(single[key], abs=0.02)
+            probabilities = [line['probability'] for line in result['scoreline_top']]
+            assert len(probabilities) == 5 and probabilities == sorted(probabilities, reverse=True)
+
+
+class TestPredictionService:
+    """Testes dos endpoints HTTP"""
+
+    def test_concurrent_match_requests_are_batched(self, service, server):
+        """Testa partidas concorrentes agrupadas e com EV/Kelly"""
+        payloads = [
+            {'home_team': f'H{i}', 'away_team': f'A{i}', 'lambda_home': 1.0 + i / 10, 'lambda_away': 1.2,
+             'odds': {'home': 2.5, 'draw': 3.2, 'away': 3.0}, 'bankroll': 1000}
+            for i in range(8)
+        ]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda payload: _request(f'{server}/v1/match', payload), payloads))
+
+        assert all(status == 200 for status, _ in responses)
+        body = responses[0][1]
+        p_home = body['prediction']['p_home_win']
+        assert body['value']['home']['ev'] == pytest.approx(p_home * 2.5 - 1)
+        assert 'stake' in body['value']['home']
+        assert service.batcher.get_stats()['batches'] < 8
+
+    def test_seeded_request_is_reproducible(self, server):
+        """Testa que seed reproduz run_prediction"""
+        payload = {'home_team': 'A', 'away_team': 'B', 'lambda_home': 1.5, 'lambda_away': 1.1,
+                   'n_sim': 3000, 'seed': 42}
+        status, body = _request(f'{server}/v1/match', payload)
+        expected = run_prediction(_match('A', 'B'), n_sim=3000, seed=42)
+        assert status == 200
+        assert body['prediction']['p_home_win'] == expected['p_home_win']
+
+    def test_dixon_coles_model(self, server):
+        """Testa o modelo Dixon-Coles analítico"""
+        payload = {'home_team': 'A', 'away_team': 'B', 'lambda_home': 1.5, 'lambda_away': 1.1,
+                   'model': 'dixon_coles', 'league': 'brasileirao'}
+        status, body = _request(f'{server}/v1/match', payload)
+        assert status == 200
+        probabilities = body['prediction']
+        assert probabilities['p_home_win'] + probabilities['p_draw'] + probabilities['p_away_win'] == pytest.approx(1)
+
+    def test_round_and_league(self, server):
+        """Testa rodada (calculada e depois pré-calculada) e liga inteira"""
+        status, body = _request(f'{server}/v1/round?league=test&round=2')
+        assert status == 200 and body['source'] == 'computed'
+        assert len(body['matches']) == 2
+
+        status, body = _request(f'{server}/v1/round?league=test&round=2')
+        assert body['source'] == 'precomputed'
+
+        status, body = _request(f'{server}/v1/league?league=test')
+        assert [entry['round'] for entry in body['rounds']] == [2]
+        status, body = _request(f'{server}/v1/league?league=test&all=1')
+        assert [entry['round'] for entry in body['rounds']] == [1, 2]
+
+    def test_round_recomputed_after_invalidation(self, service, server):
+        """Testa que invalidar o armazenamento descarta os resumos pré-calculados"""
+        assert _request(f'{server}/v1/round?league=test&round=2')[1]['source'] == 'computed'
+        assert _request(f'{server}/v1/round?league=test&round=2')[1]['source'] == 'precomputed'
+
+        service.store.invalidate()
+        status, body = _request(f'{server}/v1/round?league=test&round=2')
+        assert status == 200 and body['source'] == 'computed'
+        assert body['generation'] == service.store.generation()
+        assert _request(f'{server}/v1/round?league=test&round=2')[1]['source'] == 'precomputed'
+
+    def test_errors(self, server):
+        """Testa respostas 400 e 404"""
+        assert _request(f'{server}/v1/match', {'home_team': 'A'})[0] == 400
+        assert _request(f'{server}/v1/match', {'home_team': 'A', 'away_team': 'B', 'lambda_home': -1,
+                                               'lambda_away': 1})[0] == 400
+        assert _request(f'{server}/v1/round?league=test&round=99')[0] == 404
+        assert _request(f'{server}/v1/round?league=nope&round=1')[0] == 404
+        assert _request(f'{server}/v1/unknown')[0] == 404
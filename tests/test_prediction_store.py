@@ -0,0 +1,99 @@
+"""
+Testes para o armazenamento compartilhado de previsões (analysis/prediction_store.py)
+"""
+import pytest
+
+from analysis import prediction_store as store_module
+from analysis.prediction import MatchInputs
+from analysis.prediction_store import PredictionStore, prediction_key
+from utils.disk_cache import DiskCache
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return DiskCache(tmp_path)
+
+
+def _match(**overrides):
+    values = dict(
+        home_team='Arsenal', away_team='Chelsea', round_number=5, kickoff_utc='2024-09-01T15:00:00Z',
+        lambda_home=1.6, lambda_away=1.1, mean_cards=4.2, mean_corners=10.5,
+        context={'venue': 'Emirates'}, raw_row={'id': 1},
+    )
+    values.update(overrides)
+    return MatchInputs(**values)
+
+
+class TestPredictionKey:
+    """Testes do fingerprint das entradas"""
+
+    def test_ignores_irrelevant_fields(self):
+        """Testa que raw_row, context e nomes não mudam a chave"""
+        base = prediction_key(_match(), 1000)
+        assert prediction_key(_match(raw_row={'id': 2}, context={}, home_team='Spurs'), 1000) == base
+
+    def test_relevant_inputs_change_key(self):
+        """Testa lambdas, n_sim, seed e versão do modelo"""
+        base = prediction_key(_match(), 1000)
+        assert prediction_key(_match(lambda_home=1.7), 1000) != base
+        assert prediction_key(_match(), 2000) != base
+        assert prediction_key(_match(), 1000, seed=7) != base
+
+    def test_lambda_fallbacks_are_coerced(self):
+        """Testa lambda tipado usado direto e fallbacks de context/raw_row convertidos"""
+        assert prediction_key(_match(lambda_home=1.6, context={'lambda_home': '9'}), 1000) == \
+            prediction_key(_match(), 1000)
+        from_context = _match(lambda_home=None, context={'lambda_home': '1.6'})
+        assert prediction_key(from_context, 1000) == prediction_key(_match(), 1000)
+        from_raw_row = _match(lambda_home=float('nan'), context={}, raw_row={'home_xg': 1.6})
+        assert prediction_key(from_raw_row, 1000) == prediction_key(_match(), 1000)
+
+    def test_model_version_changes_key(self, monkeypatch):
+        """Testa que uma nova versão do modelo não reutiliza previsões"""
+        base = prediction_key(_match(), 1000)
+        monkeypatch.setattr(store_module, 'MODEL_VERSION', 'poisson-mc-2')
+        assert prediction_key(_match(), 1000) != base
+
+
+class TestPredictionStore:
+    """Testes de leitura, escrita e invalidação"""
+
+    def test_compute_once_and_return_copies(self, disk):
+        """Testa reuso da simulação e cópia independente por chamada"""
+        store = PredictionStore(disk=disk)
+        first = store.get_or_compute(_match(), 2000, seed=1)
+        first['edge_home'] = 1.0
+
+        second = store.get_or_compute(_match(raw_row={'id': 9}), 2000, seed=1)
+        assert 'edge_home' not in second
+        assert second['p_home_win'] == first['p_home_win']
+        assert store.get_stats()['hits'] == 1
+
+    def test_shared_between_processes(self, disk, tmp_path):
+        """Testa outra instância (outro processo) lendo a mesma previsão"""
+        PredictionStore(disk=disk).get_or_compute(_match(), 2000, seed=1)
+
+        other = PredictionStore(disk=DiskCache(tmp_path))
+        assert other.get(_match(), 2000, seed=1) is not None
+        assert other._cache.get_stats()['disk_hits'] == 1
+
+    def test_invalidate_reaches_other_processes(self, disk, tmp_path, monkeypatch):
+        """Testa invalidação vista por outra instância após a nova leitura da geração"""
+        monkeypatch.setattr(store_module, 'GENERATION_CHECK_SECONDS', 0)
+        reader = PredictionStore(disk=disk)
+        reader.get_or_compute(_match(), 2000, seed=1)
+
+        writer = PredictionStore(disk=DiskCache(tmp_path))
+        assert writer.invalidate() == 1
+
+        assert reader.get(_match(), 2000, seed=1) is None
+        assert reader.get_stats()['generation'] == 1
+        assert disk.count(store_module.NAMESPACE) == 0
+
+    def test_memory_only(self):
+        """Testa funcionamento sem cache em disco"""
+        store = PredictionStore(persistent=False)
+        store.get_or_compute(_match(), 1000, seed=3)
+        assert store.get(_match(), 1000, seed=3) is not None
+        store.invalidate()
+        assert store.get(_match(), 1000, seed=3) is None
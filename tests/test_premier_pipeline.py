@@ -0,0 +1,148 @@
+"""
+Testes para o pipeline de rodadas da Premier League (CSV → MatchInputs)
+"""
+import os
+
+import pytest
+
+from analysis import premier_league_data_pipeline as pipeline
+from data import schema
+
+MATCHES_CSV = """timestamp,date_GMT,status,home_team_name,away_team_name,referee,Game Week,Home Team Pre-Match xG,Away Team Pre-Match xG,average_cards_per_match_pre_match,average_corners_per_match_pre_match,odds_ft_home_team_win,odds_ft_draw,odds_ft_away_team_win,stadium_name
+1755284400,Aug 15 2025 - 7:00pm,complete,Liverpool,Bournemouth,Anthony Taylor,1,2.10,0.90,4.0,11.0,1.30,5.50,9.00,Anfield
+1755871200,Aug 22 2025 - 2:00pm,incomplete,Arsenal,Liverpool,N/A,2,,,,,0,3.40,N/A,N/A
+,Aug 23 2025 - 3:00pm,incomplete,Bournemouth,Unknown FC,,2,1.00,1.20,2.0,9.0,2.50,3.20,2.90,Vitality Stadium
+"""
+
+TEAMS_CSV = """team_name,common_name,matches_played_home,matches_played_away,xg_for_avg_home,xg_for_avg_away,xg_for_avg_overall,xg_against_avg_home,xg_against_avg_away,goals_scored_per_match_home,goals_scored_per_match,goals_conceded_per_match_home,goals_conceded_per_match,points_per_game_home,points_per_game
+Liverpool FC,Liverpool,5,5,2.20,1.80,2.00,0.90,1.10,2.6,2.4,0.8,1.0,2.6,2.3
+Arsenal FC,Arsenal,5,5,2.00,1.70,1.85,0.70,0.80,2.2,2.0,0.6,0.7,2.4,2.5
+AFC Bournemouth,Bournemouth,5,5,1.40,1.10,1.25,1.30,1.50,1.4,1.2,1.2,1.4,1.6,1.5
+"""
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    (tmp_path / '2025_matches.csv').write_text(MATCHES_CSV, encoding='utf-8')
+    (tmp_path / '2025_teams.csv').write_text(TEAMS_CSV, encoding='utf-8')
+    monkeypatch.setattr(pipeline, 'MATCHES_CSV', tmp_path / '2025_matches.csv')
+    monkeypatch.setattr(pipeline, 'TEAMS_CSV', tmp_path / '2025_teams.csv')
+    monkeypatch.setattr(pipeline, '_pipeline', None)
+    monkeypatch.setattr(pipeline, '_round_pipelines', {})
+    yield tmp_path
+
+
+@pytest.fixture
+def load_counter(monkeypatch):
+    calls = []
+    original = schema.load_table
+
+    def counting_load_table(csv_file, *args, **kwargs):
+        calls.append(os.path.basename(csv_file))
+        return original(csv_file, *args, **kwargs)
+
+    monkeypatch.setattr(pipeline, 'load_table', counting_load_table)
+    return calls
+
+
+class TestPremierPipeline:
+    """Testes do pipeline parseado uma vez e indexado por Game Week"""
+
+    def test_files_parsed_once_across_rounds(self, data_dir, load_counter):
+        for _ in range(3):
+            pipeline.load_premier_round_matches(1)
+            pipeline.load_premier_round_matches(2)
+        pipeline.get_premier_pipeline().all_matches()
+
+        assert sorted(load_counter) == ['2025_matches.csv', '2025_teams.csv']
+
+    def test_round_index(self, data_dir):
+        premier = pipeline.get_premier_pipeline()
+        assert premier.rounds() == [1, 2]
+        assert [(m.home_team, m.away_team) for m in premier.round_matches(2)] == [
+            ('Arsenal', 'Liverpool'), ('Bournemouth', 'Unknown FC')
+        ]
+        assert premier.round_matches(9) == []
+        with pytest.raises(ValueError):
+            pipeline.load_premier_round_matches(9)
+
+    def test_lambdas_and_context(self, data_dir):
+        match = pipeline.load_premier_round_matches(1)[0]
+
+        # (ataque 2.20 * 0.65 + defesa visitante 1.50 * 0.35) * 0.7 + xG pré-jogo 2.10 * 0.3
+        assert match.lambda_home == pytest.approx((2.20 * 0.65 + 1.50 * 0.35) * 0.7 + 2.10 * 0.3)
+        assert match.lambda_away == pytest.approx((1.10 * 0.65 + 0.90 * 0.35) * 0.7 + 0.90 * 0.3)
+        assert match.mean_cards == pytest.approx((2.2 + 1.8) / 2)
+        assert match.mean_corners == 11.0
+        assert match.kickoff_utc.isoformat() == '2025-08-15T19:00:00+00:00'
+
+        context = match.context
+        assert context['status'] == 'FINISHED'
+        assert context['venue'] == 'Anfield'
+        assert context['referee'] == 'Anthony Taylor'
+        assert context['odds']['home'] == 1.30
+        assert context['odds']['over_25'] is None
+        assert context['team_stats']['home']['matches_played'] == 5
+        assert context['team_stats']['home']['attack_strength'] == pytest.approx(2.6 / pipeline.PREMIER_TEAM_AVG_GOALS)
+        assert match.raw_row['home_team_name'] == 'Liverpool'
+        assert match.raw_row['Game Week'] == 1
+
+    def test_defaults_for_missing_values(self, data_dir):
+        arsenal, bournemouth = pipeline.load_premier_round_matches(2)
+
+        assert arsenal.context['odds']['home'] is None
+        assert arsenal.context['referee'] is None
+        assert arsenal.context['venue'] == 'Arsenal'
+        assert arsenal.context['expected_goals']['pre_match'] == {'home': None, 'away': None}
+        assert arsenal.mean_corners == pipeline.DEFAULT_CORNERS_PER_MATCH
+
+        # Time fora do CSV de times e jogo sem timestamp
+        assert bournemouth.context['team_stats']['away'] == pipeline._default_team_stats(is_home=False)
+        assert bournemouth.kickoff_utc.isoformat() == '2025-08-23T15:00:00+00:00'
+
+    def test_returned_objects_are_independent(self, data_dir):
+        pipeline.load_premier_round_matches(1)[0].context['team_stats']['home']['form_points'] = 0
+        assert pipeline.load_premier_round_matches(1)[0].context['team_stats']['home']['form_points'] == pytest.approx(13.0)
+
+    def test_reloads_when_file_changes(self, data_dir, load_counter):
+        assert len(pipeline.load_premier_round_matches(2)) == 2
+
+        matches_file = data_dir / '2025_matches.csv'
+        stat = matches_file.stat()
+        matches_file.write_text(MATCHES_CSV + ',Aug 30 2025 - 3:00pm,incomplete,Liverpool,Arsenal,,3,,,,,,,,\n',
+                                encoding='utf-8')
+        os.utime(matches_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert [m.home_team for m in pipeline.load_premier_round_matches(3)] == ['Liverpool']
+        assert len(load_counter) == 4
+
+    def test_missing_csv(self, data_dir):
+        (data_dir / '2025_teams.csv').unlink()
+        with pytest.raises(FileNotFoundError):
+            pipeline.load_premier_round_matches(1)
+
+    def test_single_round_read_from_parquet(self, tmp_path, monkeypatch, load_counter):
+        pytest.importorskip('pyarrow')
+        from data.parquet_store import export_csv
+
+        league_dir = tmp_path / 'csv' / 'premier_league'
+        league_dir.mkdir(parents=True)
+        (league_dir / '2025_matches.csv').write_text(MATCHES_CSV, encoding='utf-8')
+        (league_dir / '2025_teams.csv').write_text(TEAMS_CSV, encoding='utf-8')
+        for name in ('2025_matches.csv', '2025_teams.csv'):
+            export_csv(league_dir / name)
+        monkeypatch.setattr(pipeline, 'MATCHES_CSV', league_dir / '2025_matches.csv')
+        monkeypatch.setattr(pipeline, 'TEAMS_CSV', league_dir / '2025_teams.csv')
+        monkeypatch.setattr(pipeline, '_pipeline', None)
+        monkeypatch.setattr(pipeline, '_round_pipelines', {})
+
+        matches = pipeline.load_premier_round_matches(2)
+        assert [m.home_team for m in matches] == ['Arsenal', 'Bournemouth']
+        assert pipeline._round_pipelines[2].rounds() == [2]
+        assert pipeline.load_premier_round_matches(2)[0].lambda_home == matches[0].lambda_home
+        assert len(load_counter) == 2
+
+        # Com a temporada completa carregada, rodadas saem dela
+        full = pipeline.get_premier_pipeline()
+        assert pipeline.load_premier_round_matches(1)[0].context == full.round_matches(1)[0].context
+        assert len(load_counter) == 4
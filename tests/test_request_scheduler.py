@@ -0,0 +1,218 @@
+"""
+Testes para o agendador central de requisições (cotas, prioridades e deduplicação)
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from utils.request_scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    ProviderQuota,
+    RateLimitExceeded,
+    RequestScheduler,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1_760_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _response(status_code=200, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    """Agendador com cotas pequenas e envio HTTP substituído"""
+    providers = {
+        'football_data': ProviderQuota('football_data', rate=3, per_seconds=60, interactive_reserve=1),
+        'odds_api': ProviderQuota('odds_api', rate=100, per_seconds=1, monthly_limit=10, monthly_reserve=4),
+    }
+    scheduler = RequestScheduler(providers, state_file=tmp_path / 'quota.json')
+    scheduler.sent = []
+
+    def fake_send(url, params, headers, timeout):
+        scheduler.sent.append(url)
+        return _response()
+
+    scheduler._send = fake_send
+    return scheduler
+
+
+class TestTokenBucket:
+    """Testes do token bucket"""
+
+    def test_refill_and_reserve(self):
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=2, refill_per_second=0.5, clock=clock)
+
+        assert bucket.try_acquire(1, reserve=1)
+        assert not bucket.try_acquire(1, reserve=1)
+        assert bucket.try_acquire(1)
+        assert bucket.wait_time(1) == pytest.approx(2.0)
+
+        clock.now += 2
+        assert bucket.try_acquire(1)
+        assert not bucket.try_acquire(1)
+
+
+class TestRequestScheduler:
+    """Testes do agendador"""
+
+    def test_background_never_uses_interactive_reserve(self, scheduler):
+        scheduler.get('football_data', 'http://api/a', priority=BACKGROUND)
+        scheduler.get('football_data', 'http://api/b', priority=BACKGROUND)
+        with pytest.raises(RateLimitExceeded):
+            scheduler.get('football_data', 'http://api/c', priority=BACKGROUND, max_wait=0)
+
+        # A UI ainda tem o token reservado
+        scheduler.get('football_data', 'http://api/d', priority=INTERACTIVE)
+        assert scheduler.sent == ['http://api/a', 'http://api/b', 'http://api/d']
+
+    def test_monthly_quota(self, scheduler):
+        scheduler.get('odds_api', 'http://odds/1', priority=BACKGROUND, cost=6)
+        with pytest.raises(RateLimitExceeded):
+            scheduler.get('odds_api', 'http://odds/2', priority=BACKGROUND, cost=1)
+        scheduler.get('odds_api', 'http://odds/3', priority=INTERACTIVE, cost=4)
+        with pytest.raises(RateLimitExceeded):
+            scheduler.get('odds_api', 'http://odds/4', priority=INTERACTIVE, cost=1)
+        # Endpoints gratuitos continuam liberados
+        scheduler.get('odds_api', 'http://odds/sports', cost=0)
+
+    def test_remaining_header_overrides_local_count(self, scheduler):
+        scheduler._send = lambda url, params, headers, timeout: _response(
+            headers={'x-requests-remaining': '3'}
+        )
+        scheduler.get('odds_api', 'http://odds/1', cost=1)
+        assert scheduler.get_stats()['providers']['odds_api']['remaining_reported'] == 3
+        with pytest.raises(RateLimitExceeded):
+            scheduler.get('odds_api', 'http://odds/2', priority=BACKGROUND, cost=1)
+
+    def test_rate_limited_response_drains_bucket(self, scheduler):
+        scheduler._send = lambda url, params, headers, timeout: _response(status_code=429)
+        # Sem cota para repetir dentro de max_wait: devolve o 429
+        assert scheduler.get('football_data', 'http://api/a', max_wait=0).status_code == 429
+        with pytest.raises(RateLimitExceeded):
+            scheduler.get('football_data', 'http://api/b', max_wait=0)
+
+    def test_retries_go_through_quota(self, scheduler):
+        responses = [_response(status_code=429, headers={'Retry-After': '0.05'}), _response(status_code=503)]
+        scheduler._send = lambda url, params, headers, timeout: responses.pop(0) if responses else _response()
+        scheduler._sleep = lambda seconds: None
+
+        response = scheduler.get('odds_api', 'http://odds/1', cost=1)
+        assert response.status_code == 200
+        stats = scheduler.get_stats()
+        assert stats['retries'] == 2
+        # Cada tentativa é cobrada na cota mensal
+        assert stats['providers']['odds_api']['monthly_used'] == 3
+
+    def test_retry_after_respects_max_wait(self, scheduler):
+        scheduler._send = lambda url, params, headers, timeout: _response(status_code=429, headers={'Retry-After': '20'})
+        started = time.monotonic()
+        response = scheduler.get('odds_api', 'http://odds/1', max_wait=0.2)
+        assert response.status_code == 429
+        assert time.monotonic() - started < 1
+        # O bucket fica pausado para as demais chamadas
+        with pytest.raises(RateLimitExceeded):
+            scheduler.get('odds_api', 'http://odds/2', max_wait=1)
+
+    def test_http_client_does_not_retry_on_its_own(self, tmp_path):
+        client = Mock(max_retries=3)
+        client.get.return_value = _response()
+        scheduler = RequestScheduler(persist=False, http_client=client)
+        scheduler.get('football_data', 'http://api/a')
+        assert client.get.call_args.kwargs['max_retries'] == 0
+
+    def test_identical_in_flight_requests_are_deduplicated(self, scheduler):
+        release = threading.Event()
+        calls = []
+
+        def slow_send(url, params, headers, timeout):
+            calls.append(url)
+            release.wait(5)
+            return _response()
+
+        scheduler._send = slow_send
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                scheduler.get('football_data', 'http://api/x', params={'a': 1, 'b': 2})
+            ))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        while scheduler.get_stats()['deduplicated'] < 3:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ['http://api/x']
+        assert len(results) == 4
+        assert all(result is results[0] for result in results)
+
+    def test_state_persisted_across_restarts(self, scheduler, tmp_path):
+        scheduler.get('odds_api', 'http://odds/1', cost=5)
+        scheduler.get('football_data', 'http://api/a')
+        scheduler.get('football_data', 'http://api/b')
+        scheduler.flush()
+
+        restarted = RequestScheduler(scheduler.providers, state_file=tmp_path / 'quota.json')
+        stats = restarted.get_stats()['providers']
+        assert stats['odds_api']['monthly_used'] == 5
+        assert stats['football_data']['tokens_available'] < 1.1
+
+    def test_state_writes_are_throttled(self, tmp_path):
+        clock = FakeClock()
+        state_file = tmp_path / 'quota.json'
+        providers = {'odds_api': ProviderQuota('odds_api', rate=100, per_seconds=1, monthly_limit=10)}
+        scheduler = RequestScheduler(providers, state_file=state_file, clock=clock, save_interval=5)
+        scheduler._send = lambda url, params, headers, timeout: _response()
+
+        scheduler.get('odds_api', 'http://odds/1', cost=1)
+        first = state_file.read_text()
+        scheduler.get('odds_api', 'http://odds/2', cost=1)
+        assert state_file.read_text() == first
+
+        clock.now += 5
+        scheduler.get('odds_api', 'http://odds/3', cost=1)
+        assert state_file.read_text() != first
+
+    def test_interactive_does_not_wait_for_queued_background(self, tmp_path):
+        providers = {'football_data': ProviderQuota('football_data', rate=2, per_seconds=1, interactive_reserve=1)}
+        scheduler = RequestScheduler(providers, persist=False)
+        sent = []
+        scheduler._send = lambda url, params, headers, timeout: sent.append(url) or _response()
+
+        # Bucket vazio além da reserva: o background fica esperando cota
+        scheduler.get('football_data', 'http://api/a', priority=BACKGROUND)
+        background = threading.Thread(
+            target=lambda: scheduler.get('football_data', 'http://api/x', priority=BACKGROUND, max_wait=5)
+        )
+        background.start()
+        while scheduler.get_stats()['in_flight'] == 0:
+            pass
+
+        # A UI usa a reserva em vez de herdar a espera do background
+        response = scheduler.get('football_data', 'http://api/x', priority=INTERACTIVE, max_wait=0)
+        assert response.status_code == 200
+        assert sent == ['http://api/a', 'http://api/x']
+        assert scheduler.get_stats()['deduplicated'] == 0
+        background.join()
+
+    def test_unknown_provider(self, scheduler):
+        with pytest.raises(ValueError):
+            scheduler.get('api_football', 'http://x')
@@ -0,0 +1,167 @@
+"""
+Testes para o índice de rodadas do RoundManager
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from data.round_manager import RoundIndex, RoundManager
+from utils import serialization
+from utils.cache import get_cache_key_rounds, matches_cache
+
+NOW = datetime.now(timezone.utc)
+
+
+def _api_match(match_id, matchday, status, kickoff, home=(1, 'Flamengo'), away=(2, 'Palmeiras')):
+    finished = status == 'FINISHED'
+    return {
+        'id': match_id,
+        'matchday': matchday,
+        'utcDate': kickoff.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'status': status,
+        'homeTeam': {'id': home[0], 'name': home[1]},
+        'awayTeam': {'id': away[0], 'name': away[1]},
+        'score': {
+            'fullTime': {'home': 2 if finished else None, 'away': 1 if finished else None},
+            'halfTime': {'home': 1 if finished else None, 'away': 0 if finished else None},
+        },
+    }
+
+
+def _season():
+    return [
+        _api_match(1, 1, 'FINISHED', NOW - timedelta(days=14)),
+        _api_match(2, 1, 'FINISHED', NOW - timedelta(days=14), (3, 'Botafogo'), (4, 'Fluminense')),
+        _api_match(3, 2, 'FINISHED', NOW - timedelta(days=7)),
+        # Rodada 3 já começou, mas o índice ainda a vê agendada
+        _api_match(4, 3, 'SCHEDULED', NOW - timedelta(hours=3)),
+        _api_match(5, 3, 'SCHEDULED', NOW - timedelta(hours=1), (3, 'Botafogo'), (4, 'Fluminense')),
+        _api_match(6, 4, 'SCHEDULED', NOW + timedelta(days=7)),
+    ]
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeApi:
+    """Substitui collector._get e registra os parâmetros de cada chamada"""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.calls = []
+
+    def __call__(self, endpoint, params=None):
+        self.calls.append(dict(params or {}))
+        matchday = (params or {}).get('matchday')
+        if matchday is None:
+            return FakeResponse({'matches': self.matches})
+        # Filtro por rodada não devolve o campo matchday (formato antigo)
+        return FakeResponse({'matches': [
+            {k: v for k, v in m.items() if k != 'matchday'} for m in self.matches if m['matchday'] == matchday
+        ]})
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    matches_cache.clear()
+    yield
+    matches_cache.clear()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = RoundManager(csv_path=tmp_path / 'missing_matches.csv')
+    manager.collector._get = FakeApi(_season())
+    return manager
+
+
+class TestRoundManager:
+    """Testes do índice de rodadas"""
+
+    def test_whole_season_costs_one_request(self, manager):
+        assert manager.get_current_round() == 3
+        assert manager.get_next_round() == 3
+        statuses = [manager.get_round_status(r) for r in range(1, manager.total_rounds + 1)]
+
+        assert len(manager.collector._get.calls) == 1
+        assert 'matchday' not in manager.collector._get.calls[0]
+        assert statuses[0]['is_complete'] and statuses[0]['total_matches'] == 2
+        assert statuses[2]['scheduled'] == 2
+        assert statuses[10]['total_matches'] == 0
+        assert manager.is_round_finished(2)
+        assert manager.get_match_by_teams(1, 'Botafogo', 'Fluminense')['score']['home'] == 2
+
+    def test_index_shared_through_cache(self, manager, tmp_path):
+        manager.get_current_round()
+        other = RoundManager(csv_path=tmp_path / 'missing_matches.csv')
+        other.collector._get = FakeApi([])
+
+        assert other.get_current_round() == 3
+        assert other.collector._get.calls == []
+
+    def test_incremental_refresh_only_fetches_started_rounds(self, manager):
+        index = manager.get_round_index()
+        api = manager.collector._get
+        for match in api.matches:
+            if match['matchday'] == 3:
+                match['status'] = 'FINISHED'
+                match['score']['fullTime'] = {'home': 1, 'away': 1}
+                match['score']['halfTime'] = {'home': 0, 'away': 0}
+
+        index.updated_at -= manager.refresh_interval + 1
+        assert manager.get_current_round() == 4
+
+        # Só a rodada 3 foi buscada de novo; rodada 4 ainda está longe
+        assert api.calls[1:] == [{'season': manager.current_season, 'matchday': 3}]
+        assert manager.get_round_status(3)['is_complete']
+        assert manager.get_round_matches(3)[0]['round'] == 3
+        # O índice antigo (compartilhado via cache) não foi alterado
+        assert not index.summaries[3]['is_complete']
+        assert matches_cache.get(get_cache_key_rounds(manager.brasileirao_id, manager.current_season)) is manager.get_round_index()
+
+    def test_index_survives_serialization(self, manager):
+        index = manager.get_round_index()
+        restored = serialization.loads(serialization.dumps(index))
+
+        assert restored.summaries == index.summaries
+        assert restored.current_round == index.current_round
+        with restored.lock:
+            assert len(restored) == len(index)
+
+    def test_csv_fallback_when_api_fails(self):
+        manager = RoundManager()
+
+        def failing_get(endpoint, params=None):
+            raise requests.exceptions.ConnectionError('offline')
+
+        manager.collector._get = failing_get
+        index = manager.get_round_index()
+
+        assert index.source == 'csv'
+        assert manager.get_current_round() == 31
+        assert manager.is_round_finished(1)
+        match = manager.get_round_matches(1)[0]
+        assert match['home_team']['name'] == 'Flamengo'
+        assert match['score'] == {'home': 2, 'away': 1, 'half_time_home': None, 'half_time_away': None}
+
+    def test_round_index_pointers(self):
+        finished = [
+            {'round': r, 'status': 'FINISHED', 'date': '2025-04-13T16:00:00Z'} for r in (1, 2)
+        ]
+        index = RoundIndex(finished, total_rounds=38)
+        assert index.current_round == 3
+        assert index.next_round == 3
+        assert len(index) == 2
+
+        index = RoundIndex([], total_rounds=38)
+        assert index.current_round == 1
+        assert index.stale_rounds() == []
@@ -0,0 +1,73 @@
+"""
+Testes para os esquemas declarados dos CSV das ligas
+"""
+from pathlib import Path
+
+import pandas as pd
+
+from data.schema import (
+    FOOTYSTATS_MATCHES,
+    MATCHES,
+    STANDINGS,
+    apply_schema,
+    load_table,
+    schema_for,
+)
+
+CSV_DIR = Path(__file__).resolve().parent.parent / 'data' / 'csv'
+
+
+class TestSchema:
+    """Testes da coerção vetorizada"""
+
+    def test_schema_lookup(self):
+        assert schema_for(CSV_DIR / 'premier_league' / '2025_matches.csv') is FOOTYSTATS_MATCHES
+        assert schema_for(CSV_DIR / 'brasileirao' / '2025_matches.csv') is MATCHES
+        assert schema_for(CSV_DIR / 'la_liga' / '2024_standings.csv') is STANDINGS
+        assert schema_for(CSV_DIR / 'brasileirao' / 'last_update.txt') is None
+
+    def test_footystats_aliases_and_types(self):
+        df = pd.DataFrame({
+            'timestamp': [1755284400, 0],
+            'date_GMT': ['Aug 15 2025 - 7:00pm', 'Aug 23 2025 - 12:30pm'],
+            'status': ['complete', 'incomplete'],
+            'home_team_name': ['Liverpool', 'Arsenal'],
+            'away_team_name': ['AFC Bournemouth', 'Liverpool'],
+            'Game Week': [1, 2],
+            'attendance': ['N/A', '60,5'],
+        })
+        result = apply_schema(df, FOOTYSTATS_MATCHES)
+
+        assert {'home_team', 'away_team', 'round', 'date'} <= set(result.columns)
+        assert 'home_team_name' not in result.columns
+        assert result['status'].tolist() == ['FINISHED', 'incomplete']
+        assert isinstance(result['home_team'].dtype, pd.CategoricalDtype)
+        assert pd.isna(result['attendance'][0]) and result['attendance'][1] == 60.5
+        # Timestamp zerado cai para o rótulo date_GMT
+        assert result['kickoff_dt'].tolist() == [
+            pd.Timestamp('2025-08-15 19:00', tz='UTC'),
+            pd.Timestamp('2025-08-23 12:30', tz='UTC'),
+        ]
+
+    def test_integers_keep_nan_as_float(self):
+        df = pd.DataFrame({
+            'round': ['1', '2'],
+            'home_score': [2, None],
+            'lambda_home': ['1,45', ''],
+            'kickoff_utc': ['2025-11-02T16:00:00Z', None],
+            'date': [None, '2025-11-09 18:30'],
+        })
+        result = apply_schema(df, MATCHES)
+
+        assert result['round'].dtype == 'int64'
+        assert result['home_score'].dtype == 'float64'
+        assert result['lambda_home'][0] == 1.45 and pd.isna(result['lambda_home'][1])
+        assert result['kickoff_dt'][1] == pd.Timestamp('2025-11-09 18:30', tz='UTC')
+
+    def test_load_table_brasileirao(self):
+        df = load_table(CSV_DIR / 'brasileirao' / '2025_matches.csv')
+
+        assert df['round'].dtype == 'int64'
+        assert isinstance(df['status'].dtype, pd.CategoricalDtype)
+        assert df['kickoff_dt'].notna().all()
+        assert set(df['status']) == {'FINISHED', 'SCHEDULED'}
@@ -0,0 +1,66 @@
+"""
+Testes para a serialização binária dos caches compartilhados
+"""
+import os
+import pickle
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.prediction import MatchInputs
+from utils import serialization
+
+
+class TestSerialization:
+    """Testes de ida e volta e do Unpickler restrito"""
+
+    def test_round_trip_numpy_and_datetimes(self):
+        value = {
+            'matrix': np.arange(12, dtype=np.float64).reshape(3, 4),
+            'scalar': np.float64(0.42),
+            'kickoff': datetime(2025, 11, 2, 16, 0, tzinfo=timezone.utc),
+            'teams': ('Flamengo', 'Palmeiras'),
+        }
+        restored = serialization.loads(serialization.dumps(value))
+
+        np.testing.assert_array_equal(restored['matrix'], value['matrix'])
+        assert restored['matrix'].dtype == np.float64
+        assert restored['scalar'] == value['scalar']
+        assert restored['kickoff'] == value['kickoff']
+        assert restored['teams'] == value['teams']
+
+    def test_round_trip_match_inputs_and_frames(self):
+        match = MatchInputs(
+            home_team='Flamengo', away_team='Palmeiras', round_number=30,
+            kickoff_utc=datetime(2025, 11, 2, 16, 0, tzinfo=timezone.utc),
+            lambda_home=1.6, lambda_away=1.1, mean_cards=4.5, mean_corners=9.2,
+            context={'odds': {'home': 1.9}}, raw_row={'match_id': 501},
+        )
+        frame = pd.DataFrame({'team': pd.Categorical(['A', 'B']), 'points': [3, 1]})
+
+        assert serialization.loads(serialization.dumps(match)) == match
+        pd.testing.assert_frame_equal(serialization.loads(serialization.dumps(frame)), frame)
+
+    def test_large_payload_compressed(self):
+        payload = serialization.dumps({'rows': ['Flamengo'] * 5000})
+        assert payload[:1] == serialization.COMPRESSED
+        assert len(payload) < 5000
+        assert serialization.loads(payload) == {'rows': ['Flamengo'] * 5000}
+
+    def test_rejects_unsafe_globals(self):
+        class Exploit:
+            def __reduce__(self):
+                return (os.system, ('echo pwned',))
+
+        payload = serialization.RAW + pickle.dumps(Exploit())
+        with pytest.raises(serialization.UnsafePayloadError):
+            serialization.loads(payload)
+
+        with pytest.raises(serialization.UnsafePayloadError):
+            serialization.loads(serialization.RAW + pickle.dumps(eval))
+
+    def test_unknown_header(self):
+        with pytest.raises(ValueError):
+            serialization.loads(b'X' + pickle.dumps(1))
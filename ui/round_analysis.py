@@ -9,12 +9,13 @@ from datetime import datetime
 
 try:
     from data.round_manager import RoundManager
-    from data.odds_collector import OddsCollector
+    from data.odds_collector import get_odds_collector
     from analysis.comparison import PrognosisComparator
     from models.auto_calibration import ModelCalibrator
     from analysis.calculator import PrognosisCalculator
     from data.processor import DataProcessor
     from data.collector import FootballDataCollector
+    from data.async_collector import AsyncFootballDataCollector
 except ImportError as e:
     st.error(f"Erro ao importar módulos: {e}")
 
@@ -97,6 +98,9 @@ def show_past_round_analysis(rodada: int, matches: List[Dict]):
     comparator = PrognosisComparator()
     calibrator = ModelCalibrator()
     
+    # Estatísticas de todos os times da rodada em paralelo
+    round_stats = prefetch_round_stats(matches)
+    
     # Processar cada jogo
     all_comparisons = []
     
@@ -105,7 +109,7 @@ def show_past_round_analysis(rodada: int, matches: List[Dict]):
             
             # Gerar prognóstico (como teria sido)
             try:
-                prognosis = generate_prognosis_for_match(match)
+                prognosis = generate_prognosis_for_match(match, round_stats)
                 
                 # Comparar com resultado real
                 real_result = {
@@ -200,14 +204,17 @@ def show_future_round_analysis(rodada: int, matches: List[Dict]):
     
     st.info(f"📅 Rodada {rodada} ainda não começou. Gerando prognósticos...")
     
-    # Inicializar coletor de odds
+    # Snapshot de odds da rodada: 1 requisição para todos os jogos
     try:
-        odds_collector = OddsCollector()
+        odds_snapshot = get_odds_collector().get_snapshot()
         odds_available = True
     except:
         odds_available = False
         st.warning("⚠️ Odds API não disponível. Usando apenas modelos estatísticos.")
     
+    # Estatísticas de todos os times da rodada em paralelo
+    round_stats = prefetch_round_stats(matches)
+    
     # Processar cada jogo
     for match in matches:
         with st.expander(f"⚽ {match['home_team']['name']} vs {match['away_team']['name']} - {format_match_date(match['date'])}"):
@@ -219,11 +226,11 @@ def show_future_round_analysis(rodada: int, matches: List[Dict]):
             
             # Gerar prognóstico
             try:
-                prognosis = generate_prognosis_for_match(match)
+                prognosis = generate_prognosis_for_match(match, round_stats)
                 
                 # Buscar odds reais
                 if odds_available:
-                    odds_data = odds_collector.get_match_odds(
+                    odds_data = odds_snapshot.get(
                         match['home_team']['name'],
                         match['away_team']['name']
                     )
@@ -261,25 +268,57 @@ def show_live_round_status(matches: List[Dict]):
             st.markdown(f"{status_emoji} **{match['home_team']['name']} vs {match['away_team']['name']}** - {format_match_date(match['date'])}")
 
 
-def generate_prognosis_for_match(match: Dict) -> Dict:
+def prefetch_round_stats(matches: List[Dict]) -> Dict:
+    """
+    Busca as estatísticas de todos os jogos da rodada de uma vez
+    
+    Args:
+        matches: Jogos no formato do RoundManager
+        
+    Returns:
+        Dict (mandante_id, visitante_id) -> dados do jogo (vazio em caso de erro)
+    """
+    collector = AsyncFootballDataCollector()
+    try:
+        with st.spinner("Buscando estatísticas dos times da rodada..."):
+            round_data = collector.fetch_round(matches, include_standings=False, include_scorers=False)
+    except Exception as e:
+        st.warning(f"⚠️ Não foi possível pré-carregar as estatísticas da rodada: {e}")
+        return {}
+    finally:
+        collector.close()
+    
+    return {
+        (item['home_team_id'], item['away_team_id']): item
+        for item in round_data['fixtures']
+    }
+
+
+def generate_prognosis_for_match(match: Dict, round_stats: Optional[Dict] = None) -> Dict:
     """
     Gera prognóstico para um jogo específico
     
     Args:
         match: Dados do jogo
+        round_stats: Estatísticas pré-carregadas por prefetch_round_stats()
         
     Returns:
         Dict com prognóstico completo
     """
     
     # Inicializar módulos
-    collector = FootballDataCollector()
     processor = DataProcessor()
     calculator = PrognosisCalculator()
     
     # Buscar estatísticas dos times
-    home_stats = collector.calculate_team_stats(match['home_team']['id'], venue='HOME')
-    away_stats = collector.calculate_team_stats(match['away_team']['id'], venue='AWAY')
+    prefetched = (round_stats or {}).get((match['home_team']['id'], match['away_team']['id']))
+    if prefetched:
+        home_stats = prefetched['home_stats']
+        away_stats = prefetched['away_stats']
+    else:
+        collector = FootballDataCollector()
+        home_stats = collector.calculate_team_stats(match['home_team']['id'], venue='HOME')
+        away_stats = collector.calculate_team_stats(match['away_team']['id'], venue='AWAY')
     
     # Processar dados
     processed_data = processor.process_match_data(
@@ -340,9 +379,7 @@ def display_odds_comparison(prognosis: Dict, odds_data: Dict):
     st.markdown("### 💰 Comparação com Odds Reais")
     
     # Converter odds para probabilidades
-    from data.odds_collector import OddsCollector
-    odds_collector = OddsCollector()
-    market_probs = odds_collector.get_market_probabilities(odds_data)
+    market_probs = get_odds_collector().get_market_probabilities(odds_data)
     
     # Comparar probabilidades
     col1, col2, col3 = st.columns(3)
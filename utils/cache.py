@@ -1,30 +1,88 @@
 """
 Sistema de Cache com TTL (Time To Live)
 Reduz requisições à API armazenando dados temporariamente
+
+Com stale_ttl_seconds, uma entrada vencida continua disponível por mais um
+período: get_or_refresh devolve o valor antigo na hora e atualiza a entrada em
+segundo plano (stale-while-revalidate). Entradas acessadas com frequência são
+atualizadas antes de vencer (refresh-ahead), por uma thread de fundo que
+percorre os caches registrados.
+
+Caches persistentes (persistent=True) gravam cada entrada também no cache em
+disco (utils.disk_cache): após um reinício, a primeira leitura de uma chave a
+encontra no disco e a promove de volta para a memória.
+
+As entradas ficam em shards com lock próprio, escolhidos pelo hash da chave,
+para que os workers do BatchMatchProcessor não se serializem em um lock só.
 """
 
+import logging
+import os
+import threading
 import time
-from typing import Any, Optional, Dict
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Dict
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
+# Fração final do TTL em que entradas quentes são atualizadas antecipadamente
+REFRESH_AHEAD_FRACTION = 0.1
+# Acessos mínimos para uma entrada ser considerada quente
+HOT_KEY_MIN_HITS = 2
+# Intervalo da varredura de refresh-ahead em segundo plano
+REFRESH_INTERVAL_SECONDS = 30
+# Shards com lock próprio: threads concorrentes não disputam um lock global
+DEFAULT_SHARDS = 16
+
+Loader = Callable[[], Optional[Any]]
+
+
 class CacheManager:
     """Gerenciador de cache com expiração automática"""
     
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        stale_ttl_seconds: int = 0,
+        name: Optional[str] = None,
+        persistent: bool = False,
+        disk: Any = None,
+        shards: Optional[int] = None
+    ):
         """
         Inicializa o cache
         
         Args:
             ttl_seconds: Tempo de vida do cache em segundos (padrão: 1 hora)
+            stale_ttl_seconds: Por quanto tempo após vencer a entrada ainda pode
+                ser servida por get_or_refresh enquanto é atualizada (padrão: 0)
+            name: Namespace das entradas no cache em disco
+            persistent: Usar o cache em disco global (get_disk_cache)
+            disk: Cache em disco específico (DiskCache); implica persistent
+            shards: Número de shards com lock próprio (padrão: CACHE_SHARDS ou 16)
         """
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._stats = {
-            'hits': 0,
-            'misses': 0,
-            'sets': 0,
-            'expirations': 0
-        }
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.name = name or 'default'
+        self.persistent = persistent or disk is not None
+        self._disk = disk
+        n_shards = shards if shards is not None else int(os.getenv('CACHE_SHARDS', DEFAULT_SHARDS))
+        self._shards = [_Shard() for _ in range(max(1, n_shards))]
+        # Atualizações em segundo plano: chaves em andamento e contadores
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._refresh_stats = {'refreshes': 0, 'refresh_errors': 0}
+    
+    @property
+    def _cache(self) -> Dict[str, Dict[str, Any]]:
+        """Todas as entradas (cópia do índice; os dicts de entrada são os originais)"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for shard in self._shards:
+            with shard.lock:
+                merged.update(shard.entries)
+        return merged
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -36,36 +94,203 @@ class CacheManager:
         Returns:
             Valor armazenado ou None se não existir/expirado
         """
-        if key not in self._cache:
-            self._stats['misses'] += 1
-            return None
-        
-        entry = self._cache[key]
-        
-        # Verificar se expirou
-        if time.time() > entry['expires_at']:
-            del self._cache[key]
-            self._stats['expirations'] += 1
-            self._stats['misses'] += 1
-            return None
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+        if entry is None:
+            # Leitura do disco fora do lock do shard
+            entry = self._promote(shard, key)
         
-        self._stats['hits'] += 1
-        return entry['value']
+        with shard.lock:
+            if entry is None:
+                shard.stats['misses'] += 1
+                return None
+            
+            # Verificar se expirou
+            now = time.time()
+            if now > entry['expires_at']:
+                # Dentro da janela de stale a entrada fica para get_or_refresh
+                if now > entry['expires_at'] + self.stale_ttl_seconds:
+                    if shard.entries.get(key) is entry:
+                        del shard.entries[key]
+                    shard.stats['expirations'] += 1
+                shard.stats['misses'] += 1
+                return None
+            
+            entry['hits'] += 1
+            shard.stats['hits'] += 1
+            return entry['value']
     
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, loader: Optional[Loader] = None) -> None:
         """
         Armazena valor no cache
         
         Args:
             key: Chave do cache
             value: Valor a armazenar
+            loader: Função que recarrega o valor (usada pelo refresh em segundo plano)
         """
-        self._cache[key] = {
-            'value': value,
-            'created_at': time.time(),
-            'expires_at': time.time() + self.ttl_seconds
-        }
-        self._stats['sets'] += 1
+        created_at = time.time()
+        expires_at = created_at + self.ttl_seconds
+        shard = self._shard(key)
+        with shard.lock:
+            previous = shard.entries.get(key)
+            shard.entries[key] = {
+                'value': value,
+                'created_at': created_at,
+                'expires_at': expires_at,
+                # Acessos contados por período de TTL: só chaves ainda usadas são renovadas
+                'hits': 0,
+                'loader': loader or (previous['loader'] if previous else None)
+            }
+            shard.stats['sets'] += 1
+        
+        disk = self._disk_tier()
+        if disk is not None:
+            disk.set(self.name, key, value, created_at, expires_at, expires_at + self.stale_ttl_seconds)
+    
+    def get_or_refresh(self, key: str, loader: Loader, refresher: Optional[Loader] = None) -> Optional[Any]:
+        """
+        Busca valor no cache, servindo dados vencidos enquanto atualiza
+        
+        - Entrada válida: devolvida; perto de vencer, é atualizada em segundo plano
+        - Entrada vencida dentro de stale_ttl_seconds: devolvida e atualizada em segundo plano
+        - Sem entrada: loader é chamado na hora
+        
+        Args:
+            key: Chave do cache
+            loader: Função sem argumentos que busca o valor; None indica falha
+                (nada é armazenado e o valor antigo, se houver, continua)
+            refresher: Função usada nas atualizações em segundo plano (padrão: loader),
+                por exemplo com prioridade menor na cota da API
+            
+        Returns:
+            Valor em cache ou carregado (None se o loader falhar sem valor antigo)
+        """
+        _register_for_refresh_ahead(self)
+        refresher = refresher or loader
+        shard = self._shard(key)
+        
+        value = self.get(key)
+        if value is not None:
+            with shard.lock:
+                due = self._is_due_for_refresh(shard.entries.get(key))
+            if due:
+                self._schedule_refresh(key, refresher)
+            return value
+        
+        with shard.lock:
+            # get já removeu entradas além da janela de stale
+            entry = shard.entries.get(key)
+            if entry is not None:
+                shard.stats['stale_hits'] += 1
+                entry['hits'] += 1
+        if entry is not None:
+            self._schedule_refresh(key, refresher)
+            return entry['value']
+        
+        value = loader()
+        if value is not None:
+            self.set(key, value, loader=refresher)
+        return value
+    
+    def refresh_ahead(self) -> int:
+        """
+        Agenda a atualização das entradas quentes perto de vencer
+        
+        Returns:
+            Número de entradas agendadas
+        """
+        scheduled = 0
+        for shard in self._shards:
+            with shard.lock:
+                due = [
+                    (key, entry['loader']) for key, entry in shard.entries.items()
+                    if entry['loader'] is not None and self._is_due_for_refresh(entry)
+                ]
+            for key, loader in due:
+                if self._schedule_refresh(key, loader):
+                    scheduled += 1
+        return scheduled
+    
+    def _shard(self, key: str) -> '_Shard':
+        return self._shards[hash(key) % len(self._shards)]
+    
+    def _disk_tier(self):
+        if self._disk is None and self.persistent:
+            from utils.disk_cache import get_disk_cache
+            self._disk = get_disk_cache()
+            if self._disk is None:
+                # Desativado ou indisponível: não tenta de novo a cada operação
+                self.persistent = False
+        return self._disk
+    
+    def _promote(self, shard: '_Shard', key: str) -> Optional[Dict[str, Any]]:
+        """Traz para a memória uma entrada gravada em disco (por este ou outro processo)"""
+        disk = self._disk_tier()
+        if disk is None:
+            return None
+        found = disk.get(self.name, key)
+        if found is None:
+            return None
+        value, created_at, expires_at = found
+        with shard.lock:
+            # Outra thread pode ter gravado a chave enquanto o disco era lido
+            if key in shard.entries:
+                return shard.entries[key]
+            entry = {
+                'value': value,
+                'created_at': created_at,
+                'expires_at': expires_at,
+                'hits': 0,
+                'loader': None
+            }
+            shard.entries[key] = entry
+            shard.stats['disk_hits'] += 1
+            return entry
+    
+    def _is_due_for_refresh(self, entry: Optional[Dict[str, Any]]) -> bool:
+        if entry is None or entry['hits'] < HOT_KEY_MIN_HITS:
+            return False
+        remaining = entry['expires_at'] - time.time()
+        return remaining < self.ttl_seconds * REFRESH_AHEAD_FRACTION
+    
+    def _schedule_refresh(self, key: str, loader: Loader) -> bool:
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+        _refresh_executor().submit(self._refresh, key, loader)
+        return True
+    
+    def _refresh(self, key: str, loader: Loader) -> None:
+        try:
+            value = loader()
+            if value is not None:
+                self.set(key, value, loader=loader)
+                with self._lock:
+                    self._refresh_stats['refreshes'] += 1
+        except Exception as e:
+            with self._lock:
+                self._refresh_stats['refresh_errors'] += 1
+            logger.warning(f"Falha ao atualizar cache {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def wait_for_refreshes(self, timeout: float = 5.0) -> bool:
+        """
+        Aguarda as atualizações em segundo plano em andamento
+        
+        Returns:
+            True se todas terminaram dentro do prazo
+        """
+        deadline = time.time() + timeout
+        while self._refreshing:
+            if time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
     
     def has(self, key: str) -> bool:
         """
@@ -80,14 +305,16 @@ class CacheManager:
         return self.get(key) is not None
     
     def clear(self) -> None:
-        """Limpa todo o cache"""
-        self._cache.clear()
-        self._stats = {
-            'hits': 0,
-            'misses': 0,
-            'sets': 0,
-            'expirations': 0
-        }
+        """Limpa todo o cache (inclusive as entradas em disco deste namespace)"""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.stats = _Shard.empty_stats()
+        with self._lock:
+            self._refresh_stats = {'refreshes': 0, 'refresh_errors': 0}
+        disk = self._disk_tier()
+        if disk is not None:
+            disk.clear(self.name)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -96,17 +323,31 @@ class CacheManager:
         Returns:
             Dict com hits, misses, hit_rate, etc.
         """
-        total_requests = self._stats['hits'] + self._stats['misses']
-        hit_rate = (self._stats['hits'] / total_requests * 100) if total_requests > 0 else 0
+        totals = _Shard.empty_stats()
+        cached_items = 0
+        for shard in self._shards:
+            with shard.lock:
+                for name, count in shard.stats.items():
+                    totals[name] += count
+                cached_items += len(shard.entries)
+        with self._lock:
+            totals.update(self._refresh_stats)
+        
+        total_requests = totals['hits'] + totals['misses']
+        hit_rate = (totals['hits'] / total_requests * 100) if total_requests > 0 else 0
         
         return {
-            'hits': self._stats['hits'],
-            'misses': self._stats['misses'],
-            'sets': self._stats['sets'],
-            'expirations': self._stats['expirations'],
+            'hits': totals['hits'],
+            'misses': totals['misses'],
+            'sets': totals['sets'],
+            'expirations': totals['expirations'],
+            'stale_hits': totals['stale_hits'],
+            'refreshes': totals['refreshes'],
+            'refresh_errors': totals['refresh_errors'],
+            'disk_hits': totals['disk_hits'],
             'hit_rate': hit_rate,
             'total_requests': total_requests,
-            'cached_items': len(self._cache)
+            'cached_items': cached_items
         }
     
     def get_ttl_remaining(self, key: str) -> Optional[int]:
@@ -119,41 +360,116 @@ class CacheManager:
         Returns:
             Segundos restantes ou None se não existe
         """
-        if key not in self._cache:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+        if entry is None:
             return None
         
-        entry = self._cache[key]
         remaining = int(entry['expires_at'] - time.time())
         
         return max(0, remaining)
     
     def cleanup_expired(self) -> int:
         """
-        Remove entradas expiradas
+        Remove entradas expiradas (incluindo a janela de stale)
         
         Returns:
             Número de entradas removidas
         """
-        expired_keys = []
+        removed = 0
         current_time = time.time()
         
-        for key, entry in self._cache.items():
-            if current_time > entry['expires_at']:
-                expired_keys.append(key)
+        for shard in self._shards:
+            with shard.lock:
+                expired_keys = [
+                    key for key, entry in shard.entries.items()
+                    if current_time > entry['expires_at'] + self.stale_ttl_seconds
+                ]
+                for key in expired_keys:
+                    del shard.entries[key]
+                shard.stats['expirations'] += len(expired_keys)
+            removed += len(expired_keys)
         
-        for key in expired_keys:
-            del self._cache[key]
+        disk = self._disk_tier()
+        if disk is not None:
+            disk.purge_expired()
         
-        self._stats['expirations'] += len(expired_keys)
-        
-        return len(expired_keys)
+        return removed
+
+
+class _Shard:
+    """Parte das entradas com lock e contadores próprios"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = self.empty_stats()
+    
+    @staticmethod
+    def empty_stats() -> Dict[str, int]:
+        return {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'expirations': 0,
+            'stale_hits': 0,
+            'disk_hits': 0,
+            'refreshes': 0,
+            'refresh_errors': 0
+        }
+
+
+# Atualizações em segundo plano ---------------------------------------------
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_refresh_caches: 'weakref.WeakSet[CacheManager]' = weakref.WeakSet()
+_refresher_thread: Optional[threading.Thread] = None
+
+
+def _refresh_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv('CACHE_REFRESH_WORKERS', 2)),
+                thread_name_prefix='cache-refresh'
+            )
+        return _executor
+
 
+def _register_for_refresh_ahead(cache: CacheManager) -> None:
+    """Inclui o cache na varredura de refresh-ahead (thread iniciada uma vez)"""
+    global _refresher_thread
+    if os.getenv('CACHE_REFRESH_AHEAD', '1').lower() in ('0', 'false', 'no'):
+        return
+    with _executor_lock:
+        _refresh_caches.add(cache)
+        if _refresher_thread is None:
+            _refresher_thread = threading.Thread(
+                target=_refresh_ahead_loop, name='cache-refresh-ahead', daemon=True
+            )
+            _refresher_thread.start()
 
-# Cache global para partidas (1 hora)
-matches_cache = CacheManager(ttl_seconds=3600)
 
-# Cache global para times (24 horas)
-teams_cache = CacheManager(ttl_seconds=86400)
+def _refresh_ahead_loop() -> None:
+    while True:
+        time.sleep(REFRESH_INTERVAL_SECONDS)
+        for cache in list(_refresh_caches):
+            try:
+                cache.refresh_ahead()
+            except Exception as e:
+                logger.warning(f"Falha no refresh-ahead do cache: {e}")
+
+
+# Cache global para partidas (1 hora; vencidas servidas por até 6 horas enquanto atualizam)
+matches_cache = CacheManager(ttl_seconds=3600, stale_ttl_seconds=6 * 3600, name='matches', persistent=True)
+
+# Cache global para times (24 horas; vencidos servidos por até 7 dias enquanto atualizam)
+teams_cache = CacheManager(ttl_seconds=86400, stale_ttl_seconds=7 * 86400, name='teams', persistent=True)
+
+# Cache global para snapshots de odds da rodada (10 minutos)
+odds_cache = CacheManager(ttl_seconds=600)
 
 
 def get_cache_key_matches(team_id: int, status: str = "FINISHED", limit: int = 10) -> str:
@@ -173,6 +489,21 @@ def get_cache_key_h2h(team1_id: int, team2_id: int, limit: int = 5) -> str:
     return f"h2h_{id1}_{id2}_{limit}"
 
 
+def get_cache_key_match_index(league_code: str, season: int) -> str:
+    """Gera chave de cache para o índice de partidas da temporada"""
+    return f"match_index_{league_code}_{season}"
+
+
+def get_cache_key_rounds(competition_id, season: int) -> str:
+    """Gera chave de cache para o índice de rodadas da temporada"""
+    return f"rounds_{competition_id}_{season}"
+
+
+def get_cache_key_odds(sport_key: str) -> str:
+    """Gera chave de cache para o snapshot de odds de uma liga"""
+    return f"odds_{sport_key}"
+
+
 def format_cache_stats(stats: Dict) -> str:
     """Formata estatísticas do cache para exibição"""
     return (
@@ -0,0 +1,203 @@
+"""
+Chaves de cache canônicas e estáveis entre processos
+
+make_key percorre os argumentos e alimenta um hash com uma codificação binária
+canônica de cada valor, em vez de montar strings com str(): arrays NumPy entram
+pelo buffer (com dtype e shape), DataFrames/Series pelo fingerprint de conteúdo
+do pandas, dataclasses campo a campo e dicts/sets com itens ordenados. Nada
+depende de id(), endereço de memória ou PYTHONHASHSEED, então a mesma chamada
+gera a mesma chave em qualquer worker ou réplica e o cache compartilhado
+(Redis, disco) de fato acerta.
+
+O hash é sempre blake2b de 128 bits, da biblioteca padrão: o formato da chave
+não pode depender do que está instalado em cada réplica. Com argumentos comuns
+(dicts, parâmetros, DataFrames via hash do pandas) o custo é dominado pela
+codificação; só arrays grandes sentiriam a diferença para um hash não
+criptográfico. O nome do algoritmo fica no prefixo para que uma troca futura
+invalide as chaves antigas em vez de colidir com elas.
+"""
+import dataclasses
+import datetime
+import decimal
+import enum
+import hashlib
+import os
+import struct
+import uuid
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+HASH_ALGORITHM = 'b2b'
+
+# Limite de aninhamento: evita recursão infinita em estruturas com ciclo
+MAX_DEPTH = 32
+
+_FLOAT = struct.Struct('<d')
+_LENGTH = struct.Struct('<Q')
+_CANONICAL_NAN = _FLOAT.pack(float('nan'))
+
+
+class UnstableKeyError(TypeError):
+    """Argumento sem representação estável para compor uma chave"""
+
+
+def make_key(*args, **kwargs) -> str:
+    """
+    Gera o hash canônico de uma combinação de argumentos
+
+    Args:
+        *args: Argumentos posicionais
+        **kwargs: Argumentos nomeados (a ordem não importa)
+
+    Returns:
+        Hexdigest de 32 caracteres prefixado pelo algoritmo (ex.: "b2b-3f9a...")
+
+    Raises:
+        UnstableKeyError: Algum argumento não tem representação estável
+            (ex.: objeto sem atributos, função, ciclo)
+    """
+    hasher = _new_hasher()
+    _feed(hasher, args, 0)
+    _feed(hasher, kwargs, 0)
+    return f"{HASH_ALGORITHM}-{hasher.hexdigest()}"
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Hash canônico de um único valor
+
+    Returns:
+        Hexdigest de 32 caracteres
+    """
+    hasher = _new_hasher()
+    _feed(hasher, value, 0)
+    return hasher.hexdigest()
+
+
+def _new_hasher():
+    return hashlib.blake2b(digest_size=16)
+
+
+def _feed(hasher, value: Any, depth: int) -> None:
+    if depth > MAX_DEPTH:
+        raise UnstableKeyError("Argumento aninhado demais (possível ciclo)")
+    update = hasher.update
+
+    if value is None:
+        update(b'N')
+    elif isinstance(value, bool):
+        # Antes de int: True e 1 não devem colidir
+        update(b'T' if value else b'F')
+    elif isinstance(value, enum.Enum):
+        _feed_tagged(hasher, b'E', _qualified_name(type(value)))
+        _feed(hasher, value.value, depth + 1)
+    elif isinstance(value, (int, np.integer)):
+        _feed_tagged(hasher, b'i', str(int(value)))
+    elif isinstance(value, (float, np.floating)):
+        number = float(value)
+        update(b'f')
+        # Todos os NaN são iguais; 0.0 e -0.0 também
+        update(_CANONICAL_NAN if number != number else _FLOAT.pack(number + 0.0))
+    elif isinstance(value, str):
+        _feed_tagged(hasher, b's', value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _feed_bytes(hasher, b'b', bytes(value))
+    elif isinstance(value, (list, tuple)):
+        update(b'l')
+        update(_LENGTH.pack(len(value)))
+        for item in value:
+            _feed(hasher, item, depth + 1)
+    elif isinstance(value, dict):
+        # Ordem de inserção não importa: itens ordenados pelo hash da chave
+        items = sorted(
+            ((_digest(key, depth + 1), item) for key, item in value.items()),
+            key=lambda pair: pair[0]
+        )
+        update(b'd')
+        update(_LENGTH.pack(len(items)))
+        for key_digest, item in items:
+            update(key_digest)
+            _feed(hasher, item, depth + 1)
+    elif isinstance(value, (set, frozenset)):
+        digests = sorted(_digest(item, depth + 1) for item in value)
+        update(b'S')
+        update(_LENGTH.pack(len(digests)))
+        for digest in digests:
+            update(digest)
+    elif isinstance(value, np.ndarray):
+        _feed_array(hasher, value, depth)
+    elif isinstance(value, np.generic):
+        _feed(hasher, value.item(), depth + 1)
+    elif isinstance(value, pd.DataFrame):
+        update(b'D')
+        _feed(hasher, [str(c) for c in value.columns], depth + 1)
+        _feed(hasher, [str(t) for t in value.dtypes], depth + 1)
+        _feed_array(hasher, pd.util.hash_pandas_object(value, index=True).to_numpy(), depth)
+    elif isinstance(value, pd.Series):
+        update(b'R')
+        _feed(hasher, None if value.name is None else str(value.name), depth + 1)
+        _feed_tagged(hasher, b's', str(value.dtype))
+        _feed_array(hasher, pd.util.hash_pandas_object(value, index=True).to_numpy(), depth)
+    elif isinstance(value, pd.Index):
+        update(b'I')
+        _feed_array(hasher, pd.util.hash_pandas_object(value).to_numpy(), depth)
+    elif isinstance(value, pd.Timestamp):
+        _feed_tagged(hasher, b't', value.isoformat())
+    elif isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        _feed_tagged(hasher, b't', value.isoformat())
+    elif isinstance(value, datetime.timedelta):
+        _feed_tagged(hasher, b'e', repr(value.total_seconds()))
+    elif isinstance(value, (decimal.Decimal, uuid.UUID)):
+        _feed_tagged(hasher, b'x', str(value))
+    elif isinstance(value, os.PathLike):
+        _feed_tagged(hasher, b'p', os.fspath(value))
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        _feed_tagged(hasher, b'C', _qualified_name(type(value)))
+        for field in dataclasses.fields(value):
+            _feed_tagged(hasher, b's', field.name)
+            _feed(hasher, getattr(value, field.name), depth + 1)
+    elif hasattr(value, '__dict__') and not callable(value):
+        # Objetos simples (ex.: coletores passados como self): tipo + atributos públicos
+        state = {k: v for k, v in vars(value).items() if not k.startswith('_')}
+        _feed_tagged(hasher, b'O', _qualified_name(type(value)))
+        _feed(hasher, state, depth + 1)
+    else:
+        raise UnstableKeyError(f"Tipo sem chave estável: {_qualified_name(type(value))}")
+
+
+def _digest(value: Any, depth: int) -> bytes:
+    # Usado para ordenar itens de dicts e sets de forma independente do tipo
+    hasher = _new_hasher()
+    _feed(hasher, value, depth)
+    return hasher.digest()
+
+
+def _feed_array(hasher, array: np.ndarray, depth: int) -> None:
+    if array.dtype.hasobject:
+        hasher.update(b'o')
+        _feed(hasher, list(array.shape), depth + 1)
+        _feed(hasher, array.ravel().tolist(), depth + 1)
+        return
+    hasher.update(b'a')
+    _feed_tagged(hasher, b's', array.dtype.str)
+    _feed(hasher, list(array.shape), depth + 1)
+    # Buffer direto, sem cópia quando o array já é contíguo
+    hasher.update(np.ascontiguousarray(array).data)
+
+
+def _feed_tagged(hasher, tag: bytes, text: str) -> None:
+    _feed_bytes(hasher, tag, text.encode('utf-8'))
+
+
+def _feed_bytes(hasher, tag: bytes, data: bytes) -> None:
+    # Prefixo de tamanho: ("ab", "c") e ("a", "bc") não colidem
+    hasher.update(tag)
+    hasher.update(_LENGTH.pack(len(data)))
+    hasher.update(data)
+
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
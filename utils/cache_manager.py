@@ -1,50 +1,141 @@
 """
 Gerenciador de cache inteligente com TTL
 Suporta cache em memória e Redis
+
+O cache em memória é limitado por número de itens (CACHE_MAX_ENTRIES) e por
+bytes estimados (CACHE_MAX_BYTES), com despejo LRU ou LFU (CACHE_EVICTION).
+Itens expirados saem por uma varredura amortizada a cada escrita, e o tamanho
+de cada valor é medido uma vez, na escrita, para que get_stats seja O(1).
+As chaves são distribuídas em shards com lock próprio (CACHE_SHARDS), então
+threads de BatchMatchProcessor não disputam um único lock global.
+
+Com Redis (REDIS_URL), as réplicas do app compartilham o cache: conexões vêm
+de um pool por URL, valores são serializados em binário (utils.serialization),
+chaves ficam sob um namespace (CACHE_NAMESPACE) e get_many/set_many usam uma
+única ida ao servidor.
 """
-from typing import Any, Optional, Callable
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Callable, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-import json
-import hashlib
+import functools
+import heapq
+import itertools
 import logging
+import os
+import sys
+import re
+import threading
+
+from utils import serialization
+from utils.cache_keys import UnstableKeyError, make_key
 
 
 logger = logging.getLogger(__name__)
 
+EVICTION_POLICIES = ('lru', 'lfu')
+
+# Limites padrão do cache em memória (0 desativa o limite)
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Itens expirados removidos por escrita na varredura amortizada
+SWEEP_BATCH = 16
+
+# Shards do cache em memória; caches pequenos usam menos (mínimo de itens por shard)
+DEFAULT_SHARDS = 16
+MIN_ENTRIES_PER_SHARD = 64
+
+DEFAULT_REDIS_URL = 'redis://localhost:6379/0'
+DEFAULT_NAMESPACE = 'prognosticos'
+
+# Pools de conexão Redis compartilhados por URL dentro do processo
+_redis_pools: Dict[str, Any] = {}
+_redis_pools_lock = threading.Lock()
+
 
 class CacheManager:
     """Gerenciador de cache com TTL"""
     
-    def __init__(self, use_redis: bool = False):
+    def __init__(
+        self,
+        use_redis: bool = False,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        eviction_policy: Optional[str] = None,
+        redis_url: Optional[str] = None,
+        namespace: Optional[str] = None,
+        redis_client: Any = None,
+        shards: Optional[int] = None
+    ):
         """
         Inicializa o gerenciador de cache
-        
+
         Args:
             use_redis: Usar Redis (True) ou memória (False)
+            max_entries: Máximo de itens em memória (padrão: CACHE_MAX_ENTRIES; 0 = sem limite)
+            max_bytes: Máximo de bytes estimados em memória (padrão: CACHE_MAX_BYTES; 0 = sem limite)
+            eviction_policy: 'lru' ou 'lfu' (padrão: CACHE_EVICTION ou 'lru')
+            redis_url: URL do Redis (padrão: REDIS_URL ou redis://localhost:6379/0)
+            namespace: Prefixo das chaves no Redis (padrão: CACHE_NAMESPACE)
+            redis_client: Cliente já criado (compatível com redis.Redis); ativa o Redis
+            shards: Número de shards em memória (padrão: CACHE_SHARDS ou 16)
         """
-        self.use_redis = use_redis
-        self.memory_cache = {}
-        self.cache_timestamps = {}
-        
-        if use_redis:
+        self.use_redis = use_redis or redis_client is not None
+        self.namespace = namespace or os.getenv('CACHE_NAMESPACE', DEFAULT_NAMESPACE)
+        self.redis_client = redis_client
+        self.max_entries = _env_int('CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES) if max_entries is None else max_entries
+        self.max_bytes = _env_int('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES) if max_bytes is None else max_bytes
+        policy = (eviction_policy or os.getenv('CACHE_EVICTION', 'lru')).lower()
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Política de despejo inválida: {policy} (use {', '.join(EVICTION_POLICIES)})")
+        self.eviction_policy = policy
+
+        n_shards = _env_int('CACHE_SHARDS', DEFAULT_SHARDS) if shards is None else shards
+        if self.max_entries:
+            n_shards = min(n_shards, self.max_entries // MIN_ENTRIES_PER_SHARD)
+        self._shards = [_MemoryShard(policy) for _ in range(max(1, n_shards))]
+        self._sweep_cursor = itertools.count()
+        # Single-flight do decorator: chave -> (Future do cálculo, thread que calcula)
+        self._inflight: Dict[str, Tuple[Future, int]] = {}
+        self._inflight_lock = threading.Lock()
+
+        if self.use_redis and self.redis_client is None:
             try:
                 import redis
-                self.redis_client = redis.Redis(
-                    host='localhost',
-                    port=6379,
-                    db=0,
-                    decode_responses=True
-                )
+                url = redis_url or os.getenv('REDIS_URL', DEFAULT_REDIS_URL)
+                self.redis_client = redis.Redis(connection_pool=_redis_pool(url))
                 self.redis_client.ping()
                 logger.info("Redis conectado com sucesso")
             except Exception as e:
                 logger.warning(f"Redis não disponível: {e}. Usando cache em memória.")
                 self.use_redis = False
     
+    @property
+    def memory_cache(self) -> Dict[str, Any]:
+        """Cópia de todos os itens em memória (shard a shard, na ordem de despejo)"""
+        merged: Dict[str, Any] = {}
+        for shard in self._shards:
+            with shard.lock:
+                merged.update(shard.entries)
+        return merged
+    
+    @property
+    def cache_timestamps(self) -> Dict[str, datetime]:
+        """Cópia dos prazos de expiração dos itens em memória"""
+        merged: Dict[str, datetime] = {}
+        for shard in self._shards:
+            with shard.lock:
+                merged.update(shard.timestamps)
+        return merged
+    
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """
         Gera chave de cache única
         
+        A chave é o hash canônico dos argumentos (utils.cache_keys): a mesma
+        chamada gera a mesma chave em qualquer processo ou réplica.
+        
         Args:
             prefix: Prefixo da chave
             *args: Argumentos posicionais
@@ -52,20 +143,11 @@ class CacheManager:
             
         Returns:
             Chave de cache
+            
+        Raises:
+            UnstableKeyError: Algum argumento não tem representação estável
         """
-        # Criar string com todos os argumentos
-        key_parts = [prefix]
-        key_parts.extend(str(arg) for arg in args)
-        key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-        
-        key_string = "|".join(key_parts)
-        
-        # Hash para chaves muito longas
-        if len(key_string) > 100:
-            key_hash = hashlib.md5(key_string.encode()).hexdigest()
-            return f"{prefix}:{key_hash}"
-        
-        return key_string
+        return f"{prefix}:{make_key(*args, **kwargs)}"
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -79,19 +161,23 @@ class CacheManager:
         """
         try:
             if self.use_redis:
-                value = self.redis_client.get(key)
-                if value:
-                    return json.loads(value)
+                value = self.redis_client.get(self._redis_key(key))
+                if value is not None:
+                    return serialization.loads(value)
             else:
-                # Verificar TTL em memória
-                if key in self.memory_cache:
-                    timestamp = self.cache_timestamps.get(key)
-                    if timestamp and datetime.now() < timestamp:
-                        return self.memory_cache[key]
-                    else:
+                shard = self._shard(key)
+                with shard.lock:
+                    if key in shard.entries:
+                        # Verificar TTL em memória
+                        timestamp = shard.timestamps.get(key)
+                        if timestamp and datetime.now() < timestamp:
+                            shard.touch(key)
+                            shard.stats['hits'] += 1
+                            return shard.entries[key]
                         # Cache expirado
-                        del self.memory_cache[key]
-                        del self.cache_timestamps[key]
+                        shard.remove(key)
+                        shard.stats['expirations'] += 1
+                    shard.stats['misses'] += 1
             
             return None
         except Exception as e:
@@ -113,13 +199,27 @@ class CacheManager:
         try:
             if self.use_redis:
                 self.redis_client.setex(
-                    key,
-                    ttl_seconds,
-                    json.dumps(value, default=str)
+                    self._redis_key(key),
+                    max(int(ttl_seconds), 1),
+                    serialization.dumps(value)
                 )
             else:
-                self.memory_cache[key] = value
-                self.cache_timestamps[key] = datetime.now() + timedelta(seconds=ttl_seconds)
+                size = _estimate_size(value)
+                if self.max_bytes and size > self.max_bytes:
+                    logger.debug(f"Cache ignorado: {key} ({size} bytes excede o limite de {self.max_bytes})")
+                    self.delete(key)
+                    return False
+                expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+                shard = self._shard(key)
+                with shard.lock:
+                    shard.sweep_expired(SWEEP_BATCH)
+                    if key in shard.entries:
+                        shard.remove(key)
+                    shard.insert(key, value, size, expires_at)
+                    shard.stats['sets'] += 1
+                # Fora do lock do shard: o despejo pode precisar de outro shard
+                self._sweep_next_shard()
+                self._enforce_limits(shard)
             
             logger.debug(f"Cache armazenado: {key} (TTL: {ttl_seconds}s)")
             return True
@@ -139,12 +239,12 @@ class CacheManager:
         """
         try:
             if self.use_redis:
-                self.redis_client.delete(key)
+                self.redis_client.delete(self._redis_key(key))
             else:
-                if key in self.memory_cache:
-                    del self.memory_cache[key]
-                if key in self.cache_timestamps:
-                    del self.cache_timestamps[key]
+                shard = self._shard(key)
+                with shard.lock:
+                    if key in shard.entries:
+                        shard.remove(key)
             
             logger.debug(f"Cache deletado: {key}")
             return True
@@ -154,17 +254,18 @@ class CacheManager:
     
     def clear(self) -> bool:
         """
-        Limpar todo o cache
+        Limpar todo o cache (no Redis, apenas as chaves do namespace)
         
         Returns:
             True se sucesso
         """
         try:
             if self.use_redis:
-                self.redis_client.flushdb()
+                self.delete_prefix('')
             else:
-                self.memory_cache.clear()
-                self.cache_timestamps.clear()
+                for shard in self._shards:
+                    with shard.lock:
+                        shard.clear()
             
             logger.info("Cache limpo")
             return True
@@ -172,10 +273,109 @@ class CacheManager:
             logger.error(f"Erro ao limpar cache: {e}")
             return False
     
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Obter vários valores de uma vez (MGET no Redis)
+        
+        Args:
+            keys: Chaves do cache
+            
+        Returns:
+            Dict chave -> valor, só com as chaves encontradas
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        if not self.use_redis:
+            found = {}
+            for key in keys:
+                value = self.get(key)
+                if value is not None:
+                    found[key] = value
+            return found
+        
+        try:
+            values = self.redis_client.mget([self._redis_key(key) for key in keys])
+            return {
+                key: serialization.loads(value)
+                for key, value in zip(keys, values) if value is not None
+            }
+        except Exception as e:
+            logger.error(f"Erro ao obter {len(keys)} chaves do cache: {e}")
+            return {}
+    
+    def set_many(self, items: Mapping[str, Any], ttl_seconds: int = 3600) -> bool:
+        """
+        Armazenar vários valores de uma vez (pipeline no Redis)
+        
+        Args:
+            items: Dict chave -> valor
+            ttl_seconds: Tempo de vida em segundos
+            
+        Returns:
+            True se sucesso
+        """
+        if not items:
+            return True
+        if not self.use_redis:
+            return all([self.set(key, value, ttl_seconds) for key, value in items.items()])
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(self._redis_key(key), max(int(ttl_seconds), 1), serialization.dumps(value))
+            pipe.execute()
+            logger.debug(f"Cache armazenado: {len(items)} chaves (TTL: {ttl_seconds}s)")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao armazenar {len(items)} chaves no cache: {e}")
+            return False
+    
+    def delete_prefix(self, prefix: str) -> int:
+        """
+        Invalidar todas as chaves que começam com um prefixo
+        
+        Args:
+            prefix: Prefixo das chaves (ex.: 'match|'); '' remove o namespace inteiro
+            
+        Returns:
+            Número de chaves removidas
+        """
+        try:
+            if self.use_redis:
+                pattern = f"{_escape_glob(self._redis_key(prefix))}*"
+                removed = 0
+                batch = []
+                for redis_key in self.redis_client.scan_iter(match=pattern, count=500):
+                    batch.append(redis_key)
+                    if len(batch) >= 500:
+                        removed += self.redis_client.delete(*batch)
+                        batch = []
+                if batch:
+                    removed += self.redis_client.delete(*batch)
+            else:
+                removed = 0
+                for shard in self._shards:
+                    with shard.lock:
+                        keys = [key for key in shard.entries if key.startswith(prefix)]
+                        for key in keys:
+                            shard.remove(key)
+                    removed += len(keys)
+            
+            logger.debug(f"Cache invalidado: {removed} chaves com prefixo '{prefix}'")
+            return removed
+        except Exception as e:
+            logger.error(f"Erro ao invalidar prefixo {prefix}: {e}")
+            return 0
+    
     def cached(self, ttl_seconds: int = 3600, prefix: str = "cache"):
         """
         Decorator para cachear resultado de função
         
+        Chamadas concorrentes com a mesma chave em um cache miss são agrupadas
+        (single-flight): a primeira executa a função e as demais esperam o mesmo
+        resultado, ou recebem a mesma exceção.
+        
         Args:
             ttl_seconds: Tempo de vida em segundos
             prefix: Prefixo da chave
@@ -184,9 +384,14 @@ class CacheManager:
             Função decorada
         """
         def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
             def wrapper(*args, **kwargs):
                 # Gerar chave
-                key = self._generate_key(prefix, func.__name__, *args, **kwargs)
+                try:
+                    key = self._generate_key(prefix, func.__qualname__, *args, **kwargs)
+                except UnstableKeyError as e:
+                    logger.debug(f"Sem cache para {func.__qualname__}: {e}")
+                    return func(*args, **kwargs)
                 
                 # Tentar obter do cache
                 cached_value = self.get(key)
@@ -194,16 +399,45 @@ class CacheManager:
                     logger.debug(f"Cache hit: {key}")
                     return cached_value
                 
+                return self._compute_once(key, lambda: func(*args, **kwargs), ttl_seconds)
+            
+            return wrapper
+        return decorator
+    
+    def _compute_once(self, key: str, compute: Callable[[], Any], ttl_seconds: int) -> Any:
+        """Executa compute uma vez por chave, mesmo com chamadas concorrentes"""
+        thread_id = threading.get_ident()
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                future: Future = Future()
+                self._inflight[key] = (future, thread_id)
+        
+        if inflight is not None:
+            future, owner = inflight
+            if owner != thread_id:
+                logger.debug(f"Aguardando cálculo em andamento: {key}")
+                return future.result()
+            # Chamada recursiva com a mesma chave: esperar seria deadlock
+            return compute()
+        
+        try:
+            # Outro líder pode ter terminado entre o miss e a entrada aqui
+            result = self.get(key)
+            if result is None:
                 # Executar função
-                result = func(*args, **kwargs)
+                result = compute()
                 
                 # Armazenar no cache
                 self.set(key, result, ttl_seconds)
-                
-                return result
-            
-            return wrapper
-        return decorator
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
     
     def get_stats(self) -> dict:
         """
@@ -217,6 +451,7 @@ class CacheManager:
                 info = self.redis_client.info()
                 return {
                     'type': 'redis',
+                    'namespace': self.namespace,
                     'used_memory': info.get('used_memory_human', 'N/A'),
                     'connected_clients': info.get('connected_clients', 0),
                     'total_commands': info.get('total_commands_processed', 0)
@@ -224,13 +459,245 @@ class CacheManager:
             except Exception as e:
                 logger.error(f"Erro ao obter stats Redis: {e}")
         
-        # Stats de memória
+        # Stats de memória: contadores de cada shard, somados (O(shards))
+        totals = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'expirations': 0}
+        items = memory_bytes = 0
+        for shard in self._shards:
+            with shard.lock:
+                for name in totals:
+                    totals[name] += shard.stats[name]
+                items += len(shard.entries)
+                memory_bytes += shard.total_bytes
+        total_requests = totals['hits'] + totals['misses']
         return {
             'type': 'memory',
-            'cached_items': len(self.memory_cache),
-            'memory_usage': f"{len(str(self.memory_cache)) / 1024:.2f} KB"
+            'cached_items': items,
+            'memory_bytes': memory_bytes,
+            'memory_usage': f"{memory_bytes / 1024:.2f} KB",
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'eviction_policy': self.eviction_policy,
+            'shards': len(self._shards),
+            'hits': totals['hits'],
+            'misses': totals['misses'],
+            'hit_rate': (totals['hits'] / total_requests * 100) if total_requests > 0 else 0,
+            'sets': totals['sets'],
+            'evictions': totals['evictions'],
+            'expirations': totals['expirations'],
         }
 
+    def cleanup_expired(self) -> int:
+        """
+        Remove todos os itens expirados do cache em memória
+
+        Returns:
+            Número de itens removidos
+        """
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                removed += shard.sweep_expired(None)
+        return removed
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _shard(self, key: str) -> '_MemoryShard':
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _sweep_next_shard(self) -> None:
+        """Varre um shard por escrita, em rodízio, sem esperar se ele estiver ocupado"""
+        shard = self._shards[next(self._sweep_cursor) % len(self._shards)]
+        if shard.lock.acquire(blocking=False):
+            try:
+                shard.sweep_expired(SWEEP_BATCH)
+            finally:
+                shard.lock.release()
+
+    def _over_limits(self) -> bool:
+        # Leitura sem lock dos totais de cada shard: no pior caso despeja um item a mais
+        if self.max_entries and sum(len(shard.entries) for shard in self._shards) > self.max_entries:
+            return True
+        return bool(self.max_bytes) and sum(shard.total_bytes for shard in self._shards) > self.max_bytes
+
+    def _enforce_limits(self, preferred: '_MemoryShard') -> None:
+        """Despeja itens até respeitar os limites globais, começando pelo shard que cresceu"""
+        while self._over_limits():
+            victim = preferred if len(preferred.entries) > 1 else max(self._shards, key=lambda s: len(s.entries))
+            with victim.lock:
+                if not victim.entries:
+                    return
+                key = victim.eviction_candidate()
+                victim.remove(key)
+                victim.stats['evictions'] += 1
+            logger.debug(f"Cache despejado ({self.eviction_policy}): {key}")
+
+
+class _MemoryShard:
+    """Parte do cache em memória com lock, despejo e contadores próprios"""
+
+    def __init__(self, policy: str):
+        self.policy = policy
+        self.lock = threading.Lock()
+        # OrderedDict: ordem de uso recente (LRU) ou de inserção dentro da frequência (LFU)
+        self.entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self.timestamps: Dict[str, datetime] = {}
+        self.sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        # Heap (expira_em, seq, chave); entradas sobrescritas ficam obsoletas e são ignoradas
+        self.expiry_heap: List[Tuple[datetime, int, str]] = []
+        self.expiry_seq = 0
+        # LFU: frequência por chave e chaves por frequência (ordem de inserção)
+        self.frequencies: Dict[str, int] = {}
+        self.frequency_buckets: Dict[int, 'OrderedDict[str, None]'] = {}
+        self.min_frequency = 0
+        self.stats = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'expirations': 0}
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.timestamps.clear()
+        self.sizes.clear()
+        self.total_bytes = 0
+        self.expiry_heap.clear()
+        self.frequencies.clear()
+        self.frequency_buckets.clear()
+        self.min_frequency = 0
+
+    def insert(self, key: str, value: Any, size: int, expires_at: datetime) -> None:
+        self.entries[key] = value
+        self.timestamps[key] = expires_at
+        self.sizes[key] = size
+        self.total_bytes += size
+        self.expiry_seq += 1
+        heapq.heappush(self.expiry_heap, (expires_at, self.expiry_seq, key))
+        if self.policy == 'lfu':
+            self.frequencies[key] = 1
+            self.frequency_buckets.setdefault(1, OrderedDict())[key] = None
+            self.min_frequency = 1
+
+    def remove(self, key: str) -> None:
+        del self.entries[key]
+        self.timestamps.pop(key, None)
+        self.total_bytes -= self.sizes.pop(key, 0)
+        if self.policy == 'lfu':
+            frequency = self.frequencies.pop(key)
+            bucket = self.frequency_buckets[frequency]
+            del bucket[key]
+            if not bucket:
+                del self.frequency_buckets[frequency]
+        # A entrada no heap fica obsoleta; compacta quando sobra demais
+        if len(self.expiry_heap) > 2 * len(self.entries) + 64:
+            self.expiry_heap = [
+                entry for entry in self.expiry_heap
+                if self.timestamps.get(entry[2]) == entry[0]
+            ]
+            heapq.heapify(self.expiry_heap)
+
+    def touch(self, key: str) -> None:
+        if self.policy == 'lru':
+            self.entries.move_to_end(key)
+            return
+        frequency = self.frequencies[key]
+        bucket = self.frequency_buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self.frequency_buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = frequency + 1
+        self.frequencies[key] = frequency + 1
+        self.frequency_buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def eviction_candidate(self) -> str:
+        if self.policy == 'lru':
+            return next(iter(self.entries))
+        if self.min_frequency not in self.frequency_buckets:
+            # Após remoções o mínimo pode ter ficado desatualizado
+            self.min_frequency = min(self.frequency_buckets)
+        return next(iter(self.frequency_buckets[self.min_frequency]))
+
+    def sweep_expired(self, limit: Optional[int]) -> int:
+        """Remove até `limit` itens expirados (None = todos), do mais antigo ao mais novo"""
+        now = datetime.now()
+        removed = 0
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now and (limit is None or removed < limit):
+            expires_at, _, key = heapq.heappop(heap)
+            # Entrada obsoleta: chave removida ou regravada com outro prazo
+            if self.timestamps.get(key) != expires_at:
+                continue
+            self.remove(key)
+            removed += 1
+        self.stats['expirations'] += removed
+        return removed
+
+
+def _redis_pool(url: str) -> Any:
+    """Pool de conexões compartilhado para uma URL do Redis"""
+    import redis
+    with _redis_pools_lock:
+        pool = _redis_pools.get(url)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(
+                url,
+                max_connections=_env_int('REDIS_MAX_CONNECTIONS', 32),
+                socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT', 2.0)),
+                socket_connect_timeout=float(os.getenv('REDIS_CONNECT_TIMEOUT', 2.0)),
+                health_check_interval=30
+            )
+            _redis_pools[url] = pool
+        return pool
+
+
+def _escape_glob(pattern: str) -> str:
+    return re.sub(r'([*?\[\]\\])', r'\\\1', pattern)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"{name} inválido, usando {default}")
+        return default
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Bytes aproximados ocupados por um valor (recursivo em containers)
+
+    DataFrames/Series usam memory_usage(deep=True) e arrays numpy usam nbytes.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        memory_usage = getattr(obj, 'memory_usage', None)
+        if callable(memory_usage) and hasattr(obj, 'index'):
+            try:
+                usage = memory_usage(deep=True)
+                total += int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+                continue
+            except TypeError:
+                pass
+        nbytes = getattr(obj, 'nbytes', None)
+        if isinstance(nbytes, int):
+            total += nbytes
+            continue
+
+        total += sys.getsizeof(obj, 64)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__dict__') and not isinstance(obj, type):
+            stack.append(vars(obj))
+    return total
+
 
 # Instância global
 _cache_manager = None
@@ -241,14 +708,14 @@ def get_cache_manager(use_redis: bool = False) -> CacheManager:
     Obter instância global do gerenciador de cache
     
     Args:
-        use_redis: Usar Redis
+        use_redis: Usar Redis (também ativado quando REDIS_URL está definida)
         
     Returns:
         Instância do CacheManager
     """
     global _cache_manager
     if _cache_manager is None:
-        _cache_manager = CacheManager(use_redis=use_redis)
+        _cache_manager = CacheManager(use_redis=use_redis or bool(os.getenv('REDIS_URL')))
     return _cache_manager
 
 
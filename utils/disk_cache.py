@@ -0,0 +1,206 @@
+"""
+Segunda camada de cache em disco (SQLite) que sobrevive a reinícios
+
+Cada entrada guarda o valor serializado (utils.serialization) e os metadados de
+TTL: criado_em, expira_em e até quando ainda pode ser servida vencida. O banco
+usa journal WAL, então vários processos (workers do Streamlit, réplicas com o
+mesmo volume cache/) leem em paralelo enquanto um escreve, e cada gravação é
+uma transação atômica. utils.cache.CacheManager consulta esta camada quando a
+memória não tem a chave e promove de volta para a memória o que encontrar.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from utils import serialization
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / 'cache' / 'store'
+DB_NAME = 'cache.sqlite3'
+
+# Espera máxima por um lock de escrita de outro processo
+BUSY_TIMEOUT_SECONDS = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       BLOB NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    stale_until REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_stale_until ON entries (stale_until);
+"""
+
+# (valor, criado_em, expira_em)
+DiskEntry = Tuple[Any, float, float]
+
+
+class DiskCache:
+    """Entradas com TTL em um arquivo SQLite compartilhado entre processos"""
+
+    def __init__(self, root_dir: Optional[Union[str, Path]] = None):
+        """
+        Inicializa o cache em disco
+
+        Args:
+            root_dir: Diretório do banco (padrão: cache/store)
+        """
+        self.root_dir = Path(root_dir) if root_dir else DEFAULT_CACHE_DIR
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.root_dir / DB_NAME
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {'reads': 0, 'hits': 0, 'writes': 0, 'errors': 0}
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+        self.purge_expired()
+
+    def get(self, namespace: str, key: str) -> Optional[DiskEntry]:
+        """
+        Entrada ainda servível (válida ou dentro da janela de stale)
+
+        Returns:
+            (valor, criado_em, expira_em) ou None
+        """
+        self._count('reads')
+        try:
+            row = self._connection().execute(
+                'SELECT value, created_at, expires_at FROM entries '
+                'WHERE namespace = ? AND key = ? AND stale_until >= ?',
+                (namespace, key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._count('errors')
+            logger.warning(f"Falha ao ler cache em disco {namespace}/{key}: {e}")
+            return None
+        if row is None:
+            return None
+
+        try:
+            value = serialization.loads(row[0])
+        except Exception as e:
+            # Classe mudou entre versões ou payload corrompido: descarta
+            logger.debug(f"Entrada ilegível no cache em disco {namespace}/{key}: {e}")
+            self.delete(namespace, key)
+            return None
+        self._count('hits')
+        return value, row[1], row[2]
+
+    def set(self, namespace: str, key: str, value: Any, created_at: float, expires_at: float,
+            stale_until: float) -> bool:
+        """
+        Grava (ou substitui) uma entrada em uma transação
+
+        Returns:
+            True se gravou; False se o valor não é serializável ou o disco falhou
+        """
+        try:
+            payload = serialization.dumps(value)
+        except Exception as e:
+            logger.warning(f"Valor não serializável para o cache em disco {namespace}/{key}: {e}")
+            return False
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries '
+                    '(namespace, key, value, created_at, expires_at, stale_until) VALUES (?, ?, ?, ?, ?, ?)',
+                    (namespace, key, sqlite3.Binary(payload), created_at, expires_at, stale_until)
+                )
+        except sqlite3.Error as e:
+            self._count('errors')
+            logger.warning(f"Falha ao gravar cache em disco {namespace}/{key}: {e}")
+            return False
+        self._count('writes')
+        return True
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove uma entrada"""
+        self._execute('DELETE FROM entries WHERE namespace = ? AND key = ?', (namespace, key))
+
+    def clear(self, namespace: str) -> None:
+        """Remove todas as entradas de um namespace"""
+        self._execute('DELETE FROM entries WHERE namespace = ?', (namespace,))
+
+    def purge_expired(self) -> int:
+        """
+        Remove entradas além da janela de stale
+
+        Returns:
+            Número de entradas removidas
+        """
+        return self._execute('DELETE FROM entries WHERE stale_until < ?', (time.time(),))
+
+    def count(self, namespace: Optional[str] = None) -> int:
+        """Número de entradas gravadas (de um namespace ou de todos)"""
+        query, params = 'SELECT COUNT(*) FROM entries', ()
+        if namespace is not None:
+            query, params = query + ' WHERE namespace = ?', (namespace,)
+        try:
+            return self._connection().execute(query, params).fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Contadores de leituras, acertos, gravações e erros"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _execute(self, query: str, params: tuple) -> int:
+        try:
+            with self._connection() as conn:
+                return conn.execute(query, params).rowcount
+        except sqlite3.Error as e:
+            self._count('errors')
+            logger.warning(f"Falha no cache em disco: {e}")
+            return 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3.Connection não deve ser compartilhada entre threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """
+    Obter instância global do cache em disco
+
+    O diretório pode ser definido por PERSISTENT_CACHE_DIR;
+    PERSISTENT_CACHE_ENABLED=0 desativa a camada.
+
+    Returns:
+        Instância do DiskCache ou None se desativado/indisponível
+    """
+    global _disk_cache
+    if os.getenv('PERSISTENT_CACHE_ENABLED', '1').lower() in ('0', 'false', 'no'):
+        return None
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            try:
+                _disk_cache = DiskCache(os.getenv('PERSISTENT_CACHE_DIR') or None)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Cache em disco indisponível: {e}")
+                return None
+        return _disk_cache
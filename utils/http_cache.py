@@ -0,0 +1,202 @@
+"""
+Cache de respostas HTTP em disco com revalidação condicional
+
+Respostas 200 de GET que trazem validadores (ETag e/ou Last-Modified) são
+gravadas em disco. Na próxima requisição igual o cliente envia If-None-Match /
+If-Modified-Since; se a API responder 304, o corpo é servido do disco. Assim um
+container recém-iniciado não baixa tudo de novo e cada revalidação custa apenas
+cabeçalhos.
+
+Cada entrada é um único arquivo (uma linha JSON de metadados seguida do corpo),
+trocado atomicamente: gravações concorrentes nunca misturam o corpo de uma
+resposta com o ETag de outra. A URL não é gravada, pois a da The Odds API leva
+a apiKey na query string; o nome do arquivo é só o hash da requisição.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / 'cache' / 'http'
+
+# Cabeçalhos da resposta original preservados junto com o corpo
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date')
+
+
+class HttpCache:
+    """Armazena respostas com validadores e monta revalidações"""
+
+    def __init__(self, root_dir: Optional[Union[str, Path]] = None):
+        """
+        Inicializa o cache
+
+        Args:
+            root_dir: Diretório das entradas (padrão: cache/http)
+        """
+        self.root_dir = Path(root_dir) if root_dir else DEFAULT_CACHE_DIR
+        self._lock = threading.Lock()
+        self._stats = {'stored': 0, 'revalidated': 0}
+
+    def key(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> str:
+        """Chave estável da requisição (URL + parâmetros + cabeçalhos)"""
+        params_part = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+        headers_part = sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items())
+        raw = json.dumps([url, params_part, headers_part], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """
+        Entrada gravada
+
+        Returns:
+            Dict com etag, last_modified, headers etc. e o corpo em 'content', ou None
+        """
+        try:
+            with open(self._entry_path(key), 'rb') as handle:
+                meta = json.loads(handle.readline())
+                meta['content'] = handle.read()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    @staticmethod
+    def conditional_headers(meta: Dict) -> Dict[str, str]:
+        """Cabeçalhos de revalidação para uma entrada"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, key: str, response: requests.Response) -> bool:
+        """
+        Grava uma resposta 200 que tenha validadores
+
+        Returns:
+            True se a resposta foi gravada
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return False
+        if 'no-store' in (response.headers.get('Cache-Control') or '').lower():
+            return False
+
+        meta = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'headers': {
+                name: response.headers[name] for name in STORED_HEADERS if name in response.headers
+            },
+            'stored_at': time.time(),
+        }
+        try:
+            self._write_atomic(self._entry_path(key), json.dumps(meta).encode('utf-8') + b'\n' + response.content)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar resposta em cache: {e}")
+            return False
+
+        self._count('stored')
+        return True
+
+    def to_response(self, key: str, meta: Dict, not_modified: requests.Response) -> Optional[requests.Response]:
+        """
+        Monta a resposta completa a partir do disco após um 304
+
+        Args:
+            key: Chave da entrada
+            meta: Entrada devolvida por lookup() (a que foi revalidada)
+            not_modified: Resposta 304 da API (cabeçalhos atualizados)
+
+        Returns:
+            Resposta 200 com o corpo gravado ou None se a entrada não tem corpo
+        """
+        body = meta.get('content')
+        if body is None:
+            return None
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = body
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.encoding = meta.get('encoding')
+        response.elapsed = not_modified.elapsed
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        # Cabeçalhos novos (cota, Date, validadores) prevalecem
+        for name, value in not_modified.headers.items():
+            if name.lower() not in ('content-length', 'content-encoding', 'transfer-encoding'):
+                response.headers[name] = value
+        response.from_cache = True
+
+        self._count('revalidated')
+        return response
+
+    def invalidate(self, key: str) -> None:
+        """Remove uma entrada"""
+        try:
+            self._entry_path(key).unlink()
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """Contadores de respostas gravadas e revalidadas"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root_dir / key[:2] / f'{key}.entry'
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except OSError:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """
+    Obter instância global do cache HTTP
+
+    O diretório pode ser definido por HTTP_CACHE_DIR; HTTP_CACHE_ENABLED=0
+    desativa o cache.
+
+    Returns:
+        Instância do HttpCache ou None se desativado
+    """
+    global _http_cache
+    if os.getenv('HTTP_CACHE_ENABLED', '1').lower() in ('0', 'false', 'no'):
+        return None
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(os.getenv('HTTP_CACHE_DIR') or None)
+        return _http_cache
@@ -0,0 +1,229 @@
+"""
+Cliente HTTP compartilhado pelos coletores
+
+Uma única requests.Session com pool de conexões (keep-alive) evita abrir uma
+nova conexão TCP/TLS a cada chamada. Respostas 429/5xx e falhas de conexão são
+repetidas com backoff exponencial com jitter, respeitando o cabeçalho
+Retry-After quando presente. GETs podem ser revalidados com ETag /
+If-Modified-Since contra o cache em disco (utils/http_cache.py).
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.http_cache import HttpCache, get_http_cache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HttpClient:
+    """Sessão HTTP com pool de conexões e retry com backoff"""
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 60.0,
+        retry_statuses: Tuple[int, ...] = RETRY_STATUSES,
+        sleep: Callable[[float], None] = time.sleep,
+        cache: Optional[HttpCache] = None
+    ):
+        """
+        Inicializa o cliente
+
+        Args:
+            pool_connections: Número de hosts mantidos no pool
+            pool_maxsize: Conexões simultâneas por host
+            connect_timeout: Timeout de conexão (padrão: HTTP_CONNECT_TIMEOUT ou 3.05s)
+            read_timeout: Timeout de leitura (padrão: HTTP_READ_TIMEOUT ou 10s)
+            max_retries: Tentativas extras após a primeira
+            backoff_factor: Base do backoff exponencial em segundos
+            max_backoff: Teto do backoff calculado
+            max_retry_after: Retry-After maior que isso não é esperado (resposta é devolvida)
+            retry_statuses: Status HTTP que disparam nova tentativa
+            sleep: Função de espera — injetável em testes
+            cache: Cache em disco para revalidação condicional de GETs
+        """
+        self.connect_timeout = connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+        self.read_timeout = read_timeout or float(os.getenv('HTTP_READ_TIMEOUT', 10))
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = tuple(retry_statuses)
+        self._sleep = sleep
+        self.cache = cache
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'errors': 0}
+
+        self.session = requests.Session()
+        # Retry é feito aqui (com Retry-After e jitter), não pelo urllib3
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """Timeout padrão (conexão, leitura)"""
+        return self.connect_timeout, self.read_timeout
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: Optional[Timeout] = None,
+        max_retries: Optional[int] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Executa uma requisição com retry
+
+        Args:
+            method: Método HTTP
+            url: URL completa
+            params: Query string
+            headers: Cabeçalhos HTTP
+            timeout: Timeout em segundos ou (conexão, leitura)
+            max_retries: Tentativas extras desta chamada (padrão: as do cliente; o
+                RequestScheduler usa 0 e repete passando pela cota)
+
+        Returns:
+            Resposta final (pode ser 429/5xx se as tentativas acabarem)
+
+        Raises:
+            requests.exceptions.RequestException: Falha de conexão após todas as tentativas
+        """
+        timeout = timeout or self.timeout
+
+        cache_key, cached = None, None
+        send_headers = headers
+        if self.cache is not None and method.upper() == 'GET':
+            cache_key = self.cache.key(url, params, headers)
+            cached = self.cache.lookup(cache_key)
+            if cached:
+                send_headers = {**(headers or {}), **self.cache.conditional_headers(cached)}
+
+        retries = self.max_retries if max_retries is None else max_retries
+        response = self._send_with_retry(method, url, params, send_headers, timeout, retries, **kwargs)
+
+        if cache_key is not None:
+            if response.status_code == 304 and cached:
+                # Não modificado: corpo vem do disco
+                from_disk = self.cache.to_response(cache_key, cached, response)
+                if from_disk is not None:
+                    return from_disk
+            elif response.status_code == 200:
+                self.cache.store(cache_key, response)
+        return response
+
+    def _send_with_retry(self, method: str, url: str, params: Optional[Dict],
+                         headers: Optional[Dict], timeout: Timeout, max_retries: int,
+                         **kwargs) -> requests.Response:
+        for attempt in range(max_retries + 1):
+            self._count('requests')
+            try:
+                response = self.session.request(
+                    method, url, params=params, headers=headers, timeout=timeout, **kwargs
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= max_retries:
+                    self._count('errors')
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"Falha de conexão em {url} ({e}); nova tentativa em {delay:.2f}s")
+            else:
+                if response.status_code not in self.retry_statuses or attempt >= max_retries:
+                    return response
+
+                delay = self.retry_after(response)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                elif delay > self.max_retry_after:
+                    # Espera longa demais para uma requisição síncrona
+                    return response
+                logger.warning(
+                    f"{url} respondeu {response.status_code}; nova tentativa em {delay:.2f}s"
+                )
+                # Devolve a conexão ao pool antes de esperar
+                response.close()
+
+            self._count('retries')
+            self._sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET com retry (mesmos argumentos de request)"""
+        return self.request('GET', url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Contadores de requisições, novas tentativas e erros"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Fecha as conexões do pool"""
+        self.session.close()
+
+    def backoff(self, attempt: int) -> float:
+        """Espera antes da tentativa attempt + 1 (full jitter: uniforme até o teto exponencial)"""
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """Segundos pedidos pelo cabeçalho Retry-After (None se ausente ou inválido)"""
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Obter instância global do cliente HTTP (com cache em disco, se ativo)
+
+    Returns:
+        Instância do HttpClient
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(cache=get_http_cache())
+        return _http_client
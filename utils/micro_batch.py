@@ -0,0 +1,129 @@
+"""
+Agrupamento de chamadas concorrentes em lotes (micro-batching)
+
+Cada chamada a submit() entra em uma fila; uma thread despachante espera até
+window_seconds a partir do primeiro item (ou até max_batch itens) e chama o
+handler uma única vez com o lote inteiro. Cada chamador recebe um Future com o
+seu próprio resultado. Útil quando processar N itens juntos custa bem menos
+que N chamadas separadas, como nas simulações vetorizadas de previsão.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_SECONDS = 0.005
+DEFAULT_MAX_BATCH = 256
+
+# Recebe os itens do lote e devolve um resultado (ou exceção) por item, na mesma ordem
+BatchHandler = Callable[[List[Any]], Sequence[Any]]
+
+
+class MicroBatcher:
+    """Despacha itens submetidos por várias threads em lotes"""
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        name: str = 'micro-batcher'
+    ):
+        """
+        Inicializa o agrupador e inicia a thread despachante
+
+        Args:
+            handler: Função chamada com cada lote
+            window_seconds: Espera máxima por mais itens após o primeiro
+            max_batch: Tamanho máximo de um lote
+            name: Nome da thread despachante
+        """
+        self.handler = handler
+        self.window_seconds = window_seconds
+        self.max_batch = max(1, max_batch)
+        self._pending: List[Tuple[Any, Future]] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {'batches': 0, 'items': 0, 'largest_batch': 0, 'errors': 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Enfileira um item
+
+        Returns:
+            Future com o resultado do item
+
+        Raises:
+            RuntimeError: Agrupador já fechado
+        """
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher fechado")
+            self._pending.append((item, future))
+            self._cond.notify()
+        return future
+
+    def process(self, item: Any, timeout: float = None) -> Any:
+        """Enfileira um item e aguarda o resultado"""
+        return self.submit(item).result(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Processa os itens pendentes e encerra a thread despachante"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lotes, itens, maior lote, erros e tamanho médio dos lotes"""
+        with self._cond:
+            stats = dict(self._stats, pending=len(self._pending))
+        stats['avg_batch'] = stats['items'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Janela conta a partir do primeiro item do lote
+                deadline = time.monotonic() + self.window_seconds
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                self._pending = self._pending[self.max_batch:]
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        try:
+            results = list(self.handler([item for item, _ in batch]))
+            if len(results) != len(batch):
+                raise RuntimeError(f"Handler devolveu {len(results)} resultados para {len(batch)} itens")
+        except Exception as e:
+            logger.warning(f"Falha ao processar lote de {len(batch)} itens: {e}")
+            with self._cond:
+                self._stats['errors'] += 1
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        with self._cond:
+            self._stats['batches'] += 1
+            self._stats['items'] += len(batch)
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
@@ -0,0 +1,590 @@
+"""
+Agendador central de requisições às APIs externas
+
+Cada provedor tem um token bucket com a sua cota (Football-Data.org: ~10
+requisições/minuto; The Odds API: cota mensal medida em créditos). As
+requisições têm duas prioridades:
+
+- interactive: páginas da UI. Podem usar a reserva do bucket e têm preferência
+  sobre qualquer requisição em segundo plano que esteja esperando.
+- background: atualizações agendadas (scripts, pré-cálculo). Esperam o quanto
+  for necessário, consomem todo o restante da cota, mas nunca a reserva.
+
+Requisições GET idênticas em andamento são deduplicadas (apenas a primeira vai
+à rede, as demais recebem a mesma resposta). Uma chamada interativa só espera
+por uma idêntica em segundo plano se esta já estiver na rede, e no máximo pelo
+seu próprio max_wait; caso contrário segue com o seu próprio token. O consumo
+de cota é persistido em disco (no máximo a cada STATE_SAVE_INTERVAL segundos e
+ao encerrar o processo) para sobreviver a reinícios.
+
+Novas tentativas (429/5xx, falhas de conexão) são feitas aqui e não pelo
+HttpClient: cada uma passa de novo por _acquire, conta na cota e respeita o
+max_wait da chamada. Um Retry-After pausa o bucket do provedor.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+
+from utils.http_client import RETRY_STATUSES, HttpClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+_PRIORITY_RANK = {INTERACTIVE: 1, BACKGROUND: 0}
+
+DEFAULT_INTERACTIVE_WAIT = 30.0
+STATE_SAVE_INTERVAL = float(os.getenv('REQUEST_QUOTA_SAVE_SECONDS', 5))
+
+DEFAULT_STATE_FILE = Path(__file__).resolve().parent.parent / 'cache' / 'request_quota.json'
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Cota do provedor esgotada (ou espera maior que a permitida)"""
+
+
+@dataclass
+class ProviderQuota:
+    """Configuração de cota de um provedor"""
+    name: str
+    rate: float                          # requisições por janela
+    per_seconds: float                   # tamanho da janela em segundos
+    burst: Optional[float] = None        # capacidade do bucket (padrão: rate)
+    interactive_reserve: float = 1       # tokens que o background não pode usar
+    monthly_limit: Optional[int] = None  # cota mensal em créditos (APIs medidas)
+    monthly_reserve: int = 0             # créditos mensais reservados para a UI
+
+
+DEFAULT_PROVIDERS = {
+    'football_data': ProviderQuota(
+        name='football_data',
+        rate=float(os.getenv('FOOTBALL_DATA_RATE_PER_MINUTE', 10)),
+        per_seconds=60,
+        interactive_reserve=2,
+    ),
+    'odds_api': ProviderQuota(
+        name='odds_api',
+        rate=30,
+        per_seconds=60,
+        interactive_reserve=5,
+        monthly_limit=int(os.getenv('ODDS_API_MONTHLY_QUOTA', 500)),
+        monthly_reserve=int(os.getenv('ODDS_API_MONTHLY_RESERVE', 50)),
+    ),
+}
+
+
+class TokenBucket:
+    """Token bucket com reabastecimento contínuo"""
+
+    def __init__(self, capacity: float, refill_per_second: float,
+                 clock: Callable[[], float] = time.time):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._clock = clock
+        self.tokens = float(capacity)
+        self.updated_at = clock()
+        self.paused_until = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def available(self) -> float:
+        """Tokens disponíveis agora"""
+        self._refill()
+        return self.tokens
+
+    def try_acquire(self, cost: float = 1, reserve: float = 0) -> bool:
+        """
+        Consome tokens se houver saldo acima da reserva
+
+        Args:
+            cost: Tokens a consumir
+            reserve: Tokens que devem continuar no bucket após o consumo
+
+        Returns:
+            True se os tokens foram consumidos
+        """
+        self._refill()
+        if self._clock() < self.paused_until:
+            return False
+        if self.tokens - cost >= reserve - 1e-9:
+            self.tokens -= cost
+            return True
+        return False
+
+    def wait_time(self, cost: float = 1, reserve: float = 0) -> float:
+        """Segundos até que try_acquire(cost, reserve) seja possível"""
+        self._refill()
+        paused = max(0.0, self.paused_until - self._clock())
+        missing = cost + reserve - self.tokens
+        if missing <= 0:
+            return paused
+        if self.refill_per_second <= 0:
+            return float('inf')
+        return max(paused, missing / self.refill_per_second)
+
+    def drain(self, tokens: Optional[float] = None) -> None:
+        """Limita o saldo (ex.: quando a API informa menos cota do que o esperado)"""
+        self._refill()
+        self.tokens = 0.0 if tokens is None else min(self.tokens, float(tokens))
+
+    def pause(self, seconds: float) -> None:
+        """Bloqueia novas aquisições por alguns segundos (ex.: Retry-After)"""
+        self.paused_until = max(self.paused_until, self._clock() + max(0.0, seconds))
+
+
+class _InFlight:
+    """Requisição em andamento compartilhada entre chamadas idênticas"""
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.sending = False  # já tem o token e está na rede
+        self.done = threading.Event()
+        self.response: Optional[requests.Response] = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestScheduler:
+    """Agenda requisições HTTP respeitando a cota de cada provedor"""
+
+    def __init__(
+        self,
+        providers: Optional[Dict[str, ProviderQuota]] = None,
+        state_file: Optional[os.PathLike] = None,
+        persist: bool = True,
+        clock: Callable[[], float] = time.time,
+        http_client: Optional[HttpClient] = None,
+        save_interval: float = STATE_SAVE_INTERVAL,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Inicializa o agendador
+
+        Args:
+            providers: Cotas por provedor (padrão: DEFAULT_PROVIDERS)
+            state_file: Arquivo JSON com o consumo persistido
+            persist: Se False, não lê nem grava o estado em disco
+            clock: Relógio (segundos, epoch) — injetável em testes
+            http_client: Cliente HTTP (padrão: cliente global com pool)
+            save_interval: Intervalo mínimo entre gravações do estado (0 = a cada mudança)
+            sleep: Função de espera do backoff — injetável em testes
+        """
+        self.providers = dict(providers or DEFAULT_PROVIDERS)
+        self.state_file = Path(state_file) if state_file else DEFAULT_STATE_FILE
+        self.persist = persist
+        self._clock = clock
+        self._http_client = http_client
+        self.save_interval = save_interval
+        self._sleep = sleep
+        self._dirty = False
+        self._saved_at = float('-inf')
+        self._condition = threading.Condition()
+        self._in_flight: Dict[Tuple, _InFlight] = {}
+        self._interactive_waiting: Dict[str, int] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._usage: Dict[str, Dict[str, Any]] = {}
+        self._stats = {'requests': 0, 'deduplicated': 0, 'waits': 0, 'rejected': 0, 'retries': 0}
+
+        for name, quota in self.providers.items():
+            self._buckets[name] = TokenBucket(
+                capacity=quota.burst or quota.rate,
+                refill_per_second=quota.rate / quota.per_seconds,
+                clock=clock,
+            )
+            self._usage[name] = {'month': self._current_month(), 'used': 0, 'remaining': None}
+
+        if self.persist:
+            self._load_state()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def get(
+        self,
+        provider: str,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        priority: str = INTERACTIVE,
+        cost: int = 1,
+        timeout: Optional[float] = None,
+        max_wait: Optional[float] = None
+    ) -> requests.Response:
+        """
+        Executa um GET respeitando a cota do provedor
+
+        Args:
+            provider: Nome do provedor ('football_data', 'odds_api')
+            url: URL completa
+            params: Query string
+            headers: Cabeçalhos HTTP
+            priority: INTERACTIVE ou BACKGROUND
+            cost: Créditos consumidos pela chamada (0 para endpoints gratuitos)
+            timeout: Timeout da requisição (padrão: o do cliente HTTP)
+            max_wait: Espera máxima por cota (padrão: 30s interativo, sem limite background)
+
+        Returns:
+            Resposta HTTP (pode ser 429/5xx se não houver cota ou tempo para repetir)
+
+        Raises:
+            RateLimitExceeded: Cota esgotada ou espera maior que max_wait
+        """
+        if provider not in self.providers:
+            raise ValueError(f"Provedor desconhecido: {provider}. Opções: {list(self.providers)}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Prioridade inválida: {priority}. Opções: {list(PRIORITIES)}")
+
+        if max_wait is None:
+            max_wait = DEFAULT_INTERACTIVE_WAIT if priority == INTERACTIVE else None
+        deadline = None if max_wait is None else self._clock() + max_wait
+        key = self._request_key(provider, url, params, headers)
+
+        with self._condition:
+            shared = self._in_flight.get(key)
+            if shared is not None and (self._can_follow(shared, priority) or shared.sending):
+                self._stats['deduplicated'] += 1
+            else:
+                shared = None
+                in_flight = self._lead(key, priority)
+
+        if shared is not None:
+            if self._can_follow(shared, priority):
+                shared.done.wait()
+                if shared.error is not None:
+                    raise shared.error
+                return shared.response
+
+            # Líder de menor prioridade já na rede: espera no máximo o próprio max_wait
+            # e, se não der (ou se ele falhar), segue com o próprio token
+            if shared.done.wait(max_wait) and shared.error is None:
+                return shared.response
+            with self._condition:
+                in_flight = self._lead(key, priority)
+
+        try:
+            response = self._fetch(provider, url, params, headers, priority, cost, timeout, deadline, in_flight)
+            in_flight.response = response
+            return response
+        except BaseException as e:
+            in_flight.error = e
+            raise
+        finally:
+            with self._condition:
+                if self._in_flight.get(key) is in_flight:
+                    del self._in_flight[key]
+            in_flight.done.set()
+
+    def flush(self) -> None:
+        """Grava o estado de cota pendente em disco"""
+        self._save_state(force=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna o estado das cotas
+
+        Returns:
+            Dict com contadores globais e, por provedor, tokens e consumo mensal
+        """
+        with self._condition:
+            providers = {}
+            for name, quota in self.providers.items():
+                usage = self._usage[name]
+                providers[name] = {
+                    'tokens_available': round(self._buckets[name].available(), 2),
+                    'capacity': self._buckets[name].capacity,
+                    'monthly_used': usage['used'],
+                    'monthly_limit': quota.monthly_limit,
+                    'remaining_reported': usage['remaining'],
+                }
+            return {**self._stats, 'in_flight': len(self._in_flight), 'providers': providers}
+
+    # ------------------------------------------------------------------
+    # Deduplicação
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _can_follow(shared: _InFlight, priority: str) -> bool:
+        # Só espera por um líder de prioridade igual ou maior
+        return _PRIORITY_RANK[shared.priority] >= _PRIORITY_RANK[priority]
+
+    def _lead(self, key: Tuple, priority: str) -> _InFlight:
+        # Chamado com self._condition; substitui um líder de menor prioridade
+        in_flight = _InFlight(priority)
+        self._in_flight[key] = in_flight
+        return in_flight
+
+    # ------------------------------------------------------------------
+    # Envio e novas tentativas
+    # ------------------------------------------------------------------
+
+    def _fetch(self, provider: str, url: str, params: Optional[Dict], headers: Optional[Dict],
+               priority: str, cost: int, timeout: Optional[float], deadline: Optional[float],
+               in_flight: _InFlight) -> requests.Response:
+        max_retries = self.http_client.max_retries
+        response = None
+        for attempt in range(max_retries + 1):
+            remaining = None if deadline is None else max(0.0, deadline - self._clock())
+            try:
+                self._acquire(provider, priority, cost, remaining)
+            except RateLimitExceeded:
+                # Sem cota (ou tempo) para repetir: devolve a última resposta
+                if response is None:
+                    raise
+                return response
+            in_flight.sending = True
+
+            try:
+                response = self._send(url, params=params, headers=headers, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= max_retries:
+                    raise
+                response = None
+                delay = self.http_client.backoff(attempt)
+                logger.warning(f"Falha de conexão em {url} ({e}); nova tentativa em {delay:.2f}s")
+            else:
+                retry_after = self._observe_response(provider, response)
+                if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                    return response
+                if retry_after is not None and retry_after > self.http_client.max_retry_after:
+                    return response
+                # 429 e Retry-After já estão no bucket: a espera acontece em _acquire
+                if retry_after is not None or response.status_code == 429:
+                    delay = 0.0
+                else:
+                    delay = self.http_client.backoff(attempt)
+                logger.warning(f"{url} respondeu {response.status_code}; nova tentativa pela cota de {provider}")
+
+            if deadline is not None and self._clock() + delay > deadline:
+                if response is None:
+                    raise RateLimitExceeded(f"Sem tempo para repetir {url} dentro de max_wait")
+                return response
+            with self._condition:
+                self._stats['retries'] += 1
+            if delay > 0:
+                self._sleep(delay)
+        return response
+
+    # ------------------------------------------------------------------
+    # Cota
+    # ------------------------------------------------------------------
+
+    def _acquire(self, provider: str, priority: str, cost: int, max_wait: Optional[float]) -> None:
+        quota = self.providers[provider]
+        bucket = self._buckets[provider]
+        interactive = priority == INTERACTIVE
+        deadline = None if max_wait is None else self._clock() + max_wait
+
+        with self._condition:
+            if interactive:
+                self._interactive_waiting[provider] = self._interactive_waiting.get(provider, 0) + 1
+            try:
+                while True:
+                    self._check_monthly(provider, quota, cost, interactive)
+
+                    if cost <= 0:
+                        break
+
+                    # Background cede a vez enquanto houver UI esperando
+                    blocked = not interactive and self._interactive_waiting.get(provider, 0) > 0
+                    reserve = 0 if interactive else quota.interactive_reserve
+                    if not blocked and bucket.try_acquire(cost, reserve):
+                        break
+
+                    wait = bucket.wait_time(cost, reserve) if not blocked else 0.05
+                    if deadline is not None:
+                        remaining = deadline - self._clock()
+                        if wait > remaining:
+                            self._stats['rejected'] += 1
+                            raise RateLimitExceeded(
+                                f"Cota de {provider} esgotada: espera de {wait:.1f}s "
+                                f"excede o limite de {max_wait:.1f}s"
+                            )
+                    self._stats['waits'] += 1
+                    # Acorda antes se outra requisição liberar a vez
+                    self._condition.wait(timeout=max(wait, 0.01))
+
+                self._usage[provider]['used'] += max(cost, 0)
+                self._stats['requests'] += 1
+                self._dirty = True
+            finally:
+                if interactive:
+                    self._interactive_waiting[provider] -= 1
+                    self._condition.notify_all()
+
+        self._save_state()
+
+    def _check_monthly(self, provider: str, quota: ProviderQuota, cost: int, interactive: bool) -> None:
+        if quota.monthly_limit is None or cost <= 0:
+            return
+
+        usage = self._usage[provider]
+        month = self._current_month()
+        if usage['month'] != month:
+            usage.update({'month': month, 'used': 0, 'remaining': None})
+
+        remaining = quota.monthly_limit - usage['used']
+        if usage['remaining'] is not None:
+            # O que a API informa prevalece sobre a contagem local
+            remaining = min(remaining, usage['remaining'])
+
+        reserve = 0 if interactive else quota.monthly_reserve
+        if remaining - cost < reserve:
+            self._stats['rejected'] += 1
+            raise RateLimitExceeded(
+                f"Cota mensal de {provider} esgotada ({remaining} créditos restantes, "
+                f"{reserve} reservados para uso interativo)"
+            )
+
+    def _observe_response(self, provider: str, response: requests.Response) -> Optional[float]:
+        """
+        Ajusta a contabilidade com os cabeçalhos de cota da resposta
+
+        Returns:
+            Retry-After em segundos, se a resposta pedir nova tentativa mais tarde
+        """
+        headers = response.headers or {}
+        retry_after = None
+
+        with self._condition:
+            # The Odds API
+            remaining = headers.get('x-requests-remaining')
+            if remaining is not None:
+                try:
+                    self._usage[provider]['remaining'] = int(float(remaining))
+                except ValueError:
+                    pass
+
+            # Football-Data.org
+            available = headers.get('X-Requests-Available-Minute')
+            if available is not None:
+                try:
+                    self._buckets[provider].drain(float(available))
+                except ValueError:
+                    pass
+
+            if response.status_code == 429:
+                self._buckets[provider].drain()
+                logger.warning(f"{provider} respondeu 429; bucket esvaziado")
+
+            if response.status_code in RETRY_STATUSES:
+                retry_after = HttpClient.retry_after(response)
+                if retry_after is not None:
+                    self._buckets[provider].pause(retry_after)
+
+            self._dirty = True
+
+        self._save_state()
+        return retry_after
+
+    # ------------------------------------------------------------------
+    # Infraestrutura
+    # ------------------------------------------------------------------
+
+    @property
+    def http_client(self) -> HttpClient:
+        """Cliente HTTP usado nas requisições (global por padrão)"""
+        if self._http_client is None:
+            self._http_client = get_http_client()
+        return self._http_client
+
+    def _send(self, url: str, params: Optional[Dict], headers: Optional[Dict],
+              timeout: Optional[float]) -> requests.Response:
+        # Sem retry no cliente: cada tentativa precisa passar pela cota
+        return self.http_client.get(url, params=params, headers=headers, timeout=timeout, max_retries=0)
+
+    @staticmethod
+    def _request_key(provider: str, url: str, params: Optional[Dict], headers: Optional[Dict]) -> Tuple:
+        params_key = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        headers_key = tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items()))
+        return provider, url, params_key, headers_key
+
+    def _current_month(self) -> str:
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc).strftime('%Y-%m')
+
+    def _load_state(self) -> None:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return
+
+        for name, saved in state.get('providers', {}).items():
+            if name not in self.providers:
+                continue
+            bucket = self._buckets[name]
+            bucket.tokens = min(bucket.capacity, float(saved.get('tokens', bucket.capacity)))
+            bucket.updated_at = float(saved.get('updated_at', self._clock()))
+            if saved.get('month') == self._current_month():
+                self._usage[name].update({
+                    'month': saved['month'],
+                    'used': int(saved.get('used', 0)),
+                    'remaining': saved.get('remaining'),
+                })
+
+    def _save_state(self, force: bool = False) -> None:
+        if not self.persist:
+            return
+
+        with self._condition:
+            now = self._clock()
+            if not self._dirty or (not force and now - self._saved_at < self.save_interval):
+                return
+            self._dirty = False
+            self._saved_at = now
+            state = {'providers': {
+                name: {
+                    'tokens': self._buckets[name].tokens,
+                    'updated_at': self._buckets[name].updated_at,
+                    **self._usage[name],
+                }
+                for name in self.providers
+            }}
+
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.state_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(state, handle)
+            os.replace(tmp_name, self.state_file)
+        except OSError as e:
+            with self._condition:
+                self._dirty = True
+            logger.warning(f"Não foi possível salvar o estado de cota: {e}")
+
+
+_request_scheduler = None
+_request_scheduler_lock = threading.Lock()
+
+
+def get_request_scheduler() -> RequestScheduler:
+    """
+    Obter instância global do agendador
+
+    O arquivo de estado pode ser definido pela variável REQUEST_QUOTA_FILE; o
+    estado pendente é gravado ao encerrar o processo.
+
+    Returns:
+        Instância do RequestScheduler
+    """
+    global _request_scheduler
+    with _request_scheduler_lock:
+        if _request_scheduler is None:
+            _request_scheduler = RequestScheduler(state_file=os.getenv('REQUEST_QUOTA_FILE') or None)
+            atexit.register(_request_scheduler.flush)
+        return _request_scheduler
@@ -0,0 +1,132 @@
+"""
+Serialização binária compacta para caches compartilhados (Redis, disco)
+
+dumps/loads usam pickle (protocolo 5), com zlib acima de COMPRESS_MIN_BYTES,
+e preservam arrays NumPy, datetimes, DataFrames e dataclasses do projeto como
+MatchInputs. Na leitura, um Unpickler restrito só aceita tipos de uma lista
+permitida: dados vindos de um Redis compartilhado não podem executar funções
+arbitrárias ao serem desserializados.
+"""
+import io
+import pickle
+import zlib
+from typing import Any
+
+# Cabeçalho de 1 byte: formato do payload
+RAW = b'P'
+COMPRESSED = b'Z'
+
+COMPRESS_MIN_BYTES = 1024
+PICKLE_PROTOCOL = 5
+
+SAFE_BUILTINS = {
+    'bool', 'bytearray', 'bytes', 'complex', 'dict', 'float', 'frozenset',
+    'int', 'list', 'range', 'set', 'slice', 'str', 'tuple',
+}
+
+SAFE_GLOBALS = {
+    ('collections', 'OrderedDict'),
+    ('collections', 'defaultdict'),
+    ('collections', 'deque'),
+    ('collections', 'Counter'),
+    ('datetime', 'date'),
+    ('datetime', 'datetime'),
+    ('datetime', 'time'),
+    ('datetime', 'timedelta'),
+    ('datetime', 'timezone'),
+    ('decimal', 'Decimal'),
+    ('zoneinfo', 'ZoneInfo'),
+    ('numpy.core.multiarray', '_reconstruct'),
+    ('numpy.core.multiarray', 'scalar'),
+    ('numpy._core.multiarray', '_reconstruct'),
+    ('numpy._core.multiarray', 'scalar'),
+    ('numpy.core.numeric', '_frombuffer'),
+    ('numpy._core.numeric', '_frombuffer'),
+    ('pyarrow.lib', 'py_buffer'),
+    ('pyarrow.lib', 'type_for_alias'),
+}
+
+# Pacotes cujas classes (e funções internas de reconstrução) são aceitas
+LIBRARY_PACKAGES = ('numpy', 'pandas', 'pyarrow')
+RECONSTRUCTOR_PREFIXES = ('_unpickle', '__pyx_unpickle', '_new_', '_restore')
+
+# Pacotes do projeto: apenas classes (dataclasses como MatchInputs)
+PROJECT_PACKAGES = ('analysis', 'data', 'models', 'modules', 'utils', 'leagues', 'collectors')
+
+
+class UnsafePayloadError(pickle.UnpicklingError):
+    """Payload referencia um objeto fora da lista permitida"""
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serializa um valor para bytes
+
+    Args:
+        value: Valor a serializar
+
+    Returns:
+        Bytes com cabeçalho de formato
+    """
+    data = pickle.dumps(value, protocol=PICKLE_PROTOCOL)
+    if len(data) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            return COMPRESSED + compressed
+    return RAW + data
+
+
+def loads(payload: bytes) -> Any:
+    """
+    Desserializa bytes gerados por dumps
+
+    Raises:
+        UnsafePayloadError: Payload usa tipos não permitidos
+        ValueError: Cabeçalho desconhecido
+    """
+    header, data = payload[:1], payload[1:]
+    if header == COMPRESSED:
+        data = zlib.decompress(data)
+    elif header != RAW:
+        raise ValueError(f"Formato de payload desconhecido: {header!r}")
+    return RestrictedUnpickler(io.BytesIO(data)).load()
+
+
+class RestrictedUnpickler(pickle.Unpickler):
+    """Unpickler que só resolve globais da lista permitida"""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == 'builtins':
+            if name in SAFE_BUILTINS:
+                return super().find_class(module, name)
+            if name == 'getattr':
+                # Usado para métodos de classe (ex.: ZoneInfo._unpickle)
+                return _safe_getattr
+            raise UnsafePayloadError(f"Global não permitido: {module}.{name}")
+
+        if (module, name) in SAFE_GLOBALS:
+            return super().find_class(module, name)
+
+        package = module.partition('.')[0]
+        if package in LIBRARY_PACKAGES:
+            if name.startswith(RECONSTRUCTOR_PREFIXES):
+                return super().find_class(module, name)
+            return _class_only(super().find_class(module, name), module, name)
+
+        if package in PROJECT_PACKAGES:
+            return _class_only(super().find_class(module, name), module, name)
+
+        raise UnsafePayloadError(f"Global não permitido: {module}.{name}")
+
+
+def _class_only(obj: Any, module: str, name: str) -> Any:
+    if not isinstance(obj, type):
+        raise UnsafePayloadError(f"Global não permitido: {module}.{name}")
+    return obj
+
+
+def _safe_getattr(obj: Any, name: str) -> Any:
+    # Só atributos públicos ou "_privados" de classes já permitidas, nunca dunders
+    if not isinstance(obj, type) or name.startswith('__'):
+        raise UnsafePayloadError(f"Atributo não permitido: {name}")
+    return getattr(obj, name)